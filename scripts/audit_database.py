@@ -5,37 +5,44 @@ FAANG-Grade Database Health Check
 
 Runs comprehensive audit queries and outputs results for DATABASE_AUDIT.md
 
+The audit queries are independent and read-only, so they run concurrently on
+pooled connections (see diagnostics_engine.py), each with its own
+statement_timeout. Sections are printed in order once all have finished,
+followed by per-query timings.
+
 Usage:
     python3 scripts/audit_database.py
+    python3 scripts/audit_database.py --workers 2 --report /tmp/audit.json
 """
 
+import argparse
+import json
 import sys
 import os
+import time
+from dataclasses import replace
 from datetime import datetime
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from db_config import get_connection
+from db_config import close_pools
+from diagnostics_engine import (
+    DEFAULT_TIMEOUT_MS,
+    DEFAULT_WORKERS,
+    DiagnosticCheck,
+    build_report,
+    print_timings,
+    run_checks,
+)
 
-def run_audit():
-    """Run all database audit queries and print results."""
 
-    print("=" * 80)
-    print("DATABASE AUDIT - StarHouse Platform")
-    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
-    print()
+def audit_check(name, sql, section):
+    """Audit queries print every row, so none are capped."""
+    return DiagnosticCheck(name=name, sql=sql, description=section, max_rows=None)
 
-    conn = get_connection()
-    cur = conn.cursor()
 
-    # ================================================================
-    # 1. TABLE ROW COUNTS
-    # ================================================================
-    print("## 1. TABLE ROW COUNTS")
-    print("-" * 60)
-
-    cur.execute("""
+AUDIT_CHECKS = [
+    audit_check('table_row_counts', """
         SELECT
             relname as tablename,
             n_live_tup as row_count,
@@ -43,22 +50,9 @@ def run_audit():
         FROM pg_stat_user_tables
         WHERE schemaname = 'public'
         ORDER BY n_live_tup DESC;
-    """)
-
-    rows = cur.fetchall()
-    print(f"{'Table':<40} {'Rows':>10} {'Dead':>10}")
-    print("-" * 60)
-    for row in rows:
-        print(f"{row[0]:<40} {row[1]:>10,} {row[2]:>10,}")
-    print()
+    """, "## 1. TABLE ROW COUNTS"),
 
-    # ================================================================
-    # 2. TABLES WITHOUT PRIMARY KEYS
-    # ================================================================
-    print("## 2. TABLES WITHOUT PRIMARY KEYS")
-    print("-" * 60)
-
-    cur.execute("""
+    audit_check('tables_without_primary_keys', """
         SELECT t.tablename
         FROM pg_tables t
         WHERE t.schemaname = 'public'
@@ -69,23 +63,9 @@ def run_audit():
               AND i.indexname LIKE '%pkey%'
           )
         ORDER BY t.tablename;
-    """)
-
-    rows = cur.fetchall()
-    if rows:
-        for row in rows:
-            print(f"  - {row[0]}")
-    else:
-        print("  ✓ All tables have primary keys")
-    print()
-
-    # ================================================================
-    # 3. FOREIGN KEY RELATIONSHIPS
-    # ================================================================
-    print("## 3. FOREIGN KEY RELATIONSHIPS")
-    print("-" * 60)
+    """, "## 2. TABLES WITHOUT PRIMARY KEYS"),
 
-    cur.execute("""
+    audit_check('foreign_keys', """
         SELECT
             tc.table_name,
             kcu.column_name,
@@ -101,22 +81,9 @@ def run_audit():
         WHERE tc.constraint_type = 'FOREIGN KEY'
           AND tc.table_schema = 'public'
         ORDER BY tc.table_name, kcu.column_name;
-    """)
-
-    rows = cur.fetchall()
-    print(f"{'Table.Column':<40} {'References':>30}")
-    print("-" * 70)
-    for row in rows:
-        print(f"{row[0]}.{row[1]:<30} -> {row[2]}.{row[3]}")
-    print()
-
-    # ================================================================
-    # 4. DUPLICATE CONTACTS BY EMAIL
-    # ================================================================
-    print("## 4. DUPLICATE CONTACTS BY EMAIL")
-    print("-" * 60)
+    """, "## 3. FOREIGN KEY RELATIONSHIPS"),
 
-    cur.execute("""
+    audit_check('duplicate_emails', """
         SELECT email, COUNT(*) as count
         FROM contacts
         WHERE email IS NOT NULL
@@ -124,53 +91,18 @@ def run_audit():
         HAVING COUNT(*) > 1
         ORDER BY count DESC
         LIMIT 20;
-    """)
+    """, "## 4. DUPLICATE CONTACTS BY EMAIL"),
 
-    rows = cur.fetchall()
-    if rows:
-        print(f"{'Email':<50} {'Count':>10}")
-        print("-" * 60)
-        for row in rows:
-            print(f"{row[0]:<50} {row[1]:>10}")
-    else:
-        print("  ✓ No duplicate emails found")
-    print()
-
-    # ================================================================
-    # 5. DUPLICATE EXTERNAL IDENTITIES
-    # ================================================================
-    print("## 5. DUPLICATE EXTERNAL IDENTITIES")
-    print("-" * 60)
-
-    try:
-        cur.execute("""
-            SELECT system, external_id, COUNT(*) as count
-            FROM external_identities
-            GROUP BY system, external_id
-            HAVING COUNT(*) > 1
-            ORDER BY count DESC
-            LIMIT 20;
-        """)
-
-        rows = cur.fetchall()
-        if rows:
-            print(f"{'System':<20} {'External ID':<30} {'Count':>10}")
-            print("-" * 60)
-            for row in rows:
-                print(f"{row[0]:<20} {row[1]:<30} {row[2]:>10}")
-        else:
-            print("  ✓ No duplicate external identities found")
-    except Exception as e:
-        print(f"  (Table may not exist: {e})")
-    print()
-
-    # ================================================================
-    # 6. CONTACTS DATA COMPLETENESS
-    # ================================================================
-    print("## 6. CONTACTS DATA COMPLETENESS")
-    print("-" * 60)
+    audit_check('duplicate_external_identities', """
+        SELECT system, external_id, COUNT(*) as count
+        FROM external_identities
+        GROUP BY system, external_id
+        HAVING COUNT(*) > 1
+        ORDER BY count DESC
+        LIMIT 20;
+    """, "## 5. DUPLICATE EXTERNAL IDENTITIES"),
 
-    cur.execute("""
+    audit_check('contact_completeness', """
         SELECT
             COUNT(*) as total_contacts,
             COUNT(email) as has_email,
@@ -184,9 +116,164 @@ def run_audit():
             ROUND(100.0 * COUNT(phone) / NULLIF(COUNT(*), 0), 2) as phone_pct,
             ROUND(100.0 * COUNT(address_line_1) / NULLIF(COUNT(*), 0), 2) as address_pct
         FROM contacts;
-    """)
+    """, "## 6. CONTACTS DATA COMPLETENESS"),
+
+    audit_check('contacts_without_source', """
+        SELECT COUNT(*) as contacts_without_source
+        FROM contacts c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM external_identities ei
+            WHERE ei.contact_id = c.id
+        );
+    """, "## 7. CONTACTS WITHOUT SOURCE TRACKING"),
+
+    audit_check('rls_status', """
+        SELECT
+            tablename,
+            rowsecurity
+        FROM pg_tables
+        WHERE schemaname = 'public'
+        ORDER BY tablename;
+    """, "## 8. RLS (ROW LEVEL SECURITY) STATUS"),
 
-    row = cur.fetchone()
+    audit_check('rls_policies', """
+        SELECT
+            tablename,
+            policyname,
+            cmd
+        FROM pg_policies
+        WHERE schemaname = 'public'
+        ORDER BY tablename, policyname;
+    """, "## 9. RLS POLICIES"),
+
+    audit_check('index_usage', """
+        SELECT
+            relname as table_name,
+            seq_scan,
+            seq_tup_read,
+            idx_scan,
+            idx_tup_fetch,
+            CASE
+                WHEN (seq_scan + idx_scan) > 0
+                THEN ROUND(100.0 * idx_scan / (seq_scan + idx_scan), 2)
+                ELSE 0
+            END as index_usage_pct
+        FROM pg_stat_user_tables
+        WHERE schemaname = 'public'
+          AND (seq_scan + idx_scan) > 0
+        ORDER BY seq_scan DESC
+        LIMIT 20;
+    """, "## 10. INDEX USAGE STATISTICS"),
+
+    audit_check('table_sizes', """
+        SELECT
+            tablename,
+            pg_size_pretty(pg_total_relation_size(quote_ident(tablename)::regclass)) as total_size,
+            pg_size_pretty(pg_relation_size(quote_ident(tablename)::regclass)) as table_size,
+            pg_size_pretty(pg_indexes_size(quote_ident(tablename)::regclass)) as index_size
+        FROM pg_tables
+        WHERE schemaname = 'public'
+        ORDER BY pg_total_relation_size(quote_ident(tablename)::regclass) DESC;
+    """, "## 11. TABLE SIZES"),
+
+    audit_check('indexes', """
+        SELECT
+            tablename,
+            indexname,
+            indexdef
+        FROM pg_indexes
+        WHERE schemaname = 'public'
+        ORDER BY tablename, indexname;
+    """, "## 12. INDEXES BY TABLE"),
+
+    audit_check('transactions_by_source', """
+        SELECT
+            source_system,
+            COUNT(*) as transaction_count,
+            SUM(amount) as total_amount,
+            MIN(transaction_date) as earliest,
+            MAX(transaction_date) as latest
+        FROM transactions
+        GROUP BY source_system
+        ORDER BY transaction_count DESC;
+    """, "## 13. TRANSACTIONS BY SOURCE SYSTEM"),
+
+    audit_check('subscription_status', """
+        SELECT
+            status,
+            COUNT(*) as count,
+            SUM(amount) as total_mrr
+        FROM subscriptions
+        GROUP BY status
+        ORDER BY count DESC;
+    """, "## 14. SUBSCRIPTION STATUS BREAKDOWN"),
+
+    audit_check('orphaned_transactions', """
+        SELECT COUNT(*)
+        FROM transactions t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM contacts c WHERE c.id = t.contact_id
+        );
+    """, "## 15. ORPHANED RECORDS CHECK"),
+
+    audit_check('orphaned_subscriptions', """
+        SELECT COUNT(*)
+        FROM subscriptions s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM contacts c WHERE c.id = s.contact_id
+        );
+    """, "## 15. ORPHANED RECORDS CHECK"),
+]
+
+
+# ================================================================
+# SECTION PRINTERS (rows are tuples in SELECT column order)
+# ================================================================
+
+def print_table_row_counts(rows):
+    print(f"{'Table':<40} {'Rows':>10} {'Dead':>10}")
+    print("-" * 60)
+    for row in rows:
+        print(f"{row[0]:<40} {row[1]:>10,} {row[2]:>10,}")
+
+
+def print_tables_without_primary_keys(rows):
+    if rows:
+        for row in rows:
+            print(f"  - {row[0]}")
+    else:
+        print("  ✓ All tables have primary keys")
+
+
+def print_foreign_keys(rows):
+    print(f"{'Table.Column':<40} {'References':>30}")
+    print("-" * 70)
+    for row in rows:
+        print(f"{row[0]}.{row[1]:<30} -> {row[2]}.{row[3]}")
+
+
+def print_duplicate_emails(rows):
+    if rows:
+        print(f"{'Email':<50} {'Count':>10}")
+        print("-" * 60)
+        for row in rows:
+            print(f"{row[0]:<50} {row[1]:>10}")
+    else:
+        print("  ✓ No duplicate emails found")
+
+
+def print_duplicate_external_identities(rows):
+    if rows:
+        print(f"{'System':<20} {'External ID':<30} {'Count':>10}")
+        print("-" * 60)
+        for row in rows:
+            print(f"{row[0]:<20} {row[1]:<30} {row[2]:>10}")
+    else:
+        print("  ✓ No duplicate external identities found")
+
+
+def print_contact_completeness(rows):
+    row = rows[0]
     print(f"Total Contacts: {row[0]:,}")
     print()
     print(f"{'Field':<20} {'Count':>10} {'Percentage':>12}")
@@ -196,46 +283,13 @@ def run_audit():
     print(f"{'Last Name':<20} {row[3]:>10,} {row[8]:>10.1f}%")
     print(f"{'Phone':<20} {row[4]:>10,} {row[9]:>10.1f}%")
     print(f"{'Address':<20} {row[5]:>10,} {row[10]:>10.1f}%")
-    print()
 
-    # ================================================================
-    # 7. CONTACTS WITHOUT SOURCE TRACKING
-    # ================================================================
-    print("## 7. CONTACTS WITHOUT SOURCE TRACKING")
-    print("-" * 60)
 
-    try:
-        cur.execute("""
-            SELECT COUNT(*) as contacts_without_source
-            FROM contacts c
-            WHERE NOT EXISTS (
-                SELECT 1 FROM external_identities ei
-                WHERE ei.contact_id = c.id
-            );
-        """)
-
-        row = cur.fetchone()
-        print(f"Contacts without external identity: {row[0]:,}")
-    except Exception as e:
-        print(f"  (Could not check: {e})")
-    print()
+def print_contacts_without_source(rows):
+    print(f"Contacts without external identity: {rows[0][0]:,}")
 
-    # ================================================================
-    # 8. RLS (ROW LEVEL SECURITY) STATUS
-    # ================================================================
-    print("## 8. RLS (ROW LEVEL SECURITY) STATUS")
-    print("-" * 60)
 
-    cur.execute("""
-        SELECT
-            tablename,
-            rowsecurity
-        FROM pg_tables
-        WHERE schemaname = 'public'
-        ORDER BY tablename;
-    """)
-
-    rows = cur.fetchall()
+def print_rls_status(rows):
     enabled = 0
     disabled = 0
     print(f"{'Table':<40} {'RLS Enabled':>15}")
@@ -249,25 +303,9 @@ def run_audit():
             disabled += 1
     print()
     print(f"Summary: {enabled} enabled, {disabled} disabled")
-    print()
 
-    # ================================================================
-    # 9. RLS POLICIES
-    # ================================================================
-    print("## 9. RLS POLICIES")
-    print("-" * 60)
-
-    cur.execute("""
-        SELECT
-            tablename,
-            policyname,
-            cmd
-        FROM pg_policies
-        WHERE schemaname = 'public'
-        ORDER BY tablename, policyname;
-    """)
 
-    rows = cur.fetchall()
+def print_rls_policies(rows):
     if rows:
         print(f"{'Table':<30} {'Policy':<35} {'Command':>10}")
         print("-" * 75)
@@ -275,81 +313,23 @@ def run_audit():
             print(f"{row[0]:<30} {row[1]:<35} {row[2]:>10}")
     else:
         print("  No RLS policies found")
-    print()
 
-    # ================================================================
-    # 10. INDEX USAGE STATISTICS
-    # ================================================================
-    print("## 10. INDEX USAGE STATISTICS")
-    print("-" * 60)
-
-    cur.execute("""
-        SELECT
-            relname as table_name,
-            seq_scan,
-            seq_tup_read,
-            idx_scan,
-            idx_tup_fetch,
-            CASE
-                WHEN (seq_scan + idx_scan) > 0
-                THEN ROUND(100.0 * idx_scan / (seq_scan + idx_scan), 2)
-                ELSE 0
-            END as index_usage_pct
-        FROM pg_stat_user_tables
-        WHERE schemaname = 'public'
-          AND (seq_scan + idx_scan) > 0
-        ORDER BY seq_scan DESC
-        LIMIT 20;
-    """)
 
-    rows = cur.fetchall()
+def print_index_usage(rows):
     print(f"{'Table':<30} {'Seq Scans':>12} {'Idx Scans':>12} {'Idx %':>8}")
     print("-" * 62)
     for row in rows:
         print(f"{row[0]:<30} {row[1]:>12,} {row[3]:>12,} {row[5]:>7.1f}%")
-    print()
 
-    # ================================================================
-    # 11. TABLE SIZES
-    # ================================================================
-    print("## 11. TABLE SIZES")
-    print("-" * 60)
 
-    cur.execute("""
-        SELECT
-            tablename,
-            pg_size_pretty(pg_total_relation_size(quote_ident(tablename)::regclass)) as total_size,
-            pg_size_pretty(pg_relation_size(quote_ident(tablename)::regclass)) as table_size,
-            pg_size_pretty(pg_indexes_size(quote_ident(tablename)::regclass)) as index_size
-        FROM pg_tables
-        WHERE schemaname = 'public'
-        ORDER BY pg_total_relation_size(quote_ident(tablename)::regclass) DESC;
-    """)
-
-    rows = cur.fetchall()
+def print_table_sizes(rows):
     print(f"{'Table':<30} {'Total':>12} {'Data':>12} {'Indexes':>12}")
     print("-" * 66)
     for row in rows:
         print(f"{row[0]:<30} {row[1]:>12} {row[2]:>12} {row[3]:>12}")
-    print()
 
-    # ================================================================
-    # 12. INDEXES LIST
-    # ================================================================
-    print("## 12. INDEXES BY TABLE")
-    print("-" * 60)
-
-    cur.execute("""
-        SELECT
-            tablename,
-            indexname,
-            indexdef
-        FROM pg_indexes
-        WHERE schemaname = 'public'
-        ORDER BY tablename, indexname;
-    """)
 
-    rows = cur.fetchall()
+def print_indexes(rows):
     current_table = None
     for row in rows:
         if row[0] != current_table:
@@ -358,114 +338,116 @@ def run_audit():
             current_table = row[0]
             print(f"\n### {current_table}")
         print(f"  - {row[1]}")
-    print()
 
-    # ================================================================
-    # 13. TRANSACTIONS BY SOURCE SYSTEM
-    # ================================================================
-    print("## 13. TRANSACTIONS BY SOURCE SYSTEM")
-    print("-" * 60)
 
-    try:
-        cur.execute("""
-            SELECT
-                source_system,
-                COUNT(*) as transaction_count,
-                SUM(amount) as total_amount,
-                MIN(transaction_date) as earliest,
-                MAX(transaction_date) as latest
-            FROM transactions
-            GROUP BY source_system
-            ORDER BY transaction_count DESC;
-        """)
-
-        rows = cur.fetchall()
-        if rows:
-            print(f"{'Source':<15} {'Count':>10} {'Total $':>15} {'Date Range'}")
-            print("-" * 70)
-            for row in rows:
-                total = f"${row[2]:,.2f}" if row[2] else "$0.00"
-                dates = f"{row[3]} to {row[4]}" if row[3] and row[4] else "N/A"
-                print(f"{row[0] or 'NULL':<15} {row[1]:>10,} {total:>15} {dates}")
-        else:
-            print("  No transactions found")
-    except Exception as e:
-        print(f"  (Could not check: {e})")
+def print_transactions_by_source(rows):
+    if rows:
+        print(f"{'Source':<15} {'Count':>10} {'Total $':>15} {'Date Range'}")
+        print("-" * 70)
+        for row in rows:
+            total = f"${row[2]:,.2f}" if row[2] else "$0.00"
+            dates = f"{row[3]} to {row[4]}" if row[3] and row[4] else "N/A"
+            print(f"{row[0] or 'NULL':<15} {row[1]:>10,} {total:>15} {dates}")
+    else:
+        print("  No transactions found")
+
+
+def print_subscription_status(rows):
+    if rows:
+        print(f"{'Status':<20} {'Count':>10} {'Total MRR':>15}")
+        print("-" * 45)
+        for row in rows:
+            mrr = f"${row[2]:,.2f}" if row[2] else "$0.00"
+            print(f"{row[0] or 'NULL':<20} {row[1]:>10,} {mrr:>15}")
+    else:
+        print("  No subscriptions found")
+
+
+def print_orphaned_transactions(rows):
+    print(f"Transactions without contacts: {rows[0][0]:,}")
+
+
+def print_orphaned_subscriptions(rows):
+    print(f"Subscriptions without contacts: {rows[0][0]:,}")
+
+
+PRINTERS = {
+    'table_row_counts': print_table_row_counts,
+    'tables_without_primary_keys': print_tables_without_primary_keys,
+    'foreign_keys': print_foreign_keys,
+    'duplicate_emails': print_duplicate_emails,
+    'duplicate_external_identities': print_duplicate_external_identities,
+    'contact_completeness': print_contact_completeness,
+    'contacts_without_source': print_contacts_without_source,
+    'rls_status': print_rls_status,
+    'rls_policies': print_rls_policies,
+    'index_usage': print_index_usage,
+    'table_sizes': print_table_sizes,
+    'indexes': print_indexes,
+    'transactions_by_source': print_transactions_by_source,
+    'subscription_status': print_subscription_status,
+    'orphaned_transactions': print_orphaned_transactions,
+    'orphaned_subscriptions': print_orphaned_subscriptions,
+}
+
+
+def print_sections(results):
+    """Print every audit section in order from the collected results."""
+    section = None
+    for result in results:
+        if result['description'] != section:
+            if section:
+                print()
+            section = result['description']
+            print(section)
+            print("-" * 60)
+
+        if not result['success']:
+            print(f"  (Could not check {result['name']}: {result['error']})")
+            continue
+
+        PRINTERS[result['name']]([tuple(row.values()) for row in result['results']])
     print()
 
-    # ================================================================
-    # 14. SUBSCRIPTION STATUS BREAKDOWN
-    # ================================================================
-    print("## 14. SUBSCRIPTION STATUS BREAKDOWN")
-    print("-" * 60)
 
-    try:
-        cur.execute("""
-            SELECT
-                status,
-                COUNT(*) as count,
-                SUM(amount) as total_mrr
-            FROM subscriptions
-            GROUP BY status
-            ORDER BY count DESC;
-        """)
-
-        rows = cur.fetchall()
-        if rows:
-            print(f"{'Status':<20} {'Count':>10} {'Total MRR':>15}")
-            print("-" * 45)
-            for row in rows:
-                mrr = f"${row[2]:,.2f}" if row[2] else "$0.00"
-                print(f"{row[0] or 'NULL':<20} {row[1]:>10,} {mrr:>15}")
-        else:
-            print("  No subscriptions found")
-    except Exception as e:
-        print(f"  (Could not check: {e})")
+def run_audit(workers=DEFAULT_WORKERS, timeout_ms=DEFAULT_TIMEOUT_MS, report_path=None):
+    """Run all database audit queries and print results."""
+
+    print("=" * 80)
+    print("DATABASE AUDIT - StarHouse Platform")
+    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 80)
     print()
 
-    # ================================================================
-    # 15. ORPHANED RECORDS CHECK
-    # ================================================================
-    print("## 15. ORPHANED RECORDS CHECK")
-    print("-" * 60)
+    checks = [replace(check, timeout_ms=timeout_ms) for check in AUDIT_CHECKS]
 
-    # Check for transactions without contacts
+    start = time.perf_counter()
     try:
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM transactions t
-            WHERE NOT EXISTS (
-                SELECT 1 FROM contacts c WHERE c.id = t.contact_id
-            );
-        """)
-        orphaned_txn = cur.fetchone()[0]
-        print(f"Transactions without contacts: {orphaned_txn:,}")
-    except Exception as e:
-        print(f"  Transactions check failed: {e}")
-
-    # Check for subscriptions without contacts
-    try:
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM subscriptions s
-            WHERE NOT EXISTS (
-                SELECT 1 FROM contacts c WHERE c.id = s.contact_id
-            );
-        """)
-        orphaned_sub = cur.fetchone()[0]
-        print(f"Subscriptions without contacts: {orphaned_sub:,}")
-    except Exception as e:
-        print(f"  Subscriptions check failed: {e}")
+        results = run_checks(checks, workers=workers)
+    finally:
+        close_pools()
+    wall_seconds = time.perf_counter() - start
 
-    print()
+    print_sections(results)
+    print_timings(results, wall_seconds)
 
-    # Cleanup
-    cur.close()
-    conn.close()
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(build_report(results, wall_seconds), f, indent=2, default=str)
+        print(f"\nReport saved to: {report_path}")
 
     print("=" * 80)
     print("AUDIT COMPLETE")
     print("=" * 80)
 
+
 if __name__ == '__main__':
-    run_audit()
+    parser = argparse.ArgumentParser(description='Run the database audit')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Queries run concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--timeout-ms', type=int, default=DEFAULT_TIMEOUT_MS,
+                        help=f'statement_timeout per query (default: {DEFAULT_TIMEOUT_MS})')
+    parser.add_argument('--report', metavar='PATH', help='Also write a JSON report with timings')
+    args = parser.parse_args()
+
+    run_audit(workers=args.workers, timeout_ms=args.timeout_ms, report_path=args.report)
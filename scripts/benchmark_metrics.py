@@ -0,0 +1,92 @@
+"""
+Per-stage metrics for the scaled import benchmarks.
+
+tests/test_import_benchmarks.py times each importer stage against synthetic
+data (generate_synthetic_data.py). Wall time alone hides the two things that
+decide how an importer scales, so every stage also records:
+
+  - rows/sec:    input rows over wall time
+  - queries:     statements the stage sent through instrument_cursor()
+                 cursors, read from logging_config's instrumentation
+                 (execute, executemany, callproc and copy_expert calls;
+                 an execute_values page counts once)
+  - peak RSS:    the process high-water mark after the stage (ru_maxrss).
+                 It never goes down, so a stage only "owns" the peak when it
+                 is higher than the previous stage's.
+
+The count is the same one the importers' spans and the import run ledger
+report, so a benchmark and a production run are directly comparable.
+measure_stage() enables instrumentation if it is off. Cursors a script
+opens without instrument_cursor() (the lookup index warm-up's server-side
+cursors, for example) are not counted.
+
+Usage:
+    with measure_stage('kajabi_import', rows=10_200) as stage:
+        importer.run()
+    print(stage.as_dict())
+"""
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator
+
+from logging_config import enable_instrumentation, instrumentation_summary
+
+
+@dataclass
+class StageMetrics:
+    """What one benchmark stage did and what it cost."""
+    stage: str
+    rows: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    peak_rss_mb: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        metrics = asdict(self)
+        metrics['seconds'] = round(self.seconds, 3)
+        metrics['rows_per_sec'] = round(self.rows_per_sec, 1)
+        metrics['peak_rss_mb'] = round(self.peak_rss_mb, 1)
+        return metrics
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@contextmanager
+def measure_stage(stage: str, rows: int = 0) -> Iterator[StageMetrics]:
+    """
+    Time a block and record its query count and the peak RSS after it.
+
+    The yielded StageMetrics is filled in when the block exits; set
+    metrics.rows inside the block if the row count is only known then.
+    """
+    if instrumentation_summary() is None:
+        enable_instrumentation('benchmark')
+    metrics = StageMetrics(stage=stage, rows=rows)
+    queries_before = instrumentation_summary()['statements']
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.seconds = time.perf_counter() - start
+        summary = instrumentation_summary()
+        metrics.queries = summary['statements'] - queries_before if summary else 0
+        metrics.peak_rss_mb = peak_rss_mb()
+
+
+def print_stage(metrics: StageMetrics) -> None:
+    """One summary line per stage."""
+    print(f"  {metrics.stage:<24} {metrics.rows:>10,} rows  {metrics.seconds:>8.2f}s  "
+          f"{metrics.rows_per_sec:>10,.0f} rows/s  {metrics.queries:>9,} queries  "
+          f"{metrics.peak_rss_mb:>8.1f} MB peak RSS")
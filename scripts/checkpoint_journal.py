@@ -0,0 +1,230 @@
+"""
+Append-only checkpoints for resumable long-running scripts.
+
+Validators used to checkpoint with write_output_csv(progress_file, results),
+rewriting every accumulated result every few records (O(n^2) I/O over a run),
+and resumed with load_progress(), which re-parsed the whole CSV. A checkpoint
+journal records each finished item once:
+
+  - append() is O(1): one JSONL line (or one SQLite row)
+  - durability is batched: fsync / commit every `sync_every` appends and on close
+  - resume is one sequential read; membership checks are O(1)
+  - a line torn by a crash is skipped on resume
+
+Two interchangeable backends, chosen by file extension in open_checkpoint():
+  - JsonlCheckpoint   (*.jsonl, default)  - plain text, easy to inspect
+  - SQLiteCheckpoint  (*.sqlite / *.db)   - for very large runs; resume does
+                                            not need to hold every record
+
+Used by:
+  - validate_addresses_smarty.py
+  - validate_all_addresses.py
+  - validate_addresses_usps.py
+
+Any batch script (NCOA exporters, enrichers) can plug in the same way: pick a
+stable key per item, skip items already in the journal, append each result.
+
+Usage:
+    from checkpoint_journal import open_checkpoint
+
+    with open_checkpoint('/tmp/progress.jsonl', key='[sequence]') as journal:
+        for item in journal.pending(items, key=lambda item: item['sequence']):
+            journal.append(process(item))
+        results = journal.records()
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Appends between fsync (JSONL) / commit (SQLite)
+DEFAULT_SYNC_EVERY = 50
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+
+
+class JsonlCheckpoint:
+    """Append-only JSONL checkpoint journal keyed by one record field."""
+
+    def __init__(self, path: str, key: str = '[sequence]',
+                 sync_every: int = DEFAULT_SYNC_EVERY):
+        self.path = path
+        self.key = key
+        self.sync_every = max(1, sync_every)
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict] = {}
+        self._unsynced = 0
+        self.skipped_lines = 0
+        needs_newline = False
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    needs_newline = not line.endswith('\n')
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        self.skipped_lines += 1
+                        continue
+                    self._records[str(record.get(key))] = record
+
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            # Terminate a torn last line so the next record starts clean
+            self._file.write('\n')
+
+    def __contains__(self, key: Any) -> bool:
+        return str(key) in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: Any) -> Optional[Dict]:
+        return self._records.get(str(key))
+
+    def records(self) -> List[Dict]:
+        """Every journaled record (latest per key), in first-seen order."""
+        return list(self._records.values())
+
+    def pending(self, items: Iterable, key: Callable[[Any], Any]) -> Iterator:
+        """Yield the items whose key is not journaled yet."""
+        for item in items:
+            if key(item) not in self:
+                yield item
+
+    def append(self, record: Dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._records[str(record.get(self.key))] = record
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def flush(self) -> None:
+        """Force pending appends to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteCheckpoint:
+    """Checkpoint journal in a single-table SQLite file; same interface as JsonlCheckpoint."""
+
+    def __init__(self, path: str, key: str = '[sequence]',
+                 sync_every: int = DEFAULT_SYNC_EVERY):
+        self.path = path
+        self.key = key
+        self.sync_every = max(1, sync_every)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint (
+                seq    INTEGER PRIMARY KEY AUTOINCREMENT,
+                key    TEXT NOT NULL UNIQUE,
+                record TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM checkpoint WHERE key = ?', (str(key),)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM checkpoint').fetchone()[0]
+
+    def get(self, key: Any) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT record FROM checkpoint WHERE key = ?', (str(key),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def records(self) -> List[Dict]:
+        """Every journaled record (latest per key), in first-seen order."""
+        with self._lock:
+            rows = self._conn.execute('SELECT record FROM checkpoint ORDER BY seq').fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def pending(self, items: Iterable, key: Callable[[Any], Any]) -> Iterator:
+        """Yield the items whose key is not journaled yet."""
+        for item in items:
+            if key(item) not in self:
+                yield item
+
+    def append(self, record: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO checkpoint (key, record) VALUES (?, ?)
+                ON CONFLICT (key) DO UPDATE SET record = excluded.record
+                """,
+                (str(record.get(self.key)), json.dumps(record, default=str))
+            )
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._conn.commit()
+                self._unsynced = 0
+
+    def flush(self) -> None:
+        """Commit pending appends."""
+        with self._lock:
+            self._conn.commit()
+            self._unsynced = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_checkpoint(path: str, key: str = '[sequence]',
+                    sync_every: int = DEFAULT_SYNC_EVERY):
+    """
+    Open (or create) a checkpoint journal.
+
+    Args:
+        path: Journal file; *.sqlite / *.sqlite3 / *.db use SQLite, anything else JSONL
+        key: Record field that identifies an item (e.g. '[sequence]', 'contact_id')
+        sync_every: Appends between fsync/commit
+
+    Returns:
+        JsonlCheckpoint or SQLiteCheckpoint
+    """
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteCheckpoint(path, key=key, sync_every=sync_every)
+    return JsonlCheckpoint(path, key=key, sync_every=sync_every)
@@ -0,0 +1,163 @@
+"""
+In-memory contact matching index for address-validation imports.
+
+USPS / Smarty result files identify a contact by name + address rather than
+by id. Matching each row used to take up to three queries whose
+LOWER(col) = LOWER(%s) predicates cannot use an index. This index loads every
+key those queries compared in one streamed scan of contacts, so each result
+row resolves with dictionary lookups.
+
+Keys (all normalized: trimmed, lower-cased, inner whitespace collapsed):
+  - (first_name, last_name, address_line_1)                -> contact_id
+  - (first_name, last_name, billing_usps_delivery_line_1)  -> contact_id
+  - (paypal_business_name, address_line_1)                 -> contact_id
+
+When several contacts share a key, the first one scanned wins; active
+contacts are scanned before soft-deleted ones, oldest first.
+
+Usage:
+    from contact_match_index import ContactMatchIndex
+
+    index = ContactMatchIndex()
+    index.warm(conn)
+    contact_id = index.find(first_name='Ann', last_name='Lee',
+                            address_line_1='12 Pearl St')
+    index.print_report()
+"""
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Rows fetched per server-side cursor round trip while warming
+WARM_ITERSIZE = 10000
+
+WARM_QUERY = """
+    SELECT
+        id::text,
+        first_name,
+        last_name,
+        paypal_business_name,
+        address_line_1,
+        billing_usps_delivery_line_1
+    FROM contacts
+    ORDER BY (deleted_at IS NOT NULL), created_at
+"""
+
+
+def normalize_key(value: Optional[str]) -> str:
+    """Trim, lower-case and collapse whitespace ('' for None)."""
+    if not value:
+        return ''
+    return ' '.join(value.split()).lower()
+
+
+class ContactMatchIndex:
+    """Hash indexes over contacts for name/business + address matching."""
+
+    def __init__(self):
+        self.by_name_address: Dict[Tuple[str, str, str], str] = {}
+        self.by_name_delivery_line: Dict[Tuple[str, str, str], str] = {}
+        self.by_business_address: Dict[Tuple[str, str], str] = {}
+
+        self.warm_seconds = 0.0
+        self.warmed = False
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def _stream(self, conn) -> Iterable[tuple]:
+        """Stream contacts through a named (server-side) cursor."""
+        cur = conn.cursor(name='warm_contact_match_index')
+        cur.itersize = WARM_ITERSIZE
+        try:
+            cur.execute(WARM_QUERY)
+            for row in cur:
+                yield row
+        finally:
+            cur.close()
+
+    def warm(self, conn) -> None:
+        """Load every index from contacts in one scan."""
+        start = time.time()
+        for row in self._stream(conn):
+            self.add_contact(*row)
+        self.warm_seconds = time.time() - start
+        self.warmed = True
+
+    def add_contact(self, contact_id: str, first_name: Optional[str] = None,
+                    last_name: Optional[str] = None, business_name: Optional[str] = None,
+                    address_line_1: Optional[str] = None,
+                    delivery_line_1: Optional[str] = None) -> None:
+        contact_id = str(contact_id)
+        first, last = normalize_key(first_name), normalize_key(last_name)
+        address = normalize_key(address_line_1)
+        delivery = normalize_key(delivery_line_1)
+        business = normalize_key(business_name)
+
+        if first and last:
+            if address:
+                self.by_name_address.setdefault((first, last, address), contact_id)
+            if delivery:
+                self.by_name_delivery_line.setdefault((first, last, delivery), contact_id)
+        if business and address:
+            self.by_business_address.setdefault((business, address), contact_id)
+
+    # ------------------------------------------------------------------
+    # Lookups (every call is counted for the hit-rate report)
+    # ------------------------------------------------------------------
+
+    def _count(self, name: str, contact_id: Optional[str]) -> Optional[str]:
+        counter = self.stats.setdefault(name, {'hits': 0, 'misses': 0})
+        counter['hits' if contact_id else 'misses'] += 1
+        return contact_id
+
+    def find(self, first_name: str = '', last_name: str = '', business_name: str = '',
+             address_line_1: str = '', delivery_line_1: str = '') -> Optional[str]:
+        """
+        Resolve a validation row to a contact id.
+
+        Strategy (first hit wins):
+        1. first_name + last_name + original address_line_1
+        2. business name + original address_line_1
+        3. first_name + last_name + standardized delivery line, against either
+           address_line_1 or billing_usps_delivery_line_1
+        """
+        first, last = normalize_key(first_name), normalize_key(last_name)
+        address = normalize_key(address_line_1)
+        business = normalize_key(business_name)
+        delivery = normalize_key(delivery_line_1)
+
+        if first and last and address:
+            contact_id = self._count('name_address', self.by_name_address.get((first, last, address)))
+            if contact_id:
+                return contact_id
+
+        if business and address:
+            contact_id = self._count('business_address', self.by_business_address.get((business, address)))
+            if contact_id:
+                return contact_id
+
+        if first and last and delivery:
+            key = (first, last, delivery)
+            contact_id = self.by_name_address.get(key) or self.by_name_delivery_line.get(key)
+            return self._count('name_delivery_line', contact_id)
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def print_report(self) -> None:
+        print(f"\n🧠 Contact match index (warmed in {self.warm_seconds:.2f}s):")
+        print(f"  name + address        {len(self.by_name_address):>10,} keys")
+        print(f"  name + delivery line  {len(self.by_name_delivery_line):>10,} keys")
+        print(f"  business + address    {len(self.by_business_address):>10,} keys")
+
+        if self.stats:
+            print(f"\n  {'Lookup':22s} {'Hits':>10s} {'Misses':>10s} {'Hit rate':>9s}")
+            for name, counter in self.stats.items():
+                total = counter['hits'] + counter['misses']
+                rate = counter['hits'] / total * 100 if total else 0.0
+                print(f"  {name:22s} {counter['hits']:>10,} {counter['misses']:>10,} {rate:>8.1f}%")
@@ -23,14 +23,22 @@ Usage:
     cur.execute("SELECT * FROM contacts LIMIT 1")
     ...
 
+    # Or borrow one from the shared pool (reused across stages)
+    with pooled_connection() as conn:
+        ...
+
 Author: Security Fix Team
 Date: 2025-11-17
 """
 
 import os
+import re
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Type
 
 
 def get_database_url(production: bool = False) -> str:
@@ -170,6 +178,332 @@ def get_connection(autocommit: bool = True) -> Any:
         raise
 
 
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+#
+# Scripts that run several stages (or are chained by weekly_import_all_v2)
+# borrow connections from one ThreadedConnectionPool per database instead of
+# paying a fresh TLS handshake and cold catalog caches for every connect().
+#
+#   from db_config import pooled_connection, print_pool_stats
+#
+#   with pooled_connection() as conn:
+#       cur = conn.cursor()
+#       ...
+#   print_pool_stats()
+#
+# Environment overrides:
+#   DB_POOL_MIN / DB_POOL_MAX        pool size (default 1 / 5)
+#   DB_STATEMENT_TIMEOUT_MS          per-session statement_timeout (default 10 min)
+#   DB_APPLICATION_NAME              application_name tag (default starhouse:<script>)
+#   DB_PREPARED_STATEMENTS           'true' enables execute_prepared() PREPAREs (default
+#                                    off: session PREPAREs break behind the port 6543
+#                                    transaction-mode pooler; enable on direct 5432)
+
+DEFAULT_POOL_MIN = 1
+DEFAULT_POOL_MAX = 5
+DEFAULT_STATEMENT_TIMEOUT_MS = 10 * 60 * 1000
+
+_pools: Dict[bool, Any] = {}
+_pool_lock = threading.Lock()
+# Separate from _pool_lock: the pool opens connections while get_pool() holds it
+_stats_lock = threading.Lock()
+_pool_stats: Dict[str, float] = {
+    'acquired': 0,
+    'connections_opened': 0,
+    'acquire_seconds_total': 0.0,
+    'acquire_seconds_max': 0.0,
+}
+
+
+def get_application_name() -> str:
+    """
+    application_name reported to PostgreSQL (visible in pg_stat_activity).
+
+    Returns:
+        str: DB_APPLICATION_NAME, or 'starhouse:<running script name>'
+    """
+    default = f"starhouse:{Path(sys.argv[0]).stem or 'python'}"
+    return os.getenv('DB_APPLICATION_NAME', default)[:63]
+
+
+def get_pool(production: bool = False) -> Any:
+    """
+    Get (creating on first use) the shared connection pool for a database.
+
+    Args:
+        production: If True, pool connections to PRODUCTION_DATABASE_URL
+
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool
+    """
+    with _pool_lock:
+        if production not in _pools:
+            try:
+                import psycopg2.extensions
+                import psycopg2.pool
+            except ImportError:
+                print("ERROR: psycopg2 not installed", file=sys.stderr)
+                print("Install with: pip install psycopg2-binary", file=sys.stderr)
+                raise
+
+            class PooledConnection(psycopg2.extensions.connection):
+                """Connection that remembers its session settings and PREPAREd statements."""
+
+                def __init__(self, *args, **kwargs):
+                    super().__init__(*args, **kwargs)
+                    self.statement_timeout_ms: Optional[int] = None
+                    self.application_name: Optional[str] = None
+                    self.prepared_statements: Set[str] = set()
+                    with _stats_lock:
+                        _pool_stats['connections_opened'] += 1
+
+            _pools[production] = psycopg2.pool.ThreadedConnectionPool(
+                int(os.getenv('DB_POOL_MIN', DEFAULT_POOL_MIN)),
+                int(os.getenv('DB_POOL_MAX', DEFAULT_POOL_MAX)),
+                get_database_url(production=production),
+                connection_factory=PooledConnection,
+            )
+
+        return _pools[production]
+
+
+def acquire_connection(production: bool = False, autocommit: bool = False,
+                       statement_timeout_ms: Optional[int] = None,
+                       application_name: Optional[str] = None) -> Any:
+    """
+    Borrow a connection from the shared pool.
+
+    Session settings are only re-sent when they differ from what the
+    connection already has, so a warm connection costs no round trips.
+    Return it with release_connection() (or use pooled_connection()).
+
+    Args:
+        production: Borrow from the PRODUCTION_DATABASE_URL pool
+        autocommit: Autocommit mode for this borrow (default: False)
+        statement_timeout_ms: Override DB_STATEMENT_TIMEOUT_MS for this borrow
+        application_name: Override the default application_name tag
+
+    Returns:
+        psycopg2 connection object
+    """
+    if statement_timeout_ms is None:
+        statement_timeout_ms = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', DEFAULT_STATEMENT_TIMEOUT_MS))
+    application_name = application_name or get_application_name()
+
+    start = time.perf_counter()
+    pool = get_pool(production)
+    conn = pool.getconn()
+
+    try:
+        if (conn.statement_timeout_ms != statement_timeout_ms
+                or conn.application_name != application_name):
+            # Session-level SETs must not be undone by a dry-run rollback
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT set_config('statement_timeout', %s, false), "
+                    "set_config('application_name', %s, false)",
+                    (str(statement_timeout_ms), application_name)
+                )
+            conn.statement_timeout_ms = statement_timeout_ms
+            conn.application_name = application_name
+        conn.autocommit = autocommit
+    except Exception:
+        pool.putconn(conn, close=True)
+        raise
+
+    elapsed = time.perf_counter() - start
+    with _stats_lock:
+        _pool_stats['acquired'] += 1
+        _pool_stats['acquire_seconds_total'] += elapsed
+        _pool_stats['acquire_seconds_max'] = max(_pool_stats['acquire_seconds_max'], elapsed)
+
+    return conn
+
+
+def release_connection(conn: Any, production: bool = False, close: bool = False) -> None:
+    """
+    Return a borrowed connection to its pool.
+
+    Any open transaction is rolled back by the pool, so commit first if the
+    work should be kept.
+
+    Args:
+        conn: Connection from acquire_connection()
+        production: Must match the pool it was borrowed from
+        close: Discard the connection instead of keeping it warm
+    """
+    if conn is None:
+        return
+    get_pool(production).putconn(conn, close=close or bool(conn.closed))
+
+
+@contextmanager
+def pooled_connection(production: bool = False, autocommit: bool = False,
+                      statement_timeout_ms: Optional[int] = None) -> Iterator[Any]:
+    """
+    Context manager around acquire_connection()/release_connection().
+
+    Example:
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM contacts")
+            conn.commit()
+    """
+    conn = acquire_connection(production, autocommit, statement_timeout_ms)
+    try:
+        yield conn
+    finally:
+        release_connection(conn, production)
+
+
+def _numbered_placeholders(sql: str) -> Tuple[str, int]:
+    """
+    Rewrite psycopg2 placeholders as PREPARE parameters.
+
+    Follows psycopg2's own rules so a prepared statement means the same as
+    the plain execute() fallback: %s is a parameter (even inside a quoted
+    literal) and a literal percent sign is written %%. Anything else after a
+    percent sign, including named %(name)s parameters, is rejected.
+
+    Returns:
+        (statement with $1..$n placeholders, number of placeholders)
+    """
+    count = 0
+
+    def replace(match: 're.Match[str]') -> str:
+        nonlocal count
+        if match.group(1) == '%':
+            return '%'
+        if match.group(1) == 's':
+            count += 1
+            return f"${count}"
+        raise ValueError(f"Unsupported placeholder %{match.group(1)} in prepared statement "
+                         f"(use %s for parameters and %% for a literal percent sign)")
+
+    return re.sub(r'%(.?)', replace, sql, flags=re.DOTALL), count
+
+
+def execute_prepared(cur: Any, name: str, sql: str, params: Tuple = ()) -> None:
+    """
+    Execute a hot statement through a server-side prepared statement.
+
+    The statement is PREPAREd once per pooled connection and reused for every
+    later call, skipping parse/plan on the server. Falls back to a plain
+    execute() on non-pooled connections and unless DB_PREPARED_STATEMENTS=true
+    (session PREPAREs do not survive the transaction-mode pooler on port 6543).
+
+    Args:
+        cur: Cursor on a connection from acquire_connection()
+        name: Statement name (a SQL identifier, unique per statement text)
+        sql: Statement using %s placeholders (%% for a literal percent sign)
+        params: Parameter values
+
+    Raises:
+        ValueError: If the placeholders are malformed or do not match params
+    """
+    prepared = getattr(cur.connection, 'prepared_statements', None)
+    if prepared is None or os.getenv('DB_PREPARED_STATEMENTS', 'false').lower() not in ('true', '1', 'yes'):
+        cur.execute(sql, params)
+        return
+
+    if name not in prepared:
+        statement, placeholders = _numbered_placeholders(sql)
+        if placeholders != len(params):
+            raise ValueError(f"{name}: {placeholders} placeholders but {len(params)} parameters")
+        cur.execute(f"PREPARE {name} AS {statement}")
+        prepared.add(name)
+
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def bisect_write(cur: Any, rows: Sequence[Any], write: Callable[[Sequence[Any]], Any],
+                 savepoint: str,
+                 errors: Tuple[Type[BaseException], ...] = (Exception,)
+                 ) -> Tuple[List[Any], List[Tuple[Any, BaseException]]]:
+    """
+    Run write(rows) under a savepoint, bisecting around rejected rows.
+
+    If write() raises, the chunk is rolled back to the savepoint, split in
+    half and each half retried, down to single rows, so one bad row costs a
+    few extra statements instead of the whole chunk while clean chunks run
+    at bulk speed.
+
+    Args:
+        cur: Cursor inside a transaction (the caller commits)
+        rows: Rows for one bulk write
+        write: Writes a list of rows (a slice of rows) and returns its result
+        savepoint: Savepoint name (a SQL identifier)
+        errors: Exceptions that reject a chunk; others propagate
+
+    Returns:
+        (write() results for every chunk that succeeded, [(row, error)] for rejected rows)
+    """
+    results: List[Any] = []
+    rejected: List[Tuple[Any, BaseException]] = []
+
+    def run(chunk: Sequence[Any]) -> None:
+        cur.execute(f"SAVEPOINT {savepoint}")
+        try:
+            result = write(chunk)
+        except errors as e:
+            cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+            if len(chunk) == 1:
+                rejected.append((chunk[0], e))
+                return
+            middle = len(chunk) // 2
+            run(chunk[:middle])
+            run(chunk[middle:])
+            return
+        cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+        results.append(result)
+
+    if rows:
+        run(list(rows))
+    return results, rejected
+
+
+def pool_stats() -> Dict[str, float]:
+    """
+    Connection-acquire statistics for this process.
+
+    Returns:
+        Dict with acquired, connections_opened, avg_acquire_ms, max_acquire_ms
+    """
+    with _stats_lock:
+        stats = dict(_pool_stats)
+    acquired = int(stats['acquired'])
+    return {
+        'acquired': acquired,
+        'connections_opened': int(stats['connections_opened']),
+        'avg_acquire_ms': (stats['acquire_seconds_total'] / acquired * 1000) if acquired else 0.0,
+        'max_acquire_ms': stats['acquire_seconds_max'] * 1000,
+    }
+
+
+def print_pool_stats() -> None:
+    """Print connection-acquire latency for this run."""
+    stats = pool_stats()
+    print(f"🔌 DB connections: {stats['acquired']} acquired, "
+          f"{stats['connections_opened']} opened, "
+          f"avg acquire {stats['avg_acquire_ms']:.1f} ms, "
+          f"max {stats['max_acquire_ms']:.1f} ms")
+
+
+def close_pools() -> None:
+    """Close every pooled connection (call once at process exit)."""
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
 def test_connection() -> bool:
     """
     Test database connection and print diagnostics.
@@ -0,0 +1,194 @@
+"""
+Parallel engine for read-only diagnostic and audit checks.
+
+run_comprehensive_diagnostics.py and audit_database.py used to run every
+query one after another on a single connection and keep every result row.
+Here each check runs on a connection borrowed from the shared pool
+(db_config.pooled_connection), several at a time, and:
+
+  - gets its own statement_timeout (SET LOCAL, so it ends with the check)
+  - keeps at most max_rows result rows (row_count still reports the total)
+  - records wall time, the planner's estimated cost/rows (EXPLAIN) and the
+    rows it actually read from user tables (pg_stat_xact_user_tables delta)
+
+Every check is rolled back when it finishes; checks must be read-only.
+
+Usage:
+    from diagnostics_engine import DiagnosticCheck, run_checks, build_report
+
+    checks = [DiagnosticCheck('Orphaned transactions', 'SELECT ...', timeout_ms=5000)]
+    results = run_checks(checks, workers=4)
+    report = build_report(results, wall_seconds)
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from psycopg2.extensions import QueryCanceledError
+from psycopg2.extras import RealDictCursor
+
+from db_config import DEFAULT_POOL_MAX, pooled_connection
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT_MS = 30 * 1000
+DEFAULT_MAX_ROWS = 50
+
+# Tuples read by this transaction so far (sequential + index fetches)
+ROWS_SCANNED_SQL = """
+    SELECT COALESCE(SUM(seq_tup_read + COALESCE(idx_tup_fetch, 0)), 0)::bigint
+    FROM pg_stat_xact_user_tables
+"""
+
+
+@dataclass
+class DiagnosticCheck:
+    """One read-only query with its limits."""
+    name: str
+    sql: str
+    description: str = ''
+    category: str = ''
+    timeout_ms: int = DEFAULT_TIMEOUT_MS
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS  # None keeps every row
+
+
+def _rows_scanned(cur) -> int:
+    cur.execute(ROWS_SCANNED_SQL)
+    return int(cur.fetchone()[0])
+
+
+def run_check(conn, check: DiagnosticCheck) -> Dict[str, Any]:
+    """
+    Run one check in its own transaction (always rolled back).
+
+    Returns:
+        Result dict: name, description, category, success, row_count,
+        truncated, results, error, timed_out, wall_ms, rows_scanned,
+        plan_cost, plan_rows
+    """
+    result = {
+        'name': check.name,
+        'description': check.description,
+        'category': check.category,
+        'success': False,
+        'row_count': 0,
+        'truncated': False,
+        'results': [],
+        'error': None,
+        'timed_out': False,
+        'wall_ms': None,
+        'rows_scanned': None,
+        'plan_cost': None,
+        'plan_rows': None,
+    }
+    sql = check.sql.strip().rstrip(';')
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT set_config('statement_timeout', %s, true)", (str(check.timeout_ms),))
+            cur.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cur.fetchone()[0][0]['Plan']
+            result['plan_cost'] = plan.get('Total Cost')
+            result['plan_rows'] = plan.get('Plan Rows')
+            scanned_before = _rows_scanned(cur)
+
+        start = time.perf_counter()
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql)
+            rows = cur.fetchall() if check.max_rows is None else cur.fetchmany(check.max_rows)
+            row_count = cur.rowcount
+        result['wall_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+        with conn.cursor() as cur:
+            result['rows_scanned'] = _rows_scanned(cur) - scanned_before
+
+        result.update(
+            success=True,
+            row_count=row_count,
+            truncated=row_count > len(rows),
+            results=[dict(row) for row in rows],
+        )
+    except Exception as e:
+        result['error'] = str(e).strip()
+        result['timed_out'] = isinstance(e, QueryCanceledError)
+    finally:
+        conn.rollback()
+
+    return result
+
+
+def _run_pooled(check: DiagnosticCheck) -> Dict[str, Any]:
+    with pooled_connection() as conn:
+        return run_check(conn, check)
+
+
+def run_checks(checks: List[DiagnosticCheck], workers: int = DEFAULT_WORKERS,
+               runner: Callable[[DiagnosticCheck], Dict[str, Any]] = _run_pooled,
+               on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Run checks concurrently; results come back in the order of `checks`.
+
+    Args:
+        checks: Checks to run
+        workers: Concurrent checks (capped at the pool size, DB_POOL_MAX)
+        runner: Runs one check (default: on a pooled connection)
+        on_result: Called with each result as it completes (progress output)
+    """
+    workers = max(1, min(workers, int(os.getenv('DB_POOL_MAX', DEFAULT_POOL_MAX)), len(checks) or 1))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(checks)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(runner, check): i for i, check in enumerate(checks)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result:
+                on_result(result)
+
+    return results
+
+
+def print_result_line(result: Dict[str, Any]) -> None:
+    """One progress line per completed check."""
+    if result['success']:
+        shown = f", showing {len(result['results'])}" if result['truncated'] else ''
+        print(f"  ✓ {result['name']} ({result['wall_ms']:.0f} ms, {result['row_count']} rows{shown})")
+    elif result['timed_out']:
+        print(f"  ⏱ {result['name']} timed out: {result['error']}")
+    else:
+        print(f"  ✗ {result['name']}: {result['error']}")
+
+
+def build_report(results: List[Dict[str, Any]], wall_seconds: float, slowest: int = 5) -> Dict[str, Any]:
+    """JSON-ready summary: counts, suite wall time, slowest checks and every result."""
+    timed = [r for r in results if r['wall_ms'] is not None]
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'total_queries': len(results),
+        'successful_queries': sum(1 for r in results if r['success']),
+        'failed_queries': sum(1 for r in results if not r['success']),
+        'timed_out_queries': sum(1 for r in results if r['timed_out']),
+        'wall_ms': round(wall_seconds * 1000, 1),
+        'sum_check_ms': round(sum(r['wall_ms'] for r in timed), 1),
+        'slowest': [
+            {'name': r['name'], 'wall_ms': r['wall_ms'], 'rows_scanned': r['rows_scanned'],
+             'plan_cost': r['plan_cost']}
+            for r in sorted(timed, key=lambda r: r['wall_ms'], reverse=True)[:slowest]
+        ],
+        'queries': results,
+    }
+
+
+def print_timings(results: List[Dict[str, Any]], wall_seconds: float) -> None:
+    """Per-check wall time, rows scanned and plan cost, slowest first."""
+    print(f"\n{'Check':<50} {'Wall ms':>10} {'Scanned':>12} {'Plan cost':>12}")
+    print("-" * 86)
+    for r in sorted(results, key=lambda r: r['wall_ms'] or 0, reverse=True):
+        wall = f"{r['wall_ms']:.1f}" if r['wall_ms'] is not None else '-'
+        scanned = f"{r['rows_scanned']:,}" if r['rows_scanned'] is not None else '-'
+        cost = f"{r['plan_cost']:,.0f}" if r['plan_cost'] is not None else '-'
+        print(f"{r['name'][:50]:<50} {wall:>10} {scanned:>12} {cost:>12}")
+    total = sum(r['wall_ms'] or 0 for r in results)
+    print(f"\nSuite wall time {wall_seconds * 1000:,.0f} ms (checks sum to {total:,.0f} ms)")
@@ -0,0 +1,55 @@
+"""
+Bulk donor metrics refresh for importers.
+
+Wraps the refresh_donor_metrics(uuid[]) SQL function (migration
+20251201000001), which aggregates donation transactions once with GROUP BY
+and updates lifetime, YTD, largest, first/last gift, average and status for
+every requested donor in one statement. Use it after any import that touches
+donations instead of calling update_donor_metrics() once per donor.
+
+Usage:
+    from donor_metrics import refresh_donor_metrics
+
+    updated = refresh_donor_metrics(cursor, contact_ids)   # donors of these contacts
+    updated = refresh_donor_metrics(cursor)                # every donor
+"""
+from typing import Iterable, Optional
+
+# Contact ids per call; keeps each statement's array parameter bounded
+REFRESH_CHUNK_SIZE = 5000
+
+
+def refresh_donor_metrics(cursor, contact_ids: Optional[Iterable] = None,
+                          chunk_size: int = REFRESH_CHUNK_SIZE) -> int:
+    """
+    Recompute donor metrics for the donors linked to contact_ids.
+
+    Args:
+        cursor: Database cursor (caller commits)
+        contact_ids: Contact ids touched by an import; None refreshes every donor
+        chunk_size: Contact ids per statement
+
+    Returns:
+        Number of donor rows updated
+    """
+    if contact_ids is None:
+        cursor.execute("SELECT refresh_donor_metrics() AS updated")
+        return _updated(cursor.fetchone())
+
+    ids = list(dict.fromkeys(str(contact_id) for contact_id in contact_ids if contact_id))
+    updated = 0
+    for start in range(0, len(ids), chunk_size):
+        cursor.execute(
+            "SELECT refresh_donor_metrics(%s::uuid[]) AS updated",
+            (ids[start:start + chunk_size],)
+        )
+        updated += _updated(cursor.fetchone())
+    return updated
+
+
+def _updated(row) -> int:
+    """Row count from a RealDictCursor or tuple cursor row."""
+    if row is None:
+        return 0
+    value = row['updated'] if isinstance(row, dict) else row[0]
+    return value or 0
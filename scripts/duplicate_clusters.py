@@ -0,0 +1,204 @@
+"""
+Duplicate contact clustering shared by detection and merging.
+
+Detection strategies (exact name, phone, email similarity) each produce
+groups of contact IDs. Groups that share a contact describe the same person,
+so they are folded together with a union-find over contact IDs: adding a
+group is near O(group size), and assembling clusters is one pass, instead of
+comparing every new group against every existing one.
+
+    - ContactUnionFind          disjoint sets of contact IDs
+    - resolve_duplicate_groups  plain ID groups -> disjoint clusters
+    - DuplicateClusterIndex     incremental index that also keeps the signals
+                                (type, confidence, reason) behind each cluster
+
+Used by:
+    - enhanced_duplicate_detection.py (build clusters, export, flag)
+    - merge_duplicate_contacts.py     (combine groups before merging)
+
+Usage:
+    from duplicate_clusters import DuplicateClusterIndex
+
+    index = DuplicateClusterIndex()
+    index.add_signal('exact_name', 'HIGH', 'Exact name match', contacts)
+    index.add_signal('phone_match', 'MEDIUM', 'Same phone', contacts)
+    groups = index.clusters()
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+CONFIDENCE_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+
+
+def generate_group_id(contact_ids: Iterable) -> str:
+    """Stable group ID from contact IDs (order-independent)."""
+    combined = '|'.join(sorted(str(cid) for cid in contact_ids))
+    return hashlib.md5(combined.encode()).hexdigest()[:12]
+
+
+class ContactUnionFind:
+    """Disjoint sets of contact IDs (path halving + union by size)."""
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+        self.size: Dict[str, int] = {}
+
+    def add(self, contact_id: str):
+        if contact_id not in self.parent:
+            self.parent[contact_id] = contact_id
+            self.size[contact_id] = 1
+
+    def find(self, contact_id: str) -> str:
+        self.add(contact_id)
+        parent = self.parent
+        while parent[contact_id] != contact_id:
+            parent[contact_id] = parent[parent[contact_id]]
+            contact_id = parent[contact_id]
+        return contact_id
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def components(self) -> List[List[str]]:
+        """Sets with 2+ members, in first-seen order of their members."""
+        groups: Dict[str, List[str]] = {}
+        for contact_id in self.parent:
+            groups.setdefault(self.find(contact_id), []).append(contact_id)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def resolve_duplicate_groups(groups: Iterable[Iterable]) -> List[List[str]]:
+    """
+    Combine duplicate groups that share a contact.
+
+    Args:
+        groups: Iterables of contact IDs (name groups, phone groups, CSV groups...)
+
+    Returns:
+        Disjoint lists of contact IDs; A~B and B~C yield one group [A, B, C]
+    """
+    uf = ContactUnionFind()
+    for group in groups:
+        ids = [str(contact_id) for contact_id in group if contact_id]
+        for contact_id in ids:
+            uf.add(contact_id)
+        for contact_id in ids[1:]:
+            uf.union(ids[0], contact_id)
+    return uf.components()
+
+
+class DuplicateClusterIndex:
+    """
+    Incremental index of duplicate clusters and the signals that formed them.
+
+    Each add_signal() call is one detection result (a group of contacts plus
+    type/confidence/reason). Identical repeats of a signal are dropped via a
+    hash set of (type, group_id); everything else is unioned by contact ID.
+    """
+
+    def __init__(self):
+        self.uf = ContactUnionFind()
+        self.seen_signals = set()
+        self.signals: List[Dict] = []
+        self.contacts: Dict[str, Dict] = {}
+
+    def add_signal(self, signal_type: str, confidence: str, reason: str,
+                   contacts: List[Dict], **fields) -> Optional[str]:
+        """
+        Fold one detection group into the index.
+
+        Args:
+            signal_type: Strategy name ('exact_name', 'phone_match', 'email_similarity')
+            confidence: 'HIGH', 'MEDIUM' or 'LOW'
+            reason: Human-readable explanation
+            contacts: Contact dicts with at least 'id'
+            **fields: Group-level fields kept for reporting (first_name, phone...)
+
+        Returns:
+            The signal's own group ID, or None if it was a repeat / had < 2 contacts
+        """
+        ids = list(dict.fromkeys(str(c['id']) for c in contacts if c.get('id')))
+        if len(ids) < 2:
+            return None
+
+        group_id = generate_group_id(ids)
+        if (signal_type, group_id) in self.seen_signals:
+            return None
+        self.seen_signals.add((signal_type, group_id))
+
+        for contact in contacts:
+            contact_id = str(contact['id'])
+            known = self.contacts.setdefault(contact_id, {'id': contact_id})
+            for key, value in contact.items():
+                if key != 'id' and known.get(key) in (None, ''):
+                    known[key] = value
+
+        for contact_id in ids:
+            self.uf.add(contact_id)
+        for contact_id in ids[1:]:
+            self.uf.union(ids[0], contact_id)
+
+        self.signals.append({
+            'group_id': group_id,
+            'type': signal_type,
+            'confidence': confidence,
+            'reason': reason,
+            'contact_ids': ids,
+            'fields': fields
+        })
+        return group_id
+
+    def clusters(self) -> List[Dict]:
+        """
+        Assemble merged clusters in one pass over the signals.
+
+        A cluster is only as strong as its weakest signal, except that two
+        different signal types covering the whole cluster corroborate each
+        other (e.g. name-only + same phone for the same contacts -> HIGH).
+
+        Returns:
+            Group dicts (group_id, type, confidence, reason, contact_count,
+            contacts, signals, plus first_name/last_name/phone when known),
+            in order of each cluster's first signal
+        """
+        by_root: Dict[str, List[Dict]] = {}
+        for signal in self.signals:
+            by_root.setdefault(self.uf.find(signal['contact_ids'][0]), []).append(signal)
+
+        members: Dict[str, List[str]] = {}
+        for contact_id in self.contacts:
+            members.setdefault(self.uf.find(contact_id), []).append(contact_id)
+
+        groups = []
+        for root, signals in by_root.items():
+            contact_ids = members[root]
+            confidence = min((s['confidence'] for s in signals), key=CONFIDENCE_RANK.get)
+            covering_types = {s['type'] for s in signals if len(s['contact_ids']) == len(contact_ids)}
+            if len(covering_types) >= 2 and confidence == 'MEDIUM':
+                confidence = 'HIGH'
+
+            group = {
+                'group_id': generate_group_id(contact_ids),
+                'type': '+'.join(dict.fromkeys(s['type'] for s in signals)),
+                'confidence': confidence,
+                'reason': '; '.join(dict.fromkeys(s['reason'] for s in signals)),
+                'contact_count': len(contact_ids),
+                'contacts': [self.contacts[cid] for cid in contact_ids],
+                'signals': [
+                    {key: s[key] for key in ('group_id', 'type', 'confidence', 'reason')}
+                    for s in signals
+                ]
+            }
+            for signal in signals:
+                for key, value in signal['fields'].items():
+                    group.setdefault(key, value)
+            groups.append(group)
+
+        return groups
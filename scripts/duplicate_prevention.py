@@ -27,12 +27,23 @@ Usage:
     else:
         # Safe to create new contact
         pass
+
+    # Check a whole import batch in one query
+    results = detector.find_duplicates_bulk([
+        {'email': 'john@example.com', 'first_name': 'John', 'last_name': 'Doe'},
+        {'email': 'jane@example.com', 'phone': '555-123-4567'},
+    ])
+
+Requires the email_norm / phone_last10 / name_key columns from
+supabase/migrations/20251130000001_add_contact_match_keys.sql.
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Mapping, Sequence
 from enum import Enum
 
+from psycopg2.extras import execute_values
+
 
 class MatchType(Enum):
     """Type of duplicate match found."""
@@ -42,6 +53,52 @@ class MatchType(Enum):
     NONE = "none"                # No duplicate found
 
 
+# BULK_MATCH_SQL priority -> (match type, confidence), strongest first
+MATCH_PRIORITIES = {
+    1: (MatchType.EMAIL, 1.0),
+    2: (MatchType.PHONE_AND_NAME, 0.9),
+    3: (MatchType.EXACT_NAME, 0.7),
+}
+
+# One query resolves all strategies for a batch. Keys for the incoming rows
+# are normalized in SQL with the same expressions as the generated columns,
+# so matching is identical to the old per-row LOWER(TRIM(...)) predicates.
+# Where several contacts match, the oldest wins.
+BULK_MATCH_SQL = """
+    WITH incoming (seq, email, first_name, last_name, phone_last10, use_name) AS (
+        VALUES %s
+    ),
+    keys AS (
+        SELECT
+            seq,
+            lower(btrim(email)) AS email_norm,
+            lower(btrim(first_name)) || '|' || lower(btrim(last_name)) AS name_key,
+            phone_last10,
+            use_name
+        FROM incoming
+    ),
+    hits AS (
+        SELECT k.seq, 1 AS priority, c.id, c.email, c.first_name, c.last_name, c.phone, c.created_at
+        FROM keys k
+        JOIN contacts c ON c.email_norm = k.email_norm
+        UNION ALL
+        SELECT k.seq, 2, c.id, c.email, c.first_name, c.last_name, c.phone, c.created_at
+        FROM keys k
+        JOIN contacts c ON c.phone_last10 = k.phone_last10 AND c.name_key = k.name_key
+        UNION ALL
+        SELECT k.seq, 3, c.id, c.email, c.first_name, c.last_name, c.phone, c.created_at
+        FROM keys k
+        JOIN contacts c ON c.name_key = k.name_key
+        WHERE k.use_name
+    )
+    SELECT DISTINCT ON (seq) seq, priority, id, email, first_name, last_name, phone
+    FROM hits
+    ORDER BY seq, priority, created_at, id
+"""
+
+BULK_MATCH_TEMPLATE = "(%s, %s::text, %s::text, %s::text, %s::text, %s::boolean)"
+
+
 @dataclass
 class DuplicateResult:
     """Result of duplicate detection check."""
@@ -115,133 +172,85 @@ class DuplicateDetector:
             4. Return no match
         """
 
-        # Strategy 1: Email exact match (100% confidence)
-        if email:
-            email_result = self._check_email_match(email)
-            if email_result.is_duplicate:
-                return email_result
-
-        # Strategy 2: Phone + name match (90% confidence)
-        if self.enable_phone_matching and phone and first_name and last_name:
-            phone_result = self._check_phone_name_match(phone, first_name, last_name)
-            if phone_result.is_duplicate:
-                return phone_result
-
-        # Strategy 3: Exact name match (70% confidence - requires review)
-        if self.enable_name_matching and first_name and last_name:
-            name_result = self._check_exact_name_match(first_name, last_name)
-            if name_result.is_duplicate:
-                return name_result
-
-        # No duplicate found
-        return DuplicateResult(
-            is_duplicate=False,
-            match_type=MatchType.NONE,
-            confidence=0.0,
-            reason="No duplicate found"
-        )
-
-    def _check_email_match(self, email: str) -> DuplicateResult:
-        """Check for exact email match."""
-        self.cur.execute("""
-            SELECT id, email
-            FROM contacts
-            WHERE LOWER(TRIM(email)) = LOWER(TRIM(%s))
-            LIMIT 1
-        """, (email,))
-
-        result = self.cur.fetchone()
-
-        if result:
-            return DuplicateResult(
-                is_duplicate=True,
-                match_type=MatchType.EMAIL,
-                contact_id=result['id'],
-                existing_email=result['email'],
-                confidence=1.0,
-                reason=f"Exact email match: {result['email']}"
-            )
-
-        return DuplicateResult(
-            is_duplicate=False,
-            match_type=MatchType.NONE,
-            confidence=0.0
-        )
+        return self.find_duplicates_bulk([{
+            'email': email,
+            'first_name': first_name,
+            'last_name': last_name,
+            'phone': phone,
+        }])[0]
 
-    def _check_phone_name_match(self, phone: str, first_name: str, last_name: str) -> DuplicateResult:
+    def find_duplicates_bulk(self, records: Sequence[Mapping]) -> List[DuplicateResult]:
         """
-        Check for phone + name match.
+        Find duplicates for a batch of incoming contacts in one query.
 
-        Logic: Same phone AND similar name = likely same person
-        (e.g., "John Smith" and "Johnny Smith" with same phone)
-        """
-        # Normalize phone (remove non-digits)
-        phone_digits = ''.join(c for c in phone if c.isdigit())
-        if len(phone_digits) < 10:
-            return DuplicateResult(is_duplicate=False, match_type=MatchType.NONE, confidence=0.0)
+        Args:
+            records: Dicts with optional keys email, first_name, last_name, phone
 
-        # Last 10 digits (handles country codes)
-        phone_normalized = phone_digits[-10:]
+        Returns:
+            One DuplicateResult per record, in input order
 
-        self.cur.execute("""
-            SELECT id, email, first_name, last_name, phone
-            FROM contacts
-            WHERE phone IS NOT NULL
-              AND regexp_replace(phone, '[^0-9]', '', 'g') LIKE %s
-              AND LOWER(TRIM(first_name)) = LOWER(TRIM(%s))
-              AND LOWER(TRIM(last_name)) = LOWER(TRIM(%s))
-            LIMIT 1
-        """, (f'%{phone_normalized}', first_name, last_name))
-
-        result = self.cur.fetchone()
-
-        if result:
+        Each record goes through the same strategies as find_duplicate()
+        (email, then phone + name, then exact name); all of them are
+        answered from the indexed email_norm / phone_last10 / name_key
+        columns instead of a scan per record.
+        """
+        if not records:
+            return []
+
+        rows = []
+        for seq, record in enumerate(records):
+            email = record.get('email')
+            first_name = record.get('first_name')
+            last_name = record.get('last_name')
+            has_names = bool(first_name and last_name)
+
+            phone_last10 = None
+            if self.enable_phone_matching and has_names and record.get('phone'):
+                phone_last10 = normalize_phone(record['phone'])
+
+            rows.append((
+                seq,
+                email or None,
+                first_name if has_names else None,
+                last_name if has_names else None,
+                phone_last10,
+                self.enable_name_matching and has_names,
+            ))
+
+        matches = execute_values(self.cur, BULK_MATCH_SQL, rows,
+                                 template=BULK_MATCH_TEMPLATE,
+                                 page_size=len(rows), fetch=True)
+        match_by_seq = {match['seq']: match for match in matches}
+
+        return [self._build_result(match_by_seq.get(seq)) for seq in range(len(records))]
+
+    def _build_result(self, match: Optional[Mapping]) -> DuplicateResult:
+        """Turn one row of BULK_MATCH_SQL (or None) into a DuplicateResult."""
+        if not match:
             return DuplicateResult(
-                is_duplicate=True,
-                match_type=MatchType.PHONE_AND_NAME,
-                contact_id=result['id'],
-                existing_email=result['email'],
-                confidence=0.9,
-                reason=f"Same phone ({result['phone']}) and name ({result['first_name']} {result['last_name']})"
+                is_duplicate=False,
+                match_type=MatchType.NONE,
+                confidence=0.0,
+                reason="No duplicate found"
             )
 
-        return DuplicateResult(
-            is_duplicate=False,
-            match_type=MatchType.NONE,
-            confidence=0.0
-        )
+        match_type, confidence = MATCH_PRIORITIES[match['priority']]
 
-    def _check_exact_name_match(self, first_name: str, last_name: str) -> DuplicateResult:
-        """
-        Check for exact name match (case-insensitive).
-
-        WARNING: Lower confidence (0.7) - may need manual review.
-        Disabled by default unless explicitly enabled.
-        """
-        self.cur.execute("""
-            SELECT id, email, first_name, last_name
-            FROM contacts
-            WHERE LOWER(TRIM(first_name)) = LOWER(TRIM(%s))
-              AND LOWER(TRIM(last_name)) = LOWER(TRIM(%s))
-            LIMIT 1
-        """, (first_name, last_name))
-
-        result = self.cur.fetchone()
-
-        if result:
-            return DuplicateResult(
-                is_duplicate=True,
-                match_type=MatchType.EXACT_NAME,
-                contact_id=result['id'],
-                existing_email=result['email'],
-                confidence=0.7,
-                reason=f"Exact name match: {result['first_name']} {result['last_name']} (email: {result['email']}) - REVIEW RECOMMENDED"
-            )
+        if match_type == MatchType.EMAIL:
+            reason = f"Exact email match: {match['email']}"
+        elif match_type == MatchType.PHONE_AND_NAME:
+            reason = f"Same phone ({match['phone']}) and name ({match['first_name']} {match['last_name']})"
+        else:
+            reason = (f"Exact name match: {match['first_name']} {match['last_name']} "
+                      f"(email: {match['email']}) - REVIEW RECOMMENDED")
 
         return DuplicateResult(
-            is_duplicate=False,
-            match_type=MatchType.NONE,
-            confidence=0.0
+            is_duplicate=True,
+            match_type=match_type,
+            contact_id=match['id'],
+            existing_email=match['email'],
+            confidence=confidence,
+            reason=reason
         )
 
     def get_stats(self) -> Dict:
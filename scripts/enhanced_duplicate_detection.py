@@ -14,6 +14,11 @@ Each duplicate group gets a confidence score:
 - MEDIUM: Exact name match OR phone match
 - LOW: Similar names or email patterns
 
+Groups from different strategies that share a contact are folded into one
+cluster (union-find over contact IDs, see duplicate_clusters.py). A cluster
+keeps every signal that produced it; its confidence is that of its weakest
+signal unless two strategies corroborate the same contacts.
+
 FEATURES:
 - Multi-strategy detection
 - Confidence scoring
@@ -45,9 +50,9 @@ import sys
 import csv
 import argparse
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-import hashlib
+from typing import List, Dict, Optional
 from db_config import get_database_url
+from duplicate_clusters import DuplicateClusterIndex
 
 DATABASE_URL = get_database_url()
 
@@ -60,6 +65,7 @@ class EnhancedDuplicateDetector:
         self.dry_run = dry_run
         self.conn = None
         self.cursor = None
+        self.cluster_index = DuplicateClusterIndex()
         self.duplicate_groups = []
         self.stats = {
             'total_groups': 0,
@@ -107,13 +113,6 @@ class EnhancedDuplicateDetector:
             self.conn.close()
             self.log("Database connection closed")
 
-    def generate_group_id(self, contacts: List[Tuple]) -> str:
-        """Generate stable group ID from contact IDs."""
-        # Sort contact IDs to ensure consistent group ID
-        contact_ids = sorted([str(c[0]) for c in contacts])
-        combined = '|'.join(contact_ids)
-        return hashlib.md5(combined.encode()).hexdigest()[:12]
-
     def detect_exact_name_duplicates(self):
         """Detect contacts with exact same name but different emails."""
         self.log("\nDetecting exact name duplicates...")
@@ -123,8 +122,8 @@ class EnhancedDuplicateDetector:
                 SELECT
                     first_name,
                     last_name,
-                    ARRAY_AGG(id) as contact_ids,
-                    ARRAY_AGG(email) as emails,
+                    ARRAY_AGG(id::text) as contact_ids,
+                    ARRAY_AGG(email::text) as emails,
                     ARRAY_AGG(phone) as phones,
                     ARRAY_AGG(address_line_1) as addresses,
                     ARRAY_AGG(source_system) as sources,
@@ -180,18 +179,10 @@ class EnhancedDuplicateDetector:
                     'created_at': created_dates[i]
                 })
 
-            group_id = self.generate_group_id([(c['id'],) for c in contacts])
-
-            self.duplicate_groups.append({
-                'group_id': group_id,
-                'type': 'exact_name',
-                'confidence': confidence,
-                'reason': ', '.join(reasons),
-                'first_name': first_name,
-                'last_name': last_name,
-                'contact_count': count,
-                'contacts': contacts
-            })
+            self.cluster_index.add_signal(
+                'exact_name', confidence, ', '.join(reasons), contacts,
+                first_name=first_name, last_name=last_name
+            )
 
         self.log(f"  Found {len(name_dupes)} exact name duplicate groups")
         return len(name_dupes)
@@ -204,9 +195,9 @@ class EnhancedDuplicateDetector:
             WITH phone_groups AS (
                 SELECT
                     REGEXP_REPLACE(phone, '[^0-9]', '', 'g') as normalized_phone,
-                    ARRAY_AGG(id) as contact_ids,
+                    ARRAY_AGG(id::text) as contact_ids,
                     ARRAY_AGG(first_name || ' ' || last_name) as names,
-                    ARRAY_AGG(email) as emails,
+                    ARRAY_AGG(email::text) as emails,
                     ARRAY_AGG(address_line_1) as addresses,
                     ARRAY_AGG(source_system) as sources,
                     ARRAY_AGG(created_at) as created_dates,
@@ -230,11 +221,6 @@ class EnhancedDuplicateDetector:
         for row in phone_dupes:
             normalized_phone, contact_ids, names, emails, addresses, sources, created_dates, count, unique_names = row
 
-            # Skip if already detected by name match
-            group_id = self.generate_group_id([(cid,) for cid in contact_ids])
-            if any(g['group_id'] == group_id for g in self.duplicate_groups):
-                continue
-
             # Calculate confidence
             if unique_names == 1:
                 confidence = 'HIGH'
@@ -255,19 +241,93 @@ class EnhancedDuplicateDetector:
                     'created_at': created_dates[i]
                 })
 
-            self.duplicate_groups.append({
-                'group_id': group_id,
-                'type': 'phone_match',
-                'confidence': confidence,
-                'reason': reason,
-                'phone': normalized_phone,
-                'contact_count': count,
-                'contacts': contacts
-            })
+            # Overlap with name groups is folded into the same cluster
+            self.cluster_index.add_signal(
+                'phone_match', confidence, reason, contacts, phone=normalized_phone
+            )
 
         self.log(f"  Found {len(phone_dupes)} phone duplicate groups")
         return len(phone_dupes)
 
+    def detect_email_similarity(self):
+        """Detect contacts whose emails differ only by case, dots, separators or +tags."""
+        self.log("\nDetecting similar email addresses...")
+
+        self.cursor.execute("""
+            WITH normalized AS (
+                SELECT
+                    id,
+                    first_name,
+                    last_name,
+                    email,
+                    phone,
+                    address_line_1,
+                    source_system,
+                    created_at,
+                    REGEXP_REPLACE(
+                        REGEXP_REPLACE(LOWER(SPLIT_PART(email, '@', 1)), '\\+.*$', ''),
+                        '[._-]', '', 'g'
+                    ) || '@' ||
+                    REPLACE(LOWER(SPLIT_PART(email, '@', 2)), 'googlemail.com', 'gmail.com') AS normalized_email
+                FROM contacts
+                WHERE deleted_at IS NULL
+                  AND email IS NOT NULL
+                  AND POSITION('@' IN email) > 1
+            )
+            SELECT
+                normalized_email,
+                ARRAY_AGG(id::text ORDER BY created_at) as contact_ids,
+                ARRAY_AGG(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '') ORDER BY created_at) as names,
+                ARRAY_AGG(email::text ORDER BY created_at) as emails,
+                ARRAY_AGG(phone ORDER BY created_at) as phones,
+                ARRAY_AGG(address_line_1 ORDER BY created_at) as addresses,
+                ARRAY_AGG(source_system ORDER BY created_at) as sources,
+                ARRAY_AGG(created_at ORDER BY created_at) as created_dates,
+                COUNT(*) as count,
+                COUNT(DISTINCT LOWER(COALESCE(first_name, '') || ' ' || COALESCE(last_name, ''))) as unique_names
+            FROM normalized
+            GROUP BY normalized_email
+            HAVING COUNT(*) > 1
+               AND COUNT(DISTINCT LOWER(email)) > 1
+            ORDER BY count DESC
+        """)
+
+        email_dupes = self.cursor.fetchall()
+
+        for row in email_dupes:
+            normalized_email, contact_ids, names, emails, phones, addresses, sources, created_dates, count, unique_names = row
+
+            if unique_names == 1:
+                confidence = 'MEDIUM'
+                reason = 'Similar email + same name'
+            else:
+                confidence = 'LOW'
+                reason = 'Similar email address'
+
+            contacts = []
+            for i in range(count):
+                contacts.append({
+                    'id': contact_ids[i],
+                    'name': names[i],
+                    'email': emails[i],
+                    'phone': phones[i],
+                    'address': addresses[i],
+                    'source': sources[i],
+                    'created_at': created_dates[i]
+                })
+
+            self.cluster_index.add_signal('email_similarity', confidence, reason, contacts)
+
+        self.log(f"  Found {len(email_dupes)} similar email groups")
+        return len(email_dupes)
+
+    def build_clusters(self):
+        """Fold every detection signal into merged duplicate clusters."""
+        self.duplicate_groups = self.cluster_index.clusters()
+        self.log(f"\nMerged {len(self.cluster_index.signals)} signals into "
+                 f"{len(self.duplicate_groups)} duplicate clusters")
+        return len(self.duplicate_groups)
+
     def calculate_stats(self):
         """Calculate summary statistics."""
         self.stats['total_groups'] = len(self.duplicate_groups)
@@ -324,7 +384,7 @@ class EnhancedDuplicateDetector:
             return
 
         fieldnames = [
-            'group_id', 'confidence', 'type', 'reason', 'contact_count',
+            'group_id', 'confidence', 'type', 'reason', 'signals', 'contact_count',
             'first_name', 'last_name', 'phone',
             'contact_id', 'contact_email', 'contact_phone', 'contact_address',
             'contact_source', 'contact_created_at',
@@ -343,6 +403,9 @@ class EnhancedDuplicateDetector:
                         'confidence': group['confidence'],
                         'type': group['type'],
                         'reason': group['reason'],
+                        'signals': '; '.join(
+                            f"{s['type']} ({s['confidence']})" for s in group.get('signals', [])
+                        ),
                         'contact_count': group['contact_count'],
                         'first_name': group.get('first_name', ''),
                         'last_name': group.get('last_name', ''),
@@ -398,7 +461,7 @@ class EnhancedDuplicateDetector:
                     SET potential_duplicate_group = %s,
                         potential_duplicate_reason = %s,
                         potential_duplicate_flagged_at = NOW()
-                    WHERE id = ANY(%s)
+                    WHERE id = ANY(%s::uuid[])
                 """, (group['group_id'], group['reason'], contact_ids))
 
                 self.stats['flagged'] += len(contact_ids)
@@ -425,6 +488,8 @@ class EnhancedDuplicateDetector:
             # Run detection strategies
             self.detect_exact_name_duplicates()
             self.detect_phone_duplicates()
+            self.detect_email_similarity()
+            self.build_clusters()
 
             # Calculate stats
             self.calculate_stats()
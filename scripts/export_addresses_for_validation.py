@@ -4,24 +4,25 @@ Export addresses for SmartyStreets validation
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
-import csv
 from db_config import get_database_url
+from streaming_export import copy_query_to_csv
 
 DATABASE_URL = get_database_url()
+OUTPUT_FILE = '/tmp/shipping_addresses_for_validation.csv'
 
 conn = psycopg2.connect(DATABASE_URL)
-cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-# Get all addresses needing validation
-cursor.execute("""
+# All addresses needing validation, streamed by COPY straight into the
+# SmartyStreets CSV (NULLs become empty fields)
+count = copy_query_to_csv(conn, """
     SELECT
-        id,
-        address_line_1,
-        address_line_2,
+        ROW_NUMBER() OVER (ORDER BY total_spent DESC, id) AS sequence,
+        id AS contact_id,
+        address_line_1 AS addressline1,
+        address_line_2 AS addressline2,
         city,
         state,
-        postal_code
+        postal_code AS postalcode
     FROM contacts
     WHERE address_line_1 IS NOT NULL
       AND city IS NOT NULL
@@ -29,28 +30,9 @@ cursor.execute("""
       AND postal_code IS NOT NULL
       AND (address_validated = false OR address_validated IS NULL)
     ORDER BY total_spent DESC, id
-""")
+""", OUTPUT_FILE)
 
-contacts = cursor.fetchall()
-
-print(f"Found {len(contacts)} addresses to validate")
-
-# Write to CSV in SmartyStreets format
-with open('/tmp/shipping_addresses_for_validation.csv', 'w', newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
-    writer.writerow(['sequence', 'contact_id', 'addressline1', 'addressline2', 'city', 'state', 'postalcode'])
-
-    for i, contact in enumerate(contacts, 1):
-        writer.writerow([
-            i,  # sequence
-            contact['id'],  # contact_id
-            contact['address_line_1'] or '',
-            contact['address_line_2'] or '',
-            contact['city'] or '',
-            contact['state'] or '',
-            contact['postal_code'] or ''
-        ])
-
-print(f"✅ Exported {len(contacts)} addresses to /tmp/shipping_addresses_for_validation.csv")
+print(f"Found {count} addresses to validate")
+print(f"✅ Exported {count} addresses to {OUTPUT_FILE}")
 
 conn.close()
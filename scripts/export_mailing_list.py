@@ -21,14 +21,19 @@ Usage:
 
   # Export to custom file
   python3 scripts/export_mailing_list.py --output /tmp/my_mailing_list.csv
+
+  # Bring stored address scores up to date first
+  python3 scripts/export_mailing_list.py --refresh-scores
+
+Scores are read from contact_address_scores (see refresh_address_scores.py);
+rows that are stale or missing there are scored live by the view.
 """
 
-import csv
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from datetime import datetime
 import argparse
 from db_config import get_database_url
+from refresh_address_scores import refresh_address_scores
+from streaming_export import SampleRows, export_query_to_csv
 
 DB_URL = get_database_url()
 
@@ -44,7 +49,8 @@ def export_mailing_list(
     min_confidence='high',
     recent_customers_days=None,
     output_file='/tmp/mailing_list_export.csv',
-    include_metadata=True
+    include_metadata=True,
+    refresh_scores=False
 ):
     """
     Export mailing list with smart address selection.
@@ -54,10 +60,13 @@ def export_mailing_list(
         recent_customers_days: Only include customers with transactions in last N days
         output_file: Path to output CSV file
         include_metadata: Include scoring metadata in export
+        refresh_scores: Rescore changed/expired contacts before exporting
     """
 
     conn = psycopg2.connect(DB_URL)
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+    if refresh_scores:
+        refresh_address_scores(conn)
 
     # Build query
     confidence_threshold = CONFIDENCE_LEVELS[min_confidence]
@@ -107,65 +116,72 @@ def export_mailing_list(
             GREATEST(billing_score, shipping_score) DESC
     """
 
-    cursor.execute(query, params)
-    contacts = cursor.fetchall()
-
-    # Write to CSV
-    if contacts:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            # Base fields
-            fieldnames = [
-                'first_name',
-                'last_name',
-                'email',
-                'address_line_1',
-                'address_line_2',
-                'city',
-                'state',
-                'postal_code',
-                'country'
-            ]
-
-            # Add metadata fields if requested
-            if include_metadata:
-                fieldnames.extend([
-                    'address_source',
-                    'confidence',
-                    'score',
-                    'billing_score',
-                    'shipping_score',
-                    'manual_override',
-                    'last_transaction_date'
-                ])
-
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for contact in contacts:
-                row = {
-                    'first_name': contact['first_name'] or '',
-                    'last_name': contact['last_name'] or '',
-                    'email': contact['email'] or '',
-                    'address_line_1': contact['address_line_1'] or '',
-                    'address_line_2': contact['address_line_2'] or '',
-                    'city': contact['city'] or '',
-                    'state': contact['state'] or '',
-                    'postal_code': contact['postal_code'] or '',
-                    'country': contact['country'] or 'US',
-                }
-
-                if include_metadata:
-                    row.update({
-                        'address_source': contact['address_source'],
-                        'confidence': contact['confidence'],
-                        'score': max(contact['billing_score'] or 0, contact['shipping_score'] or 0),
-                        'billing_score': contact['billing_score'] or 0,
-                        'shipping_score': contact['shipping_score'] or 0,
-                        'manual_override': 'yes' if contact['is_manual_override'] else 'no',
-                        'last_transaction_date': contact['last_transaction_date'].strftime('%Y-%m-%d') if contact['last_transaction_date'] else ''
-                    })
-
-                writer.writerow(row)
+    # Base fields
+    fieldnames = [
+        'first_name',
+        'last_name',
+        'email',
+        'address_line_1',
+        'address_line_2',
+        'city',
+        'state',
+        'postal_code',
+        'country'
+    ]
+
+    # Add metadata fields if requested
+    if include_metadata:
+        fieldnames.extend([
+            'address_source',
+            'confidence',
+            'score',
+            'billing_score',
+            'shipping_score',
+            'manual_override',
+            'last_transaction_date'
+        ])
+
+    # Summary counters, updated as rows stream to the CSV
+    confidence_counts = {}
+    source_counts = {}
+    sample = SampleRows(5)
+
+    def to_csv_row(contact):
+        conf = contact['confidence']
+        confidence_counts[conf] = confidence_counts.get(conf, 0) + 1
+        src = contact['address_source']
+        source_counts[src] = source_counts.get(src, 0) + 1
+        sample.add(dict(contact))
+
+        row = {
+            'first_name': contact['first_name'] or '',
+            'last_name': contact['last_name'] or '',
+            'email': contact['email'] or '',
+            'address_line_1': contact['address_line_1'] or '',
+            'address_line_2': contact['address_line_2'] or '',
+            'city': contact['city'] or '',
+            'state': contact['state'] or '',
+            'postal_code': contact['postal_code'] or '',
+            'country': contact['country'] or 'US',
+        }
+
+        if include_metadata:
+            row.update({
+                'address_source': contact['address_source'],
+                'confidence': contact['confidence'],
+                'score': max(contact['billing_score'] or 0, contact['shipping_score'] or 0),
+                'billing_score': contact['billing_score'] or 0,
+                'shipping_score': contact['shipping_score'] or 0,
+                'manual_override': 'yes' if contact['is_manual_override'] else 'no',
+                'last_transaction_date': contact['last_transaction_date'].strftime('%Y-%m-%d') if contact['last_transaction_date'] else ''
+            })
+
+        return row
+
+    # Stream from a server-side cursor straight into the CSV
+    total = export_query_to_csv(conn, query, output_file, fieldnames,
+                                transform=to_csv_row, params=params)
+    conn.close()
 
     # Print summary
     print("=" * 80)
@@ -175,16 +191,11 @@ def export_mailing_list(
     print(f"Minimum Confidence: {min_confidence}")
     if recent_customers_days:
         print(f"Recent Customers: Last {recent_customers_days} days")
-    print(f"Total Contacts: {len(contacts)}")
+    print(f"Total Contacts: {total}")
     print(f"Output File: {output_file}")
     print()
 
     # Confidence breakdown
-    confidence_counts = {}
-    for contact in contacts:
-        conf = contact['confidence']
-        confidence_counts[conf] = confidence_counts.get(conf, 0) + 1
-
     print("Confidence Breakdown:")
     for conf in ['very_high', 'high', 'medium', 'low', 'very_low']:
         if conf in confidence_counts:
@@ -192,21 +203,16 @@ def export_mailing_list(
     print()
 
     # Address source breakdown
-    source_counts = {}
-    for contact in contacts:
-        src = contact['address_source']
-        source_counts[src] = source_counts.get(src, 0) + 1
-
     print("Address Source:")
     for src in ['billing', 'shipping']:
         if src in source_counts:
-            pct = source_counts[src] * 100.0 / len(contacts)
+            pct = source_counts[src] * 100.0 / total
             print(f"  {src:12s}: {source_counts[src]:4d} contacts ({pct:.1f}%)")
     print()
 
     # Sample contacts
     print("Sample Contacts (first 5):")
-    for i, contact in enumerate(contacts[:5], 1):
+    for i, contact in enumerate(sample.rows, 1):
         print(f"\n{i}. {contact['first_name']} {contact['last_name']} <{contact['email']}>")
         print(f"   {contact['address_line_1']}")
         if contact['address_line_2']:
@@ -216,13 +222,10 @@ def export_mailing_list(
 
     print()
     print("=" * 80)
-    print(f"✓ Export complete - {len(contacts)} contacts written to {output_file}")
+    print(f"✓ Export complete - {total} contacts written to {output_file}")
     print("=" * 80)
 
-    cursor.close()
-    conn.close()
-
-    return len(contacts)
+    return total
 
 
 def main():
@@ -271,13 +274,20 @@ Examples:
         help='Exclude scoring metadata from export (cleaner for mail merge)'
     )
 
+    parser.add_argument(
+        '--refresh-scores',
+        action='store_true',
+        help='Refresh stored address scores for changed contacts before exporting'
+    )
+
     args = parser.parse_args()
 
     export_mailing_list(
         min_confidence=args.min_confidence,
         recent_customers_days=args.recent_customers,
         output_file=args.output,
-        include_metadata=not args.no_metadata
+        include_metadata=not args.no_metadata,
+        refresh_scores=args.refresh_scores
     )
 
 
@@ -27,6 +27,21 @@ Usage:
   # Export to CSV
   python3 scripts/find_duplicate_contacts.py --output duplicates.csv
 
+  # Score candidate pairs on 4 worker processes
+  python3 scripts/find_duplicate_contacts.py --workers 4
+
+  # Compare every pair (slow; reference run for low thresholds)
+  python3 scripts/find_duplicate_contacts.py --threshold 0.6 --exhaustive
+
+Blocking:
+  Only pairs that share a block are scored: the same normalized phone, the
+  same email local part, a name block (Soundex of last name + first initial,
+  or the first 4 letters of the full name), or the same ZIP + house number.
+  Phone and email blocks cover every pair whose phone matches or whose email
+  scores 0.7+, and any other pair scores below 68% (name 35% + email 30% x 0.6
+  + address 15%), so at a threshold of 68% or more the output is identical
+  to comparing every pair. Below that, name/ZIP blocks are a heuristic.
+
 Author: StarHouse Development Team
 Date: 2025-11-08
 Version: 1.0.0
@@ -36,7 +51,10 @@ import os
 import sys
 import argparse
 import csv
-from typing import List, Tuple, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice
+from typing import Iterable, Iterator, List, Tuple, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import psycopg2
@@ -45,6 +63,8 @@ from dotenv import load_dotenv
 import Levenshtein
 import re
 
+from logging_config import instrument_cursor
+
 load_dotenv()
 
 # ============================================================================
@@ -64,6 +84,7 @@ class Contact:
     state: Optional[str]
     source_system: Optional[str]
     created_at: datetime
+    postal_code: Optional[str] = None
 
 
 @dataclass
@@ -280,23 +301,246 @@ def calculate_duplicate_score(contact1: Contact, contact2: Contact) -> Duplicate
     )
 
 
+# ============================================================================
+# BLOCKING
+# ============================================================================
+
+# Block kinds that cover every pair able to reach EXACT_BLOCKING_THRESHOLD
+EXACT_BLOCK_KINDS = ('phone', 'email')
+
+# Highest score a pair can reach without a phone match or an email score of
+# 0.7+ (name 0.35 + email 0.30 * 0.6 + address 0.15); see module docstring
+EXACT_BLOCKING_THRESHOLD = 0.35 + 0.30 * 0.6 + 0.15
+
+# Name/ZIP blocks larger than this are too generic to be useful and are skipped
+MAX_HEURISTIC_BLOCK_SIZE = 500
+
+# Candidate pairs per process-pool task
+SCORE_CHUNK_SIZE = 5000
+
+# Below this many pairs, scoring in-process beats starting worker processes
+MIN_PARALLEL_PAIRS = 20000
+
+SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'),
+                           ('4', 'l'), ('5', 'mn'), ('6', 'r'))
+    for letter in letters
+}
+
+
+def soundex(word: Optional[str]) -> str:
+    """American Soundex code (e.g. 'Robert' -> 'R163'); '' if no letters."""
+    letters = [c for c in (word or '').lower() if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+
+    code = letters[0].upper()
+    last = SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            last = digit
+
+    return code.ljust(4, '0')
+
+
+def blocking_keys(contact: Contact) -> List[Tuple[str, str]]:
+    """
+    Block keys for a contact; two contacts are compared only if they share one.
+
+    Phone and email keys mirror check_phone_match() and the 0.7/1.0 cases of
+    calculate_email_similarity() exactly.
+    """
+    keys = []
+
+    phone = normalize_phone(contact.phone)
+    if phone:
+        keys.append(('phone', phone[-10:] if len(phone) >= 10 else phone))
+
+    if contact.email:
+        email = contact.email.lower().strip()
+        keys.append(('email', email.split('@')[0] if '@' in email else email))
+
+    full_name = normalize_name(get_full_name(contact))
+    if full_name:
+        keys.append(('name_prefix', full_name.replace(' ', '')[:4]))
+    last_code = soundex(contact.last_name)
+    first_name = normalize_name(contact.first_name)
+    if last_code and first_name:
+        keys.append(('name_sound', last_code + first_name[0]))
+
+    postal = normalize_phone(contact.postal_code)[:5]
+    address = normalize_name(contact.address_line_1)
+    if postal and address:
+        keys.append(('zip', f"{postal}|{address.split(' ')[0]}"))
+
+    return keys
+
+
+def generate_candidate_pairs(contacts: List[Contact]) -> Tuple[List[Tuple[int, int]], Dict[str, int]]:
+    """
+    Build the candidate pairs (i, j), i < j, from shared blocks.
+
+    Returns:
+        (pairs sorted in the order a full comparison would visit them, stats)
+    """
+    blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for i, contact in enumerate(contacts):
+        for key in blocking_keys(contact):
+            blocks[key].append(i)
+
+    stats = {'blocks': 0, 'oversized_blocks_skipped': 0}
+    pairs = set()
+    for (kind, _), members in blocks.items():
+        if len(members) < 2:
+            continue
+        if kind not in EXACT_BLOCK_KINDS and len(members) > MAX_HEURISTIC_BLOCK_SIZE:
+            stats['oversized_blocks_skipped'] += 1
+            continue
+        stats['blocks'] += 1
+        # members are in ascending contact order, so every pair is (i, j) with i < j
+        pairs.update(combinations(members, 2))
+
+    return sorted(pairs), stats
+
+
+# ============================================================================
+# PARALLEL SCORING
+# ============================================================================
+
+# Contacts and their precomputed pair keys, set once per process by _init_worker
+_worker_contacts: List[Contact] = []
+_worker_keys: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+
+def pair_keys(contact: Contact) -> Tuple[str, Optional[str], Optional[str]]:
+    """(phone key, normalized email, email local part) used by score_upper_bound."""
+    phone = normalize_phone(contact.phone)
+    phone_key = phone[-10:] if len(phone) >= 10 else phone
+    if not contact.email:
+        return phone_key, None, None
+    email = contact.email.lower().strip()
+    return phone_key, email, email.split('@')[0] if '@' in email else email
+
+
+def score_upper_bound(keys1: Tuple[str, Optional[str], Optional[str]],
+                      keys2: Tuple[str, Optional[str], Optional[str]]) -> float:
+    """
+    Highest confidence calculate_duplicate_score() could give this pair.
+
+    Assumes a perfect name and address; the email term is exact for equal
+    emails/local parts and capped at 0.6 otherwise. Evaluated in the same
+    order as the real score, so rounding never puts the score above it.
+    """
+    phone1, email1, user1 = keys1
+    phone2, email2, user2 = keys2
+
+    if email1 is None or email2 is None:
+        email_max = 0.0
+    elif email1 == email2:
+        email_max = 1.0
+    elif user1 == user2:
+        email_max = 0.7
+    else:
+        email_max = 0.6
+
+    phone_score = 1.0 if phone1 and phone1 == phone2 else 0.0
+
+    return 1.0 * 0.35 + email_max * 0.30 + phone_score * 0.20 + 1.0 * 0.15
+
+
+def _init_worker(contacts: List[Contact]):
+    global _worker_contacts, _worker_keys
+    _worker_contacts = contacts
+    _worker_keys = [pair_keys(contact) for contact in contacts]
+
+
+def _score_chunk(task: Tuple[List[Tuple[int, int]], float]) -> List[DuplicateMatch]:
+    """Score one chunk of pairs, keeping matches at or above the threshold."""
+    pairs, threshold = task
+    matches = []
+    for i, j in pairs:
+        # Cheap key comparison first: skip pairs that cannot reach the threshold
+        if score_upper_bound(_worker_keys[i], _worker_keys[j]) < threshold:
+            continue
+        match = calculate_duplicate_score(_worker_contacts[i], _worker_contacts[j])
+        if match.confidence_score >= threshold:
+            matches.append(match)
+    return matches
+
+
+def _chunks(pairs: Iterable[Tuple[int, int]], size: int) -> Iterator[List[Tuple[int, int]]]:
+    iterator = iter(pairs)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_pairs(contacts: List[Contact], pairs: Iterable[Tuple[int, int]], total_pairs: int,
+                threshold: float, limit: Optional[int] = None,
+                workers: Optional[int] = None) -> List[DuplicateMatch]:
+    """
+    Score candidate pairs, in parallel when there are enough of them.
+
+    Matches come back in pair order, so with a limit the same first matches
+    are kept as a sequential scan would keep.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = ((chunk, threshold) for chunk in _chunks(pairs, SCORE_CHUNK_SIZE))
+    duplicates: List[DuplicateMatch] = []
+    scored = 0
+
+    executor = None
+    if workers > 1 and total_pairs >= MIN_PARALLEL_PAIRS:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(contacts,))
+        results = executor.map(_score_chunk, tasks)
+    else:
+        _init_worker(contacts)
+        results = map(_score_chunk, tasks)
+
+    try:
+        for matches in results:
+            duplicates.extend(matches)
+            scored = min(scored + SCORE_CHUNK_SIZE, total_pairs)
+            if scored % (SCORE_CHUNK_SIZE * 20) == 0:
+                print(f"Progress: {scored:,} / {total_pairs:,} pairs scored...")
+            if limit and len(duplicates) >= limit:
+                return duplicates[:limit]
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    return duplicates
+
+
 # ============================================================================
 # DUPLICATE DETECTION
 # ============================================================================
 
-def find_duplicates(threshold: float = 0.8, limit: Optional[int] = None) -> List[DuplicateMatch]:
+def find_duplicates(threshold: float = 0.8, limit: Optional[int] = None,
+                    workers: Optional[int] = None, exhaustive: bool = False) -> List[DuplicateMatch]:
     """
     Find potential duplicate contacts.
 
     FAANG Standards:
-    - Efficient N^2 comparison with early termination
+    - Blocking: only pairs sharing a phone, email, name or ZIP block are scored
+    - Pair scoring spread across a process pool
     - Configurable threshold
     - Progress tracking
-    - Memory efficient
 
     Args:
         threshold: Minimum confidence score (0.0-1.0)
         limit: Maximum duplicates to return (for testing)
+        workers: Scoring processes (default: CPU count)
+        exhaustive: Score every pair instead of blocking
 
     Returns:
         List of duplicate matches sorted by confidence
@@ -304,52 +548,46 @@ def find_duplicates(threshold: float = 0.8, limit: Optional[int] = None) -> List
     conn = psycopg2.connect(os.getenv('DATABASE_URL'))
 
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        with instrument_cursor(conn.cursor(cursor_factory=RealDictCursor)) as cursor:
             # Fetch all contacts
             cursor.execute("""
                 SELECT id, email, first_name, last_name, phone,
-                       address_line_1, city, state, source_system, created_at
+                       address_line_1, city, state, postal_code, source_system, created_at
                 FROM contacts
                 ORDER BY created_at DESC
             """)
 
             contacts = [Contact(**row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
 
-            print(f"Analyzing {len(contacts):,} contacts for duplicates...")
-            print(f"Confidence threshold: {threshold*100:.0f}%")
-            print()
-
-            duplicates = []
-            checked = set()
-
-            # Compare each contact with others
-            for i, contact1 in enumerate(contacts):
-                if i % 100 == 0 and i > 0:
-                    print(f"Progress: {i:,} / {len(contacts):,} contacts checked...")
-
-                for contact2 in contacts[i+1:]:
-                    # Skip if already checked this pair
-                    pair_key = tuple(sorted([contact1.id, contact2.id]))
-                    if pair_key in checked:
-                        continue
-
-                    checked.add(pair_key)
-
-                    # Calculate duplicate score
-                    match = calculate_duplicate_score(contact1, contact2)
-
-                    if match.confidence_score >= threshold:
-                        duplicates.append(match)
+    print(f"Analyzing {len(contacts):,} contacts for duplicates...")
+    print(f"Confidence threshold: {threshold*100:.0f}%")
 
-                        if limit and len(duplicates) >= limit:
-                            return sorted(duplicates, key=lambda x: x.confidence_score, reverse=True)
+    n = len(contacts)
+    if exhaustive:
+        total_pairs = n * (n - 1) // 2
+        pairs: Iterable[Tuple[int, int]] = ((i, j) for i in range(n) for j in range(i + 1, n))
+        print(f"Exhaustive mode: scoring all {total_pairs:,} pairs")
+    else:
+        candidate_pairs, stats = generate_candidate_pairs(contacts)
+        total_pairs = len(candidate_pairs)
+        pairs = candidate_pairs
+        print(f"Blocking: {total_pairs:,} candidate pairs from {stats['blocks']:,} blocks "
+              f"(vs {n * (n - 1) // 2:,} for a full comparison)")
+        if stats['oversized_blocks_skipped']:
+            print(f"  Skipped {stats['oversized_blocks_skipped']:,} name/ZIP blocks "
+                  f"over {MAX_HEURISTIC_BLOCK_SIZE} contacts")
+        if threshold < EXACT_BLOCKING_THRESHOLD:
+            print(f"  Note: below {EXACT_BLOCKING_THRESHOLD*100:.0f}% blocking may miss pairs; "
+                  f"use --exhaustive for a full comparison")
+    print()
 
-            print(f"Analysis complete! Found {len(duplicates):,} potential duplicates.")
+    duplicates = score_pairs(contacts, pairs, total_pairs, threshold, limit=limit, workers=workers)
 
-            return sorted(duplicates, key=lambda x: x.confidence_score, reverse=True)
+    print(f"Analysis complete! Found {len(duplicates):,} potential duplicates.")
 
-    finally:
-        conn.close()
+    return sorted(duplicates, key=lambda x: x.confidence_score, reverse=True)
 
 
 # ============================================================================
@@ -430,6 +668,16 @@ def main():
         default=20,
         help='Maximum results to display (default: 20)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes used to score candidate pairs (default: CPU count)'
+    )
+    parser.add_argument(
+        '--exhaustive',
+        action='store_true',
+        help='Compare every pair instead of blocking (slow)'
+    )
 
     args = parser.parse_args()
 
@@ -447,7 +695,9 @@ def main():
     # Find duplicates
     duplicates = find_duplicates(
         threshold=args.threshold,
-        limit=args.limit
+        limit=args.limit,
+        workers=args.workers,
+        exhaustive=args.exhaustive
     )
 
     # Print report
@@ -0,0 +1,154 @@
+"""
+Approximate name lookup for the name-matching importers and enrichers.
+
+Replaces "call Levenshtein.ratio against every known name" with a bigram
+inverted index. A search only verifies names that could possibly reach the
+requested ratio, so results are identical to a full scan but far fewer names
+are compared.
+
+Why the filter is exact:
+  Levenshtein.ratio(a, b) = 1 - d / (len(a) + len(b)), where d counts
+  insertions and deletions. Each insert/delete touches at most Q q-grams of
+  the padded string, so two names within distance d share at least
+  T = max(len(a), len(b)) + Q - 1 - Q * d q-grams. A name sharing T of the
+  query's N q-grams must contain one of any N - T + 1 of them, so only the
+  postings of the query's N - T + 1 rarest q-grams are read (prefix filter).
+  Names of a length that cannot reach the ratio at all are skipped outright.
+
+The filter prunes well at the matchers' acceptance bar (0.80); at low ratios
+the bound drops to zero and a search degrades to a scan of the plausible
+name lengths.
+
+Usage:
+    from fuzzy_name_index import FuzzyNameIndex
+
+    index = FuzzyNameIndex(normalized_names)
+    for name, score in index.search('jon smith', min_ratio=0.8, limit=5):
+        ...
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import Levenshtein
+    HAS_LEVENSHTEIN = True
+except ImportError:
+    HAS_LEVENSHTEIN = False
+
+# q-gram size; bigrams keep the count filter useful for short names
+Q = 2
+
+# Padding so the first and last characters appear in Q grams like the rest
+PAD = '\x00'
+
+# Slack for float comparisons; errs towards keeping candidates
+EPSILON = 1e-9
+
+
+def qgrams(text: str, q: int = Q) -> Counter:
+    """Multiset of padded q-grams of text."""
+    padded = PAD * (q - 1) + text + PAD * (q - 1)
+    return Counter(padded[i:i + q] for i in range(len(padded) - q + 1))
+
+
+def max_distance(len1: int, len2: int, min_ratio: float) -> int:
+    """Largest insert/delete distance that still scores min_ratio."""
+    return int((1.0 - min_ratio) * (len1 + len2) + EPSILON)
+
+
+class FuzzyNameIndex:
+    """Bigram index over normalized names with exact ratio-threshold search."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+        # (gram, name length) -> [name id]
+        self._postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+
+        # name length -> [name id]
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+
+        self.stats = {'searches': 0, 'verified': 0}
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str) -> None:
+        """Index a name; ids follow insertion order, which breaks score ties."""
+        if not name or name in self._ids:
+            return
+
+        name_id = len(self.names)
+        self.names.append(name)
+        self._ids[name] = name_id
+        self._by_length[len(name)].append(name_id)
+
+        for gram in qgrams(name):
+            self._postings[(gram, len(name))].append(name_id)
+
+    def _candidates(self, query: str, query_grams: Counter, min_ratio: float) -> Set[int]:
+        """Ids of names that pass the length and q-gram prefix filters."""
+        len1 = len(query)
+        total_grams = sum(query_grams.values())
+        candidates: Set[int] = set()
+
+        for len2, ids in self._by_length.items():
+            # ratio <= 2 * min(len1, len2) / (len1 + len2)
+            if 2 * min(len1, len2) < min_ratio * (len1 + len2) - EPSILON:
+                continue
+
+            required = max(len1, len2) + Q - 1 - Q * max_distance(len1, len2, min_ratio)
+            if required <= 0:
+                candidates.update(ids)
+                continue
+
+            prefix_size = total_grams - required + 1
+            if prefix_size <= 0:
+                continue
+
+            # Rarest grams first; take grams until prefix_size occurrences are covered
+            by_rarity = sorted(query_grams.items(),
+                               key=lambda item: len(self._postings.get((item[0], len2), ())))
+            covered = 0
+            for gram, count in by_rarity:
+                candidates.update(self._postings.get((gram, len2), ()))
+                covered += count
+                if covered >= prefix_size:
+                    break
+
+        return candidates
+
+    def search(self, query: str, min_ratio: float,
+               limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Names scoring at least min_ratio against query, best first.
+
+        Args:
+            query: Normalized name to look up
+            min_ratio: Minimum Levenshtein.ratio (0.0-1.0)
+            limit: Return at most this many (top-k)
+
+        Returns:
+            [(name, ratio)] sorted by ratio, ties in insertion order
+        """
+        if not HAS_LEVENSHTEIN:
+            raise RuntimeError("FuzzyNameIndex.search requires the Levenshtein module")
+        if not query:
+            return []
+
+        self.stats['searches'] += 1
+        results = []
+        for name_id in self._candidates(query, qgrams(query), min_ratio):
+            self.stats['verified'] += 1
+            score = Levenshtein.ratio(query, self.names[name_id])
+            if score >= min_ratio:
+                results.append((name_id, score))
+
+        results.sort(key=lambda result: (-result[1], result[0]))
+        if limit is not None:
+            results = results[:limit]
+        return [(self.names[name_id], score) for name_id, score in results]
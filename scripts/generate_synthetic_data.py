@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic, referentially consistent import files at scale.
+
+The only real test data is the handful of rows in data/samples/ (see
+regenerate_samples.py). This script writes every export the importers read,
+in the column layouts they expect, for any number of contacts:
+
+  - Kajabi v2:      the 7 v2_*.csv files (weekly_import_kajabi_v2.py)
+  - PayPal:         paypal_export.txt, tab-delimited (weekly_import_paypal_improved.py)
+  - QuickBooks:     quickbooks_donations.csv, report preamble included (import_quickbooks_donors.py)
+  - Zoho:           zoho_contacts.csv (import_zoho_contacts.py)
+  - Ticket Tailor:  ticket_tailor_orders.csv (import_ticket_tailor.py)
+
+Every source draws from one population of people, so the same email, name,
+phone and address show up across files the way they do in production:
+relationship files only reference ids that exist in v2_contacts.csv,
+v2_tags.csv and v2_products.csv, PayPal/Zoho/Ticket Tailor rows reuse Kajabi
+emails (plus a few people only that source knows), and about 2% of Kajabi
+contacts have a near-duplicate record (same name/phone/address, different
+email) for the duplicate finder to catch.
+
+Person i is derived from (seed, i) alone, so files are written row by row
+and memory stays flat even at 1M contacts. The same seed always produces
+the same files.
+
+Usage:
+    python3 scripts/generate_synthetic_data.py --scale 10k --output-dir data/synthetic/10k
+    python3 scripts/generate_synthetic_data.py --contacts 250000 --output-dir /tmp/synth --seed 7
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+DEFAULT_SEED = 42
+
+# Same names as weekly_import_kajabi_v2.REQUIRED_FILES
+KAJABI_FILES = {
+    'contacts': 'v2_contacts.csv',
+    'tags': 'v2_tags.csv',
+    'contact_tags': 'v2_contact_tags.csv',
+    'products': 'v2_products.csv',
+    'contact_products': 'v2_contact_products.csv',
+    'subscriptions': 'v2_subscriptions.csv',
+    'transactions': 'v2_transactions.csv',
+}
+PAYPAL_FILE = 'paypal_export.txt'
+QUICKBOOKS_FILE = 'quickbooks_donations.csv'
+ZOHO_FILE = 'zoho_contacts.csv'
+TICKET_TAILOR_FILE = 'ticket_tailor_orders.csv'
+
+# Share of the population present in each secondary source
+PAYPAL_SHARE = 0.30
+QUICKBOOKS_SHARE = 0.05
+ZOHO_SHARE = 0.10
+TICKET_TAILOR_SHARE = 0.10
+SUBSCRIBER_SHARE = 0.10
+# Extra people per source that are not in Kajabi (as a share of its rows)
+SOURCE_ONLY_SHARE = 0.05
+# Every DUPLICATE_EVERY-th Kajabi contact gets a near-duplicate record
+DUPLICATE_EVERY = 50
+
+TAG_COUNT = 50
+PRODUCT_COUNT = 40
+
+# Column layouts (header order of the real exports)
+KAJABI_COLUMNS = {
+    'contacts': [
+        'id', 'email', 'first_name', 'last_name', 'phone', 'address_line_1', 'address_line_2',
+        'city', 'state', 'postal_code', 'country', 'email_subscribed', 'source_system',
+        'kajabi_id', 'kajabi_member_id', 'ticket_tailor_id', 'zoho_id', 'quickbooks_id',
+        'mailchimp_id', 'notes', 'created_at', 'updated_at',
+    ],
+    'tags': ['id', 'name', 'description', 'category', 'created_at', 'updated_at'],
+    'contact_tags': ['id', 'contact_id', 'tag_id', 'created_at'],
+    'products': [
+        'id', 'name', 'description', 'product_type', 'kajabi_offer_id', 'active',
+        'archived_at', 'created_at', 'updated_at',
+    ],
+    'contact_products': ['id', 'contact_id', 'product_id', 'created_at'],
+    'subscriptions': [
+        'id', 'contact_id', 'product_id', 'kajabi_subscription_id', 'status', 'amount',
+        'currency', 'billing_cycle', 'start_date', 'trial_end_date', 'cancellation_date',
+        'next_billing_date', 'payment_processor', 'coupon_code', 'created_at', 'updated_at',
+    ],
+    'transactions': [
+        'id', 'contact_id', 'product_id', 'subscription_id', 'kajabi_transaction_id',
+        'order_number', 'transaction_type', 'status', 'amount', 'currency', 'tax_amount',
+        'quantity', 'payment_method', 'payment_processor', 'coupon_code', 'transaction_date',
+        'created_at', 'updated_at',
+    ],
+}
+
+PAYPAL_COLUMNS = [
+    'Date', 'Time', 'TimeZone', 'Name', 'Type', 'Status', 'Currency', 'Gross', 'Fee', 'Net',
+    'From Email Address', 'To Email Address', 'Transaction ID', 'Address Line 1',
+    'Address Line 2/District/Neighborhood', 'Town/City',
+    'State/Province/Region/County/Territory/Prefecture/Republic', 'Zip/Postal Code',
+    'Country', 'Contact Phone Number', 'Item Title', 'Invoice Number', 'Receipt ID',
+]
+
+QUICKBOOKS_COLUMNS = [
+    'Transaction date', 'Transaction type', 'Num', 'Customer', 'Customer ID', 'Full name',
+    'Memo/Description', 'Amount', 'Customer email', 'Customer phone', 'Customer mobile',
+    'Customer bill street', 'Customer bill city', 'Customer bill state', 'Customer bill zip',
+    'Customer ship street', 'Customer ship city', 'Customer ship state', 'Customer ship zip',
+    'Class full name', 'Payment method',
+]
+
+ZOHO_COLUMNS = [
+    'Record Id', 'First Name', 'Last Name', 'Contact Name', 'Email', 'Secondary Email', 'Phone',
+    'Mailing Street', 'Mailing City', 'Mailing State', 'Mailing Zip', 'Mailing Country',
+    'Created Time', 'Modified Time', 'Description', 'Account Name', 'Contact Owner',
+]
+
+TICKET_TAILOR_COLUMNS = [
+    'Order ID', 'Order date', 'Name', 'First Name', 'Last Name', 'Email', 'Mobile number',
+    'Address 1', 'Address 2', 'Address 3', 'Postcode / Zip', 'Event ID', 'Event name',
+    'Event start', 'Event end', 'Tickets purchased', 'Total paid', 'Order value',
+    'Remaining order value', 'Refunded amount', 'PAYG fees', 'Payment method',
+    'Transaction ID', 'Order cancelled', 'Are you open to receive emails from StarHouse?',
+]
+
+FIRST_NAMES = [
+    'Ann', 'Ben', 'Carla', 'David', 'Elena', 'Frank', 'Grace', 'Henry', 'Iris', 'Jack',
+    'Karen', 'Leo', 'Maria', 'Noah', 'Olivia', 'Paul', 'Quinn', 'Rosa', 'Sam', 'Tara',
+    'Uma', 'Victor', 'Wendy', 'Xavier', 'Yara', 'Zach', 'Alice', 'Brian', 'Chloe', 'Dylan',
+    'Emma', 'Felix', 'Gina', 'Hugo', 'Ivy', 'Jonah', 'Kate', 'Liam', 'Mia', 'Nina',
+]
+LAST_NAMES = [
+    'Anderson', 'Brown', 'Clark', 'Davis', 'Evans', 'Fisher', 'Garcia', 'Harris', 'Iverson',
+    'Johnson', 'King', 'Lopez', 'Miller', 'Nelson', 'Owens', 'Parker', 'Quintero', 'Reed',
+    'Smith', 'Taylor', 'Underwood', 'Vasquez', 'Walker', 'Young', 'Zimmerman', 'Baker',
+    'Carter', 'Diaz', 'Foster', 'Gray', 'Hughes', 'Jenkins', 'Kelly', 'Lewis', 'Morgan',
+]
+STREETS = [
+    'Pearl St', 'Walnut St', 'Spruce St', 'Arapahoe Ave', 'Baseline Rd', 'Broadway',
+    'Canyon Blvd', 'Folsom St', 'Mapleton Ave', 'Table Mesa Dr', 'Iris Ave', 'Valmont Rd',
+]
+CITIES = [
+    ('Boulder', 'CO', '80302'), ('Boulder', 'CO', '80304'), ('Louisville', 'CO', '80027'),
+    ('Lafayette', 'CO', '80026'), ('Longmont', 'CO', '80501'), ('Denver', 'CO', '80203'),
+    ('Golden', 'CO', '80401'), ('Nederland', 'CO', '80466'), ('Lyons', 'CO', '80540'),
+    ('Santa Fe', 'NM', '87501'), ('Austin', 'TX', '78701'), ('Portland', 'OR', '97201'),
+]
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'comcast.net', 'icloud.com', 'hotmail.com', 'example.org']
+
+EPOCH = datetime(2018, 1, 1)
+SPAN_DAYS = 7 * 365
+
+
+class Person(NamedTuple):
+    """One member of the synthetic population."""
+    index: int
+    contact_id: str
+    email: str
+    first_name: str
+    last_name: str
+    phone: str
+    street: str
+    city: str
+    state: str
+    postal_code: str
+    created_at: datetime
+
+
+# ============================================================================
+# POPULATION
+# ============================================================================
+
+class Population:
+    """Deterministic people and catalog rows, derived from the seed."""
+
+    def __init__(self, contacts: int, seed: int = DEFAULT_SEED):
+        self.contacts = contacts
+        self.seed = seed
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f'starhouse-synthetic:{seed}')
+        self.tag_ids = [self.uuid('tag', i) for i in range(TAG_COUNT)]
+        self.product_ids = [self.uuid('product', i) for i in range(PRODUCT_COUNT)]
+
+    def uuid(self, kind: str, i: int) -> str:
+        return str(uuid.uuid5(self.namespace, f'{kind}:{i}'))
+
+    def rng(self, kind: str, i: int) -> random.Random:
+        """Random stream for one (kind, index); independent of generation order."""
+        return random.Random(f'{self.seed}:{kind}:{i}')
+
+    def person(self, i: int) -> Person:
+        """Person i (indexes >= contacts are people Kajabi does not know)."""
+        rng = self.rng('person', i)
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        city, state, postal_code = rng.choice(CITIES)
+        return Person(
+            index=i,
+            contact_id=self.uuid('contact', i),
+            email=f'{first}.{last}.{i}@{rng.choice(EMAIL_DOMAINS)}'.lower(),
+            first_name=first,
+            last_name=last,
+            phone=f'{rng.choice(("303", "720", "970"))}-{i // 10000 % 1000:03d}-{i % 10000:04d}',
+            street=f'{rng.randint(1, 9999)} {rng.choice(STREETS)}',
+            city=city,
+            state=state,
+            postal_code=postal_code,
+            created_at=EPOCH + timedelta(days=rng.randrange(SPAN_DAYS), seconds=rng.randrange(86400)),
+        )
+
+    def members(self, source: str, share: float) -> Iterator[Person]:
+        """People present in a secondary source: a share of Kajabi plus some only it has."""
+        for i in range(self.contacts):
+            if self.rng(source, i).random() < share:
+                yield self.person(i)
+        extra = int(self.contacts * share * SOURCE_ONLY_SHARE)
+        offset = self.contacts + {'paypal': 0, 'quickbooks': 1, 'zoho': 2, 'ticket_tailor': 3}[source] * self.contacts
+        for i in range(extra):
+            yield self.person(offset + i)
+
+
+def iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def money(value: float) -> str:
+    return f'{value:.2f}'
+
+
+def _writer(output_dir: str, filename: str, columns: List[str], delimiter: str = ','):
+    f = open(os.path.join(output_dir, filename), 'w', newline='', encoding='utf-8')
+    writer = csv.DictWriter(f, fieldnames=columns, delimiter=delimiter)
+    writer.writeheader()
+    return f, writer
+
+
+# ============================================================================
+# KAJABI V2
+# ============================================================================
+
+def write_kajabi(pop: Population, output_dir: str) -> Dict[str, int]:
+    """Write the 7 Kajabi v2 files; relationship rows only reference written ids."""
+    counts = {name: 0 for name in KAJABI_FILES}
+    files = {}
+    writers = {}
+    try:
+        for name, filename in KAJABI_FILES.items():
+            files[name], writers[name] = _writer(output_dir, filename, KAJABI_COLUMNS[name])
+
+        now = iso(EPOCH + timedelta(days=SPAN_DAYS))
+        for i, tag_id in enumerate(pop.tag_ids):
+            writers['tags'].writerow({
+                'id': tag_id, 'name': f'Tag {i + 1:02d}', 'created_at': now, 'updated_at': now,
+            })
+        for i, product_id in enumerate(pop.product_ids):
+            writers['products'].writerow({
+                'id': product_id, 'name': f'Offer {i + 1:02d}', 'product_type': 'offer',
+                'kajabi_offer_id': str(2_000_000 + i), 'active': 'true',
+                'created_at': now, 'updated_at': now,
+            })
+        counts['tags'] = TAG_COUNT
+        counts['products'] = PRODUCT_COUNT
+
+        transaction_number = 0
+        for i in range(pop.contacts):
+            p = pop.person(i)
+            rng = pop.rng('kajabi', i)
+            created = iso(p.created_at)
+
+            writers['contacts'].writerow({
+                'id': p.contact_id, 'email': p.email, 'first_name': p.first_name,
+                'last_name': p.last_name, 'phone': p.phone, 'address_line_1': p.street,
+                'city': p.city, 'state': p.state, 'postal_code': p.postal_code, 'country': 'US',
+                'email_subscribed': 'true' if rng.random() < 0.7 else 'false',
+                'source_system': 'kajabi', 'kajabi_id': str(100_000_000 + i),
+                'kajabi_member_id': str(30_000_000 + i), 'created_at': created, 'updated_at': created,
+            })
+            counts['contacts'] += 1
+
+            if i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1:
+                # Same person signed up again with another address
+                writers['contacts'].writerow({
+                    'id': pop.uuid('duplicate', i),
+                    'email': f'{p.first_name[0]}{p.last_name}{i}@{EMAIL_DOMAINS[-1]}'.lower(),
+                    'first_name': p.first_name, 'last_name': p.last_name, 'phone': p.phone,
+                    'address_line_1': p.street, 'city': p.city, 'state': p.state,
+                    'postal_code': p.postal_code, 'country': 'US', 'email_subscribed': 'false',
+                    'source_system': 'kajabi', 'kajabi_id': str(200_000_000 + i),
+                    'created_at': created, 'updated_at': created,
+                })
+                counts['contacts'] += 1
+
+            for tag_id in rng.sample(pop.tag_ids, rng.randint(0, 3)):
+                writers['contact_tags'].writerow({
+                    'id': pop.uuid(f'contact_tag:{tag_id}', i), 'contact_id': p.contact_id,
+                    'tag_id': tag_id, 'created_at': created,
+                })
+                counts['contact_tags'] += 1
+
+            purchased = rng.sample(pop.product_ids, rng.randint(0, 2))
+            for product_id in purchased:
+                writers['contact_products'].writerow({
+                    'id': pop.uuid(f'contact_product:{product_id}', i), 'contact_id': p.contact_id,
+                    'product_id': product_id, 'created_at': created,
+                })
+                counts['contact_products'] += 1
+
+            if rng.random() < SUBSCRIBER_SHARE:
+                yearly = rng.random() < 0.3
+                status = 'active' if rng.random() < 0.7 else 'canceled'
+                writers['subscriptions'].writerow({
+                    'id': pop.uuid('subscription', i), 'contact_id': p.contact_id,
+                    'product_id': rng.choice(pop.product_ids),
+                    'kajabi_subscription_id': str(40_000_000 + i), 'status': status,
+                    'amount': money(242.0 if yearly else 22.0), 'currency': 'USD',
+                    'billing_cycle': 'Year' if yearly else 'Month', 'start_date': created,
+                    'payment_processor': rng.choice(('Stripe', 'PayPal')),
+                    'created_at': created, 'updated_at': created,
+                })
+                counts['subscriptions'] += 1
+
+            # Purchases of the products above; the export leaves subscription_id blank
+            for product_id in purchased:
+                transaction_number += 1
+                when = iso(p.created_at + timedelta(days=rng.randrange(365)))
+                writers['transactions'].writerow({
+                    'id': pop.uuid('transaction', transaction_number), 'contact_id': p.contact_id,
+                    'product_id': product_id, 'kajabi_transaction_id': str(3_000_000_000 + transaction_number),
+                    'order_number': str(500_000 + transaction_number), 'transaction_type': 'purchase',
+                    'status': 'completed', 'amount': money(rng.choice((25, 55, 88, 150, 242))),
+                    'currency': 'USD', 'quantity': '1', 'payment_method': 'card',
+                    'payment_processor': 'Stripe', 'transaction_date': when,
+                    'created_at': when, 'updated_at': when,
+                })
+                counts['transactions'] += 1
+    finally:
+        for f in files.values():
+            f.close()
+
+    return counts
+
+
+# ============================================================================
+# OTHER SOURCES
+# ============================================================================
+
+def write_paypal(pop: Population, output_dir: str) -> int:
+    """PayPal activity export: 1-3 payments per member, a few non-importable rows."""
+    f, writer = _writer(output_dir, PAYPAL_FILE, PAYPAL_COLUMNS, delimiter='\t')
+    rows = 0
+    with f:
+        for p in pop.members('paypal', PAYPAL_SHARE):
+            rng = pop.rng('paypal_rows', p.index)
+            for n in range(rng.randint(1, 3)):
+                when = p.created_at + timedelta(days=rng.randrange(365), seconds=rng.randrange(86400))
+                subscription = rng.random() < 0.4
+                gross = 22.0 if subscription else float(rng.choice((25, 55, 88, 150)))
+                status = 'Completed' if rng.random() < 0.95 else 'Pending'
+                txn_id = f'{p.index:013d}PP{n}'
+                writer.writerow({
+                    'Date': when.strftime('%m/%d/%Y'), 'Time': when.strftime('%H:%M:%S'),
+                    'TimeZone': 'MST', 'Name': f'{p.last_name}, {p.first_name}',
+                    'Type': 'Subscription Payment' if subscription else 'Website Payment',
+                    'Status': status, 'Currency': 'USD', 'Gross': money(gross),
+                    'Fee': money(-gross * 0.03), 'Net': money(gross * 0.97),
+                    'From Email Address': p.email, 'To Email Address': 'payments@example.org',
+                    'Transaction ID': txn_id, 'Address Line 1': p.street, 'Town/City': p.city,
+                    'State/Province/Region/County/Territory/Prefecture/Republic': p.state,
+                    'Zip/Postal Code': p.postal_code, 'Country': 'United States',
+                    'Contact Phone Number': p.phone,
+                    'Item Title': 'Monthly Membership' if subscription else 'Workshop',
+                    'Receipt ID': f'{p.index:04d}-{n:04d}-{rng.randrange(10000):04d}',
+                })
+                rows += 1
+    return rows
+
+
+def write_quickbooks(pop: Population, output_dir: str) -> int:
+    """QuickBooks transaction report: preamble, DEVELOPMENT gifts and some other income."""
+    rows = 0
+    with open(os.path.join(output_dir, QUICKBOOKS_FILE), 'w', newline='', encoding='utf-8') as f:
+        f.write('Star House\n"Transaction Detail by Account"\n"January 1, 2018 - December 31, 2025"\n\n')
+        writer = csv.DictWriter(f, fieldnames=QUICKBOOKS_COLUMNS)
+        writer.writeheader()
+        for p in pop.members('quickbooks', QUICKBOOKS_SHARE):
+            rng = pop.rng('quickbooks_rows', p.index)
+            customer = f'{p.first_name} {p.last_name}'
+            for n in range(rng.randint(1, 4)):
+                when = p.created_at + timedelta(days=rng.randrange(SPAN_DAYS // 2))
+                development = rng.random() < 0.8
+                writer.writerow({
+                    'Transaction date': when.strftime('%m/%d/%Y'),
+                    'Transaction type': 'Sales Receipt', 'Num': str(10_000 + rows),
+                    'Customer': customer, 'Customer ID': f'QB{p.index}',
+                    'Full name': 'DEVELOPMENT:General' if development else 'PROGRAMS:Workshops',
+                    'Amount': money(rng.choice((25, 50, 100, 250, 1000, 2500))),
+                    'Customer email': p.email, 'Customer phone': p.phone,
+                    'Customer bill street': p.street, 'Customer bill city': p.city,
+                    'Customer bill state': p.state, 'Customer bill zip': p.postal_code,
+                    'Class full name': 'Annual Fund' if development else '',
+                    'Payment method': rng.choice(('Check', 'Credit Card', 'Cash')),
+                })
+                rows += 1
+    return rows
+
+
+def write_zoho(pop: Population, output_dir: str) -> int:
+    """Zoho CRM contacts export."""
+    f, writer = _writer(output_dir, ZOHO_FILE, ZOHO_COLUMNS)
+    rows = 0
+    with f:
+        for p in pop.members('zoho', ZOHO_SHARE):
+            stamp = p.created_at.strftime('%Y-%m-%d %H:%M:%S')
+            writer.writerow({
+                'Record Id': f'zcrm_{4_000_000_000_000 + p.index}', 'First Name': p.first_name,
+                'Last Name': p.last_name, 'Contact Name': f'{p.first_name} {p.last_name}',
+                'Email': p.email, 'Phone': p.phone, 'Mailing Street': p.street,
+                'Mailing City': p.city, 'Mailing State': p.state, 'Mailing Zip': p.postal_code,
+                'Mailing Country': 'United States', 'Created Time': stamp, 'Modified Time': stamp,
+                'Contact Owner': 'StarHouse',
+            })
+            rows += 1
+    return rows
+
+
+def write_ticket_tailor(pop: Population, output_dir: str) -> int:
+    """Ticket Tailor orders export: one order per member."""
+    f, writer = _writer(output_dir, TICKET_TAILOR_FILE, TICKET_TAILOR_COLUMNS)
+    rows = 0
+    with f:
+        for p in pop.members('ticket_tailor', TICKET_TAILOR_SHARE):
+            rng = pop.rng('ticket_tailor_rows', p.index)
+            event = rng.randrange(200)
+            start = EPOCH + timedelta(days=event * 10, hours=19)
+            ordered = start - timedelta(days=rng.randint(1, 30), minutes=rng.randrange(600))
+            tickets = rng.randint(1, 3)
+            total = money(tickets * 35.0)
+            writer.writerow({
+                'Order ID': f'or_{10_000_000 + p.index}', 'Order date': ordered.strftime('%b %-d, %Y %-I:%M %p'),
+                'Name': f'{p.first_name} {p.last_name}', 'First Name': p.first_name,
+                'Last Name': p.last_name, 'Email': p.email, 'Mobile number': p.phone,
+                'Address 1': p.street, 'Address 2': p.city, 'Postcode / Zip': p.postal_code,
+                'Event ID': f'ev_{event}', 'Event name': f'Community Evening {event}',
+                'Event start': start.strftime('%a %b %-d, %Y %-I:%M %p'),
+                'Event end': (start + timedelta(hours=2)).strftime('%a %b %-d, %Y %-I:%M %p'),
+                'Tickets purchased': str(tickets), 'Total paid': total, 'Order value': total,
+                'Remaining order value': total, 'Refunded amount': '0.00', 'PAYG fees': '0.00',
+                'Payment method': 'STRIPE', 'Transaction ID': f'ch_{p.index:012d}',
+                'Order cancelled': '0',
+                'Are you open to receive emails from StarHouse?': 'Yes' if rng.random() < 0.6 else 'No',
+            })
+            rows += 1
+    return rows
+
+
+def generate(output_dir: str, contacts: int, seed: int = DEFAULT_SEED) -> Dict[str, int]:
+    """
+    Write every source's files for a population of `contacts` people.
+
+    Returns:
+        Rows written per file (Kajabi counted per v2 file)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    pop = Population(contacts, seed)
+
+    counts = {KAJABI_FILES[name]: n for name, n in write_kajabi(pop, output_dir).items()}
+    counts[PAYPAL_FILE] = write_paypal(pop, output_dir)
+    counts[QUICKBOOKS_FILE] = write_quickbooks(pop, output_dir)
+    counts[ZOHO_FILE] = write_zoho(pop, output_dir)
+    counts[TICKET_TAILOR_FILE] = write_ticket_tailor(pop, output_dir)
+    return counts
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate synthetic import files at scale',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--scale', choices=sorted(SCALES), help='Preset population size')
+    size.add_argument('--contacts', type=int, help='Population size')
+    parser.add_argument('--output-dir', required=True, help='Directory to write the files to')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Random seed (default: {DEFAULT_SEED})')
+    args = parser.parse_args()
+
+    contacts = SCALES[args.scale] if args.scale else args.contacts
+    print(f"Generating {contacts:,} contacts into {args.output_dir} (seed {args.seed})...")
+
+    start = time.perf_counter()
+    counts = generate(args.output_dir, contacts, args.seed)
+    elapsed = time.perf_counter() - start
+
+    for filename, rows in counts.items():
+        print(f"  ✓ {filename:30s} {rows:>12,} rows")
+    print(f"\n✅ Done in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,9 +14,8 @@ This script generates a comprehensive mailing list that includes:
 
 import os
 import psycopg2
-from psycopg2.extras import RealDictCursor
-import csv
-from datetime import datetime
+
+from streaming_export import SampleRows, export_query_to_csv
 
 # Database connection parameters
 DB_PARAMS = {
@@ -27,74 +26,71 @@ DB_PARAMS = {
     'password': os.getenv('DB_PASSWORD')
 }
 
-def get_validated_contacts(conn):
-    """
-    Get all contacts that have USPS validated addresses.
-    Returns contacts sorted by last name, first name.
-    """
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-    query = """
-        SELECT
-            c.id,
-            c.first_name,
-            c.last_name,
-            c.email,
-            c.phone,
-            c.email_subscribed,
-
-            -- Address information (use USPS validated delivery lines)
-            COALESCE(c.billing_usps_delivery_line_1, c.address_line_1) as address_line_1,
-            COALESCE(c.billing_usps_delivery_line_2, c.address_line_2) as address_line_2,
-            c.city,
-            c.state,
-            c.postal_code,
-            c.billing_usps_last_line,
-            COALESCE(c.country, 'US') as country,
-
-            -- Business information
-            c.paypal_business_name,
-
-            -- Financial information
-            c.total_spent,
-            c.transaction_count,
-
-            -- Membership information
-            c.has_active_subscription,
-            c.membership_tier,
-            c.membership_level,
-            c.membership_group,
-
-            -- Date information
-            c.created_at,
-            c.updated_at,
-            c.last_transaction_date,
-
-            -- USPS validation metadata
-            c.billing_usps_validated_at,
-            c.billing_usps_dpv_match_code,
-            c.billing_usps_precision,
-            c.billing_usps_county,
-            c.billing_usps_rdi,
-            c.billing_usps_active,
-            c.billing_address_verified
-
-        FROM contacts c
-        WHERE
-            -- Only include contacts with USPS validated addresses
-            c.billing_usps_validated_at IS NOT NULL
-            AND c.billing_address_verified = true
-            AND c.billing_usps_dpv_match_code = 'Y'
-        ORDER BY
-            COALESCE(c.last_name, ''),
-            COALESCE(c.first_name, '')
-    """
-
-    cursor.execute(query)
-    results = cursor.fetchall()
-    cursor.close()
+# Contacts with USPS validated addresses, sorted by last name, first name
+VALIDATED_CONTACTS_QUERY = """
+    SELECT
+        c.id,
+        c.first_name,
+        c.last_name,
+        c.email,
+        c.phone,
+        c.email_subscribed,
+
+        -- Address information (use USPS validated delivery lines)
+        COALESCE(c.billing_usps_delivery_line_1, c.address_line_1) as address_line_1,
+        COALESCE(c.billing_usps_delivery_line_2, c.address_line_2) as address_line_2,
+        c.city,
+        c.state,
+        c.postal_code,
+        c.billing_usps_last_line,
+        COALESCE(c.country, 'US') as country,
+
+        -- Business information
+        c.paypal_business_name,
+
+        -- Financial information
+        c.total_spent,
+        c.transaction_count,
+
+        -- Membership information
+        c.has_active_subscription,
+        c.membership_tier,
+        c.membership_level,
+        c.membership_group,
+
+        -- Date information
+        c.created_at,
+        c.updated_at,
+        c.last_transaction_date,
+
+        -- USPS validation metadata
+        c.billing_usps_validated_at,
+        c.billing_usps_dpv_match_code,
+        c.billing_usps_precision,
+        c.billing_usps_county,
+        c.billing_usps_rdi,
+        c.billing_usps_active,
+        c.billing_address_verified
+
+    FROM contacts c
+    WHERE
+        -- Only include contacts with USPS validated addresses
+        c.billing_usps_validated_at IS NOT NULL
+        AND c.billing_address_verified = true
+        AND c.billing_usps_dpv_match_code = 'Y'
+    ORDER BY
+        COALESCE(c.last_name, ''),
+        COALESCE(c.first_name, '')
+"""
 
-    return results
+OUTPUT_FIELDNAMES = [
+    'FirstName', 'LastName', 'FullName', 'BusinessName',
+    'Email', 'Phone',
+    'AddressLine1', 'AddressLine2', 'City', 'State', 'PostalCode', 'Country',
+    'ActiveMember', 'MembershipInfo', 'TotalAmount', 'EmailSubscriber',
+    'OriginalCreatedDate', 'LastActivityDate', 'TransactionCount',
+    'USPSValidatedDate', 'USPSPrecision', 'USPSCounty', 'USPSRDI'
+]
 
 
 def determine_active_member_status(contact):
@@ -133,134 +129,156 @@ def calculate_last_activity_date(contact):
     return contact['created_at']
 
 
-def main():
-    print("Connecting to database...")
-    conn = psycopg2.connect(**DB_PARAMS)
+def format_mailing_row(contact):
+    """
+    Build one output CSV row from a validated contact.
+    """
+    # Determine active member status
+    is_active_member, membership_info = determine_active_member_status(contact)
+
+    # Calculate last activity date
+    last_activity = calculate_last_activity_date(contact)
+
+    # Format total amount
+    total_amount = float(contact['total_spent']) if contact['total_spent'] else 0.00
+
+    # Email subscriber status
+    email_subscriber = 'Yes' if contact['email_subscribed'] else 'No'
+
+    # Format full name
+    full_name = f"{contact['first_name'] or ''} {contact['last_name'] or ''}".strip()
+
+    # Format postal code based on country
+    country = contact['country'] or 'US'
+
+    # Try to extract ZIP from USPS validated data first, then fall back to postal_code
+    postal_code = ''
+    usps_last_line = contact.get('billing_usps_last_line', '')
+    original_postal = contact.get('postal_code', '')
+
+    if usps_last_line:
+        # Extract ZIP from USPS last_line (format: "City Name ST 12345-6789")
+        # The ZIP is the last part after the last space
+        parts = usps_last_line.strip().split()
+        if parts:
+            postal_code = parts[-1].split('-')[0]  # Get just the 5-digit part
+
+    if not postal_code and original_postal:
+        # Fall back to original postal code
+        postal_code = original_postal.split('-')[0]
+
+    if postal_code:
+        # For US addresses, ensure 5-digit format with leading zeros
+        if country.upper() in ['US', 'USA', 'UNITED STATES', '']:
+            postal_code = postal_code.replace(' ', '')
+            if postal_code.isdigit():
+                postal_code = postal_code.zfill(5)
+        else:
+            # For international addresses, just remove spaces but keep format
+            postal_code = postal_code.replace(' ', '')
+
+    return {
+        'FirstName': contact['first_name'] or '',
+        'LastName': contact['last_name'] or '',
+        'FullName': full_name,
+        'BusinessName': contact['paypal_business_name'] or '',
+        'Email': contact['email'] or '',
+        'Phone': contact['phone'] or '',
+
+        # Address (USPS validated)
+        'AddressLine1': contact['address_line_1'] or '',
+        'AddressLine2': contact['address_line_2'] or '',
+        'City': contact['city'] or '',
+        'State': contact['state'] or '',
+        'PostalCode': postal_code,
+        'Country': contact['country'] or '',
+
+        # Requested columns
+        'ActiveMember': is_active_member,
+        'MembershipInfo': membership_info,
+        'TotalAmount': f"${total_amount:.2f}",
+        'EmailSubscriber': email_subscriber,
+        'OriginalCreatedDate': str(contact['created_at'].date()) if contact['created_at'] else '',
+        'LastActivityDate': str(last_activity.date()) if last_activity else '',
+
+        # Additional useful information
+        'TransactionCount': contact['transaction_count'] or 0,
+
+        # USPS validation metadata
+        'USPSValidatedDate': str(contact['billing_usps_validated_at'].date()) if contact['billing_usps_validated_at'] else '',
+        'USPSPrecision': contact['billing_usps_precision'] or '',
+        'USPSCounty': contact['billing_usps_county'] or '',
+        'USPSRDI': contact['billing_usps_rdi'] or '',
+    }
+
+
+class MailingListStats:
+    """
+    Running totals for the summary, updated as rows stream to the CSV.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.us_count = 0
+        self.active_members = 0
+        self.email_subscribers = 0
+        self.total_spending = 0.0
+        self.sample = SampleRows(5)
+
+    def add(self, row):
+        self.total += 1
+        if row['Country'].upper() in ['', 'US', 'USA', 'UNITED STATES']:
+            self.us_count += 1
+        if row['ActiveMember'] == 'Yes':
+            self.active_members += 1
+        if row['EmailSubscriber'] == 'Yes':
+            self.email_subscribers += 1
+        self.total_spending += float(row['TotalAmount'].replace('$', '').replace(',', ''))
+        self.sample.add(row)
+
 
-    print("Fetching contacts with USPS validated addresses...")
-    contacts = get_validated_contacts(conn)
-
-    conn.close()
-
-    print(f"\nFound {len(contacts)} contacts with USPS validated addresses")
-
-    # Prepare data for CSV export
-    mailing_list = []
-
-    for contact in contacts:
-        # Determine active member status
-        is_active_member, membership_info = determine_active_member_status(contact)
-
-        # Calculate last activity date
-        last_activity = calculate_last_activity_date(contact)
-
-        # Format total amount
-        total_amount = float(contact['total_spent']) if contact['total_spent'] else 0.00
-
-        # Email subscriber status
-        email_subscriber = 'Yes' if contact['email_subscribed'] else 'No'
-
-        # Format full name
-        full_name = f"{contact['first_name'] or ''} {contact['last_name'] or ''}".strip()
-
-        # Format postal code based on country
-        country = contact['country'] or 'US'
-
-        # Try to extract ZIP from USPS validated data first, then fall back to postal_code
-        postal_code = ''
-        usps_last_line = contact.get('billing_usps_last_line', '')
-        original_postal = contact.get('postal_code', '')
-
-        if usps_last_line:
-            # Extract ZIP from USPS last_line (format: "City Name ST 12345-6789")
-            # The ZIP is the last part after the last space
-            parts = usps_last_line.strip().split()
-            if parts:
-                postal_code = parts[-1].split('-')[0]  # Get just the 5-digit part
-
-        if not postal_code and original_postal:
-            # Fall back to original postal code
-            postal_code = original_postal.split('-')[0]
-
-        if postal_code:
-            # For US addresses, ensure 5-digit format with leading zeros
-            if country.upper() in ['US', 'USA', 'UNITED STATES', '']:
-                postal_code = postal_code.replace(' ', '')
-                if postal_code.isdigit():
-                    postal_code = postal_code.zfill(5)
-            else:
-                # For international addresses, just remove spaces but keep format
-                postal_code = postal_code.replace(' ', '')
-
-        mailing_list.append({
-            'FirstName': contact['first_name'] or '',
-            'LastName': contact['last_name'] or '',
-            'FullName': full_name,
-            'BusinessName': contact['paypal_business_name'] or '',
-            'Email': contact['email'] or '',
-            'Phone': contact['phone'] or '',
-
-            # Address (USPS validated)
-            'AddressLine1': contact['address_line_1'] or '',
-            'AddressLine2': contact['address_line_2'] or '',
-            'City': contact['city'] or '',
-            'State': contact['state'] or '',
-            'PostalCode': postal_code,
-            'Country': contact['country'] or '',
-
-            # Requested columns
-            'ActiveMember': is_active_member,
-            'MembershipInfo': membership_info,
-            'TotalAmount': f"${total_amount:.2f}",
-            'EmailSubscriber': email_subscriber,
-            'OriginalCreatedDate': str(contact['created_at'].date()) if contact['created_at'] else '',
-            'LastActivityDate': str(last_activity.date()) if last_activity else '',
-
-            # Additional useful information
-            'TransactionCount': contact['transaction_count'] or 0,
-
-            # USPS validation metadata
-            'USPSValidatedDate': str(contact['billing_usps_validated_at'].date()) if contact['billing_usps_validated_at'] else '',
-            'USPSPrecision': contact['billing_usps_precision'] or '',
-            'USPSCounty': contact['billing_usps_county'] or '',
-            'USPSRDI': contact['billing_usps_rdi'] or '',
-        })
-
-    # Write to CSV
+def main():
     output_file = '/workspaces/starhouse-database-v2/validated_mailing_list.csv'
+    stats = MailingListStats()
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = [
-            'FirstName', 'LastName', 'FullName', 'BusinessName',
-            'Email', 'Phone',
-            'AddressLine1', 'AddressLine2', 'City', 'State', 'PostalCode', 'Country',
-            'ActiveMember', 'MembershipInfo', 'TotalAmount', 'EmailSubscriber',
-            'OriginalCreatedDate', 'LastActivityDate', 'TransactionCount',
-            'USPSValidatedDate', 'USPSPrecision', 'USPSCounty', 'USPSRDI'
-        ]
+    def transform(contact):
+        row = format_mailing_row(contact)
+        stats.add(row)
+        return row
 
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(mailing_list)
+    print("Connecting to database...")
+    conn = psycopg2.connect(**DB_PARAMS)
 
+    # Rows go from a server-side cursor straight into the CSV
+    print("Streaming contacts with USPS validated addresses...")
+    try:
+        export_query_to_csv(conn, VALIDATED_CONTACTS_QUERY, output_file, OUTPUT_FIELDNAMES,
+                            transform=transform)
+    finally:
+        conn.close()
+
+    print(f"\nFound {stats.total} contacts with USPS validated addresses")
     print(f"\nValidated mailing list exported to: {output_file}")
-    print(f"Total contacts: {len(mailing_list)}")
+    print(f"Total contacts: {stats.total}")
+
+    if not stats.total:
+        return
 
     # Statistics
-    us_count = sum(1 for c in mailing_list if c['Country'].upper() in ['', 'US', 'USA', 'UNITED STATES'])
-    intl_count = len(mailing_list) - us_count
+    us_count = stats.us_count
+    intl_count = stats.total - us_count
 
     # Active member breakdown
-    active_members = sum(1 for c in mailing_list if c['ActiveMember'] == 'Yes')
-    inactive_members = len(mailing_list) - active_members
+    active_members = stats.active_members
+    inactive_members = stats.total - active_members
 
     # Email subscriber breakdown
-    email_subscribers = sum(1 for c in mailing_list if c['EmailSubscriber'] == 'Yes')
-    non_subscribers = len(mailing_list) - email_subscribers
+    email_subscribers = stats.email_subscribers
+    non_subscribers = stats.total - email_subscribers
 
     # Spending statistics
-    total_spending = sum(float(c['TotalAmount'].replace('$', '').replace(',', '')) for c in mailing_list)
-    avg_spending = total_spending / len(mailing_list) if mailing_list else 0
+    total_spending = stats.total_spending
+    avg_spending = total_spending / stats.total
 
     print(f"\n{'='*80}")
     print("STATISTICS")
@@ -271,12 +289,12 @@ def main():
     print(f"  International:     {intl_count}")
 
     print(f"\nMembership Status:")
-    print(f"  Active Members:    {active_members} ({active_members/len(mailing_list)*100:.1f}%)")
-    print(f"  Inactive Members:  {inactive_members} ({inactive_members/len(mailing_list)*100:.1f}%)")
+    print(f"  Active Members:    {active_members} ({active_members/stats.total*100:.1f}%)")
+    print(f"  Inactive Members:  {inactive_members} ({inactive_members/stats.total*100:.1f}%)")
 
     print(f"\nEmail Subscription:")
-    print(f"  Subscribed:        {email_subscribers} ({email_subscribers/len(mailing_list)*100:.1f}%)")
-    print(f"  Not Subscribed:    {non_subscribers} ({non_subscribers/len(mailing_list)*100:.1f}%)")
+    print(f"  Subscribed:        {email_subscribers} ({email_subscribers/stats.total*100:.1f}%)")
+    print(f"  Not Subscribed:    {non_subscribers} ({non_subscribers/stats.total*100:.1f}%)")
 
     print(f"\nFinancial Summary:")
     print(f"  Total Spending:    ${total_spending:,.2f}")
@@ -287,7 +305,7 @@ def main():
     print("SAMPLE CONTACTS (first 5):")
     print('='*80)
 
-    for i, contact in enumerate(mailing_list[:5], 1):
+    for i, contact in enumerate(stats.sample.rows, 1):
         print(f"\n{i}. {contact['FullName']}")
         if contact['BusinessName']:
             print(f"   Business: {contact['BusinessName']}")
@@ -0,0 +1,270 @@
+"""
+In-memory lookup indexes for the weekly importers.
+
+Loads every key an import step needs to decide insert / update / skip into
+plain Python hash maps in one warm-up phase, so the per-row loops never have
+to ask the database "does this already exist?".
+
+Indexes:
+  - email -> contact_id           (contacts.email, lower-cased)
+  - paypal_email -> contact_id    (contacts.paypal_email, lower-cased)
+  - kajabi_id -> contact_id       (contacts.kajabi_id)
+  - contact_ids                   (every contacts.id)
+  - tag_ids / product_ids         (catalog rows that exist)
+  - contact_tag_pairs             ((contact_id, tag_id) already linked)
+  - contact_product_pairs         ((contact_id, product_id) already linked)
+  - kajabi_subscription_ids       (subscriptions.kajabi_subscription_id)
+  - kajabi_transaction_ids        (transactions.kajabi_transaction_id)
+
+The weekly pipeline shares one index between its Kajabi and PayPal lanes,
+which run on two threads, so every write and every hit/miss counter goes
+through a lock. Plain lookups are single dict/set reads and need none.
+
+Usage:
+    from import_lookup_index import ImportLookupIndex
+
+    index = ImportLookupIndex()
+    index.warm(conn)
+    contact_id = index.contact_for_email('someone@example.com')
+    ...
+    index.print_report()
+"""
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+# Rows fetched per server-side cursor round trip while warming
+WARM_ITERSIZE = 10000
+
+# (index name, query) pairs loaded by warm(); every query streams 1 or 2 columns
+WARM_QUERIES: Tuple[Tuple[str, str], ...] = (
+    ('contacts', "SELECT id::text, LOWER(email), kajabi_id, LOWER(paypal_email) FROM contacts"),
+    ('tag_ids', "SELECT id::text FROM tags"),
+    ('product_ids', "SELECT id::text FROM products"),
+    ('contact_tag_pairs', "SELECT contact_id::text, tag_id::text FROM contact_tags"),
+    ('contact_product_pairs', "SELECT contact_id::text, product_id::text FROM contact_products"),
+    ('kajabi_subscription_ids', """
+        SELECT kajabi_subscription_id FROM subscriptions
+        WHERE kajabi_subscription_id IS NOT NULL
+    """),
+    ('kajabi_transaction_ids', """
+        SELECT kajabi_transaction_id FROM transactions
+        WHERE kajabi_transaction_id IS NOT NULL
+    """),
+)
+
+
+def deep_size(obj: Any) -> int:
+    """
+    Approximate memory footprint of a container and everything it holds.
+
+    Shared objects (e.g. a contact_id string referenced from several indexes)
+    are only counted once per call.
+    """
+    seen: Set[int] = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (set, frozenset, list, tuple)):
+            stack.extend(item)
+
+    return total
+
+
+class ImportLookupIndex:
+    """Warm hash indexes shared by every step of an import run."""
+
+    def __init__(self):
+        self.contact_id_by_email: Dict[str, str] = {}
+        self.contact_id_by_paypal_email: Dict[str, str] = {}
+        self.contact_id_by_kajabi_id: Dict[str, str] = {}
+        self.contact_ids: Set[str] = set()
+        self.tag_ids: Set[str] = set()
+        self.product_ids: Set[str] = set()
+        self.contact_tag_pairs: Set[Tuple[str, str]] = set()
+        self.contact_product_pairs: Set[Tuple[str, str]] = set()
+        self.kajabi_subscription_ids: Set[str] = set()
+        self.kajabi_transaction_ids: Set[str] = set()
+
+        # Canonical string objects so the same contact_id is stored once
+        self._interned: Dict[str, str] = {}
+
+        self.warm_seconds = 0.0
+        self.warmed = False
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def _intern(self, value: str) -> str:
+        """Canonical copy of value (call with the lock held)."""
+        return self._interned.setdefault(value, value)
+
+    def _stream(self, conn, name: str, query: str) -> Iterable[tuple]:
+        """Stream query rows through a named (server-side) cursor."""
+        cur = conn.cursor(name=f'warm_{name}')
+        cur.itersize = WARM_ITERSIZE
+        try:
+            cur.execute(query)
+            for row in cur:
+                yield row
+        finally:
+            cur.close()
+
+    def warm(self, conn) -> None:
+        """Load every index from the database in one pass per table."""
+        start = time.time()
+
+        for name, query in WARM_QUERIES:
+            for row in self._stream(conn, name, query):
+                if name == 'contacts':
+                    contact_id, email, kajabi_id, paypal_email = row
+                    self.add_contact(contact_id, email, kajabi_id, paypal_email)
+                elif name in ('contact_tag_pairs', 'contact_product_pairs'):
+                    self._add_key(getattr(self, name), (row[0], row[1]))
+                else:
+                    self._add_key(getattr(self, name), row[0])
+
+        self.warm_seconds = time.time() - start
+        self.warmed = True
+
+    # ------------------------------------------------------------------
+    # Mutation (keep the index in step with rows the importer writes)
+    # ------------------------------------------------------------------
+
+    def add_contact(self, contact_id: str, email: Optional[str] = None,
+                    kajabi_id: Optional[str] = None, paypal_email: Optional[str] = None) -> None:
+        with self._lock:
+            contact_id = self._intern(str(contact_id))
+            self.contact_ids.add(contact_id)
+            if email:
+                self.contact_id_by_email[email.lower()] = contact_id
+            if paypal_email:
+                self.contact_id_by_paypal_email[paypal_email.lower()] = contact_id
+            if kajabi_id:
+                self.contact_id_by_kajabi_id[kajabi_id] = contact_id
+
+    def _add_key(self, index: set, key: Any) -> None:
+        with self._lock:
+            if isinstance(key, tuple):
+                key = tuple(self._intern(part) for part in key)
+            else:
+                key = self._intern(key)
+            index.add(key)
+
+    def add_contact_tag(self, contact_id: str, tag_id: str) -> None:
+        self._add_key(self.contact_tag_pairs, (contact_id, tag_id))
+
+    def add_contact_product(self, contact_id: str, product_id: str) -> None:
+        self._add_key(self.contact_product_pairs, (contact_id, product_id))
+
+    def add_kajabi_subscription(self, kajabi_subscription_id: str) -> None:
+        self._add_key(self.kajabi_subscription_ids, kajabi_subscription_id)
+
+    def add_kajabi_transaction(self, kajabi_transaction_id: str) -> None:
+        self._add_key(self.kajabi_transaction_ids, kajabi_transaction_id)
+
+    # ------------------------------------------------------------------
+    # Lookups (every call is counted for the hit-rate report)
+    # ------------------------------------------------------------------
+
+    def _count(self, name: str, hit: bool) -> bool:
+        with self._lock:
+            counter = self.stats.setdefault(name, {'hits': 0, 'misses': 0})
+            counter['hits' if hit else 'misses'] += 1
+        return hit
+
+    def contact_for_email(self, email: Optional[str]) -> Optional[str]:
+        contact_id = self.contact_id_by_email.get(email.lower()) if email else None
+        self._count('email', contact_id is not None)
+        return contact_id
+
+    def contact_for_paypal_email(self, email: Optional[str]) -> Optional[str]:
+        contact_id = self.contact_id_by_paypal_email.get(email.lower()) if email else None
+        self._count('paypal_email', contact_id is not None)
+        return contact_id
+
+    def contact_for_kajabi_id(self, kajabi_id: Optional[str]) -> Optional[str]:
+        contact_id = self.contact_id_by_kajabi_id.get(kajabi_id) if kajabi_id else None
+        self._count('kajabi_id', contact_id is not None)
+        return contact_id
+
+    def has_contact(self, contact_id: str) -> bool:
+        return self._count('contact_id', contact_id in self.contact_ids)
+
+    def has_tag(self, tag_id: str) -> bool:
+        return self._count('tag_id', tag_id in self.tag_ids)
+
+    def has_product(self, product_id: str) -> bool:
+        return self._count('product_id', product_id in self.product_ids)
+
+    def has_contact_tag(self, contact_id: str, tag_id: str) -> bool:
+        return self._count('contact_tag', (contact_id, tag_id) in self.contact_tag_pairs)
+
+    def has_contact_product(self, contact_id: str, product_id: str) -> bool:
+        return self._count('contact_product', (contact_id, product_id) in self.contact_product_pairs)
+
+    def has_kajabi_subscription(self, kajabi_subscription_id: str) -> bool:
+        return self._count('kajabi_subscription',
+                           kajabi_subscription_id in self.kajabi_subscription_ids)
+
+    def has_kajabi_transaction(self, kajabi_transaction_id: str) -> bool:
+        return self._count('kajabi_transaction',
+                           kajabi_transaction_id in self.kajabi_transaction_ids)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def index_sizes(self) -> Dict[str, Tuple[int, int]]:
+        """Return {index name: (entries, approx bytes)}."""
+        indexes = {
+            'email': self.contact_id_by_email,
+            'paypal_email': self.contact_id_by_paypal_email,
+            'kajabi_id': self.contact_id_by_kajabi_id,
+            'contact_ids': self.contact_ids,
+            'tag_ids': self.tag_ids,
+            'product_ids': self.product_ids,
+            'contact_tag_pairs': self.contact_tag_pairs,
+            'contact_product_pairs': self.contact_product_pairs,
+            'kajabi_subscription_ids': self.kajabi_subscription_ids,
+            'kajabi_transaction_ids': self.kajabi_transaction_ids,
+        }
+        return {name: (len(idx), deep_size(idx)) for name, idx in indexes.items()}
+
+    def total_bytes(self) -> int:
+        """Approximate total footprint, counting shared contact_id strings once."""
+        return deep_size([
+            self.contact_id_by_email, self.contact_id_by_paypal_email,
+            self.contact_id_by_kajabi_id, self.contact_ids,
+            self.tag_ids, self.product_ids,
+            self.contact_tag_pairs, self.contact_product_pairs,
+            self.kajabi_subscription_ids, self.kajabi_transaction_ids,
+        ])
+
+    def print_report(self) -> None:
+        print(f"\n🧠 Lookup Indexes (warmed in {self.warm_seconds:.2f}s):")
+        for name, (entries, size) in self.index_sizes().items():
+            print(f"  {name:26s} {entries:>10,} entries  {size / 1024 / 1024:>8.2f} MB")
+        print(f"  {'TOTAL (shared keys once)':26s} {'':>10s}          "
+              f"{self.total_bytes() / 1024 / 1024:>8.2f} MB")
+
+        if self.stats:
+            print(f"\n  {'Lookup':22s} {'Hits':>10s} {'Misses':>10s} {'Hit rate':>9s}")
+            for name, counter in self.stats.items():
+                total = counter['hits'] + counter['misses']
+                rate = counter['hits'] / total * 100 if total else 0.0
+                print(f"  {name:22s} {counter['hits']:>10,} {counter['misses']:>10,} {rate:>8.1f}%")
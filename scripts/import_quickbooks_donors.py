@@ -10,7 +10,7 @@ Strategy:
 2. Match donors to existing contacts using priority-based strategy:
    - Priority 1: QB Customer ID match (via external_identities)
    - Priority 2: Email match (100% confidence)
-   - Priority 3: Name match (exact → contact_names → fuzzy)
+   - Priority 3: Name match (exact → contact_names → fuzzy via bigram index)
 3. Handle edge cases:
    - Joint donors ("John & Jane Smith")
    - Organizations (no name split)
@@ -30,27 +30,21 @@ import re
 import sys
 import logging
 import argparse
+import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict
 
-import psycopg2
-from psycopg2.extras import RealDictCursor, execute_batch, Json
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values, Json
 
 # Import existing modules
-try:
-    from db_config import get_database_url
-except ImportError:
-    from secure_config import get_database_url
-
-try:
-    import Levenshtein
-    HAS_LEVENSHTEIN = True
-except ImportError:
-    HAS_LEVENSHTEIN = False
-    print("Warning: Levenshtein module not found. Fuzzy matching disabled.")
+from db_config import acquire_connection, bisect_write, release_connection, pool_stats
+from fuzzy_name_index import FuzzyNameIndex, HAS_LEVENSHTEIN
+from donor_metrics import refresh_donor_metrics
+from logging_config import instrument_cursor, span
+from run_ledger import RunRecorder
 
 
 # ============================================================================
@@ -58,13 +52,16 @@ except ImportError:
 # ============================================================================
 
 DRY_RUN = True  # Default to dry-run for safety
-BATCH_SIZE = 100
+BATCH_SIZE = 100  # Donors written per multi-row chunk (bisected on failure)
 
 # Confidence thresholds
 CONFIDENCE_HIGH = 0.95    # Auto-match
 CONFIDENCE_MEDIUM = 0.80  # Likely match, flag for review
 CONFIDENCE_LOW = 0.60     # Possible match, needs review
 
+# Fuzzy candidates kept per donor (best is the match, the rest are alternatives)
+FUZZY_TOP_K = 5
+
 # Organizations and payment processors to handle specially
 SKIP_NAMES = {
     'paypal giving fund',
@@ -440,6 +437,10 @@ class DonorMatcher:
 
         logger.info(f"Cached {len(self.name_cache)} unique normalized names")
 
+        # Approximate-match index over the same names (dict order breaks ties,
+        # as the old full scan did)
+        self.name_index = FuzzyNameIndex(self.name_cache.keys())
+
     def find_match(self, donor: DonorRecord) -> MatchResult:
         """
         Find matching contact for a donor using priority-based matching.
@@ -525,17 +526,14 @@ class DonorMatcher:
                 )
 
         # Strategy 3b: Fuzzy name match
+        # Only candidates at CONFIDENCE_MEDIUM or above are ever accepted, so
+        # the index is searched at that bar (where its bigram filter prunes)
         if HAS_LEVENSHTEIN:
-            best_match = None
-            best_score = 0.0
+            candidates = self.name_index.search(normalized, CONFIDENCE_MEDIUM, limit=FUZZY_TOP_K)
 
-            for norm_name, contacts in self.name_cache.items():
-                score = Levenshtein.ratio(normalized, norm_name)
-                if score > best_score and score >= CONFIDENCE_LOW:
-                    best_score = score
-                    best_match = contacts[0]  # Take first if multiple
-
-            if best_match and best_score >= CONFIDENCE_MEDIUM:
+            if candidates:
+                best_name, best_score = candidates[0]
+                best_match = self.name_cache[best_name][0]  # Take first if multiple
                 self.stats['fuzzy_matches'] += 1
                 return MatchResult(
                     contact_id=best_match['id'],
@@ -543,7 +541,12 @@ class DonorMatcher:
                     contact_name=best_match['name'],
                     match_type=MatchType.FUZZY_NAME,
                     confidence=best_score,
-                    reason=f"Fuzzy match ({best_score:.0%}): {best_match['name']}"
+                    reason=f"Fuzzy match ({best_score:.0%}): {best_match['name']}",
+                    alternative_matches=[
+                        {'id': m['id'], 'email': m['email'], 'name': m['name'], 'score': score}
+                        for name, score in candidates[1:]
+                        for m in self.name_cache[name][:1]
+                    ]
                 )
 
         # No match found
@@ -563,10 +566,48 @@ class DonorMatcher:
 # CSV PARSING
 # ============================================================================
 
+class _CustomerTotals:
+    """Running per-customer aggregate built while streaming the report."""
+
+    __slots__ = ('total', 'count', 'first_date', 'last_date', 'transactions',
+                 'customer_id', 'email', 'phone', 'address', 'campaign')
+
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+        self.first_date = None
+        self.last_date = None
+        self.transactions = []
+        self.customer_id = ''
+        self.email = ''
+        self.phone = ''
+        self.address = {}
+        self.campaign = ''
+
+
+def _find_header(f) -> List[str]:
+    """
+    Advance f past the report preamble and return the parsed header row.
+
+    QuickBooks report exports start with title/date lines; the header is the
+    line containing "Customer," and "Transaction date". Only lines up to the
+    header are read, so the caller can keep reading rows from the same handle.
+    """
+    for line in f:
+        if 'Customer,' in line and 'Transaction date' in line:
+            return next(csv.reader([line]))
+    raise ValueError("Could not find header row in CSV")
+
+
 def load_quickbooks_csv(filepath: str) -> Tuple[List[DonorRecord], Dict]:
     """
     Load and parse QuickBooks CSV file.
 
+    Streams the export: the header is located on the open handle, the csv
+    reader continues from there, and each DEVELOPMENT row is folded into its
+    customer's running totals. Non-DEVELOPMENT rows are never kept, so memory
+    follows the number of donations rather than the size of the report.
+
     Returns:
         - List of DonorRecord objects (DEVELOPMENT donations only)
         - Stats dictionary
@@ -574,18 +615,7 @@ def load_quickbooks_csv(filepath: str) -> Tuple[List[DonorRecord], Dict]:
     logger.info(f"Loading QuickBooks CSV: {filepath}")
 
     # Track donors by customer name
-    donor_data = defaultdict(lambda: {
-        'total': 0.0,
-        'count': 0,
-        'first_date': None,
-        'last_date': None,
-        'transactions': [],
-        'customer_id': '',
-        'email': '',
-        'phone': '',
-        'address': {},
-        'campaign': ''
-    })
+    donor_data: Dict[str, _CustomerTotals] = {}
 
     stats = {
         'total_rows': 0,
@@ -594,119 +624,124 @@ def load_quickbooks_csv(filepath: str) -> Tuple[List[DonorRecord], Dict]:
         'unique_donors': 0,
     }
 
-    with open(filepath, 'r', encoding='utf-8-sig') as f:
-        # Read all lines to find header row
-        lines = f.readlines()
+    # Repeated values (categories, payment methods, ...) share one string
+    intern = sys.intern
+
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        header = _find_header(f)
+        columns = {name: i for i, name in enumerate(header)}
+
+        def column(name):
+            index = columns.get(name)
+            return (lambda row: row[index] if index < len(row) else '') if index is not None else (lambda row: '')
+
+        get_full_name = column('Full name')
+        get_customer = column('Customer')
+        get_amount = column('Amount')
+        get_date = column('Transaction date')
+        get_customer_id = column('Customer ID')
+        get_email = column('Customer email')
+        get_phone = column('Customer phone')
+        get_mobile = column('Customer mobile')
+        get_bill = [column(f'Customer bill {part}') for part in ('street', 'city', 'state', 'zip')]
+        get_ship = [column(f'Customer ship {part}') for part in ('street', 'city', 'state', 'zip')]
+        get_class = column('Class full name')
+        get_memo = column('Memo/Description')
+        get_payment_method = column('Payment method')
+        get_num = column('Num')
+        get_type = column('Transaction type')
+
+        for row in csv.reader(f):
+            # Blank lines carry no fields (csv.DictReader skipped them too)
+            if not row:
+                continue
 
-    # Find the header row (contains "Customer" and "Transaction date")
-    header_idx = None
-    for i, line in enumerate(lines):
-        if 'Customer,' in line and 'Transaction date' in line:
-            header_idx = i
-            break
-
-    if header_idx is None:
-        raise ValueError("Could not find header row in CSV")
-
-    # Parse from header row
-    import io
-    csv_content = ''.join(lines[header_idx:])
-    reader = csv.DictReader(io.StringIO(csv_content))
-
-    for row in reader:
-        stats['total_rows'] += 1
-
-        full_name = row.get('Full name', '')
-
-        # Only process DEVELOPMENT donations
-        if 'DEVELOPMENT:' not in full_name:
-            stats['skipped_rows'] += 1
-            continue
-
-        stats['development_rows'] += 1
-
-        customer = row.get('Customer', '').strip()
-        if not customer or should_skip_donor(customer):
-            continue
-
-        amount = parse_amount(row.get('Amount', '0'))
-        trans_date = parse_date(row.get('Transaction date', ''))
-
-        # Update donor aggregates
-        data = donor_data[customer]
-        data['total'] += amount
-        data['count'] += 1
-
-        if trans_date:
-            if data['first_date'] is None or trans_date < data['first_date']:
-                data['first_date'] = trans_date
-            if data['last_date'] is None or trans_date > data['last_date']:
-                data['last_date'] = trans_date
-
-        # Extract contact info (take first non-empty values)
-        customer_id = row.get('Customer ID', '').strip()
-        if customer_id and not data['customer_id']:
-            data['customer_id'] = customer_id
-
-        email = row.get('Customer email', '').strip()
-        if email and '@' in email and not data['email']:
-            data['email'] = email
-
-        phone = row.get('Customer phone', '').strip() or row.get('Customer mobile', '').strip()
-        if phone and not data['phone']:
-            data['phone'] = phone
-
-        # Extract address (prefer billing)
-        if not data['address']:
-            bill_street = row.get('Customer bill street', '').strip()
-            if bill_street:
-                data['address'] = {
-                    'street': bill_street,
-                    'city': row.get('Customer bill city', '').strip(),
-                    'state': row.get('Customer bill state', '').strip(),
-                    'zip': row.get('Customer bill zip', '').strip(),
-                }
-            else:
-                ship_street = row.get('Customer ship street', '').strip()
-                if ship_street:
-                    data['address'] = {
-                        'street': ship_street,
-                        'city': row.get('Customer ship city', '').strip(),
-                        'state': row.get('Customer ship state', '').strip(),
-                        'zip': row.get('Customer ship zip', '').strip(),
-                    }
+            stats['total_rows'] += 1
 
-        # Extract campaign from Class column
-        class_name = row.get('Class full name', '').strip()
-        if class_name and not data['campaign']:
-            data['campaign'] = class_name
-
-        # Store transaction details
-        data['transactions'].append({
-            'date': trans_date,
-            'amount': amount,
-            'category': full_name,
-            'memo': row.get('Memo/Description', ''),
-            'payment_method': row.get('Payment method', ''),
-            'invoice_num': row.get('Num', ''),
-            'transaction_type': row.get('Transaction type', ''),
-        })
+            full_name = get_full_name(row)
+
+            # Only process DEVELOPMENT donations
+            if 'DEVELOPMENT:' not in full_name:
+                stats['skipped_rows'] += 1
+                continue
+
+            stats['development_rows'] += 1
+
+            customer = get_customer(row).strip()
+            if not customer or should_skip_donor(customer):
+                continue
+
+            amount = parse_amount(get_amount(row) or '0')
+            trans_date = parse_date(get_date(row))
+
+            # Update donor aggregates
+            data = donor_data.get(customer)
+            if data is None:
+                data = donor_data[customer] = _CustomerTotals()
+            data.total += amount
+            data.count += 1
+
+            if trans_date:
+                if data.first_date is None or trans_date < data.first_date:
+                    data.first_date = trans_date
+                if data.last_date is None or trans_date > data.last_date:
+                    data.last_date = trans_date
+
+            # Extract contact info (take first non-empty values)
+            if not data.customer_id:
+                data.customer_id = get_customer_id(row).strip()
+
+            if not data.email:
+                email = get_email(row).strip()
+                if email and '@' in email:
+                    data.email = email
+
+            if not data.phone:
+                data.phone = get_phone(row).strip() or get_mobile(row).strip()
+
+            # Extract address (prefer billing)
+            if not data.address:
+                for getters in (get_bill, get_ship):
+                    street = getters[0](row).strip()
+                    if street:
+                        data.address = {
+                            'street': street,
+                            'city': getters[1](row).strip(),
+                            'state': getters[2](row).strip(),
+                            'zip': getters[3](row).strip(),
+                        }
+                        break
+
+            # Extract campaign from Class column
+            if not data.campaign:
+                data.campaign = get_class(row).strip()
+
+            # Store transaction details
+            data.transactions.append({
+                'date': trans_date,
+                'amount': amount,
+                'category': intern(full_name),
+                'memo': get_memo(row),
+                'payment_method': intern(get_payment_method(row)),
+                'invoice_num': get_num(row),
+                'transaction_type': intern(get_type(row)),
+            })
 
     # Convert to DonorRecord objects
     donors = []
     for customer, data in donor_data.items():
         record = DonorRecord(
             customer_name=customer,
-            customer_id=data['customer_id'],
-            total_amount=data['total'],
-            transaction_count=data['count'],
-            first_date=data['first_date'] or datetime.now(),
-            last_date=data['last_date'] or datetime.now(),
-            transactions=data['transactions'],
-            email=data['email'],
-            phone=data['phone'],
-            address=data['address'],
-            campaign=data['campaign'],
+            customer_id=data.customer_id,
+            total_amount=data.total,
+            transaction_count=data.count,
+            first_date=data.first_date or datetime.now(),
+            last_date=data.last_date or datetime.now(),
+            transactions=data.transactions,
+            email=data.email,
+            phone=data.phone,
+            address=data.address,
+            campaign=data.campaign,
         )
 
         # Classify donor type
@@ -764,16 +799,16 @@ class QuickBooksDonorImporter:
             'email_available': 0,
         }
 
+        # Outcome of _execute_import (for the run ledger)
+        self.import_counts = {'imported': 0, 'contacts_created': 0, 'errors': 0}
+
     def connect(self):
         """Establish database connection."""
         env_name = "PRODUCTION" if self.production else "DEVELOPMENT"
         logger.info(f"Connecting to {env_name} database...")
 
-        self.conn = psycopg2.connect(
-            get_database_url(production=self.production),
-            cursor_factory=RealDictCursor
-        )
-        self.cur = self.conn.cursor()
+        self.conn = acquire_connection(production=self.production)
+        self.cur = instrument_cursor(self.conn.cursor(cursor_factory=RealDictCursor))
         logger.info(f"Database connection established ({env_name})")
 
     def disconnect(self):
@@ -781,8 +816,13 @@ class QuickBooksDonorImporter:
         if self.cur:
             self.cur.close()
         if self.conn:
-            self.conn.close()
-        logger.info("Database connection closed")
+            release_connection(self.conn, production=self.production)
+            self.conn = None
+        stats = pool_stats()
+        logger.info(
+            "Database connection released (acquire avg %.1f ms, max %.1f ms, %d opened)",
+            stats['avg_acquire_ms'], stats['max_acquire_ms'], stats['connections_opened']
+        )
 
     def run(self):
         """Execute the import process."""
@@ -798,32 +838,54 @@ class QuickBooksDonorImporter:
             logger.info("Create Contacts: ENABLED (will create contacts for new donors)")
         logger.info("")
 
+        ledger = RunRecorder('import_quickbooks_donors', dry_run=self.dry_run,
+                             production=self.production).start()
+        completed = False
+        parse_stats = {}
+
         try:
             self.connect()
 
             # Initialize matcher
-            self.matcher = DonorMatcher(self.cur)
+            with span('build_match_caches'):
+                self.matcher = DonorMatcher(self.cur)
 
             # Load CSV
-            donors, parse_stats = load_quickbooks_csv(self.csv_path)
+            with span('load_csv'):
+                donors, parse_stats = load_quickbooks_csv(self.csv_path)
 
             # Match donors to contacts
-            self._match_donors(donors)
+            with span('match_donors'):
+                self._match_donors(donors)
 
             # Generate report
             self._generate_report()
 
             # Execute import (if not dry run)
             if not self.dry_run:
-                self._execute_import()
+                with span('import_donors'):
+                    self._execute_import()
             else:
                 logger.info("\n" + "=" * 80)
                 logger.info("DRY RUN COMPLETE - No changes made")
                 logger.info("Run with --execute to apply changes")
                 logger.info("=" * 80)
 
+            completed = True
+
         finally:
             self.disconnect()
+            ledger.finish(
+                completed,
+                rows_processed=parse_stats.get('total_rows', 0),
+                rows_created=self.import_counts['imported'],
+                errors=self.import_counts['errors'],
+                details={
+                    **parse_stats,
+                    **self.import_counts,
+                    **{f'{group}_donors': len(items) for group, items in self.results.items()},
+                },
+            )
 
     def _match_donors(self, donors: List[DonorRecord]):
         """Match all donors to contacts."""
@@ -977,121 +1039,85 @@ class QuickBooksDonorImporter:
         skipped_tier = 0
         new_contacts_created = 0
         donor_ids = []
+        contact_ids = []
 
         try:
             # Process high-confidence matches
             matched_filtered = [item for item in self.results['matched'] if self._filter_by_tier(item['donor'])]
             skipped_tier += len(self.results['matched']) - len(matched_filtered)
-            total_matched = len(matched_filtered)
-            logger.info(f"\nProcessing {total_matched} high-confidence matches...")
-            for i, item in enumerate(matched_filtered, 1):
-                try:
-                    if i % 50 == 0 or i == 1:
-                        logger.info(f"  Processing donor {i}/{total_matched}: {item['donor'].customer_name}")
-                    # Use savepoint so one failure doesn't rollback all donors
-                    self.cur.execute(f"SAVEPOINT donor_{i}")
-                    donor_id = self._import_donor(item['donor'], item['match'].contact_id)
-                    if donor_id:
-                        donor_ids.append(donor_id)
-                        imported_count += 1
-                    self.cur.execute(f"RELEASE SAVEPOINT donor_{i}")
-                except Exception as e:
-                    logger.error(f"Error importing {item['donor'].customer_name}: {e}")
-                    self.cur.execute(f"ROLLBACK TO SAVEPOINT donor_{i}")
-                    error_count += 1
+            logger.info(f"\nProcessing {len(matched_filtered)} high-confidence matches...")
+            batch = self._import_in_chunks(
+                [(item['donor'], item['match'].contact_id) for item in matched_filtered], 'donor'
+            )
+            donor_ids.extend(batch['donor_ids'])
+            contact_ids.extend(batch['contact_ids'])
+            error_count += batch['errors']
 
             # Process organizations that matched
             org_with_match = [item for item in self.results['org'] if item['match'].contact_id and self._filter_by_tier(item['donor'])]
             skipped_tier += len([item for item in self.results['org'] if item['match'].contact_id]) - len(org_with_match)
-            total_orgs = len(org_with_match)
-            if total_orgs > 0:
-                logger.info(f"\nProcessing {total_orgs} matched organizations...")
-            for i, item in enumerate(org_with_match, 1):
-                try:
-                    if i % 10 == 0 or i == 1:
-                        logger.info(f"  Processing org {i}/{total_orgs}: {item['donor'].customer_name}")
-                    self.cur.execute(f"SAVEPOINT org_{i}")
-                    donor_id = self._import_donor(item['donor'], item['match'].contact_id)
-                    if donor_id:
-                        donor_ids.append(donor_id)
-                        imported_count += 1
-                    self.cur.execute(f"RELEASE SAVEPOINT org_{i}")
-                except Exception as e:
-                    logger.error(f"Error importing org {item['donor'].customer_name}: {e}")
-                    self.cur.execute(f"ROLLBACK TO SAVEPOINT org_{i}")
-                    error_count += 1
+            if org_with_match:
+                logger.info(f"\nProcessing {len(org_with_match)} matched organizations...")
+            batch = self._import_in_chunks(
+                [(item['donor'], item['match'].contact_id) for item in org_with_match], 'org'
+            )
+            donor_ids.extend(batch['donor_ids'])
+            contact_ids.extend(batch['contact_ids'])
+            error_count += batch['errors']
 
             # Process new donors (create contacts if enabled)
             if self.create_contacts:
                 new_filtered = [donor for donor in self.results['new'] if self._filter_by_tier(donor)]
                 skipped_tier += len(self.results['new']) - len(new_filtered)
-                total_new = len(new_filtered)
-                if total_new > 0:
-                    logger.info(f"\nCreating {total_new} new contacts and donors...")
-                for i, donor in enumerate(new_filtered, 1):
-                    try:
-                        if i % 10 == 0 or i == 1:
-                            logger.info(f"  Creating contact {i}/{total_new}: {donor.customer_name}")
-                        self.cur.execute(f"SAVEPOINT new_{i}")
-                        contact_id = self._create_contact(donor)
-                        if contact_id:
-                            new_contacts_created += 1
-                            donor_id = self._import_donor(donor, contact_id)
-                            if donor_id:
-                                donor_ids.append(donor_id)
-                                imported_count += 1
-                        self.cur.execute(f"RELEASE SAVEPOINT new_{i}")
-                    except Exception as e:
-                        logger.error(f"Error creating contact for {donor.customer_name}: {e}")
-                        self.cur.execute(f"ROLLBACK TO SAVEPOINT new_{i}")
-                        error_count += 1
+                if new_filtered:
+                    logger.info(f"\nCreating {len(new_filtered)} new contacts and donors...")
+                batch = self._import_in_chunks([(donor, None) for donor in new_filtered], 'new contact')
+                donor_ids.extend(batch['donor_ids'])
+                contact_ids.extend(batch['contact_ids'])
+                error_count += batch['errors']
+                new_contacts_created += batch['contacts_created']
 
                 # Also process organizations without matches
                 org_without_match = [item for item in self.results['org']
                                      if not item['match'].contact_id and self._filter_by_tier(item['donor'])]
                 skipped_tier += len([item for item in self.results['org'] if not item['match'].contact_id]) - len(org_without_match)
-                total_new_orgs = len(org_without_match)
-                if total_new_orgs > 0:
-                    logger.info(f"\nCreating {total_new_orgs} new organization contacts...")
-                for i, item in enumerate(org_without_match, 1):
-                    try:
-                        donor = item['donor']
-                        if i % 10 == 0 or i == 1:
-                            logger.info(f"  Creating org contact {i}/{total_new_orgs}: {donor.customer_name}")
-                        self.cur.execute(f"SAVEPOINT neworg_{i}")
-                        contact_id = self._create_contact(donor)
-                        if contact_id:
-                            new_contacts_created += 1
-                            donor_id = self._import_donor(donor, contact_id)
-                            if donor_id:
-                                donor_ids.append(donor_id)
-                                imported_count += 1
-                        self.cur.execute(f"RELEASE SAVEPOINT neworg_{i}")
-                    except Exception as e:
-                        logger.error(f"Error creating org contact for {item['donor'].customer_name}: {e}")
-                        self.cur.execute(f"ROLLBACK TO SAVEPOINT neworg_{i}")
-                        error_count += 1
+                if org_without_match:
+                    logger.info(f"\nCreating {len(org_without_match)} new organization contacts...")
+                batch = self._import_in_chunks(
+                    [(item['donor'], None) for item in org_without_match], 'new org contact'
+                )
+                donor_ids.extend(batch['donor_ids'])
+                contact_ids.extend(batch['contact_ids'])
+                error_count += batch['errors']
+                new_contacts_created += batch['contacts_created']
+
+            imported_count = len(donor_ids)
 
             # Commit all changes
             self.conn.commit()
             logger.info(f"\n✅ Committed {imported_count} donors to database")
 
-            # Update donor metrics
+            # Update donor metrics (one set-based pass over transactions)
             logger.info("\nUpdating donor metrics...")
-            for donor_id in donor_ids:
-                try:
-                    self.cur.execute("SELECT update_donor_metrics(%s)", (donor_id,))
-                except Exception as e:
-                    logger.warning(f"Could not update metrics for {donor_id}: {e}")
-
-            self.conn.commit()
-            logger.info(f"✅ Updated metrics for {len(donor_ids)} donors")
+            try:
+                updated = refresh_donor_metrics(self.cur, contact_ids)
+                self.conn.commit()
+                logger.info(f"✅ Updated metrics for {updated} donors")
+            except Exception as e:
+                self.conn.rollback()
+                logger.warning(f"Could not update donor metrics: {e}")
 
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Import failed, rolled back: {e}")
             raise
 
+        self.import_counts = {
+            'imported': imported_count,
+            'contacts_created': new_contacts_created,
+            'errors': error_count,
+        }
+
         logger.info("\n" + "=" * 80)
         logger.info("IMPORT COMPLETE")
         logger.info("=" * 80)
@@ -1107,6 +1133,60 @@ class QuickBooksDonorImporter:
             logger.info(f"  Skipped (new donors): {len(self.results['new'])}")
         logger.info(f"  Skipped (joint donors): {len(self.results['joint'])}")
 
+    def _chunks(self, items: List[Tuple[DonorRecord, Optional[str]]]) -> List[List[Tuple[DonorRecord, Optional[str]]]]:
+        """
+        Split (donor, contact_id) pairs into chunks of up to BATCH_SIZE.
+
+        A contact id never repeats within a chunk: a multi-row upsert cannot
+        touch the same row twice, and starting a new chunk keeps the
+        "later donor wins" behaviour of importing one donor at a time.
+        """
+        chunks = []
+        chunk = []
+        seen = set()
+        for donor, contact_id in items:
+            if len(chunk) >= BATCH_SIZE or (contact_id is not None and contact_id in seen):
+                chunks.append(chunk)
+                chunk = []
+                seen = set()
+            chunk.append((donor, contact_id))
+            if contact_id is not None:
+                seen.add(contact_id)
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _import_in_chunks(self, items: List[Tuple[DonorRecord, Optional[str]]], label: str) -> Dict:
+        """
+        Import (donor, contact_id) pairs chunk by chunk with bisecting error isolation.
+
+        Each chunk runs under one savepoint. If it fails, it is rolled back,
+        split in half and each half retried, down to single donors, so one bad
+        record never rolls back the others while clean chunks run at bulk speed.
+        contact_id None creates the contact first.
+
+        Returns:
+            {'donor_ids': [...], 'contact_ids': [...], 'contacts_created': int, 'errors': int}
+        """
+        totals = {'donor_ids': [], 'contact_ids': [], 'contacts_created': 0, 'errors': 0}
+        done = 0
+
+        for chunk in self._chunks(items):
+            results, rejected = bisect_write(self.cur, chunk, self._import_donor_batch, 'donor_chunk')
+            for imported, created in results:
+                totals['contact_ids'].extend(contact_id for contact_id, _ in imported)
+                totals['donor_ids'].extend(donor_id for _, donor_id in imported)
+                totals['contacts_created'] += created
+            for (donor, _), e in rejected:
+                logger.error(f"Error importing {label} {donor.customer_name}: {e}")
+            totals['errors'] += len(rejected)
+
+            done += len(chunk)
+            logger.info(f"  Processed {done}/{len(items)} ({label}): "
+                        f"{len(totals['donor_ids'])} imported, {totals['errors']} errors")
+
+        return totals
+
     def _create_contact(self, donor) -> Optional[str]:
         """
         Create a new contact from donor data.
@@ -1133,7 +1213,6 @@ class QuickBooksDonorImporter:
 
         # Generate placeholder email if none provided
         # Email is required in the contacts table
-        import uuid
         if donor.email:
             email = donor.email
         else:
@@ -1173,75 +1252,120 @@ class QuickBooksDonorImporter:
         """
         Import a single donor and their transactions.
 
+        Returns donor_id if successful.
+        """
+        imported, _ = self._import_donor_batch([(donor, contact_id)])
+        return imported[0][1] if imported else None
+
+    def _import_donor_batch(self, items: List[Tuple[DonorRecord, Optional[str]]]) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Import a chunk of donors and their transactions with multi-row statements.
+
         Includes enrichment logic:
         - Add phone if contact missing phone
         - Add address if contact missing address
         - Track enrichment in external_identities metadata
 
-        Returns donor_id if successful.
-        """
-        enriched_fields = []
+        Contact ids must be unique within the chunk (see _chunks). Pairs with
+        contact_id None get a new contact first.
 
-        # 1. Check contact for enrichment opportunities
+        Returns:
+            ([(contact_id, donor_id)] for imported donors, number of contacts created)
+        """
+        contacts_created = 0
+        pairs = []
+        for donor, contact_id in items:
+            if contact_id is None:
+                contact_id = self._create_contact(donor)
+                if not contact_id:
+                    pairs.append((donor, None))
+                    continue
+                contacts_created += 1
+            pairs.append((donor, str(contact_id)))
+
+        contact_ids = [contact_id for _, contact_id in pairs if contact_id]
+        if not contact_ids:
+            return [], contacts_created
+
+        # 1. Check contacts for enrichment opportunities
         self.cur.execute("""
-            SELECT phone, address_line_1, city, state, postal_code
-            FROM contacts WHERE id = %s
-        """, (contact_id,))
-        contact = self.cur.fetchone()
-
-        if contact:
-            # Enrich phone if missing
-            if not contact['phone'] and donor.phone:
-                self.cur.execute("""
-                    UPDATE contacts SET phone = %s, updated_at = now()
-                    WHERE id = %s
-                """, (donor.phone, contact_id))
-                enriched_fields.append('phone')
-
-            # Enrich address if missing
-            if not contact['address_line_1'] and donor.address.get('street'):
-                self.cur.execute("""
-                    UPDATE contacts SET
-                        address_line_1 = %s,
-                        city = %s,
-                        state = %s,
-                        postal_code = %s,
-                        updated_at = now()
-                    WHERE id = %s
-                """, (
-                    donor.address.get('street', ''),
-                    donor.address.get('city', ''),
-                    donor.address.get('state', ''),
-                    donor.address.get('zip', ''),
-                    contact_id
-                ))
-                enriched_fields.append('address')
-
-        # 2. Create external_identity with native QB Customer ID
-        metadata = {
-            'customer_name': donor.customer_name,
-            'campaign': donor.campaign,
-            'total_amount': donor.total_amount,
-            'transaction_count': donor.transaction_count,
-        }
-        if enriched_fields:
-            metadata['enriched_fields'] = enriched_fields
+            SELECT id, phone, address_line_1
+            FROM contacts WHERE id = ANY(%s::uuid[])
+        """, (contact_ids,))
+        contacts = {str(row['id']): row for row in self.cur.fetchall()}
+
+        phone_updates = []
+        address_updates = []
+        identity_rows = []
+        donor_rows = []
+
+        for donor, contact_id in pairs:
+            if not contact_id:
+                continue
 
-        self.cur.execute("""
+            enriched_fields = []
+            contact = contacts.get(contact_id)
+            if contact:
+                # Enrich phone if missing
+                if not contact['phone'] and donor.phone:
+                    phone_updates.append((contact_id, donor.phone))
+                    enriched_fields.append('phone')
+
+                # Enrich address if missing
+                if not contact['address_line_1'] and donor.address.get('street'):
+                    address_updates.append((
+                        contact_id,
+                        donor.address.get('street', ''),
+                        donor.address.get('city', ''),
+                        donor.address.get('state', ''),
+                        donor.address.get('zip', ''),
+                    ))
+                    enriched_fields.append('address')
+
+            metadata = {
+                'customer_name': donor.customer_name,
+                'campaign': donor.campaign,
+                'total_amount': donor.total_amount,
+                'transaction_count': donor.transaction_count,
+            }
+            if enriched_fields:
+                metadata['enriched_fields'] = enriched_fields
+
+            # Native QB Customer ID on both the identity and the donor
+            identity_rows.append((contact_id, donor.customer_id, Json(metadata)))
+            donor_rows.append((contact_id, donor.first_date, donor.last_date, donor.customer_id))
+
+        if phone_updates:
+            execute_values(self.cur, """
+                UPDATE contacts c SET phone = v.phone, updated_at = now()
+                FROM (VALUES %s) AS v(id, phone)
+                WHERE c.id = v.id::uuid
+            """, phone_updates, page_size=len(phone_updates))
+
+        if address_updates:
+            execute_values(self.cur, """
+                UPDATE contacts c SET
+                    address_line_1 = v.street,
+                    city = v.city,
+                    state = v.state,
+                    postal_code = v.zip,
+                    updated_at = now()
+                FROM (VALUES %s) AS v(id, street, city, state, zip)
+                WHERE c.id = v.id::uuid
+            """, address_updates, page_size=len(address_updates))
+
+        # 2. Create external_identities with native QB Customer ID
+        execute_values(self.cur, """
             INSERT INTO external_identities (contact_id, system, external_id, verified, metadata)
-            VALUES (%s, 'quickbooks', %s, true, %s)
+            VALUES %s
             ON CONFLICT (contact_id, system) DO UPDATE
-            SET external_id = EXCLUDED.external_id, verified = true, last_synced_at = now(), metadata = %s
-            RETURNING id
-        """, (
-            contact_id,
-            donor.customer_id,  # Use native QB Customer ID
-            Json(metadata),
-            Json(metadata)
-        ))
+            SET external_id = EXCLUDED.external_id, verified = true, last_synced_at = now(),
+                metadata = EXCLUDED.metadata
+        """, identity_rows, template="(%s::uuid, 'quickbooks', %s, true, %s)",
+            page_size=len(identity_rows))
 
-        # 3. Create or update donor record
-        self.cur.execute("""
+        # 3. Create or update donor records
+        donor_results = execute_values(self.cur, """
             INSERT INTO donors (
                 contact_id,
                 status,
@@ -1251,47 +1375,57 @@ class QuickBooksDonorImporter:
                 last_gift_date,
                 quickbooks_customer_id
             )
-            VALUES (%s, 'prospect', 0, 0, %s, %s, %s)
+            VALUES %s
             ON CONFLICT (contact_id) DO UPDATE
             SET
                 quickbooks_customer_id = EXCLUDED.quickbooks_customer_id,
                 updated_at = now()
-            RETURNING id
-        """, (
-            contact_id,
-            donor.first_date,
-            donor.last_date,
-            donor.customer_id  # Use native QB Customer ID
-        ))
+            RETURNING id, contact_id
+        """, donor_rows, template="(%s::uuid, 'prospect', 0, 0, %s, %s, %s)",
+            page_size=len(donor_rows), fetch=True)
+        donor_id_by_contact = {str(row['contact_id']): row['id'] for row in donor_results}
+
+        # 4. Import transactions
+        transaction_rows = []
+        transaction_meta = []
+        for donor, contact_id in pairs:
+            donor_id = donor_id_by_contact.get(contact_id) if contact_id else None
+            if not donor_id:
+                continue
 
-        result = self.cur.fetchone()
-        donor_id = result['id'] if result else None
-
-        if not donor_id:
-            return None
-
-        # 3. Import transactions
-        today = datetime.now().date()
-        ninety_days_ago = today - timedelta(days=90)
-
-        for trans in donor.transactions:
-            # Parse donation category
-            category = trans.get('category', '')
-            parts = category.split(':')
-            donation_category = parts[0] if parts else ''
-            donation_subcategory = parts[1] if len(parts) > 1 else ''
-
-            # Determine transaction type based on amount sign
-            amount = trans.get('amount', 0)
-            if amount < 0:
-                trans_type = 'refund'
-                amount = amount  # Keep negative for refunds
-            else:
-                trans_type = 'purchase'
+            for trans in donor.transactions:
+                # Parse donation category
+                category = trans.get('category', '')
+                parts = category.split(':')
+                donation_category = parts[0] if parts else ''
+                donation_subcategory = parts[1] if len(parts) > 1 else ''
+
+                # Determine transaction type based on amount sign (refunds stay negative)
+                amount = trans.get('amount', 0)
+                trans_type = 'refund' if amount < 0 else 'purchase'
+
+                # Ids are assigned here so acknowledgments never depend on
+                # the order RETURNING happens to produce rows in
+                transaction_id = str(uuid.uuid4())
+                transaction_rows.append((
+                    transaction_id,
+                    contact_id,
+                    trans_type,
+                    amount,
+                    trans.get('payment_method', ''),
+                    trans.get('date'),
+                    donation_category,
+                    donation_subcategory,
+                    trans.get('invoice_num', ''),
+                    donor.customer_name,
+                    trans.get('memo', '')
+                ))
+                transaction_meta.append((transaction_id, donor_id, donor, trans))
 
-            # Insert transaction
-            self.cur.execute("""
+        if transaction_rows:
+            execute_values(self.cur, """
                 INSERT INTO transactions (
+                    id,
                     contact_id,
                     transaction_type,
                     status,
@@ -1307,59 +1441,59 @@ class QuickBooksDonorImporter:
                     quickbooks_customer_name,
                     quickbooks_memo
                 )
-                VALUES (%s, %s, 'completed', %s, 'USD', %s, %s, true, 'quickbooks', %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
-                contact_id,
-                trans_type,
-                amount,
-                trans.get('payment_method', ''),
-                trans.get('date'),
-                donation_category,
-                donation_subcategory,
-                trans.get('invoice_num', ''),
-                donor.customer_name,
-                trans.get('memo', '')
-            ))
-
-            trans_result = self.cur.fetchone()
-            transaction_id = trans_result['id'] if trans_result else None
-
-            # 4. Create acknowledgment record
-            if transaction_id:
+                VALUES %s
+            """, transaction_rows,
+                template="(%s::uuid, %s::uuid, %s, 'completed', %s, 'USD', %s, %s, true, 'quickbooks', %s, %s, %s, %s, %s)",
+                page_size=len(transaction_rows))
+
+            # 5. Create acknowledgment records
+            today = datetime.now().date()
+            ninety_days_ago = today - timedelta(days=90)
+            ack_rows = []
+
+            for transaction_id, donor_id, donor, trans in transaction_meta:
                 trans_date = trans.get('date')
-                if trans_date:
-                    trans_date_only = trans_date.date() if hasattr(trans_date, 'date') else trans_date
-
-                    # Determine acknowledgment status
-                    if trans_date_only >= ninety_days_ago:
-                        ack_status = 'auto_queued'
-                    else:
-                        ack_status = 'skipped_old'
-
-                    self.cur.execute("""
-                        INSERT INTO donation_acknowledgments (
-                            transaction_id,
-                            donor_id,
-                            status,
-                            donor_name,
-                            donation_amount,
-                            donation_date,
-                            queued_at
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (transaction_id) DO NOTHING
-                    """, (
+                if not trans_date:
+                    continue
+                trans_date_only = trans_date.date() if hasattr(trans_date, 'date') else trans_date
+
+                # Determine acknowledgment status
+                if trans_date_only >= ninety_days_ago:
+                    ack_status = 'auto_queued'
+                else:
+                    ack_status = 'skipped_old'
+
+                ack_rows.append((
+                    transaction_id,
+                    donor_id,
+                    ack_status,
+                    donor.customer_name,
+                    trans.get('amount', 0),
+                    trans_date_only,
+                    datetime.now() if ack_status == 'auto_queued' else None
+                ))
+
+            if ack_rows:
+                execute_values(self.cur, """
+                    INSERT INTO donation_acknowledgments (
                         transaction_id,
                         donor_id,
-                        ack_status,
-                        donor.customer_name,
-                        trans.get('amount', 0),
-                        trans_date_only,
-                        datetime.now() if ack_status == 'auto_queued' else None
-                    ))
-
-        return donor_id
+                        status,
+                        donor_name,
+                        donation_amount,
+                        donation_date,
+                        queued_at
+                    )
+                    VALUES %s
+                    ON CONFLICT (transaction_id) DO NOTHING
+                """, ack_rows, page_size=len(ack_rows))
+
+        imported = [
+            (contact_id, donor_id_by_contact[contact_id])
+            for _, contact_id in pairs
+            if contact_id and donor_id_by_contact.get(contact_id)
+        ]
+        return imported, contacts_created
 
 
 # ============================================================================
@@ -3,12 +3,11 @@
 Import SmartyStreets validation results into the database
 """
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import csv
 import logging
 from datetime import datetime
-from db_config import get_database_url
+from db_config import acquire_connection, release_connection, print_pool_stats
 
 # Configure logging
 logging.basicConfig(
@@ -21,8 +20,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-DATABASE_URL = get_database_url()
-
 def read_validation_results(filepath):
     """Read SmartyStreets validation results"""
     results = []
@@ -64,8 +61,8 @@ def main():
     logger.info(f"  ✓ Loaded {len(contact_mapping)} contact mappings")
     logger.info("")
 
-    # Connect to database
-    conn = psycopg2.connect(DATABASE_URL)
+    # Borrow a connection from the shared pool
+    conn = acquire_connection()
     logger.info("✅ Connected to database")
     logger.info("")
 
@@ -191,7 +188,8 @@ def main():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        release_connection(conn)
+        print_pool_stats()
 
     logger.info("✅ Import complete!")
     logger.info("")
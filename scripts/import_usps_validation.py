@@ -10,18 +10,15 @@ delivery point validation status.
 import csv
 import os
 import sys
-from datetime import datetime
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
-# Database connection details
-DB_URL = "postgres://***REMOVED***@***REMOVED***:6543/postgres"
-DB_PASSWORD = os.getenv("DB_PASSWORD")  # SECURITY: No hardcoded credentials
+from contact_match_index import ContactMatchIndex
+from usps_validation_batch import print_failures, write_usps_validations
+from db_config import acquire_connection, release_connection, print_pool_stats
 
 def get_db_connection():
-    """Create database connection."""
-    conn = psycopg2.connect(DB_URL, password=DB_PASSWORD)
-    return conn
+    """Borrow a connection from the shared pool."""
+    return acquire_connection()
 
 def normalize_name(name):
     """Normalize name for matching."""
@@ -61,121 +58,23 @@ def parse_csv_row(row):
         'last_line': row.get('[last_line]', ''),
     }
 
-def find_contact(cursor, data):
+def find_contact(index, data):
     """
-    Find a contact in the database by matching on name and address.
+    Find a contact id by matching on name and address.
 
-    Strategy:
-    1. Try exact match on email (if we had it)
-    2. Try match on first_name, last_name, and address_line_1
-    3. Try match on business_name and address_line_1
-    4. Try match on full_name and address_line_1
+    Resolved entirely in memory against a warmed ContactMatchIndex:
+    1. first_name, last_name and original address_line_1
+    2. business name and original address_line_1
+    3. first_name, last_name and the standardized delivery line (against
+       address_line_1 or billing_usps_delivery_line_1)
     """
-
-    # Strategy 1: Match on first_name, last_name, and address
-    if data['first_name'] and data['last_name'] and data['original_address_line_1']:
-        cursor.execute("""
-            SELECT id, email, first_name, last_name,
-                   address_line_1, city, state, postal_code
-            FROM contacts
-            WHERE LOWER(first_name) = LOWER(%s)
-              AND LOWER(last_name) = LOWER(%s)
-              AND LOWER(address_line_1) = LOWER(%s)
-            LIMIT 1
-        """, (data['first_name'], data['last_name'], data['original_address_line_1']))
-
-        result = cursor.fetchone()
-        if result:
-            return result
-
-    # Strategy 2: Match on business name and address
-    if data['business_name'] and data['original_address_line_1']:
-        cursor.execute("""
-            SELECT id, email, first_name, last_name,
-                   address_line_1, city, state, postal_code
-            FROM contacts
-            WHERE LOWER(paypal_business_name) = LOWER(%s)
-              AND LOWER(address_line_1) = LOWER(%s)
-            LIMIT 1
-        """, (data['business_name'], data['original_address_line_1']))
-
-        result = cursor.fetchone()
-        if result:
-            return result
-
-    # Strategy 3: Try matching on standardized address if original didn't work
-    if data['first_name'] and data['last_name'] and data['delivery_line_1']:
-        cursor.execute("""
-            SELECT id, email, first_name, last_name,
-                   address_line_1, city, state, postal_code
-            FROM contacts
-            WHERE LOWER(first_name) = LOWER(%s)
-              AND LOWER(last_name) = LOWER(%s)
-              AND (
-                LOWER(address_line_1) = LOWER(%s)
-                OR LOWER(billing_usps_delivery_line_1) = LOWER(%s)
-              )
-            LIMIT 1
-        """, (data['first_name'], data['last_name'],
-              data['delivery_line_1'], data['delivery_line_1']))
-
-        result = cursor.fetchone()
-        if result:
-            return result
-
-    return None
-
-def update_contact_usps_data(cursor, contact_id, data):
-    """Update contact with USPS validation data."""
-
-    # Parse numeric values
-    latitude = None
-    longitude = None
-    try:
-        if data['latitude']:
-            latitude = float(data['latitude'])
-        if data['longitude']:
-            longitude = float(data['longitude'])
-    except (ValueError, TypeError):
-        pass
-
-    # Update billing address USPS validation fields
-    cursor.execute("""
-        UPDATE contacts
-        SET
-            billing_usps_validated_at = %s,
-            billing_usps_dpv_match_code = %s,
-            billing_usps_precision = %s,
-            billing_usps_delivery_line_1 = %s,
-            billing_usps_delivery_line_2 = %s,
-            billing_usps_last_line = %s,
-            billing_usps_latitude = %s,
-            billing_usps_longitude = %s,
-            billing_usps_county = %s,
-            billing_usps_rdi = %s,
-            billing_usps_footnotes = %s,
-            billing_usps_vacant = %s,
-            billing_usps_active = %s,
-            billing_address_verified = %s,
-            updated_at = NOW()
-        WHERE id = %s
-    """, (
-        datetime.now(),  # validated_at
-        data['dpv_match_code'],
-        data['precision'],
-        data['delivery_line_1'],
-        data['delivery_line_2'] if data['delivery_line_2'] else None,
-        data['last_line'],
-        latitude,
-        longitude,
-        data['county_name'] if data['county_name'] else None,
-        data['rdi'] if data['rdi'] else None,
-        data['notes'] if data['notes'] else data['summary'],
-        data['dpv_vacant'],
-        data['active'],
-        data['dpv_match_code'] == 'Y',  # Set billing_address_verified based on match
-        contact_id
-    ))
+    return index.find(
+        first_name=data['first_name'],
+        last_name=data['last_name'],
+        business_name=data['business_name'],
+        address_line_1=data['original_address_line_1'],
+        delivery_line_1=data['delivery_line_1'],
+    )
 
 def main():
     """Main import function."""
@@ -207,9 +106,15 @@ def main():
     }
 
     unmatched_contacts = []
+    updates = []
 
     try:
-        # Read and process CSV
+        # Load match keys for every contact in one scan
+        print("Loading contact match index...")
+        index = ContactMatchIndex()
+        index.warm(conn)
+
+        # Read and match CSV rows in memory
         with open(csv_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
 
@@ -225,23 +130,11 @@ def main():
                     continue
 
                 # Find matching contact
-                contact = find_contact(cursor, data)
+                contact_id = find_contact(index, data)
 
-                if contact:
+                if contact_id:
                     stats['matched'] += 1
-                    try:
-                        # Update contact with USPS data
-                        update_contact_usps_data(cursor, contact['id'], data)
-                        stats['updated'] += 1
-
-                        if stats['updated'] % 10 == 0:
-                            print(f"Updated {stats['updated']} contacts...")
-                            conn.commit()  # Commit periodically
-
-                    except Exception as e:
-                        stats['errors'] += 1
-                        print(f"Error updating contact {contact['email']}: {e}")
-                        conn.rollback()
+                    updates.append((contact_id, data))
                 else:
                     stats['not_matched'] += 1
                     unmatched_contacts.append({
@@ -249,8 +142,20 @@ def main():
                         'address': data['original_address_line_1']
                     })
 
-        # Final commit
-        conn.commit()
+        # Write every matched row in one statement
+        print(f"Writing {len(updates)} USPS validations...")
+        try:
+            updated, failed = write_usps_validations(cursor, updates, address_type='billing', key_column='id')
+            conn.commit()
+            stats['updated'] = len(updated)
+            stats['errors'] = len(failed)
+            print_failures(failed)
+        except Exception as e:
+            stats['errors'] = len(updates)
+            print(f"Error writing USPS validations: {e}")
+            conn.rollback()
+
+        index.print_report()
 
         # Print statistics
         print("\n" + "="*60)
@@ -281,7 +186,8 @@ def main():
 
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
+        print_pool_stats()
 
 if __name__ == '__main__':
     main()
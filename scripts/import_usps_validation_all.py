@@ -15,18 +15,13 @@ Safety features:
 import csv
 import os
 import sys
-from datetime import datetime
-import psycopg2
 from psycopg2.extras import RealDictCursor
-from db_config import get_database_url
-
-# Database connection
-DB_URL = get_database_url()
+from db_config import acquire_connection, release_connection, print_pool_stats
+from usps_validation_batch import print_failures, write_usps_validations
 
 def get_db_connection():
-    """Create database connection."""
-    conn = psycopg2.connect(DB_URL)
-    return conn
+    """Borrow a connection from the shared pool."""
+    return acquire_connection()
 
 def read_original_list(filepath):
     """Read the original address CSV (which has emails and address_type)."""
@@ -86,88 +81,6 @@ def read_validation_output(filepath):
             })
     return validations
 
-def update_billing_usps_data(cursor, email, validation_data):
-    """Update contact BILLING address with USPS validation data."""
-    cursor.execute("""
-        UPDATE contacts
-        SET
-            billing_usps_validated_at = %s,
-            billing_usps_dpv_match_code = %s,
-            billing_usps_precision = %s,
-            billing_usps_delivery_line_1 = %s,
-            billing_usps_delivery_line_2 = %s,
-            billing_usps_last_line = %s,
-            billing_usps_latitude = %s,
-            billing_usps_longitude = %s,
-            billing_usps_county = %s,
-            billing_usps_rdi = %s,
-            billing_usps_footnotes = %s,
-            billing_usps_vacant = %s,
-            billing_usps_active = %s,
-            billing_address_verified = %s,
-            updated_at = NOW()
-        WHERE email = %s
-        RETURNING id, email, first_name, last_name
-    """, (
-        datetime.now(),
-        validation_data['dpv_match_code'] or None,
-        validation_data['precision'] or None,
-        validation_data['delivery_line_1'] or None,
-        validation_data['delivery_line_2'] or None,
-        validation_data['last_line'] or None,
-        validation_data['latitude'],
-        validation_data['longitude'],
-        validation_data['county_name'] or None,
-        validation_data['rdi'] or None,
-        validation_data['notes'] or validation_data['summary'],
-        validation_data['dpv_vacant'],
-        validation_data['active'],
-        validation_data['dpv_match_code'] == 'Y',
-        email
-    ))
-    return cursor.fetchone()
-
-def update_shipping_usps_data(cursor, email, validation_data):
-    """Update contact SHIPPING address with USPS validation data."""
-    cursor.execute("""
-        UPDATE contacts
-        SET
-            shipping_usps_validated_at = %s,
-            shipping_usps_dpv_match_code = %s,
-            shipping_usps_precision = %s,
-            shipping_usps_delivery_line_1 = %s,
-            shipping_usps_delivery_line_2 = %s,
-            shipping_usps_last_line = %s,
-            shipping_usps_latitude = %s,
-            shipping_usps_longitude = %s,
-            shipping_usps_county = %s,
-            shipping_usps_rdi = %s,
-            shipping_usps_footnotes = %s,
-            shipping_usps_vacant = %s,
-            shipping_usps_active = %s,
-            shipping_address_verified = %s,
-            updated_at = NOW()
-        WHERE email = %s
-        RETURNING id, email, first_name, last_name
-    """, (
-        datetime.now(),
-        validation_data['dpv_match_code'] or None,
-        validation_data['precision'] or None,
-        validation_data['delivery_line_1'] or None,
-        validation_data['delivery_line_2'] or None,
-        validation_data['last_line'] or None,
-        validation_data['latitude'],
-        validation_data['longitude'],
-        validation_data['county_name'] or None,
-        validation_data['rdi'] or None,
-        validation_data['notes'] or validation_data['summary'],
-        validation_data['dpv_vacant'],
-        validation_data['active'],
-        validation_data['dpv_match_code'] == 'Y',
-        email
-    ))
-    return cursor.fetchone()
-
 def main():
     """Main import function."""
 
@@ -240,6 +153,7 @@ def main():
     print("Processing validations...")
     print("-" * 70)
 
+    updates = {'billing': [], 'shipping': []}
     for validation in validations:
         stats['total'] += 1
         sequence = validation['sequence']
@@ -264,32 +178,23 @@ def main():
             continue
 
         stats['matched'] += 1
-
-        try:
-            # Update based on address type
-            if original['address_type'] == 'billing':
-                result = update_billing_usps_data(cursor, original['email'], validation)
-                if result:
-                    stats['updated_billing'] += 1
-            else:  # shipping
-                result = update_shipping_usps_data(cursor, original['email'], validation)
-                if result:
-                    stats['updated_shipping'] += 1
-
-            # Print progress every 50 records
-            if (stats['updated_billing'] + stats['updated_shipping']) % 50 == 0:
-                total_updated = stats['updated_billing'] + stats['updated_shipping']
-                print(f"  ✓ Updated {total_updated} contacts...")
-                print(f"     Billing: {stats['updated_billing']} | Shipping: {stats['updated_shipping']}")
-                conn.commit()
-
-        except Exception as e:
-            stats['errors'] += 1
-            print(f"  ✗ Error updating {original['email']}: {e}")
-            conn.rollback()
-
-    # Final commit
-    conn.commit()
+        address_type = 'billing' if original['address_type'] == 'billing' else 'shipping'
+        updates[address_type].append((original['email'], validation))
+
+    # One statement per address type, keyed by email
+    try:
+        for address_type, rows in updates.items():
+            print(f"  Writing {len(rows)} {address_type} USPS validations...")
+            updated, failed = write_usps_validations(cursor, rows, address_type=address_type, key_column='email')
+            stats[f'updated_{address_type}'] = len(updated)
+            stats['errors'] += len(failed)
+            print_failures(failed)
+        conn.commit()
+    except Exception as e:
+        stats['errors'] += sum(len(rows) for rows in updates.values())
+        stats['updated_billing'] = stats['updated_shipping'] = 0
+        print(f"  ✗ Error writing USPS validations: {e}")
+        conn.rollback()
 
     # Print final statistics
     print()
@@ -328,7 +233,8 @@ def main():
     print()
 
     cursor.close()
-    conn.close()
+    release_connection(conn)
+    print_pool_stats()
 
     print("\n✓ Import completed successfully!")
     print()
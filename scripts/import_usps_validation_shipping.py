@@ -14,18 +14,14 @@ This eliminates any risk of updating the wrong contact.
 import csv
 import os
 import sys
-from datetime import datetime
-import psycopg2
 from psycopg2.extras import RealDictCursor
-from db_config import get_database_url
 
-# Database connection details
-DB_URL = get_database_url()
+from usps_validation_batch import print_failures, write_usps_validations
+from db_config import acquire_connection, release_connection, print_pool_stats
 
 def get_db_connection():
-    """Create database connection."""
-    conn = psycopg2.connect(DB_URL)
-    return conn
+    """Borrow a connection from the shared pool."""
+    return acquire_connection()
 
 def read_original_shipping_list(filepath):
     """Read the original shipping address CSV (which has emails)."""
@@ -84,49 +80,6 @@ def read_validation_output(filepath):
             })
     return validations
 
-def update_contact_usps_data(cursor, email, validation_data):
-    """Update contact SHIPPING address with USPS validation data using email as the key."""
-
-    cursor.execute("""
-        UPDATE contacts
-        SET
-            shipping_usps_validated_at = %s,
-            shipping_usps_dpv_match_code = %s,
-            shipping_usps_precision = %s,
-            shipping_usps_delivery_line_1 = %s,
-            shipping_usps_delivery_line_2 = %s,
-            shipping_usps_last_line = %s,
-            shipping_usps_latitude = %s,
-            shipping_usps_longitude = %s,
-            shipping_usps_county = %s,
-            shipping_usps_rdi = %s,
-            shipping_usps_footnotes = %s,
-            shipping_usps_vacant = %s,
-            shipping_usps_active = %s,
-            shipping_address_verified = %s,
-            updated_at = NOW()
-        WHERE email = %s
-        RETURNING id, email, first_name, last_name
-    """, (
-        datetime.now(),  # validated_at
-        validation_data['dpv_match_code'] or None,
-        validation_data['precision'] or None,
-        validation_data['delivery_line_1'] or None,
-        validation_data['delivery_line_2'] or None,
-        validation_data['last_line'] or None,
-        validation_data['latitude'],
-        validation_data['longitude'],
-        validation_data['county_name'] or None,
-        validation_data['rdi'] or None,
-        validation_data['notes'] or validation_data['summary'],
-        validation_data['dpv_vacant'],
-        validation_data['active'],
-        validation_data['dpv_match_code'] == 'Y',  # Set verified based on match
-        email
-    ))
-
-    return cursor.fetchone()
-
 def main():
     """Main import function."""
 
@@ -194,6 +147,7 @@ def main():
     print("Processing validations...")
     print("-" * 70)
 
+    updates = []
     for validation in validations:
         stats['total'] += 1
         sequence = validation['sequence']
@@ -218,29 +172,25 @@ def main():
             continue
 
         stats['matched'] += 1
-
-        try:
-            # Update the contact by email
-            result = update_contact_usps_data(cursor, original['email'], validation)
-
-            if result:
-                stats['updated'] += 1
-
-                # Print progress every 25 records
-                if stats['updated'] % 25 == 0:
-                    print(f"  ✓ Updated {stats['updated']} contacts...")
-                    conn.commit()
-            else:
+        updates.append((original['email'], validation))
+
+    # Write every matched row in one statement, keyed by email
+    print(f"  Writing {len(updates)} USPS validations...")
+    try:
+        updated, failed = write_usps_validations(cursor, updates, address_type='shipping', key_column='email')
+        conn.commit()
+        stats['updated'] = len(updated)
+        stats['errors'] += len(failed)
+        print_failures(failed)
+        written = set(updated) | {email for email, _ in failed}
+        for email in dict.fromkeys(email for email, _ in updates):
+            if email not in written:
                 stats['errors'] += 1
-                print(f"  ✗ Contact not found for email: {original['email']}")
-
-        except Exception as e:
-            stats['errors'] += 1
-            print(f"  ✗ Error updating {original['email']}: {e}")
-            conn.rollback()
-
-    # Final commit
-    conn.commit()
+                print(f"  ✗ Contact not found for email: {email}")
+    except Exception as e:
+        stats['errors'] += len(updates)
+        print(f"  ✗ Error writing USPS validations: {e}")
+        conn.rollback()
 
     # Print final statistics
     print()
@@ -298,7 +248,8 @@ def main():
         print(f"  Precision:  {row['shipping_usps_precision']} | Match: {row['shipping_usps_dpv_match_code']} | County: {row['shipping_usps_county']}")
 
     cursor.close()
-    conn.close()
+    release_connection(conn)
+    print_pool_stats()
 
     print("\n✓ Import completed successfully!")
 
@@ -0,0 +1,36 @@
+"""
+Watermarks for incremental maintenance jobs (job_watermarks table,
+migration 20251203000001).
+
+A job records the start time of its last successful live run and on the
+next run only processes rows changed after it. Read the start time with
+SELECT NOW() in the same transaction as the job's writes, so rows the job
+itself touches are not picked up again.
+
+Usage:
+    from job_watermarks import get_watermark, set_watermark
+
+    watermark = get_watermark(cur, 'refresh_address_scores')
+    ...
+    set_watermark(cur, 'refresh_address_scores', started_at)
+    conn.commit()
+"""
+
+
+def get_watermark(cur, job_name):
+    """Start time of the job's last live run, or None"""
+    cur.execute("SELECT watermark FROM job_watermarks WHERE job_name = %s", (job_name,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return row['watermark'] if isinstance(row, dict) else row[0]
+
+
+def set_watermark(cur, job_name, watermark):
+    """Record a completed live run (caller commits)"""
+    cur.execute("""
+        INSERT INTO job_watermarks (job_name, watermark, updated_at)
+        VALUES (%s, %s, NOW())
+        ON CONFLICT (job_name) DO UPDATE
+        SET watermark = EXCLUDED.watermark, updated_at = NOW()
+    """, (job_name, watermark))
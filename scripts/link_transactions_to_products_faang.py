@@ -30,6 +30,14 @@ Usage:
     # Execute with batch size control
     python3 link_transactions_to_products_faang.py --execute --batch-size 100
 
+Performance:
+    Unlinked transactions are fetched with keyset pagination (ORDER BY id,
+    id > last seen) in pages of FETCH_PAGE_SIZE, so no single response is
+    unbounded. Each update batch is one call to the
+    link_transactions_to_products(jsonb) RPC (migration 20251202000001),
+    which applies the whole batch with one UPDATE ... FROM instead of one
+    REST request per transaction.
+
 Author: Claude Code (Anthropic)
 Date: 2025-11-14
 """
@@ -51,6 +59,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per fetch page (PostgREST caps responses at 1000 rows by default)
+FETCH_PAGE_SIZE = 1000
+
+# RPC that applies one batch of links (migration 20251202000001)
+LINK_RPC = 'link_transactions_to_products'
+
 
 @dataclass
 class MigrationMetrics:
@@ -130,7 +144,8 @@ class TransactionProductLinker:
         """
         Fetch transactions with NULL product_id that have offer_id
 
-        FAANG Standard: Efficient query with proper filtering
+        FAANG Standard: Keyset pagination (id > last seen id), so every page
+        is an index range scan and no response exceeds FETCH_PAGE_SIZE rows
 
         Args:
             limit: Optional limit for testing/preview
@@ -141,16 +156,32 @@ class TransactionProductLinker:
         logger.info("Fetching unlinked transactions...")
 
         try:
-            query = self.supabase.table('transactions').select(
-                'id, offer_id, transaction_type, amount, transaction_date'
-            ).is_('product_id', 'null').not_.is_('offer_id', 'null')
+            transactions = []
+            last_id = None
 
-            if limit:
-                query = query.limit(limit)
+            while True:
+                page_size = FETCH_PAGE_SIZE
+                if limit:
+                    page_size = min(page_size, limit - len(transactions))
+                    if page_size <= 0:
+                        break
+
+                query = self.supabase.table('transactions').select(
+                    'id, offer_id, transaction_type, amount, transaction_date'
+                ).is_('product_id', 'null').not_.is_('offer_id', 'null')
 
-            response = query.execute()
-            logger.info(f"✓ Found {len(response.data):,} unlinked transactions")
-            return response.data
+                if last_id:
+                    query = query.gt('id', last_id)
+
+                page = query.order('id').limit(page_size).execute().data
+                transactions.extend(page)
+
+                if len(page) < page_size:
+                    break
+                last_id = page[-1]['id']
+
+            logger.info(f"✓ Found {len(transactions):,} unlinked transactions")
+            return transactions
 
         except Exception as e:
             logger.error(f"✗ Failed to fetch transactions: {e}")
@@ -220,7 +251,12 @@ class TransactionProductLinker:
         """
         Update transactions in batches for performance
 
-        FAANG Standard: Batch operations with error handling
+        FAANG Standard: Batch operations with error handling. Each batch is a
+        single RPC round trip (one UPDATE ... FROM on the server); a failed
+        batch is counted as failed as a whole and the run continues. Rows the
+        RPC leaves alone because another run linked them since they were
+        fetched are counted as already linked, so successful + already linked
+        + failed always equals the number of matches.
 
         Args:
             matches: List of (transaction_id, product_id) tuples
@@ -235,6 +271,7 @@ class TransactionProductLinker:
         logger.info(f"Updating {len(matches):,} transactions in batches of {self.batch_size}...")
 
         successful = 0
+        already_linked = 0
         failed = 0
 
         # Process in batches to avoid overwhelming the database
@@ -245,21 +282,25 @@ class TransactionProductLinker:
 
             logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} records)...")
 
-            for txn_id, product_id in batch:
-                try:
-                    self.supabase.table('transactions').update(
-                        {'product_id': product_id}
-                    ).eq('id', txn_id).execute()
+            links = [{'id': txn_id, 'product_id': product_id} for txn_id, product_id in batch]
+
+            try:
+                response = self.supabase.rpc(LINK_RPC, {'p_links': links}).execute()
 
-                    successful += 1
+                # Already-linked transactions are left alone by the RPC
+                linked = response.data or 0
+                successful += linked
+                already_linked += len(batch) - linked
 
-                except Exception as e:
-                    failed += 1
-                    logger.error(f"✗ Failed to update transaction {txn_id}: {e}")
+            except Exception as e:
+                failed += len(batch)
+                logger.error(f"✗ Failed to update batch {batch_num} ({len(batch)} transactions): {e}")
 
-            logger.info(f"✓ Batch {batch_num} complete: {successful} successful, {failed} failed")
+            logger.info(f"✓ Batch {batch_num} complete: {successful} successful, "
+                        f"{already_linked} already linked, {failed} failed")
 
         self.metrics.successful_updates = successful
+        self.metrics.already_linked = already_linked
         self.metrics.failed_updates = failed
 
         return successful
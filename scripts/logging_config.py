@@ -1,11 +1,39 @@
 """
 Logging configuration for Kajabi import system.
 
-Provides structured logging with correlation IDs for tracing.
+Provides structured logging with correlation IDs for tracing, and optional
+run instrumentation:
+
+  - span(name): context manager/decorator timing a stage of a run
+  - instrument_cursor(cur): psycopg2 cursor wrapper counting statements,
+    rows affected and bytes fetched, attributed to the active spans, and
+    tallying repeated statements (N+1 patterns show up at the top)
+  - finish_instrumentation(logger): JSON summary plus one structlog line
+
+Instrumentation is off unless INSTRUMENTATION=true or
+enable_instrumentation() is called. While off, span() only checks a global
+and instrument_cursor() returns the cursor unchanged.
+
+Usage:
+    from logging_config import enable_instrumentation, finish_instrumentation, instrument_cursor, span
+
+    enable_instrumentation('paypal_import')
+    cur = instrument_cursor(conn.cursor())
+    with span('load_products'):
+        cur.execute("SELECT ...")
+    finish_instrumentation(logger, path='instrumentation.json')
 """
+import json
 import logging
+import os
+import re
 import sys
-from typing import Optional
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict, List, Optional
 import structlog
 
 
@@ -74,3 +102,282 @@ def get_logger(name: str, trace_id: Optional[str] = None) -> structlog.BoundLogg
     if trace_id:
         logger = logger.bind(trace_id=trace_id)
     return logger
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+# Statements listed in the summary, most executed first
+TOP_STATEMENTS = 10
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUES_LIST_RE = re.compile(r"\([^()]*\)(?:\s*,\s*\([^()]*\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: Any) -> str:
+    """Statement shape for grouping: literals become ?, multi-row VALUES collapse."""
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    elif not isinstance(sql, str):
+        sql = str(sql)  # psycopg2.sql.Composed
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    sql = _LITERAL_RE.sub('?', sql)
+    return _VALUES_LIST_RE.sub('(...)', sql)[:300]
+
+
+def _value_bytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    return len(str(value))
+
+
+def _row_bytes(row: Any) -> int:
+    """Approximate wire size of a fetched row (text length of its values)."""
+    values = row.values() if isinstance(row, dict) else row
+    return sum(_value_bytes(value) for value in values)
+
+
+class _Run:
+    """Counters for one instrumented run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.statement_counts: Counter = Counter()
+        self.statement_ms: Counter = Counter()
+        self.totals = {'statements': 0, 'rows_affected': 0, 'rows_fetched': 0, 'bytes_fetched': 0}
+
+    def active(self) -> List[str]:
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def span_stats(self, name: str) -> Dict[str, float]:
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = {
+                'calls': 0, 'wall_ms': 0.0, 'statements': 0,
+                'rows_affected': 0, 'rows_fetched': 0, 'bytes_fetched': 0,
+            }
+        return stats
+
+    def add(self, **counts: int) -> None:
+        """Add to the run totals and to every active span (outer spans include inner ones)."""
+        with self.lock:
+            for key, value in counts.items():
+                self.totals[key] += value
+                for name in self.active():
+                    self.spans[name][key] += value
+
+    def record_statement(self, sql: Any, elapsed_ms: float, rows_affected: int) -> None:
+        shape = normalize_sql(sql)
+        with self.lock:
+            self.statement_counts[shape] += 1
+            self.statement_ms[shape] += elapsed_ms
+        self.add(statements=1, rows_affected=max(rows_affected, 0))
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'run': self.name,
+                'started_at': self.started_at.isoformat(),
+                'wall_ms': round((time.perf_counter() - self.start) * 1000, 1),
+                **self.totals,
+                'spans': {
+                    name: {**stats, 'wall_ms': round(stats['wall_ms'], 1)}
+                    for name, stats in self.spans.items()
+                },
+                'top_statements': [
+                    {'sql': sql, 'count': count, 'total_ms': round(self.statement_ms[sql], 1)}
+                    for sql, count in self.statement_counts.most_common(TOP_STATEMENTS)
+                ],
+            }
+
+
+_run: Optional[_Run] = None
+
+
+def enable_instrumentation(name: str = 'run') -> None:
+    """Start collecting spans and statement counters (resets any previous run)."""
+    global _run
+    _run = _Run(name)
+
+
+def instrumentation_enabled() -> bool:
+    return _run is not None
+
+
+class span:
+    """
+    Time a stage of the run; usable as a context manager or decorator.
+
+        with span('load_contacts'):
+            ...
+
+        @span('process_chunk')
+        def process_chunk(...):
+            ...
+
+    Statements run through instrument_cursor() while a span is open count
+    towards it (and towards any span it is nested in).
+    """
+    __slots__ = ('name', '_run', '_start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._run = None
+
+    def __enter__(self) -> 'span':
+        run = _run
+        if run is None:
+            return self
+        self._run = run
+        with run.lock:
+            run.span_stats(self.name)['calls'] += 1
+        run.active().append(self.name)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        run = self._run
+        if run is None:
+            return
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        run.active().pop()
+        with run.lock:
+            run.spans[self.name]['wall_ms'] += elapsed_ms
+        self._run = None
+
+    def __call__(self, func):
+        name = self.name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _run is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class InstrumentedCursor:
+    """Cursor proxy recording statements, rows affected and bytes fetched."""
+
+    def __init__(self, cursor, run: _Run):
+        self._cursor = cursor
+        self._run = run
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __enter__(self) -> 'InstrumentedCursor':
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> Any:
+        return self._cursor.__exit__(*exc)
+
+    def _timed(self, method, sql, *args):
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            # rowcount is rows returned for SELECTs; only count writes
+            affected = self._cursor.rowcount if self._cursor.description is None else 0
+            self._run.record_statement(sql, elapsed_ms, affected)
+
+    def execute(self, sql, vars=None):
+        return self._timed(self._cursor.execute, sql, vars)
+
+    def executemany(self, sql, vars_list):
+        return self._timed(self._cursor.executemany, sql, vars_list)
+
+    def callproc(self, procname, parameters=None):
+        return self._timed(self._cursor.callproc, procname, parameters)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._timed(self._cursor.copy_expert, sql, file, size)
+
+    def _fetched(self, rows):
+        self._run.add(rows_fetched=len(rows), bytes_fetched=sum(_row_bytes(row) for row in rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._fetched([row])
+        return row
+
+    def fetchmany(self, size=None):
+        return self._fetched(self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany())
+
+    def fetchall(self):
+        return self._fetched(self._cursor.fetchall())
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._fetched([row])
+            yield row
+
+
+def instrument_cursor(cursor):
+    """Wrap a psycopg2 cursor when instrumentation is on; otherwise return it as is."""
+    run = _run
+    if run is None:
+        return cursor
+    return InstrumentedCursor(cursor, run)
+
+
+def instrumentation_summary() -> Optional[Dict[str, Any]]:
+    """Counters so far (None when instrumentation is off)."""
+    return _run.summary() if _run is not None else None
+
+
+def finish_instrumentation(logger: Optional[Any] = None, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    End the run: log one summary line and write the JSON summary.
+
+    Args:
+        logger: structlog logger for the summary line (default: this module's)
+        path: JSON output path (default: INSTRUMENTATION_OUTPUT, if set)
+
+    Returns:
+        The summary dict, or None when instrumentation is off
+    """
+    global _run
+    summary = instrumentation_summary()
+    if summary is None:
+        return None
+    _run = None
+
+    (logger or get_logger(__name__)).info(
+        "instrumentation_summary",
+        run=summary['run'],
+        wall_ms=summary['wall_ms'],
+        statements=summary['statements'],
+        rows_affected=summary['rows_affected'],
+        bytes_fetched=summary['bytes_fetched'],
+        spans={name: stats['wall_ms'] for name, stats in summary['spans'].items()},
+        top_statement=summary['top_statements'][0] if summary['top_statements'] else None,
+    )
+
+    path = path or os.getenv('INSTRUMENTATION_OUTPUT')
+    if path:
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    return summary
+
+
+if os.getenv('INSTRUMENTATION', 'false').lower() in ('true', '1', 'yes'):
+    enable_instrumentation(os.path.basename(sys.argv[0]) or 'run')
@@ -3,12 +3,21 @@
 FAANG-Quality Duplicate Contact Merging
 
 Safely merges HIGH confidence duplicate contacts:
+- Resolves overlapping groups transitively (union-find)
 - Selects primary contact (oldest, most complete data)
 - Migrates all emails to contact_emails table
 - Migrates transaction history (if any)
 - Soft deletes duplicate contacts
 - Atomic transactions with rollback
 
+MERGE ENGINE:
+All groups are planned in memory from one contact query, then applied with
+a fixed number of set-based statements regardless of group count:
+  1. duplicate -> primary mapping loaded into a temp table (merge_map)
+  2. contact_emails INSERT ... SELECT ... ON CONFLICT DO NOTHING
+  3. one transactions UPDATE ... FROM merge_map
+  4. one contacts soft-delete UPDATE ... FROM merge_map
+
 SAFETY FEATURES:
 - Dry-run mode (default)
 - Before/after verification
@@ -30,29 +39,49 @@ USAGE:
     # Merge all HIGH confidence groups
     python3 scripts/merge_duplicate_contacts.py --execute
 
+    # Also merge MERGE-recommended groups from enhanced_duplicate_detection.py
+    # (groups sharing a contact are combined into one)
+    python3 scripts/merge_duplicate_contacts.py --groups-csv /tmp/duplicates.csv --execute
+
 Author: Claude Code (FAANG-Quality Engineering)
 Date: 2025-11-17
 Phase: 4 - Duplicate Merging
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import sys
 import argparse
+import csv
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 import hashlib
 import json
 from db_config import get_database_url
+from duplicate_clusters import resolve_duplicate_groups
 
 DATABASE_URL = get_database_url()
 
+
+def read_groups_csv(path: str) -> List[List[str]]:
+    """Contact ID groups marked MERGE in an enhanced_duplicate_detection.py CSV export."""
+    groups: Dict[str, List[str]] = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            if row.get('action_recommended') == 'MERGE' and row.get('contact_id'):
+                groups.setdefault(row['group_id'], []).append(row['contact_id'])
+    return list(groups.values())
+
+
 class DuplicateMerger:
     """FAANG-quality duplicate contact merger."""
 
-    def __init__(self, dry_run: bool = True, group_id: Optional[str] = None, limit: Optional[int] = None):
+    def __init__(self, dry_run: bool = True, group_id: Optional[str] = None, limit: Optional[int] = None,
+                 groups_csv: Optional[str] = None):
         self.dry_run = dry_run
         self.target_group_id = group_id
         self.limit = limit
+        self.groups_csv = groups_csv
         self.conn = None
         self.cursor = None
         self.stats = {
@@ -120,7 +149,7 @@ class DuplicateMerger:
                 SELECT
                     first_name,
                     last_name,
-                    ARRAY_AGG(id ORDER BY created_at) as contact_ids,
+                    ARRAY_AGG(id::text ORDER BY created_at) as contact_ids,
                     ARRAY_AGG(email ORDER BY created_at) as emails,
                     ARRAY_AGG(phone ORDER BY created_at) as phones,
                     ARRAY_AGG(address_line_1 ORDER BY created_at) as addresses,
@@ -148,9 +177,6 @@ class DuplicateMerger:
 
         groups = self.cursor.fetchall()
 
-        if self.limit:
-            groups = groups[:self.limit]
-
         self.log(f"  Found {len(groups)} HIGH confidence groups")
         return groups
 
@@ -168,186 +194,262 @@ class DuplicateMerger:
             bool(c['address'])
         ))
 
-    def merge_group(self, group_data):
-        """Merge a single duplicate group."""
-        first_name, last_name, contact_ids, emails, phones, addresses, sources, created_dates, count, unique_phones, unique_addresses = group_data
+    def load_contacts(self, contact_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Load merge candidates with transaction counts and contact_emails in one query.
 
-        self.log(f"\nProcessing: {first_name} {last_name}")
-        self.log(f"  {count} contacts to merge")
+        Args:
+            contact_ids: Contact IDs across all groups
 
-        try:
-            # Query contacts directly instead of using array data
-            # This avoids the array parsing issues
-            self.cursor.execute("""
-                SELECT
-                    id,
-                    email,
-                    phone,
-                    address_line_1,
-                    source_system,
-                    created_at
-                FROM contacts
-                WHERE first_name = %s
-                  AND last_name = %s
+        Returns:
+            Active contacts keyed by ID (soft-deleted IDs are absent)
+        """
+        self.cursor.execute("""
+            SELECT
+                c.id::text,
+                c.first_name,
+                c.last_name,
+                c.email::text,
+                c.phone,
+                c.address_line_1,
+                c.source_system,
+                c.created_at,
+                COALESCE(t.transaction_count, 0),
+                COALESCE(e.emails, ARRAY[]::text[])
+            FROM contacts c
+            LEFT JOIN (
+                SELECT contact_id, COUNT(*) AS transaction_count
+                FROM transactions
+                WHERE contact_id = ANY(%(ids)s::uuid[])
                   AND deleted_at IS NULL
-                ORDER BY created_at
-            """, (first_name, last_name))
-
-            contact_rows = self.cursor.fetchall()
-
-            if len(contact_rows) != count:
-                self.log(f"    Warning: Expected {count} contacts, found {len(contact_rows)}", 'WARN')
-
-            # Build contact list
-            contacts = []
-            for row in contact_rows:
-                contact_id, email, phone, address, source, created_at = row
-
-                # Get transaction count
-                self.cursor.execute("""
-                    SELECT COUNT(*)
-                    FROM transactions
-                    WHERE contact_id = %s
-                      AND deleted_at IS NULL
-                """, (contact_id,))
-
-                transaction_count = self.cursor.fetchone()[0]
-
-                # Get additional emails
-                self.cursor.execute("""
-                    SELECT email
-                    FROM contact_emails
-                    WHERE contact_id = %s
-                    ORDER BY created_at
-                """, (contact_id,))
-
-                additional_emails = [row[0] for row in self.cursor.fetchall()]
-
-                contacts.append({
-                    'id': contact_id,
-                    'email': email,
-                    'phone': phone,
-                    'address': address,
-                    'source': source,
-                    'created_at': created_at,
-                    'transaction_count': transaction_count,
-                    'additional_emails': additional_emails
-                })
-
-            # Generate group ID for tracking
+                GROUP BY contact_id
+            ) t ON t.contact_id = c.id
+            LEFT JOIN (
+                SELECT contact_id, ARRAY_AGG(email::text ORDER BY created_at) AS emails
+                FROM contact_emails
+                WHERE contact_id = ANY(%(ids)s::uuid[])
+                GROUP BY contact_id
+            ) e ON e.contact_id = c.id
+            WHERE c.id = ANY(%(ids)s::uuid[])
+              AND c.deleted_at IS NULL
+        """, {'ids': contact_ids})
+
+        contacts = {}
+        for row in self.cursor.fetchall():
+            contact_id, first_name, last_name, email, phone, address, source, created_at, \
+                transaction_count, additional_emails = row
+            contacts[contact_id] = {
+                'id': contact_id,
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': email,
+                'phone': phone,
+                'address': address,
+                'source': source,
+                'created_at': created_at,
+                'transaction_count': transaction_count,
+                'additional_emails': additional_emails
+            }
+        return contacts
+
+    def plan_merges(self, components: List[List[str]], contacts_by_id: Dict[str, Dict]) -> List[Dict]:
+        """
+        Choose a primary and the emails to migrate for every group, in memory.
+
+        Args:
+            components: Disjoint contact ID groups (see resolve_duplicate_groups)
+            contacts_by_id: Output of load_contacts()
+
+        Returns:
+            One plan per group that still has 2+ active contacts
+        """
+        plans = []
+        for component in components:
+            contacts = sorted(
+                (contacts_by_id[cid] for cid in component if cid in contacts_by_id),
+                key=lambda c: c['created_at']
+            )
+            if len(contacts) < 2:
+                continue
+
             group_id = self.generate_group_id([c['id'] for c in contacts])
 
             # Skip if not target group (when filtering)
             if self.target_group_id and group_id != self.target_group_id:
-                return False
+                continue
 
-            self.log(f"  Group ID: {group_id}")
-
-            # Select primary contact
             primary = self.select_primary_contact(contacts)
             duplicates = [c for c in contacts if c['id'] != primary['id']]
 
-            self.log(f"  Primary: {primary['email']} (created {primary['created_at'].date()})")
-            self.log(f"  Merging {len(duplicates)} duplicates into primary")
+            # Primary's existing emails (contact_emails.email is CITEXT)
+            primary_emails = {primary['email'] or ''}
+            primary_emails.update(primary['additional_emails'])
+            seen = {email.lower() for email in primary_emails}
+
+            # Emails to migrate, first spelling wins
+            emails_to_migrate = []
+            for contact in duplicates:
+                for email in [contact['email']] + contact['additional_emails']:
+                    if email and email.lower() not in seen:
+                        seen.add(email.lower())
+                        emails_to_migrate.append(email)
+
+            plans.append({
+                'group_id': group_id,
+                'name': f"{primary['first_name']} {primary['last_name']}",
+                'primary': primary,
+                'duplicates': duplicates,
+                'emails_to_migrate': emails_to_migrate
+            })
+
+            if self.limit and len(plans) >= self.limit:
+                break
+
+        return plans
+
+    def apply_merges(self, plans: List[Dict]):
+        """
+        Apply every plan with set-based statements (caller commits).
 
-            # Collect all unique emails
-            all_emails = set()
-            for contact in contacts:
-                all_emails.add(contact['email'])
-                all_emails.update(contact['additional_emails'])
+        Args:
+            plans: Output of plan_merges()
+        """
+        mapping = [(dup['id'], plan['primary']['id']) for plan in plans for dup in plan['duplicates']]
+        if not mapping:
+            return
 
-            # Primary's existing emails
-            primary_emails = {primary['email']}
-            primary_emails.update(primary['additional_emails'])
+        # 1. duplicate -> primary mapping
+        self.cursor.execute("DROP TABLE IF EXISTS pg_temp.merge_map")
+        self.cursor.execute("""
+            CREATE TEMP TABLE merge_map (
+                duplicate_id uuid PRIMARY KEY,
+                primary_id uuid NOT NULL
+            ) ON COMMIT DROP
+        """)
+        execute_values(
+            self.cursor,
+            "INSERT INTO merge_map (duplicate_id, primary_id) VALUES %s",
+            mapping,
+            template="(%s::uuid, %s::uuid)",
+            page_size=1000
+        )
+        self.cursor.execute("ANALYZE merge_map")
+
+        # 2. Migrate duplicate emails to primaries (use 'manual' source - allowed by constraint)
+        self.cursor.execute("""
+            WITH source_emails AS (
+                SELECT m.primary_id, d.email::text AS email
+                FROM merge_map m
+                JOIN contacts d ON d.id = m.duplicate_id
+                WHERE d.email IS NOT NULL AND d.email != ''
+                UNION
+                SELECT m.primary_id, ce.email::text
+                FROM merge_map m
+                JOIN contact_emails ce ON ce.contact_id = m.duplicate_id
+            )
+            INSERT INTO contact_emails (
+                contact_id, email, source, is_primary, is_outreach,
+                created_at, updated_at
+            )
+            SELECT s.primary_id, s.email, 'manual', false, false, NOW(), NOW()
+            FROM source_emails s
+            JOIN contacts p ON p.id = s.primary_id
+            WHERE LOWER(s.email) != LOWER(COALESCE(p.email, ''))
+            ON CONFLICT (contact_id, email) DO NOTHING
+            RETURNING email
+        """)
+        migrated = self.cursor.fetchall()
+        self.stats['emails_migrated'] += len(migrated)
+        for (email,) in migrated:
+            self.log(f"    Migrated email: {email}")
 
-            # Emails to migrate
-            emails_to_migrate = all_emails - primary_emails
+        # 3. Repoint transactions
+        self.cursor.execute("""
+            UPDATE transactions t
+            SET contact_id = m.primary_id, updated_at = NOW()
+            FROM merge_map m
+            WHERE t.contact_id = m.duplicate_id
+              AND t.deleted_at IS NULL
+        """)
+        self.stats['transactions_migrated'] += self.cursor.rowcount
+        self.log(f"    Migrated {self.cursor.rowcount} transactions")
 
-            if not self.dry_run:
-                # Start merge operation
-
-                # 1. Migrate emails to primary contact
-                for email in emails_to_migrate:
-                    # Check if email already exists
-                    self.cursor.execute("""
-                        SELECT COUNT(*)
-                        FROM contact_emails
-                        WHERE contact_id = %s
-                          AND LOWER(email) = LOWER(%s)
-                    """, (primary['id'], email))
-
-                    if self.cursor.fetchone()[0] == 0:
-                        # Insert email (use 'manual' source - allowed by constraint)
-                        self.cursor.execute("""
-                            INSERT INTO contact_emails (
-                                contact_id, email, source, is_primary, is_outreach,
-                                created_at, updated_at
-                            ) VALUES (
-                                %s, %s, 'manual', false, false, NOW(), NOW()
-                            )
-                        """, (primary['id'], email))
-
-                        self.stats['emails_migrated'] += 1
-                        self.log(f"    Migrated email: {email}")
-
-                # 2. Migrate transactions (if any)
-                for dup in duplicates:
-                    if dup['transaction_count'] > 0:
-                        self.cursor.execute("""
-                            UPDATE transactions
-                            SET contact_id = %s, updated_at = NOW()
-                            WHERE contact_id = %s
-                              AND deleted_at IS NULL
-                        """, (primary['id'], dup['id']))
-
-                        self.stats['transactions_migrated'] += dup['transaction_count']
-                        self.log(f"    Migrated {dup['transaction_count']} transactions from {dup['email']}")
-
-                # 3. Soft delete duplicate contacts
-                for dup in duplicates:
-                    self.cursor.execute("""
-                        UPDATE contacts
-                        SET deleted_at = NOW(), updated_at = NOW()
-                        WHERE id = %s
-                    """, (dup['id'],))
-
-                    self.stats['contacts_soft_deleted'] += 1
-                    self.log(f"    Soft deleted: {dup['email']}")
-
-                self.stats['contacts_merged'] += len(duplicates)
-                self.stats['groups_processed'] += 1
+        # 4. Soft delete duplicate contacts
+        self.cursor.execute("""
+            UPDATE contacts c
+            SET deleted_at = NOW(), updated_at = NOW()
+            FROM merge_map m
+            WHERE c.id = m.duplicate_id
+        """)
+        self.stats['contacts_soft_deleted'] += self.cursor.rowcount
+        self.log(f"    Soft deleted {self.cursor.rowcount} duplicates")
 
-                # Log merge for audit trail
-                self.merge_log.append({
-                    'group_id': group_id,
-                    'name': f"{first_name} {last_name}",
-                    'primary_id': primary['id'],
-                    'primary_email': primary['email'],
-                    'duplicates_merged': len(duplicates),
-                    'emails_migrated': len(emails_to_migrate),
-                    'timestamp': datetime.now().isoformat()
-                })
+    def merge_groups(self, groups: Iterable[Iterable]) -> List[Dict]:
+        """
+        Merge a whole set of duplicate groups.
 
-            else:
-                # Dry-run logging
-                self.log(f"    Would migrate {len(emails_to_migrate)} emails")
-                for email in emails_to_migrate:
-                    self.log(f"      - {email}")
+        Args:
+            groups: Iterables of contact IDs; groups sharing a contact are combined
+
+        Returns:
+            The executed (or, in dry-run, previewed) merge plans
+        """
+        try:
+            components = resolve_duplicate_groups(groups)
+            all_ids = [cid for component in components for cid in component]
+            self.log(f"\nResolved {len(components)} groups ({len(all_ids)} contacts)")
+
+            contacts_by_id = self.load_contacts(all_ids) if all_ids else {}
+            plans = self.plan_merges(components, contacts_by_id)
+
+            for plan in plans:
+                primary = plan['primary']
+                self.log(f"\nProcessing: {plan['name']}")
+                self.log(f"  Group ID: {plan['group_id']}")
+                self.log(f"  Primary: {primary['email']} (created {primary['created_at'].date()})")
+                self.log(f"  Merging {len(plan['duplicates'])} duplicates into primary")
 
-                for dup in duplicates:
-                    self.log(f"    Would soft delete: {dup['email']} ({dup['transaction_count']} txns)")
+                if self.dry_run:
+                    self.log(f"    Would migrate {len(plan['emails_to_migrate'])} emails")
+                    for email in plan['emails_to_migrate']:
+                        self.log(f"      - {email}")
 
-                self.stats['contacts_merged'] += len(duplicates)
-                self.stats['emails_migrated'] += len(emails_to_migrate)
+                    for dup in plan['duplicates']:
+                        self.log(f"    Would soft delete: {dup['email']} ({dup['transaction_count']} txns)")
+
+                    self.stats['emails_migrated'] += len(plan['emails_to_migrate'])
+
+                self.stats['contacts_merged'] += len(plan['duplicates'])
                 self.stats['groups_processed'] += 1
 
-            return True
+            if not self.dry_run and plans:
+                self.log(f"\nApplying {len(plans)} merges...")
+                self.apply_merges(plans)
+
+                # Log merge for audit trail
+                timestamp = datetime.now().isoformat()
+                for plan in plans:
+                    self.merge_log.append({
+                        'group_id': plan['group_id'],
+                        'name': plan['name'],
+                        'primary_id': plan['primary']['id'],
+                        'primary_email': plan['primary']['email'],
+                        'duplicates_merged': len(plan['duplicates']),
+                        'emails_migrated': len(plan['emails_to_migrate']),
+                        'timestamp': timestamp
+                    })
+
+            return plans
 
         except Exception as e:
-            self.log(f"  Error merging group: {e}", 'ERROR')
+            self.log(f"  Error merging groups: {e}", 'ERROR')
             self.stats['errors'] += 1
             raise  # Re-raise to trigger rollback
 
+    def merge_group(self, group_data):
+        """Merge a single duplicate group (row from get_high_confidence_groups)."""
+        return bool(self.merge_groups([group_data[2]]))
+
     def verify_merge_results(self):
         """Verify merge was successful."""
         if self.dry_run:
@@ -412,22 +514,25 @@ class DuplicateMerger:
                 print("=" * 80)
 
             # Get groups to merge
-            groups = self.get_high_confidence_groups()
+            groups = [row[2] for row in self.get_high_confidence_groups()]
+
+            if self.groups_csv:
+                csv_groups = read_groups_csv(self.groups_csv)
+                self.log(f"  Loaded {len(csv_groups)} MERGE groups from {self.groups_csv}")
+                groups.extend(csv_groups)
 
             if not groups:
                 self.log("No HIGH confidence groups found to merge", 'WARN')
                 return 0
 
-            # Process each group
-            for group_data in groups:
-                try:
-                    self.merge_group(group_data)
-                except Exception as e:
-                    self.log(f"Failed to merge group: {e}", 'ERROR')
-                    if not self.dry_run:
-                        # Rollback this transaction
-                        self.conn.rollback()
-                        self.log("Transaction rolled back for this group", 'WARN')
+            # Plan and apply all groups together
+            try:
+                self.merge_groups(groups)
+            except Exception as e:
+                self.log(f"Failed to merge groups: {e}", 'ERROR')
+                if not self.dry_run:
+                    self.conn.rollback()
+                    self.log("Transaction rolled back", 'WARN')
 
             # Commit all changes if no errors
             if not self.dry_run:
@@ -491,12 +596,19 @@ def main():
         help='Limit to first N groups (for testing)'
     )
 
+    parser.add_argument(
+        '--groups-csv',
+        type=str,
+        help='Also merge MERGE rows from an enhanced_duplicate_detection.py CSV export'
+    )
+
     args = parser.parse_args()
 
     merger = DuplicateMerger(
         dry_run=not args.execute,
         group_id=args.group_id,
-        limit=args.limit
+        limit=args.limit,
+        groups_csv=args.groups_csv
     )
     return merger.run()
 
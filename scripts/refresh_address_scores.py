@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Refresh persisted mailing list address scores.
+
+mailing_list_priority / mailing_list_export read billing and shipping
+scores from contact_address_scores (migration 20251205000001) and only fall
+back to calculate_address_score() for rows that are missing or stale. This
+job keeps the table current so that fallback stays rare.
+
+Each run recomputes scores only for:
+- contacts updated since the last run's watermark (address, USPS validation,
+  NCOA, last_transaction_date, ... all live on contacts)
+- contacts with transactions inserted or updated since the watermark
+- stored scores whose recency bonus has expired (expires_at <= NOW())
+
+The first run (or --full) rescores every contact.
+
+Usage:
+    python3 scripts/refresh_address_scores.py              # incremental
+    python3 scripts/refresh_address_scores.py --full       # every contact
+    python3 scripts/refresh_address_scores.py --dry-run    # count only
+"""
+import argparse
+import sys
+import time
+
+from psycopg2.extras import RealDictCursor
+
+from db_config import get_connection
+from job_watermarks import get_watermark, set_watermark
+
+# job_watermarks.job_name
+WATERMARK_JOB = 'refresh_address_scores'
+
+# Contacts rescored per refresh_contact_address_scores() call
+BATCH_SIZE = 1000
+
+CANDIDATES_QUERY = """
+    SELECT id::text AS contact_id
+    FROM contacts
+    WHERE updated_at > %(watermark)s
+    UNION
+    SELECT contact_id::text
+    FROM transactions
+    WHERE updated_at > %(watermark)s
+      AND contact_id IS NOT NULL
+    UNION
+    SELECT contact_id::text
+    FROM contact_address_scores
+    WHERE expires_at <= NOW()
+"""
+
+
+def find_stale_contacts(cur, watermark):
+    """Ids of contacts whose stored scores need recomputing"""
+    cur.execute(CANDIDATES_QUERY, {'watermark': watermark})
+    return [row['contact_id'] for row in cur.fetchall()]
+
+
+def refresh_scores(cur, contact_ids, batch_size=BATCH_SIZE):
+    """Rescore contacts in batches; returns rows written"""
+    refreshed = 0
+    for start in range(0, len(contact_ids), batch_size):
+        batch = contact_ids[start:start + batch_size]
+        cur.execute("SELECT refresh_contact_address_scores(%s::uuid[]) AS refreshed", (batch,))
+        refreshed += cur.fetchone()['refreshed']
+        print(f"  Rescored {min(start + batch_size, len(contact_ids)):,}/{len(contact_ids):,} contacts...")
+    return refreshed
+
+
+def refresh_all_scores(cur):
+    """Rescore every contact in one statement; returns rows written"""
+    cur.execute("SELECT refresh_contact_address_scores() AS refreshed")
+    return cur.fetchone()['refreshed']
+
+
+def refresh_address_scores(conn, full=False, dry_run=False, batch_size=BATCH_SIZE):
+    """
+    Bring contact_address_scores up to date and commit.
+
+    Args:
+        conn: Database connection (not autocommit)
+        full: Rescore every contact instead of only changed/expired ones
+        dry_run: Only count candidates; nothing is written
+        batch_size: Contacts per refresh_contact_address_scores() call
+
+    Returns:
+        (candidates, refreshed) counts
+    """
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        # Same transaction as the refresh, so contacts changed while it runs
+        # are picked up next time
+        cur.execute("SELECT NOW() AS started_at")
+        started_at = cur.fetchone()['started_at']
+
+        watermark = None if full else get_watermark(cur, WATERMARK_JOB)
+
+        if watermark is None:
+            cur.execute("SELECT COUNT(*) AS total FROM contacts")
+            candidates = cur.fetchone()['total']
+            print(f"Full refresh: {candidates:,} contacts")
+            refreshed = 0 if dry_run else refresh_all_scores(cur)
+        else:
+            contact_ids = find_stale_contacts(cur, watermark)
+            candidates = len(contact_ids)
+            print(f"Incremental: changed since {watermark} or expired: {candidates:,} contacts")
+            refreshed = 0 if dry_run else refresh_scores(cur, contact_ids, batch_size)
+
+        if dry_run:
+            conn.rollback()
+        else:
+            set_watermark(cur, WATERMARK_JOB, started_at)
+            conn.commit()
+        return candidates, refreshed
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh persisted mailing list address scores')
+    parser.add_argument('--full', action='store_true', help='Rescore every contact')
+    parser.add_argument('--dry-run', action='store_true', help='Only count contacts that would be rescored')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Contacts per refresh call (default: {BATCH_SIZE})')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("REFRESH ADDRESS SCORES")
+    print("=" * 70)
+
+    conn = get_connection(autocommit=False)
+    start = time.time()
+    try:
+        candidates, refreshed = refresh_address_scores(
+            conn, full=args.full, dry_run=args.dry_run, batch_size=args.batch_size
+        )
+    except Exception as e:
+        print(f"\n✗ Refresh failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if args.dry_run:
+        print(f"\nℹ DRY RUN - {candidates:,} contacts would be rescored")
+    else:
+        print(f"\n✓ Rescored {refreshed:,} contacts in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
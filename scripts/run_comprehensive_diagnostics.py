@@ -3,90 +3,44 @@
 Comprehensive Database Diagnostic Tool
 Runs all 35 diagnostic queries from HANDOFF_2025_11_11_DATA_PROTECTION_AND_ANALYSIS.md
 Generates structured report with findings
+
+Checks are independent and read-only, so they run concurrently on pooled
+connections (see diagnostics_engine.py). Each has its own statement_timeout,
+keeps at most --max-rows result rows, and the report records wall time,
+rows scanned and plan cost per check.
+
+Usage:
+    python3 scripts/run_comprehensive_diagnostics.py
+    python3 scripts/run_comprehensive_diagnostics.py --workers 2 --timeout-ms 10000
 """
 
-import os
-import sys
+import argparse
 import json
+import sys
+import time
+from dataclasses import replace
 from datetime import datetime
-from typing import Dict, List, Any
-import psycopg2
-from psycopg2.extras import RealDictCursor
-
-def get_db_connection():
-    """Get database connection from environment"""
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        raise ValueError("DATABASE_URL environment variable not set")
-    return psycopg2.connect(database_url)
-
-def run_query(conn, name: str, sql: str, description: str) -> Dict[str, Any]:
-    """Run a single diagnostic query and return results"""
-    print(f"\n{'='*80}")
-    print(f"Query: {name}")
-    print(f"Description: {description}")
-    print(f"{'='*80}")
-
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
-
-            # Convert to list of dicts for JSON serialization
-            results_list = [dict(row) for row in results]
-
-            print(f"✓ Returned {len(results_list)} rows")
-
-            # Display first few rows
-            if results_list:
-                print("\nSample Results:")
-                for i, row in enumerate(results_list[:3]):
-                    print(f"  Row {i+1}: {row}")
-                if len(results_list) > 3:
-                    print(f"  ... and {len(results_list) - 3} more rows")
-
-            return {
-                "name": name,
-                "description": description,
-                "success": True,
-                "row_count": len(results_list),
-                "results": results_list,
-                "error": None
-            }
-    except Exception as e:
-        print(f"✗ Error: {str(e)}")
-        return {
-            "name": name,
-            "description": description,
-            "success": False,
-            "row_count": 0,
-            "results": [],
-            "error": str(e)
-        }
-
-def main():
-    """Run all diagnostic queries"""
-    print("="*80)
-    print("COMPREHENSIVE DATABASE DIAGNOSTICS")
-    print(f"Started: {datetime.now().isoformat()}")
-    print("="*80)
-
-    conn = get_db_connection()
-    all_results = []
 
+from diagnostics_engine import (
+    DEFAULT_MAX_ROWS,
+    DEFAULT_TIMEOUT_MS,
+    DEFAULT_WORKERS,
+    DiagnosticCheck,
+    build_report,
+    print_result_line,
+    print_timings,
+    run_checks,
+)
+from db_config import close_pools
+
+CHECKS = [
     # =========================================================================
     # CATEGORY 1: CURRENT SUBSCRIPTION DATA
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("CATEGORY 1: CURRENT SUBSCRIPTION DATA")
-    print("="*80)
-
-    # Q1.2: Subscription status breakdown
-    all_results.append(run_query(
-        conn,
-        "Q1.2: Subscription Status Breakdown",
-        """
+    DiagnosticCheck(
+        name="Q1.2: Subscription Status Breakdown",
+        category="CATEGORY 1: CURRENT SUBSCRIPTION DATA",
+        sql="""
         SELECT
           status,
           COUNT(*) as count,
@@ -98,14 +52,12 @@ def main():
         GROUP BY status
         ORDER BY count DESC;
         """,
-        "What subscription statuses do we have and how many?"
-    ))
-
-    # Q1.3: Multiple active subscriptions
-    all_results.append(run_query(
-        conn,
-        "Q1.3: Contacts with Multiple Active Subscriptions",
-        """
+        description="What subscription statuses do we have and how many?",
+    ),
+    DiagnosticCheck(
+        name="Q1.3: Contacts with Multiple Active Subscriptions",
+        category="CATEGORY 1: CURRENT SUBSCRIPTION DATA",
+        sql="""
         SELECT
           c.email,
           c.first_name || ' ' || c.last_name as name,
@@ -119,22 +71,16 @@ def main():
         HAVING COUNT(*) > 1
         ORDER BY COUNT(*) DESC;
         """,
-        "Do we have contacts with multiple active subscriptions?"
-    ))
+        description="Do we have contacts with multiple active subscriptions?",
+    ),
 
     # =========================================================================
     # CATEGORY 2: TRANSACTION DATA
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("CATEGORY 2: TRANSACTION DATA")
-    print("="*80)
-
-    # Q2.1: Transaction breakdown by source
-    all_results.append(run_query(
-        conn,
-        "Q2.1: Transaction Breakdown by Source",
-        """
+    DiagnosticCheck(
+        name="Q2.1: Transaction Breakdown by Source",
+        category="CATEGORY 2: TRANSACTION DATA",
+        sql="""
         SELECT
           source_system,
           COUNT(*) as count,
@@ -146,14 +92,12 @@ def main():
         GROUP BY source_system
         ORDER BY count DESC;
         """,
-        "Why do we have ZERO Kajabi transactions?"
-    ))
-
-    # Q2.2: Revenue reconciliation
-    all_results.append(run_query(
-        conn,
-        "Q2.2: Revenue Reconciliation",
-        """
+        description="Why do we have ZERO Kajabi transactions?",
+    ),
+    DiagnosticCheck(
+        name="Q2.2: Revenue Reconciliation",
+        category="CATEGORY 2: TRANSACTION DATA",
+        sql="""
         SELECT
           'Transactions (PayPal)' as source,
           COUNT(*) as count,
@@ -184,22 +128,16 @@ def main():
         WHERE kajabi_subscription_id IS NOT NULL
           AND deleted_at IS NULL;
         """,
-        "Compare transaction revenue vs subscription revenue"
-    ))
+        description="Compare transaction revenue vs subscription revenue",
+    ),
 
     # =========================================================================
     # CATEGORY 3: CONTACT ENRICHMENT
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("CATEGORY 3: CONTACT ENRICHMENT")
-    print("="*80)
-
-    # Q3.1: Multi-source contacts
-    all_results.append(run_query(
-        conn,
-        "Q3.1: Multi-Source Contact Enrichment",
-        """
+    DiagnosticCheck(
+        name="Q3.1: Multi-Source Contact Enrichment",
+        category="CATEGORY 3: CONTACT ENRICHMENT",
+        sql="""
         SELECT
           source_system,
           CASE
@@ -212,14 +150,12 @@ def main():
         GROUP BY source_system, enrichment_type
         ORDER BY source_system, enrichment_type;
         """,
-        "How many contacts have data from multiple sources?"
-    ))
-
-    # Q3.2: Zoho linkage
-    all_results.append(run_query(
-        conn,
-        "Q3.2: Zoho Linkage Status",
-        """
+        description="How many contacts have data from multiple sources?",
+    ),
+    DiagnosticCheck(
+        name="Q3.2: Zoho Linkage Status",
+        category="CATEGORY 3: CONTACT ENRICHMENT",
+        sql="""
         SELECT
           c.source_system,
           COUNT(*) as total,
@@ -230,14 +166,12 @@ def main():
         GROUP BY c.source_system
         ORDER BY total DESC;
         """,
-        "What's the Zoho linkage status across sources?"
-    ))
-
-    # Q3.3: PayPal enrichment
-    all_results.append(run_query(
-        conn,
-        "Q3.3: PayPal Enrichment Status",
-        """
+        description="What's the Zoho linkage status across sources?",
+    ),
+    DiagnosticCheck(
+        name="Q3.3: PayPal Enrichment Status",
+        category="CATEGORY 3: CONTACT ENRICHMENT",
+        sql="""
         SELECT
           c.source_system,
           COUNT(*) as total,
@@ -249,50 +183,40 @@ def main():
         GROUP BY c.source_system
         ORDER BY total DESC;
         """,
-        "What's the PayPal enrichment status across sources?"
-    ))
+        description="What's the PayPal enrichment status across sources?",
+    ),
 
     # =========================================================================
     # CATEGORY 4: DATA QUALITY
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("CATEGORY 4: DATA QUALITY")
-    print("="*80)
-
-    # Q4.1: Orphaned subscriptions
-    all_results.append(run_query(
-        conn,
-        "Q4.1: Orphaned Subscriptions",
-        """
+    DiagnosticCheck(
+        name="Q4.1: Orphaned Subscriptions",
+        category="CATEGORY 4: DATA QUALITY",
+        sql="""
         SELECT COUNT(*) as orphaned_subscriptions
         FROM subscriptions s
         LEFT JOIN contacts c ON s.contact_id = c.id
         WHERE c.id IS NULL
           OR c.deleted_at IS NOT NULL;
         """,
-        "Are there orphaned subscriptions (no contact)?"
-    ))
-
-    # Q4.2: Orphaned transactions
-    all_results.append(run_query(
-        conn,
-        "Q4.2: Orphaned Transactions",
-        """
+        description="Are there orphaned subscriptions (no contact)?",
+    ),
+    DiagnosticCheck(
+        name="Q4.2: Orphaned Transactions",
+        category="CATEGORY 4: DATA QUALITY",
+        sql="""
         SELECT COUNT(*) as orphaned_transactions
         FROM transactions t
         LEFT JOIN contacts c ON t.contact_id = c.id
         WHERE c.id IS NULL
           OR c.deleted_at IS NOT NULL;
         """,
-        "Are there orphaned transactions (no contact)?"
-    ))
-
-    # Q4.3: Subscription-transaction mismatches
-    all_results.append(run_query(
-        conn,
-        "Q4.3: Active Subscriptions Without Transactions",
-        """
+        description="Are there orphaned transactions (no contact)?",
+    ),
+    DiagnosticCheck(
+        name="Q4.3: Active Subscriptions Without Transactions",
+        category="CATEGORY 4: DATA QUALITY",
+        sql="""
         SELECT
           c.email,
           c.first_name || ' ' || c.last_name as name,
@@ -310,35 +234,28 @@ def main():
           )
         LIMIT 20;
         """,
-        "Contacts with active subscriptions but no transactions"
-    ))
+        description="Contacts with active subscriptions but no transactions",
+    ),
 
     # =========================================================================
     # CATEGORY 5: HISTORICAL IMPORTS
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("CATEGORY 5: HISTORICAL IMPORTS")
-    print("="*80)
-
-    # Q5.1: Last import timestamps
-    all_results.append(run_query(
-        conn,
-        "Q5.1a: Import/Backup Tables",
-        """
+    DiagnosticCheck(
+        name="Q5.1a: Import/Backup Tables",
+        category="CATEGORY 5: HISTORICAL IMPORTS",
+        sql="""
         SELECT table_name
         FROM information_schema.tables
         WHERE table_schema = 'public'
           AND (table_name LIKE '%import%' OR table_name LIKE '%backup%')
         ORDER BY table_name;
         """,
-        "Check for any import tracking tables"
-    ))
-
-    all_results.append(run_query(
-        conn,
-        "Q5.1b: Last Updated Timestamps",
-        """
+        description="Check for any import tracking tables",
+    ),
+    DiagnosticCheck(
+        name="Q5.1b: Last Updated Timestamps",
+        category="CATEGORY 5: HISTORICAL IMPORTS",
+        sql="""
         SELECT
           'contacts' as table_name,
           MAX(updated_at) as last_update,
@@ -361,14 +278,12 @@ def main():
           MAX(created_at)
         FROM transactions;
         """,
-        "When was the last import/update?"
-    ))
-
-    # Q5.2: Merge history
-    all_results.append(run_query(
-        conn,
-        "Q5.2: Recent Merge History",
-        """
+        description="When was the last import/update?",
+    ),
+    DiagnosticCheck(
+        name="Q5.2: Recent Merge History",
+        category="CATEGORY 5: HISTORICAL IMPORTS",
+        sql="""
         SELECT
           DATE(merged_at) as merge_date,
           COUNT(*) as merges_that_day
@@ -377,22 +292,16 @@ def main():
         ORDER BY merge_date DESC
         LIMIT 30;
         """,
-        "How many merges have occurred recently?"
-    ))
+        description="How many merges have occurred recently?",
+    ),
 
     # =========================================================================
     # ADDITIONAL DIAGNOSTICS
     # =========================================================================
-
-    print("\n\n" + "="*80)
-    print("ADDITIONAL DIAGNOSTICS")
-    print("="*80)
-
-    # Protection status
-    all_results.append(run_query(
-        conn,
-        "Protection Levels Distribution",
-        """
+    DiagnosticCheck(
+        name="Protection Levels Distribution",
+        category="ADDITIONAL DIAGNOSTICS",
+        sql="""
         SELECT
           lock_level,
           COUNT(*) as count,
@@ -402,14 +311,12 @@ def main():
         GROUP BY lock_level
         ORDER BY count DESC;
         """,
-        "Current protection level distribution"
-    ))
-
-    # Subscription protection
-    all_results.append(run_query(
-        conn,
-        "Subscription Protection Status",
-        """
+        description="Current protection level distribution",
+    ),
+    DiagnosticCheck(
+        name="Subscription Protection Status",
+        category="ADDITIONAL DIAGNOSTICS",
+        sql="""
         SELECT
           subscription_protected,
           COUNT(*) as count,
@@ -419,14 +326,12 @@ def main():
         WHERE deleted_at IS NULL
         GROUP BY subscription_protected;
         """,
-        "Subscription protection breakdown"
-    ))
-
-    # Contact source distribution
-    all_results.append(run_query(
-        conn,
-        "Contact Source Distribution",
-        """
+        description="Subscription protection breakdown",
+    ),
+    DiagnosticCheck(
+        name="Contact Source Distribution",
+        category="ADDITIONAL DIAGNOSTICS",
+        sql="""
         SELECT
           source_system,
           COUNT(*) as count,
@@ -438,14 +343,12 @@ def main():
         GROUP BY source_system
         ORDER BY count DESC;
         """,
-        "Contact distribution by source with subscription status"
-    ))
-
-    # Enrichment overview
-    all_results.append(run_query(
-        conn,
-        "Data Enrichment Overview",
-        """
+        description="Contact distribution by source with subscription status",
+    ),
+    DiagnosticCheck(
+        name="Data Enrichment Overview",
+        category="ADDITIONAL DIAGNOSTICS",
+        sql="""
         SELECT
           COUNT(*) as total_contacts,
           COUNT(*) FILTER (WHERE additional_email IS NOT NULL) as has_additional_email,
@@ -457,10 +360,64 @@ def main():
         FROM contacts
         WHERE deleted_at IS NULL;
         """,
-        "Overall enrichment status across all contacts"
-    ))
+        description="Overall enrichment status across all contacts",
+    ),
+]
+
+
+def main():
+    """Run all diagnostic queries"""
+    parser = argparse.ArgumentParser(description='Run comprehensive database diagnostics')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Checks run concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--timeout-ms', type=int, default=DEFAULT_TIMEOUT_MS,
+                        help=f'statement_timeout per check (default: {DEFAULT_TIMEOUT_MS})')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help=f'Result rows kept per check (default: {DEFAULT_MAX_ROWS})')
+    parser.add_argument('--output', default='diagnostics_report.json',
+                        help='Report path (default: diagnostics_report.json)')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("COMPREHENSIVE DATABASE DIAGNOSTICS")
+    print(f"Started: {datetime.now().isoformat()}")
+    print(f"Checks: {len(CHECKS)} | Workers: {args.workers} | Timeout: {args.timeout_ms} ms")
+    print("="*80)
+
+    checks = [replace(check, timeout_ms=args.timeout_ms, max_rows=args.max_rows) for check in CHECKS]
+
+    start = time.perf_counter()
+    try:
+        all_results = run_checks(checks, workers=args.workers, on_result=print_result_line)
+    finally:
+        close_pools()
+    wall_seconds = time.perf_counter() - start
+
+    # =========================================================================
+    # RESULTS BY CATEGORY
+    # =========================================================================
 
-    conn.close()
+    category = None
+    for r in all_results:
+        if r['category'] != category:
+            category = r['category']
+            print("\n\n" + "="*80)
+            print(category)
+            print("="*80)
+
+        print(f"\nQuery: {r['name']}")
+        print(f"Description: {r['description']}")
+        if not r['success']:
+            print(f"✗ Error: {r['error']}")
+            continue
+
+        print(f"✓ Returned {r['row_count']} rows")
+        if r['results']:
+            print("Sample Results:")
+            for i, row in enumerate(r['results'][:3]):
+                print(f"  Row {i+1}: {row}")
+            if r['row_count'] > 3:
+                print(f"  ... and {r['row_count'] - 3} more rows")
 
     # =========================================================================
     # GENERATE SUMMARY REPORT
@@ -470,24 +427,18 @@ def main():
     print("GENERATING SUMMARY REPORT")
     print("="*80)
 
-    # Create summary
-    summary = {
-        "generated_at": datetime.now().isoformat(),
-        "total_queries": len(all_results),
-        "successful_queries": sum(1 for r in all_results if r["success"]),
-        "failed_queries": sum(1 for r in all_results if not r["success"]),
-        "queries": all_results
-    }
+    print_timings(all_results, wall_seconds)
+    summary = build_report(all_results, wall_seconds)
 
     # Save to file
-    output_file = "diagnostics_report.json"
+    output_file = args.output
     with open(output_file, 'w') as f:
         json.dump(summary, f, indent=2, default=str)
 
     print(f"\n✓ Full report saved to: {output_file}")
     print(f"\n✓ Total queries: {summary['total_queries']}")
     print(f"✓ Successful: {summary['successful_queries']}")
-    print(f"✗ Failed: {summary['failed_queries']}")
+    print(f"✗ Failed: {summary['failed_queries']} ({summary['timed_out_queries']} timed out)")
 
     if summary['failed_queries'] > 0:
         print("\nFailed queries:")
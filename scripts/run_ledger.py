@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Import run ledger (import_runs table, migration 20251206000001).
+
+Every importer/enricher run() records itself here instead of (or as well
+as) dropping a JSON report in the repo root: script, mode, start/end time,
+per-stage timings, rows processed/created/updated, errors and database
+round trips.
+
+Every run records its wall time and row counts. Stage timings and round
+trips come from logging_config's instrumentation and are only recorded when
+it is on (INSTRUMENTATION=true, or the script enabled it): stages are the
+span()s the run opened and round trips are the statements sent through
+instrument_cursor() cursors. Otherwise stages stay '{}' and round trips NULL,
+so an ordinary run pays nothing for instrumentation.
+
+Ledger writes use their own autocommit connection, so a dry run's rollback
+does not erase its row. If the table is missing or the database refuses the
+write, the run continues unrecorded with a warning.
+
+Usage:
+    from run_ledger import RunRecorder
+
+    ledger = RunRecorder('weekly_import_kajabi_v2', dry_run=self.dry_run).start()
+    ...
+    ledger.finish(success, rows_processed=..., rows_created=..., errors=...)
+
+    # Week-over-week throughput and regression flags
+    python3 scripts/run_ledger.py report
+    python3 scripts/run_ledger.py report --weeks 12 --threshold 0.2 --script weekly_import_paypal_improved
+"""
+
+import argparse
+import os
+import sys
+import time
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2.extras import Json, RealDictCursor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from db_config import pooled_connection
+from logging_config import instrumentation_summary
+
+DEFAULT_WEEKS = 8
+# Flag a week whose throughput falls (or round trips per row rise) by more than this
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+
+START_RUN_SQL = """
+    INSERT INTO import_runs (script, mode, trace_id)
+    VALUES (%s, %s, %s)
+    RETURNING id
+"""
+
+FINISH_RUN_SQL = """
+    UPDATE import_runs
+    SET status = %(status)s,
+        finished_at = NOW(),
+        duration_ms = %(duration_ms)s,
+        stages = COALESCE(%(stages)s, stages),
+        rows_processed = %(rows_processed)s,
+        rows_created = %(rows_created)s,
+        rows_updated = %(rows_updated)s,
+        error_count = %(errors)s,
+        db_round_trips = %(round_trips)s,
+        details = %(details)s
+    WHERE id = %(run_id)s
+"""
+
+WEEKLY_THROUGHPUT_SQL = """
+    SELECT script,
+           date_trunc('week', started_at) AS week,
+           COUNT(*) AS runs,
+           SUM(rows_processed) AS rows_processed,
+           SUM(duration_ms) AS duration_ms,
+           SUM(db_round_trips) AS round_trips,
+           SUM(error_count) AS errors
+    FROM import_runs
+    WHERE mode = 'execute'
+      AND status = 'succeeded'
+      AND started_at >= date_trunc('week', NOW()) - make_interval(weeks => %(weeks)s)
+      AND (%(script)s::text IS NULL OR script = %(script)s)
+    GROUP BY script, week
+    ORDER BY script, week
+"""
+
+
+class RunRecorder:
+    """Record one run of a script in import_runs."""
+
+    def __init__(self, script: str, dry_run: bool, production: bool = False,
+                 trace_id: Optional[str] = None):
+        self.script = script
+        self.mode = 'dry_run' if dry_run else 'execute'
+        self.production = production
+        self.trace_id = trace_id
+        self.run_id: Optional[str] = None
+        self.enabled = True
+        self._start: Optional[float] = None
+
+    def _write(self, sql: str, params: Any, fetch: bool = False) -> Any:
+        if not self.enabled:
+            return None
+        try:
+            with pooled_connection(production=self.production, autocommit=True) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+                    return cur.fetchone()[0] if fetch else None
+        except psycopg2.Error as e:
+            print(f"[WARN] Run ledger unavailable, this run is not recorded: {str(e).strip()}", file=sys.stderr)
+            self.enabled = False
+            return None
+
+    def start(self) -> 'RunRecorder':
+        """Insert the running row."""
+        self._start = time.perf_counter()
+        self.run_id = self._write(START_RUN_SQL, (self.script, self.mode, self.trace_id), fetch=True)
+        return self
+
+    def finish(self, success: bool, rows_processed: int = 0, rows_created: int = 0,
+               rows_updated: int = 0, errors: int = 0,
+               details: Optional[Dict[str, Any]] = None) -> None:
+        """Fill in the outcome of the run."""
+        if self.run_id is None:
+            return
+
+        # None when instrumentation is off: no stages or round trips recorded
+        summary = instrumentation_summary() or {}
+        self._write(FINISH_RUN_SQL, {
+            'run_id': self.run_id,
+            'status': 'succeeded' if success else 'failed',
+            'duration_ms': round((time.perf_counter() - self._start) * 1000, 1),
+            'stages': Json(summary['spans']) if summary else None,
+            'rows_processed': rows_processed,
+            'rows_created': rows_created,
+            'rows_updated': rows_updated,
+            'errors': errors,
+            'round_trips': summary.get('statements') or None,
+            'details': Json(details) if details is not None else None,
+        })
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def weekly_throughput(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group weekly ledger totals by script, adding rows/sec and round trips per row."""
+    by_script: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        seconds = float(row['duration_ms'] or 0) / 1000
+        processed = int(row['rows_processed'] or 0)
+        week = dict(row)
+        week['rows_per_sec'] = processed / seconds if seconds else None
+        week['trips_per_row'] = (int(row['round_trips']) / processed
+                                 if row['round_trips'] is not None and processed else None)
+        by_script.setdefault(row['script'], []).append(week)
+    return by_script
+
+
+def find_regressions(weeks: List[Dict[str, Any]],
+                     threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[str]:
+    """Compare the latest week against the median of the earlier ones."""
+    if len(weeks) < 2:
+        return []
+    latest, history = weeks[-1], weeks[:-1]
+    flags = []
+
+    baseline = [w['rows_per_sec'] for w in history if w['rows_per_sec']]
+    if baseline and latest['rows_per_sec'] is not None:
+        expected = median(baseline)
+        if latest['rows_per_sec'] < expected * (1 - threshold):
+            flags.append(f"throughput {latest['rows_per_sec']:,.0f} rows/s is "
+                         f"{1 - latest['rows_per_sec'] / expected:.0%} below the "
+                         f"{len(baseline)}-week median of {expected:,.0f}")
+
+    baseline = [w['trips_per_row'] for w in history if w['trips_per_row']]
+    if baseline and latest['trips_per_row'] is not None:
+        expected = median(baseline)
+        if latest['trips_per_row'] > expected * (1 + threshold):
+            flags.append(f"{latest['trips_per_row']:.2f} round trips per row, up from a "
+                         f"median of {expected:.2f}")
+
+    return flags
+
+
+def print_report(by_script: Dict[str, List[Dict[str, Any]]],
+                 threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> int:
+    """Print each script's weekly table and flags; returns the number of flagged scripts."""
+    flagged = 0
+    for script, weeks in sorted(by_script.items()):
+        print(f"\n## {script}")
+        print(f"{'Week':<12} {'Runs':>5} {'Rows':>12} {'Rows/s':>10} {'WoW':>8} {'Trips/row':>10} {'Errors':>7}")
+        print("-" * 70)
+        previous = None
+        for week in weeks:
+            rate = week['rows_per_sec']
+            wow = f"{rate / previous - 1:+.0%}" if rate and previous else '-'
+            trips = f"{week['trips_per_row']:.2f}" if week['trips_per_row'] is not None else '-'
+            print(f"{week['week']:%Y-%m-%d}   {week['runs']:>5} {int(week['rows_processed'] or 0):>12,} "
+                  f"{f'{rate:,.0f}' if rate else '-':>10} {wow:>8} {trips:>10} {int(week['errors'] or 0):>7,}")
+            previous = rate
+
+        flags = find_regressions(weeks, threshold)
+        for flag in flags:
+            print(f"  ⚠️  Regression: {flag}")
+        flagged += bool(flags)
+    return flagged
+
+
+def run_report(weeks: int = DEFAULT_WEEKS, threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+               script: Optional[str] = None) -> int:
+    with pooled_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(WEEKLY_THROUGHPUT_SQL, {'weeks': weeks, 'script': script})
+            rows = cur.fetchall()
+        conn.rollback()
+
+    print("=" * 70)
+    print(f"IMPORT RUN LEDGER - last {weeks} weeks (successful live runs)")
+    print("=" * 70)
+
+    if not rows:
+        print("\nNo runs recorded yet")
+        return 0
+
+    flagged = print_report(weekly_throughput(rows), threshold)
+    print()
+    if flagged:
+        print(f"⚠️  {flagged} script(s) regressed by more than {threshold:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Import run ledger',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser('report', help='Week-over-week throughput and regression flags')
+    report.add_argument('--weeks', type=int, default=DEFAULT_WEEKS,
+                        help=f'Weeks of history to show (default: {DEFAULT_WEEKS})')
+    report.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help=f'Regression threshold as a fraction (default: {DEFAULT_REGRESSION_THRESHOLD})')
+    report.add_argument('--script', help='Only this script')
+
+    args = parser.parse_args()
+    return run_report(args.weeks, args.threshold, args.script)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Shared SmartyStreets US Street API client for the address validators.
+
+Replaces one-GET-per-address + sleep(1/REQUESTS_PER_SECOND) with:
+  - batch POSTs of up to 100 lookups per request (Smarty's limit)
+  - several requests in flight at once (thread pool)
+  - a token-bucket rate limiter shared by all in-flight requests
+  - retries with backoff on 429 / 5xx / network errors
+
+Progress checkpointing lives in checkpoint_journal.py.
+
+Used by:
+  - validate_addresses_smarty.py
+  - validate_all_addresses.py
+  - validate_google_addresses_smarty.py
+
+Usage:
+    from smarty_client import SmartyClient
+
+    client = SmartyClient(auth_id, auth_token, requests_per_second=10, max_in_flight=4)
+    lookups = [{'input_id': '1', 'street': '1 Main St', 'city': 'Boulder',
+                'state': 'CO', 'zipcode': '80302'}]
+    for input_id, candidate, error in client.validate_all(lookups):
+        ...  # candidate is Smarty's best match (dict) or None
+
+Testing: point api_url at a local stub server (see tests/test_smarty_client.py).
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+SMARTY_API_URL = "https://us-street.api.smarty.com/street-address"
+
+# Smarty accepts at most 100 lookups per POST
+MAX_BATCH_SIZE = 100
+
+DEFAULT_REQUESTS_PER_SECOND = 10
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+
+# Lookup fields forwarded to Smarty (anything else is dropped)
+LOOKUP_FIELDS = ('street', 'street2', 'city', 'state', 'zipcode')
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def http_error_message(code: int, reason: str = '') -> str:
+    """Human-readable message for a Smarty HTTP error."""
+    if code == 401:
+        return "Authentication failed - check your auth ID and token"
+    if code == 402:
+        return "Payment required - you've exceeded your free tier"
+    if code == 413:
+        return "Request too large - more than 100 lookups in one batch"
+    if code == 429:
+        return "Rate limited by SmartyStreets"
+    return f"HTTP {code}: {reason}" if reason else f"HTTP {code}"
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`.
+
+    acquire() blocks until a token is available, so N threads sharing one
+    bucket never exceed the rate together.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting if needed; returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # Epsilon keeps float rounding from stranding a nearly-full token
+                if self.tokens >= tokens - 1e-9:
+                    self.tokens = max(0.0, self.tokens - tokens)
+                    return waited
+                shortfall = (tokens - self.tokens) / self.rate
+            self._sleep(shortfall)
+            waited += shortfall
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class SmartyClient:
+    """Batching, concurrent, rate-limited client for the US Street API."""
+
+    def __init__(self, auth_id: str, auth_token: str,
+                 api_url: str = SMARTY_API_URL,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 batch_size: int = MAX_BATCH_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 match: str = 'strict'):
+        self.auth_id = auth_id
+        self.auth_token = auth_token
+        self.api_url = api_url
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.match = match
+        self.bucket = TokenBucket(requests_per_second)
+
+        self.stats = {'requests': 0, 'retries': 0, 'lookups': 0, 'rate_limit_wait_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, value=1) -> None:
+        with self._stats_lock:
+            self.stats[name] += value
+
+    def _post(self, body: List[Dict]) -> List[Dict]:
+        """One POST of up to batch_size lookups; retries transient failures."""
+        url = f"{self.api_url}?{urlencode({'auth-id': self.auth_id, 'auth-token': self.auth_token})}"
+        data = json.dumps(body).encode('utf-8')
+
+        attempt = 0
+        while True:
+            self._count('rate_limit_wait_seconds', self.bucket.acquire())
+            self._count('requests')
+            request = Request(url, data=data, method='POST')
+            request.add_header('Content-Type', 'application/json; charset=utf-8')
+            request.add_header('User-Agent', 'StarHouse-CRM/1.0')
+
+            try:
+                with urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read().decode('utf-8') or '[]')
+            except HTTPError as e:
+                if e.code not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                    raise
+                retry_after = e.headers.get('Retry-After') if e.headers else None
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+            except URLError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = 2 ** attempt
+
+            attempt += 1
+            self._count('retries')
+            time.sleep(delay)
+
+    def validate_batch(self, lookups: List[Dict]) -> Dict[str, Tuple[Optional[Dict], Optional[str]]]:
+        """
+        Validate one batch (<= batch_size lookups) in a single request.
+
+        Returns:
+            {input_id: (best candidate or None, error message or None)}
+        """
+        body = []
+        for lookup in lookups:
+            item = {field: lookup[field] for field in LOOKUP_FIELDS if lookup.get(field)}
+            item['input_id'] = str(lookup['input_id'])
+            item['candidates'] = 1
+            item['match'] = self.match
+            body.append(item)
+
+        self._count('lookups', len(lookups))
+        ids = [str(lookup['input_id']) for lookup in lookups]
+
+        try:
+            candidates = self._post(body)
+        except HTTPError as e:
+            message = http_error_message(e.code, e.reason)
+            return {input_id: (None, message) for input_id in ids}
+        except (URLError, OSError, json.JSONDecodeError) as e:
+            return {input_id: (None, str(e)) for input_id in ids}
+
+        # Lookups without a match are simply absent from the response
+        results: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {
+            input_id: (None, None) for input_id in ids
+        }
+        for candidate in candidates:
+            index = candidate.get('input_index')
+            if index is not None and 0 <= index < len(ids) and results[ids[index]][0] is None:
+                results[ids[index]] = (candidate, None)
+
+        return results
+
+    def validate_all(self, lookups: Iterable[Dict]) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+        """
+        Validate any number of lookups, max_in_flight batches at a time.
+
+        Each lookup needs an 'input_id' (unique within the run) plus any of
+        street, street2, city, state, zipcode.
+
+        Yields:
+            (input_id, best candidate or None, error message or None),
+            in completion order
+        """
+        batches = self._batches(lookups)
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        try:
+            # Submit one batch as each completes, so a caller that stops early
+            # leaves at most max_in_flight (paid) requests behind
+            pending = {executor.submit(self.validate_batch, batch)
+                       for batch in islice(batches, self.max_in_flight)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = next(batches, None)
+                    if batch is not None:
+                        pending.add(executor.submit(self.validate_batch, batch))
+                    for input_id, (candidate, error) in future.result().items():
+                        yield input_id, candidate, error
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _batches(self, lookups: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Group lookups into batches of batch_size."""
+        batch: List[Dict] = []
+        for lookup in lookups:
+            batch.append(lookup)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
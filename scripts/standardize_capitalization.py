@@ -8,26 +8,62 @@ This script:
 - Title cases cities
 - Uppercases state codes
 - Handles special cases and business names
+
+Performance:
+- Rules are precompiled (sets and compiled regexes)
+- smart_title_case is LRU-memoized; cities, states and street names repeat heavily
+- Contacts are streamed through a server-side cursor instead of fetchall()
+- Changed values are batched into a temp table with execute_values and applied
+  with one UPDATE ... FROM (instead of one UPDATE per contact)
+- --incremental only scans contacts updated since the last live run; the
+  watermark is kept in job_watermarks (migration 20251203000001)
+
+Usage:
+    python3 scripts/standardize_capitalization.py                       # dry run, all contacts
+    python3 scripts/standardize_capitalization.py --live                # apply
+    python3 scripts/standardize_capitalization.py --live --incremental  # only changed since last run
 """
+import os
 import re
 import sys
+from functools import lru_cache
+
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+
+from job_watermarks import get_watermark, set_watermark
 
 DB_URL = "postgres://***REMOVED***@***REMOVED***:6543/postgres"
 DB_PASSWORD = os.getenv("DB_PASSWORD")  # SECURITY: No hardcoded credentials
 
 # Common business suffixes that should stay uppercase
-BUSINESS_SUFFIXES = ['LLC', 'LLP', 'PC', 'PA', 'INC', 'CORP', 'LTD']
+BUSINESS_SUFFIXES = frozenset(['LLC', 'LLP', 'PC', 'PA', 'INC', 'CORP', 'LTD'])
 
 # Direction abbreviations that should stay uppercase
-DIRECTIONS = ['NE', 'NW', 'SE', 'SW', 'N', 'S', 'E', 'W']
+DIRECTIONS = frozenset(['NE', 'NW', 'SE', 'SW', 'N', 'S', 'E', 'W'])
+
+# Words kept uppercase as-is
+UPPERCASE_WORDS = BUSINESS_SUFFIXES | DIRECTIONS | {'PO', 'P.O.'}
+
+O_PREFIX_RE = re.compile(r"^O'[a-z]")
+ORDINAL_RE = re.compile(r'^(\d+)(ST|ND|RD|TH)$', re.IGNORECASE)
+
+# Distinct strings remembered by smart_title_case
+TITLE_CASE_CACHE_SIZE = 65536
+
+# Rows per server-side cursor fetch / per execute_values insert
+SCAN_BATCH_SIZE = 2000
+WRITE_BATCH_SIZE = 1000
+
+# job_watermarks.job_name for --incremental
+WATERMARK_JOB = 'standardize_capitalization'
 
 # Street types that should be title case
 STREET_TYPES = ['Street', 'Avenue', 'Boulevard', 'Drive', 'Lane', 'Road', 'Court', 'Place',
                 'Circle', 'Way', 'Trail', 'Terrace', 'Parkway', 'Highway']
 
 
+@lru_cache(maxsize=TITLE_CASE_CACHE_SIZE)
 def smart_title_case(text):
     """
     Apply smart title casing with special handling for names and addresses
@@ -53,22 +89,13 @@ def smart_title_case(text):
             result.append(word)
             continue
 
-        # Check if it's a business suffix (should be uppercase)
-        if word.upper() in BUSINESS_SUFFIXES:
-            result.append(word.upper())
-            continue
-
-        # Check if it's a direction (should be uppercase)
-        if word.upper() in DIRECTIONS:
-            result.append(word.upper())
-            continue
-
-        # Handle PO Box specially
-        if word.upper() in ['PO', 'P.O.']:
-            result.append(word.upper())
+        # Business suffixes, directions and PO stay uppercase
+        upper = word.upper()
+        if upper in UPPERCASE_WORDS:
+            result.append(upper)
             continue
 
-        if word.lower() == 'box' and i > 0 and result[-1] in ['PO', 'P.O.']:
+        if word.lower() == 'box' and i > 0 and result[-1] in ('PO', 'P.O.'):
             result.append('Box')
             continue
 
@@ -82,7 +109,7 @@ def smart_title_case(text):
             word_titled = 'Mac' + word_titled[3].upper() + word_titled[4:]
 
         # Fix O' names (O'Brien not O'brien)
-        if re.match(r"^O'[a-z]", word_titled):
+        if O_PREFIX_RE.match(word_titled):
             word_titled = "O'" + word_titled[2].upper() + word_titled[3:]
 
         # Note: Removed overly aggressive De/Da/Di/Van/Von handling
@@ -90,7 +117,7 @@ def smart_title_case(text):
         # to avoid false positives like "Denver" -> "DeNver"
 
         # Fix ordinal numbers (1st, 2nd, 3rd not 1St, 2Nd, 3Rd)
-        ordinal_match = re.match(r'^(\d+)(ST|ND|RD|TH)$', word_titled, re.IGNORECASE)
+        ordinal_match = ORDINAL_RE.match(word_titled)
         if ordinal_match:
             word_titled = ordinal_match.group(1) + ordinal_match.group(2).lower()
 
@@ -143,12 +170,98 @@ def standardize_country(country):
     return smart_title_case(country.strip())
 
 
-def standardize_contacts(dry_run=True):
+# (column, standardizer, stats key, change label); None = updated but not reported
+FIELD_RULES = [
+    ('first_name', standardize_name, 'first_name_updated', 'first_name'),
+    ('last_name', standardize_name, 'last_name_updated', 'last_name'),
+    ('address_line_1', standardize_address, 'billing_address_updated', 'address'),
+    ('address_line_2', standardize_address, None, None),
+    ('city', standardize_city, 'billing_city_updated', 'city'),
+    ('state', standardize_state, 'billing_state_updated', 'state'),
+    ('country', standardize_country, None, None),
+    ('shipping_address_line_1', standardize_address, 'shipping_address_updated', 'shipping_address'),
+    ('shipping_address_line_2', standardize_address, None, None),
+    ('shipping_city', standardize_city, 'shipping_city_updated', 'shipping_city'),
+    ('shipping_state', standardize_state, 'shipping_state_updated', 'shipping_state'),
+    ('shipping_country', standardize_country, None, None),
+]
+
+FIELDS = [column for column, _, _, _ in FIELD_RULES]
+
+
+def standardize_contact(contact, stats):
+    """
+    Standardize one contact row
+
+    Args:
+        contact: Row with id and the FIELDS columns
+        stats: Counters, incremented per reported field
+
+    Returns:
+        (updates, changes): changed columns -> new value, and human-readable changes
+    """
+    updates = {}
+    changes = []
+
+    for column, standardize, stat_key, label in FIELD_RULES:
+        value = contact[column]
+        if not value:
+            continue
+        new_value = standardize(value)
+        if new_value != value:
+            updates[column] = new_value
+            if stat_key:
+                stats[stat_key] += 1
+                changes.append(f"{label}: '{value}' → '{new_value}'")
+
+    return updates, changes
+
+
+def create_staging_table(cur):
+    """Temp table of standardized values; NULL means leave the column unchanged"""
+    columns = ',\n'.join(f"            {column} TEXT" for column in FIELDS)
+    cur.execute(f"""
+        CREATE TEMP TABLE contact_standardization (
+            id UUID PRIMARY KEY,
+{columns}
+        ) ON COMMIT DROP
+    """)
+
+
+def stage_updates(cur, rows):
+    """Insert a batch of (id, *FIELDS) tuples into the staging table"""
+    execute_values(
+        cur,
+        f"INSERT INTO contact_standardization (id, {', '.join(FIELDS)}) VALUES %s",
+        rows,
+        template='(' + ', '.join(['%s::uuid'] + ['%s'] * len(FIELDS)) + ')',
+        page_size=len(rows)
+    )
+
+
+def apply_staged_updates(cur):
+    """One UPDATE ... FROM for every staged contact; returns rows updated"""
+    set_clauses = ',\n'.join(
+        f"            {column} = COALESCE(s.{column}, c.{column})" for column in FIELDS
+    )
+    cur.execute(f"""
+        UPDATE contacts c
+        SET
+{set_clauses},
+            updated_at = NOW()
+        FROM contact_standardization s
+        WHERE c.id = s.id
+    """)
+    return cur.rowcount
+
+
+def standardize_contacts(dry_run=True, incremental=False):
     """
     Standardize all contact names and addresses
 
     Args:
         dry_run: If True, only report what would be updated without making changes
+        incremental: Only scan contacts updated since the last live run
     """
     conn = psycopg2.connect(DB_URL, password=DB_PASSWORD)
     cur = conn.cursor(cursor_factory=RealDictCursor)
@@ -158,30 +271,39 @@ def standardize_contacts(dry_run=True):
     print(f"Mode: {'DRY RUN (no changes will be made)' if dry_run else 'LIVE UPDATE'}")
     print(f"{'=' * 100}\n")
 
+    # Same transaction as the updates, so NOW() in them equals this watermark
+    cur.execute("SELECT NOW() AS started_at")
+    started_at = cur.fetchone()['started_at']
+
+    watermark = get_watermark(cur, WATERMARK_JOB) if incremental else None
+    if incremental:
+        if watermark:
+            print(f"Incremental: contacts updated after {watermark}\n")
+        else:
+            print("Incremental: no previous run recorded, scanning all contacts\n")
+
     print("Step 1: Finding contacts that need standardization...\n")
 
-    # Get all contacts
-    cur.execute("""
+    # Stream contacts through a server-side cursor
+    scan = conn.cursor(name='standardize_contacts_scan', cursor_factory=RealDictCursor)
+    scan.itersize = SCAN_BATCH_SIZE
+    scan.execute(f"""
         SELECT
             id, email,
-            first_name, last_name,
-            address_line_1, address_line_2, city, state, postal_code, country,
-            shipping_address_line_1, shipping_address_line_2,
-            shipping_city, shipping_state, shipping_postal_code, shipping_country
+            {', '.join(FIELDS)}
         FROM contacts
         WHERE
-            (first_name IS NOT NULL AND first_name != '')
-            OR (last_name IS NOT NULL AND last_name != '')
-            OR (address_line_1 IS NOT NULL AND address_line_1 != '')
-            OR (city IS NOT NULL AND city != '')
-            OR (shipping_address_line_1 IS NOT NULL AND shipping_address_line_1 != '')
-            OR (shipping_city IS NOT NULL AND shipping_city != '')
+            (
+                (first_name IS NOT NULL AND first_name != '')
+                OR (last_name IS NOT NULL AND last_name != '')
+                OR (address_line_1 IS NOT NULL AND address_line_1 != '')
+                OR (city IS NOT NULL AND city != '')
+                OR (shipping_address_line_1 IS NOT NULL AND shipping_address_line_1 != '')
+                OR (shipping_city IS NOT NULL AND shipping_city != '')
+            )
+            AND (%(watermark)s::timestamptz IS NULL OR updated_at > %(watermark)s::timestamptz)
         ORDER BY email
-    """)
-
-    contacts = cur.fetchall()
-
-    print(f"Analyzing {len(contacts):,} contacts...\n")
+    """, {'watermark': watermark})
 
     # Statistics
     stats = {
@@ -198,101 +320,17 @@ def standardize_contacts(dry_run=True):
     }
 
     sample_updates = []
+    pending = []
+
+    if not dry_run:
+        create_staging_table(cur)
 
     # Process each contact
-    for contact in contacts:
+    for contact in scan:
         stats['total_processed'] += 1
 
-        updates = {}
-        changes = []
-
-        # Check first name
-        if contact['first_name']:
-            new_first = standardize_name(contact['first_name'])
-            if new_first != contact['first_name']:
-                updates['first_name'] = new_first
-                changes.append(f"first_name: '{contact['first_name']}' → '{new_first}'")
-                stats['first_name_updated'] += 1
-
-        # Check last name
-        if contact['last_name']:
-            new_last = standardize_name(contact['last_name'])
-            if new_last != contact['last_name']:
-                updates['last_name'] = new_last
-                changes.append(f"last_name: '{contact['last_name']}' → '{new_last}'")
-                stats['last_name_updated'] += 1
-
-        # Check billing address
-        if contact['address_line_1']:
-            new_addr = standardize_address(contact['address_line_1'])
-            if new_addr != contact['address_line_1']:
-                updates['address_line_1'] = new_addr
-                changes.append(f"address: '{contact['address_line_1']}' → '{new_addr}'")
-                stats['billing_address_updated'] += 1
-
-        if contact['address_line_2']:
-            new_addr2 = standardize_address(contact['address_line_2'])
-            if new_addr2 != contact['address_line_2']:
-                updates['address_line_2'] = new_addr2
-
-        # Check billing city
-        if contact['city']:
-            new_city = standardize_city(contact['city'])
-            if new_city != contact['city']:
-                updates['city'] = new_city
-                changes.append(f"city: '{contact['city']}' → '{new_city}'")
-                stats['billing_city_updated'] += 1
-
-        # Check billing state
-        if contact['state']:
-            new_state = standardize_state(contact['state'])
-            if new_state != contact['state']:
-                updates['state'] = new_state
-                changes.append(f"state: '{contact['state']}' → '{new_state}'")
-                stats['billing_state_updated'] += 1
-
-        # Check billing country
-        if contact['country']:
-            new_country = standardize_country(contact['country'])
-            if new_country != contact['country']:
-                updates['country'] = new_country
-
-        # Check shipping address
-        if contact['shipping_address_line_1']:
-            new_ship = standardize_address(contact['shipping_address_line_1'])
-            if new_ship != contact['shipping_address_line_1']:
-                updates['shipping_address_line_1'] = new_ship
-                changes.append(f"shipping_address: '{contact['shipping_address_line_1']}' → '{new_ship}'")
-                stats['shipping_address_updated'] += 1
-
-        if contact['shipping_address_line_2']:
-            new_ship2 = standardize_address(contact['shipping_address_line_2'])
-            if new_ship2 != contact['shipping_address_line_2']:
-                updates['shipping_address_line_2'] = new_ship2
-
-        # Check shipping city
-        if contact['shipping_city']:
-            new_ship_city = standardize_city(contact['shipping_city'])
-            if new_ship_city != contact['shipping_city']:
-                updates['shipping_city'] = new_ship_city
-                changes.append(f"shipping_city: '{contact['shipping_city']}' → '{new_ship_city}'")
-                stats['shipping_city_updated'] += 1
-
-        # Check shipping state
-        if contact['shipping_state']:
-            new_ship_state = standardize_state(contact['shipping_state'])
-            if new_ship_state != contact['shipping_state']:
-                updates['shipping_state'] = new_ship_state
-                changes.append(f"shipping_state: '{contact['shipping_state']}' → '{new_ship_state}'")
-                stats['shipping_state_updated'] += 1
-
-        # Check shipping country
-        if contact['shipping_country']:
-            new_ship_country = standardize_country(contact['shipping_country'])
-            if new_ship_country != contact['shipping_country']:
-                updates['shipping_country'] = new_ship_country
-
-        # If there are updates to make, execute them
+        updates, changes = standardize_contact(contact, stats)
+
         if updates:
             stats['contacts_updated'] += 1
 
@@ -303,24 +341,27 @@ def standardize_contacts(dry_run=True):
                 })
 
             if not dry_run:
-                # Build UPDATE query dynamically
-                set_clauses = ', '.join([f"{key} = %s" for key in updates.keys()])
-                values = list(updates.values())
-                values.append(contact['id'])
+                pending.append((contact['id'],) + tuple(updates.get(column) for column in FIELDS))
+                if len(pending) >= WRITE_BATCH_SIZE:
+                    stage_updates(cur, pending)
+                    pending = []
 
-                update_query = f"""
-                    UPDATE contacts
-                    SET {set_clauses}, updated_at = NOW()
-                    WHERE id = %s
-                """
+        if stats['total_processed'] % 10000 == 0:
+            print(f"  Analyzed {stats['total_processed']:,} contacts...")
 
-                cur.execute(update_query, values)
+    scan.close()
+    print(f"Analyzed {stats['total_processed']:,} contacts\n")
 
     # Commit if not dry run
     if not dry_run:
+        if pending:
+            stage_updates(cur, pending)
+        updated = apply_staged_updates(cur) if stats['contacts_updated'] else 0
+        set_watermark(cur, WATERMARK_JOB, started_at)
         conn.commit()
-        print("✓ Changes committed to database\n")
+        print(f"✓ Changes committed to database ({updated:,} contacts)\n")
     else:
+        conn.rollback()
         print("ℹ DRY RUN - No changes were made\n")
 
     # Print statistics
@@ -338,6 +379,8 @@ def standardize_contacts(dry_run=True):
     print(f"  Shipping addresses: {stats['shipping_address_updated']:,}")
     print(f"  Shipping cities: {stats['shipping_city_updated']:,}")
     print(f"  Shipping states: {stats['shipping_state_updated']:,}")
+    cache = smart_title_case.cache_info()
+    print(f"\nTitle-case cache: {cache.hits:,} hits, {cache.misses:,} misses")
     print()
 
     # Show samples
@@ -352,7 +395,7 @@ def standardize_contacts(dry_run=True):
                 print(f"   {change}")
             print()
 
-        if len(sample_updates) > 30:
+        if stats['contacts_updated'] > 30:
             print(f"... and {stats['contacts_updated'] - 30} more contacts")
 
     cur.close()
@@ -367,10 +410,12 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Standardize contact name and address capitalization')
     parser.add_argument('--live', action='store_true',
                        help='Run in LIVE mode (default is DRY RUN)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only process contacts updated since the last live run')
     args = parser.parse_args()
 
     try:
-        stats = standardize_contacts(dry_run=not args.live)
+        stats = standardize_contacts(dry_run=not args.live, incremental=args.incremental)
 
         if not args.live and stats['contacts_updated'] > 0:
             print(f"{'=' * 100}")
@@ -0,0 +1,133 @@
+"""
+Streaming CSV export engine shared by the mailing-list and vendor exports.
+
+The export scripts used to fetchall() the whole result into RealDictRow
+dicts, build a second list of output rows, and only then open the CSV.
+Memory grew with the list and nothing reached disk until the last row had
+been fetched. The helpers here stream instead:
+
+  - copy_query_to_csv(): COPY (query) TO STDOUT WITH CSV HEADER written
+    straight into the output file. For exports whose columns need no Python
+    formatting.
+  - export_query_to_csv(): rows from a named (server-side) cursor fetched
+    itersize at a time, passed through a per-row transform and written with
+    csv.DictWriter as they arrive. The header is flushed before the query
+    runs. A transform may return None to drop a row, and it can update
+    running counters for the summary the script prints afterwards.
+
+Both keep memory constant in the size of the list.
+
+Usage:
+    from streaming_export import copy_query_to_csv, export_query_to_csv
+
+    count = copy_query_to_csv(conn, "SELECT id, email FROM contacts", '/tmp/out.csv')
+
+    count = export_query_to_csv(conn, query, '/tmp/out.csv', fieldnames,
+                                transform=format_row, params=params)
+"""
+import csv
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from psycopg2.extras import RealDictCursor
+
+# Rows fetched per server-side cursor round trip
+EXPORT_ITERSIZE = 5000
+
+
+def stream_rows(conn, query: str, params: Optional[Sequence[Any]] = None,
+                name: str = 'export_stream', itersize: int = EXPORT_ITERSIZE) -> Iterator[Dict[str, Any]]:
+    """Yield dict rows from a named (server-side) cursor, itersize per fetch."""
+    cur = conn.cursor(name=name, cursor_factory=RealDictCursor)
+    cur.itersize = itersize
+    try:
+        cur.execute(query, params)
+        for row in cur:
+            yield row
+    finally:
+        cur.close()
+
+
+def copy_query_to_csv(conn, query: str, output_file: str,
+                      params: Optional[Sequence[Any]] = None, header: bool = True) -> int:
+    """
+    Write a query's result to a CSV file with COPY ... TO STDOUT.
+
+    Column names (or aliases) become the header; NULLs are written as
+    empty fields.
+
+    Returns:
+        Number of rows written
+    """
+    cur = conn.cursor()
+    try:
+        if params is not None:
+            query = cur.mogrify(query, params).decode()
+        options = 'CSV HEADER' if header else 'CSV'
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            cur.copy_expert(f"COPY ({query}) TO STDOUT WITH {options}", f)
+        return cur.rowcount
+    finally:
+        cur.close()
+
+
+def write_csv_rows(rows: Iterator[Dict[str, Any]], output_file: str, fieldnames: List[str],
+                   transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None) -> int:
+    """
+    Write rows to a CSV file as they are produced.
+
+    Args:
+        rows: Source rows (any iterator of dicts)
+        output_file: Path to output CSV file
+        fieldnames: CSV columns, in order
+        transform: Per-row function returning the output dict, or None to skip
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        f.flush()
+
+        for row in rows:
+            out = transform(row) if transform else row
+            if out is None:
+                continue
+            writer.writerow(out)
+            written += 1
+    return written
+
+
+def export_query_to_csv(conn, query: str, output_file: str, fieldnames: List[str],
+                        transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+                        params: Optional[Sequence[Any]] = None, itersize: int = EXPORT_ITERSIZE) -> int:
+    """
+    Stream a query through a per-row transform into a CSV file.
+
+    Args:
+        conn: Database connection (not autocommit; named cursors need a transaction)
+        query: SELECT to export
+        output_file: Path to output CSV file
+        fieldnames: CSV columns, in order
+        transform: Per-row function returning the output dict, or None to skip
+        params: Query parameters
+        itersize: Rows per server-side fetch
+
+    Returns:
+        Number of rows written
+    """
+    rows = stream_rows(conn, query, params, itersize=itersize)
+    return write_csv_rows(rows, output_file, fieldnames, transform)
+
+
+class SampleRows:
+    """Keep the first N output rows for a summary printout."""
+
+    def __init__(self, size: int = 5):
+        self.size = size
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, row: Dict[str, Any]) -> None:
+        if len(self.rows) < self.size:
+            self.rows.append(row)
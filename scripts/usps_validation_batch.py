@@ -0,0 +1,149 @@
+"""
+Batched write of USPS validation results onto contacts.
+
+The import_usps_validation* scripts used to issue one UPDATE per validated
+row and commit every few dozen rows. They now collect (key, validation)
+pairs and hand them to write_usps_validations(), which applies every row
+with a single UPDATE ... FROM (VALUES ...) statement and returns the keys
+that matched a contact.
+
+The statement runs under a savepoint. If a row is rejected (bad coordinate,
+constraint violation), the chunk is rolled back, split in half and each half
+retried, down to single rows, so one bad row costs a few extra statements
+instead of the whole file. Rejected rows are returned with their errors.
+
+Usage:
+    from usps_validation_batch import print_failures, write_usps_validations
+
+    updated, failed = write_usps_validations(cursor, [(email, validation), ...],
+                                             address_type='shipping', key_column='email')
+    print_failures(failed)
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from db_config import bisect_write
+
+ADDRESS_TYPES = ('billing', 'shipping')
+
+# Key column -> cast applied to the VALUES key so the comparison uses the
+# column's own index (contacts.email is citext)
+KEY_CASTS = {
+    'id': 'uuid',
+    'email': 'citext',
+}
+
+# (VALUES column, contacts column suffix, cast)
+USPS_COLUMNS = [
+    ('dpv_match_code', 'usps_dpv_match_code', 'text'),
+    ('precision_code', 'usps_precision', 'text'),
+    ('delivery_line_1', 'usps_delivery_line_1', 'text'),
+    ('delivery_line_2', 'usps_delivery_line_2', 'text'),
+    ('last_line', 'usps_last_line', 'text'),
+    ('latitude', 'usps_latitude', 'double precision'),
+    ('longitude', 'usps_longitude', 'double precision'),
+    ('county', 'usps_county', 'text'),
+    ('rdi', 'usps_rdi', 'text'),
+    ('footnotes', 'usps_footnotes', 'text'),
+    ('vacant', 'usps_vacant', 'boolean'),
+    ('active', 'usps_active', 'boolean'),
+    ('verified', 'address_verified', 'boolean'),
+]
+
+
+def _coordinate(value) -> Optional[float]:
+    """Latitude/longitude as float (None when blank or unparseable)."""
+    if value is None or isinstance(value, float):
+        return value
+    try:
+        return float(value) if str(value).strip() else None
+    except (ValueError, TypeError):
+        return None
+
+
+def usps_values(validation: dict) -> tuple:
+    """Column values for one validation row, in USPS_COLUMNS order."""
+    return (
+        validation['dpv_match_code'] or None,
+        validation['precision'] or None,
+        validation['delivery_line_1'] or None,
+        validation['delivery_line_2'] or None,
+        validation['last_line'] or None,
+        _coordinate(validation['latitude']),
+        _coordinate(validation['longitude']),
+        validation['county_name'] or None,
+        validation['rdi'] or None,
+        validation['notes'] or validation['summary'],
+        validation['dpv_vacant'],
+        validation['active'],
+        validation['dpv_match_code'] == 'Y',
+    )
+
+
+def build_update_sql(address_type: str = 'billing', key_column: str = 'id') -> Tuple[str, str]:
+    """UPDATE ... FROM (VALUES %s) statement and execute_values template."""
+    if address_type not in ADDRESS_TYPES:
+        raise ValueError(f"address_type must be one of {ADDRESS_TYPES}, got {address_type!r}")
+    if key_column not in KEY_CASTS:
+        raise ValueError(f"key_column must be one of {tuple(KEY_CASTS)}, got {key_column!r}")
+
+    assignments = ',\n            '.join(
+        f"{address_type}_{column} = v.{alias}" for alias, column, _ in USPS_COLUMNS
+    )
+    aliases = ', '.join(alias for alias, _, _ in USPS_COLUMNS)
+
+    sql = f"""
+        UPDATE contacts c
+        SET
+            {address_type}_usps_validated_at = NOW(),
+            {assignments},
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(match_key, {aliases})
+        WHERE c.{key_column} = v.match_key::{KEY_CASTS[key_column]}
+        RETURNING v.match_key
+    """
+    template = '(%s, ' + ', '.join(f'%s::{cast}' for _, _, cast in USPS_COLUMNS) + ')'
+    return sql, template
+
+
+def write_usps_validations(cursor, updates: Iterable[Tuple[str, dict]],
+                           address_type: str = 'billing',
+                           key_column: str = 'id') -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Apply USPS validation results to contacts, bisecting around bad rows.
+
+    Args:
+        cursor: Database cursor inside a transaction (the caller commits)
+        updates: (key, validation) pairs; when a key repeats, the last row wins
+        address_type: 'billing' or 'shipping' column set
+        key_column: 'id' or 'email'
+
+    Returns:
+        (keys that matched a contact and were updated, [(key, error)] for rejected rows)
+    """
+    sql, template = build_update_sql(address_type, key_column)
+
+    rows = {}
+    for key, validation in updates:
+        rows[str(key)] = (str(key),) + usps_values(validation)
+
+    results, rejected = bisect_write(
+        cursor, list(rows.values()),
+        lambda chunk: execute_values(cursor, sql, chunk, template=template,
+                                     page_size=len(chunk), fetch=True),
+        'usps_batch', errors=(psycopg2.Error,))
+
+    updated = [row['match_key'] if isinstance(row, dict) else row[0]
+               for returned in results for row in returned]
+    failed = [(row[0], str(e).strip()) for row, e in rejected]
+    return updated, failed
+
+
+def print_failures(failed: List[Tuple[str, str]], limit: int = 10) -> None:
+    """Print rows the database rejected (first `limit` of them)."""
+    for key, error in failed[:limit]:
+        print(f"  ✗ Rejected {key}: {error}")
+    if len(failed) > limit:
+        print(f"  ... and {len(failed) - limit} more rejected rows")
@@ -17,8 +17,9 @@ To get started:
 
 This script:
 - Validates addresses using SmartyStreets US Street API
-- Rate limit: Up to 250/sec (we'll use 10/sec to be safe)
-- Saves progress after every 10 records (resumable)
+- Sends batches of up to 100 lookups per request, several in flight at once
+  (shared SmartyClient, token-bucket limited to 10 requests/sec)
+- Journals every result as it arrives (resumable)
 - Returns full USPS data including DPV, geocoding, county, RDI, etc.
 """
 
@@ -26,161 +27,129 @@ import csv
 import os
 import sys
 import time
-import json
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from smarty_client import SmartyClient
+from checkpoint_journal import open_checkpoint
 
 # SmartyStreets API Configuration
-SMARTY_API_URL = "https://us-street.api.smarty.com/street-address"
 SMARTY_AUTH_ID = os.getenv("SMARTY_AUTH_ID", "")
 SMARTY_AUTH_TOKEN = os.getenv("SMARTY_AUTH_TOKEN", "")
 
-# Rate limiting: 10 requests per second (conservative)
+# Rate limiting: 10 batch requests (up to 100 lookups each) per second, 4 in flight
 REQUESTS_PER_SECOND = 10
-DELAY_BETWEEN_REQUESTS = 1.0 / REQUESTS_PER_SECOND
+MAX_IN_FLIGHT = 4
+
+def build_lookup(address_data):
+    """Smarty lookup for one input row (input_id = sequence)."""
+    return {
+        'input_id': address_data['sequence'],
+        'street': address_data['addressline1'],
+        'street2': address_data.get('addressline2', ''),
+        'city': address_data['city'],
+        'state': address_data['state'],
+        'zipcode': address_data['postalcode'][:5],
+    }
 
-def validate_address_smarty(auth_id, auth_token, sequence, address_data):
+def parse_smarty_result(sequence, result, error=None):
     """
-    Validate a single address using SmartyStreets US Street API.
+    Turn Smarty's best candidate (or the error) into an output row.
 
     Returns dict with validation results or error information.
     """
-
-    try:
-        # Build request parameters
-        params = {
-            'auth-id': auth_id,
-            'auth-token': auth_token,
-            'street': address_data['addressline1'],
-            'city': address_data['city'],
-            'state': address_data['state'],
-            'zipcode': address_data['postalcode'][:5],
-            'candidates': '1',  # Return best match only
-            'match': 'strict'   # Strict matching
-        }
-
-        if address_data.get('addressline2'):
-            params['street2'] = address_data['addressline2']
-
-        # Make API request
-        url = f"{SMARTY_API_URL}?{urlencode(params)}"
-        request = Request(url)
-        request.add_header('User-Agent', 'StarHouse-CRM/1.0')
-
-        response = urlopen(request, timeout=10)
-        response_data = response.read().decode('utf-8')
-        results = json.loads(response_data)
-
-        # Check if we got results
-        if not results or len(results) == 0:
-            return {
-                'sequence': sequence,
-                'ValidationFlag': 'ERROR',
-                '[summary]': 'Address not found',
-                'error_message': 'No match found',
-                'success': False
-            }
-
-        # Parse the first (best) result
-        result = results[0]
-        components = result.get('components', {})
-        metadata = result.get('metadata', {})
-        analysis = result.get('analysis', {})
-
-        # Get DPV match code
-        dpv_match_code = analysis.get('dpv_match_code', 'N')  # Y, N, S, D
-        dpv_vacant = analysis.get('dpv_vacant', 'N')  # Y or N
-
-        # Build delivery lines
-        delivery_line_1 = result.get('delivery_line_1', '')
-        delivery_line_2 = result.get('delivery_line_2', '')
-        last_line = result.get('last_line', '')
-
-        # Get full zipcode
-        zip5 = components.get('zipcode', '')
-        zip4 = components.get('plus4_code', '')
-        if zip4:
-            full_zipcode = f"{zip5}-{zip4}"
-        else:
-            full_zipcode = zip5
-
-        # Get geocoding
-        latitude = metadata.get('latitude', '')
-        longitude = metadata.get('longitude', '')
-        precision = metadata.get('precision', '')  # Zip9, Zip8, Zip7, etc.
-
-        # Get county
-        county_name = metadata.get('county_name', '')
-
-        # Get RDI (Residential Delivery Indicator)
-        rdi = metadata.get('rdi', '')  # Residential, Commercial, or empty
-
-        # Get footnotes
-        footnotes = analysis.get('dpv_footnotes', '')
-
-        # Check if active
-        active_flag = analysis.get('active', 'Y')  # Y or N
-
-        # Build notes/summary
-        notes_parts = []
-        if footnotes:
-            notes_parts.append(f"DPV: {footnotes}")
-        if analysis.get('dpv_cmra') == 'Y':
-            notes_parts.append("CMRA (mail receiving agency)")
-        if analysis.get('ews_match') == 'true':
-            notes_parts.append("EWS: Early Warning System match")
-
-        notes = '; '.join(notes_parts) if notes_parts else ''
-
-        # Determine validation flag
-        validation_flag = 'OK' if dpv_match_code in ['Y', 'S', 'D'] else 'ERROR'
-
-        return {
-            '[sequence]': sequence,
-            'ValidationFlag': validation_flag,
-            '[summary]': f"DPV: {dpv_match_code}",
-            '[delivery_line_1]': delivery_line_1,
-            '[delivery_line_2]': delivery_line_2,
-            '[city_name]': components.get('city_name', ''),
-            '[state_abbreviation]': components.get('state_abbreviation', ''),
-            '[full_zipcode]': full_zipcode,
-            '[notes]': notes,
-            '[county_name]': county_name,
-            '[rdi]': rdi,
-            '[latitude]': str(latitude) if latitude else '',
-            '[longitude]': str(longitude) if longitude else '',
-            '[precision]': precision,
-            '[dpv_match_code]': dpv_match_code,
-            '[dpv_vacant]': dpv_vacant,
-            '[active]': active_flag,
-            '[last_line]': last_line,
-            'success': True
-        }
-
-    except HTTPError as e:
-        error_msg = f"HTTP {e.code}: {e.reason}"
-        if e.code == 401:
-            error_msg = "Authentication failed - check your auth ID and token"
-        elif e.code == 402:
-            error_msg = "Payment required - you've exceeded your free tier"
+    if error:
         return {
             '[sequence]': sequence,
             'ValidationFlag': 'ERROR',
-            '[summary]': error_msg,
-            'error_message': error_msg,
+            '[summary]': error,
+            'error_message': error,
             'success': False
         }
 
-    except (URLError, json.JSONDecodeError) as e:
+    # Check if we got results
+    if not result:
         return {
             '[sequence]': sequence,
             'ValidationFlag': 'ERROR',
-            '[summary]': str(e),
-            'error_message': str(e),
+            '[summary]': 'Address not found',
+            'error_message': 'No match found',
             'success': False
         }
 
+    components = result.get('components', {})
+    metadata = result.get('metadata', {})
+    analysis = result.get('analysis', {})
+
+    # Get DPV match code
+    dpv_match_code = analysis.get('dpv_match_code', 'N')  # Y, N, S, D
+    dpv_vacant = analysis.get('dpv_vacant', 'N')  # Y or N
+
+    # Build delivery lines
+    delivery_line_1 = result.get('delivery_line_1', '')
+    delivery_line_2 = result.get('delivery_line_2', '')
+    last_line = result.get('last_line', '')
+
+    # Get full zipcode
+    zip5 = components.get('zipcode', '')
+    zip4 = components.get('plus4_code', '')
+    if zip4:
+        full_zipcode = f"{zip5}-{zip4}"
+    else:
+        full_zipcode = zip5
+
+    # Get geocoding
+    latitude = metadata.get('latitude', '')
+    longitude = metadata.get('longitude', '')
+    precision = metadata.get('precision', '')  # Zip9, Zip8, Zip7, etc.
+
+    # Get county
+    county_name = metadata.get('county_name', '')
+
+    # Get RDI (Residential Delivery Indicator)
+    rdi = metadata.get('rdi', '')  # Residential, Commercial, or empty
+
+    # Get footnotes
+    footnotes = analysis.get('dpv_footnotes', '')
+
+    # Check if active
+    active_flag = analysis.get('active', 'Y')  # Y or N
+
+    # Build notes/summary
+    notes_parts = []
+    if footnotes:
+        notes_parts.append(f"DPV: {footnotes}")
+    if analysis.get('dpv_cmra') == 'Y':
+        notes_parts.append("CMRA (mail receiving agency)")
+    if analysis.get('ews_match') == 'true':
+        notes_parts.append("EWS: Early Warning System match")
+
+    notes = '; '.join(notes_parts) if notes_parts else ''
+
+    # Determine validation flag
+    validation_flag = 'OK' if dpv_match_code in ['Y', 'S', 'D'] else 'ERROR'
+
+    return {
+        '[sequence]': sequence,
+        'ValidationFlag': validation_flag,
+        '[summary]': f"DPV: {dpv_match_code}",
+        '[delivery_line_1]': delivery_line_1,
+        '[delivery_line_2]': delivery_line_2,
+        '[city_name]': components.get('city_name', ''),
+        '[state_abbreviation]': components.get('state_abbreviation', ''),
+        '[full_zipcode]': full_zipcode,
+        '[notes]': notes,
+        '[county_name]': county_name,
+        '[rdi]': rdi,
+        '[latitude]': str(latitude) if latitude else '',
+        '[longitude]': str(longitude) if longitude else '',
+        '[precision]': precision,
+        '[dpv_match_code]': dpv_match_code,
+        '[dpv_vacant]': dpv_vacant,
+        '[active]': active_flag,
+        '[last_line]': last_line,
+        'success': True
+    }
+
 def read_input_csv(filepath):
     """Read the input CSV with addresses to validate."""
     addresses = []
@@ -209,18 +178,6 @@ def write_output_csv(filepath, results):
         writer.writeheader()
         writer.writerows(results)
 
-def load_progress(progress_file):
-    """Load previously validated results to resume."""
-    if not os.path.exists(progress_file):
-        return []
-
-    results = []
-    with open(progress_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            results.append(row)
-    return results
-
 def main():
     """Main validation function."""
 
@@ -247,7 +204,7 @@ def main():
     # File paths
     input_file = '/tmp/shipping_addresses_for_validation.csv'
     output_file = '/tmp/shipping_addresses_validated.csv'
-    progress_file = '/tmp/smarty_validation_progress.csv'
+    progress_file = '/tmp/smarty_validation_progress.jsonl'
 
     # Allow override via command line
     if len(sys.argv) >= 2:
@@ -266,7 +223,7 @@ def main():
     print(f"Input file:     {input_file}")
     print(f"Output file:    {output_file}")
     print(f"Progress file:  {progress_file}")
-    print(f"Rate limit:     {REQUESTS_PER_SECOND} requests/second")
+    print(f"Rate limit:     {REQUESTS_PER_SECOND} requests/second, {MAX_IN_FLIGHT} in flight")
     print()
 
     # Read input addresses
@@ -276,21 +233,26 @@ def main():
 
     # Load previous progress
     print("Checking for previous progress...")
-    previous_results = load_progress(progress_file)
-    completed_sequences = {int(r['[sequence]']) for r in previous_results if r.get('[sequence]', '').strip()}
+    journal = open_checkpoint(progress_file, key='[sequence]')
+    previous_results = journal.records()
 
     if previous_results:
         print(f"  ✓ Found {len(previous_results)} previously validated addresses")
-        print(f"  → Will resume from address #{len(previous_results) + 1}")
     else:
         print("  → Starting fresh validation")
     print()
 
+    pending = {
+        str(int(address['sequence'])): address
+        for address in addresses
+        if int(address['sequence']) not in journal
+    }
+
     # Statistics
     stats = {
         'total': len(addresses),
-        'completed': len(previous_results),
-        'remaining': len(addresses) - len(previous_results),
+        'completed': len(addresses) - len(pending),
+        'remaining': len(pending),
         'successful': sum(1 for r in previous_results if r['ValidationFlag'] == 'OK'),
         'failed': sum(1 for r in previous_results if r['ValidationFlag'] == 'ERROR')
     }
@@ -306,49 +268,49 @@ def main():
     print(f"Progress: {stats['completed']}/{stats['total']} | Success: {stats['successful']} | Failed: {stats['failed']}")
     print("-" * 70)
 
-    results = previous_results.copy()
+    client = SmartyClient(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN,
+                          requests_per_second=REQUESTS_PER_SECOND,
+                          max_in_flight=MAX_IN_FLIGHT)
     start_time = time.time()
-
-    for i, address in enumerate(addresses, 1):
-        sequence = int(address['sequence'])
-
-        # Skip if already validated
-        if sequence in completed_sequences:
-            continue
-
-        # Validate address
-        result = validate_address_smarty(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN, sequence, address)
-        results.append(result)
-
-        # Update stats
-        stats['completed'] += 1
-        stats['remaining'] -= 1
-        if result['success'] and result['ValidationFlag'] == 'OK':
-            stats['successful'] += 1
-        else:
-            stats['failed'] += 1
-
-        # Print progress
-        if stats['completed'] % 10 == 0 or not result['success']:
-            elapsed = time.time() - start_time
-            rate = (stats['completed'] - len(previous_results)) / elapsed if elapsed > 0 else 0
-            eta_seconds = stats['remaining'] / rate if rate > 0 else 0
-            eta_minutes = eta_seconds / 60
-
-            status = "✓" if result['success'] else "✗"
-            print(f"  {status} [{stats['completed']}/{stats['total']}] "
-                  f"Success: {stats['successful']} | Failed: {stats['failed']} | "
-                  f"Rate: {rate:.1f}/sec | ETA: {eta_minutes:.1f}min")
-
-            # Save progress every 10 records
-            write_output_csv(progress_file, results)
-
-        # Rate limiting
-        time.sleep(DELAY_BETWEEN_REQUESTS)
+    validated_this_run = 0
+    errors = []
+
+    with journal:
+        lookups = (build_lookup(address) for address in pending.values())
+        for input_id, candidate, error in client.validate_all(lookups):
+            result = parse_smarty_result(int(input_id), candidate, error)
+            validated_this_run += 1
+
+            # Only journal real answers so API errors are retried on resume
+            if error:
+                errors.append(result)
+            else:
+                journal.append(result)
+
+            # Update stats
+            stats['completed'] += 1
+            stats['remaining'] -= 1
+            if result['success'] and result['ValidationFlag'] == 'OK':
+                stats['successful'] += 1
+            else:
+                stats['failed'] += 1
+
+            # Print progress
+            if validated_this_run % 100 == 0 or stats['remaining'] == 0:
+                elapsed = time.time() - start_time
+                rate = validated_this_run / elapsed if elapsed > 0 else 0
+                eta_seconds = stats['remaining'] / rate if rate > 0 else 0
+                eta_minutes = eta_seconds / 60
+
+                print(f"  ✓ [{stats['completed']}/{stats['total']}] "
+                      f"Success: {stats['successful']} | Failed: {stats['failed']} | "
+                      f"Rate: {rate:.1f}/sec | ETA: {eta_minutes:.1f}min")
+
+        results = journal.records() + errors
 
     # Final save
+    results.sort(key=lambda r: int(r['[sequence]']))
     write_output_csv(output_file, results)
-    write_output_csv(progress_file, results)
 
     # Print final statistics
     elapsed_total = time.time() - start_time
@@ -361,6 +323,7 @@ def main():
     print(f"Failed validation:      {stats['failed']}")
     print(f"Success rate:           {stats['successful']/stats['total']*100:.1f}%")
     print(f"Time elapsed:           {elapsed_total/60:.1f} minutes")
+    print(f"API requests:           {client.stats['requests']} ({client.stats['retries']} retries)")
     print()
     print(f"Output saved to: {output_file}")
     print()
@@ -13,7 +13,7 @@ Requirements:
 This script:
 - Reads addresses from CSV
 - Validates them one by one with rate limiting
-- Saves progress after every 10 records (resumable)
+- Journals every result as it finishes (resumable)
 - Outputs validation results in the expected format
 """
 
@@ -26,6 +26,9 @@ from urllib.parse import urlencode, quote
 from urllib.request import urlopen
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from checkpoint_journal import open_checkpoint
+
 # USPS Web Tools API Configuration
 USPS_API_URL = "https://secure.shippingapis.com/ShippingAPI.dll"
 USPS_USER_ID = os.getenv("USPS_USER_ID", "")
@@ -73,7 +76,7 @@ def validate_address_usps(user_id, sequence, address_data):
         if error is not None:
             error_desc = error.find('Description')
             return {
-                'sequence': sequence,
+                '[sequence]': sequence,
                 'ValidationFlag': 'ERROR',
                 'error_message': error_desc.text if error_desc is not None else 'Unknown error',
                 'success': False
@@ -83,7 +86,7 @@ def validate_address_usps(user_id, sequence, address_data):
         address = root.find('.//Address')
         if address is None:
             return {
-                'sequence': sequence,
+                '[sequence]': sequence,
                 'ValidationFlag': 'ERROR',
                 'error_message': 'No address in response',
                 'success': False
@@ -133,7 +136,7 @@ def validate_address_usps(user_id, sequence, address_data):
         active = 'Y' if dpv_code in ['Y', 'S', 'D'] else 'N'
 
         return {
-            'sequence': sequence,
+            '[sequence]': sequence,
             'ValidationFlag': 'OK' if dpv_code in ['Y', 'S', 'D'] else 'ERROR',
             '[summary]': f"DPV: {dpv_code}",
             '[delivery_line_1]': delivery_line_1,
@@ -156,7 +159,7 @@ def validate_address_usps(user_id, sequence, address_data):
 
     except Exception as e:
         return {
-            'sequence': sequence,
+            '[sequence]': sequence,
             'ValidationFlag': 'ERROR',
             'error_message': str(e),
             'success': False
@@ -190,18 +193,6 @@ def write_output_csv(filepath, results):
         writer.writeheader()
         writer.writerows(results)
 
-def load_progress(progress_file):
-    """Load previously validated results to resume."""
-    if not os.path.exists(progress_file):
-        return []
-
-    results = []
-    with open(progress_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            results.append(row)
-    return results
-
 def main():
     """Main validation function."""
 
@@ -224,7 +215,7 @@ def main():
     # File paths
     input_file = '/tmp/shipping_addresses_for_validation.csv'
     output_file = '/tmp/shipping_addresses_validated.csv'
-    progress_file = '/tmp/usps_validation_progress.csv'
+    progress_file = '/tmp/usps_validation_progress.jsonl'
 
     # Allow override via command line
     if len(sys.argv) >= 2:
@@ -253,21 +244,22 @@ def main():
 
     # Load previous progress
     print("Checking for previous progress...")
-    previous_results = load_progress(progress_file)
-    completed_sequences = {int(r['[sequence]']) for r in previous_results}
+    journal = open_checkpoint(progress_file, key='[sequence]')
+    previous_results = journal.records()
 
     if previous_results:
         print(f"  ✓ Found {len(previous_results)} previously validated addresses")
-        print(f"  → Will resume from address #{len(previous_results) + 1}")
     else:
         print("  → Starting fresh validation")
     print()
 
+    pending = list(journal.pending(addresses, key=lambda a: int(a['sequence'])))
+
     # Statistics
     stats = {
         'total': len(addresses),
-        'completed': len(previous_results),
-        'remaining': len(addresses) - len(previous_results),
+        'completed': len(addresses) - len(pending),
+        'remaining': len(pending),
         'successful': sum(1 for r in previous_results if r['ValidationFlag'] == 'OK'),
         'failed': sum(1 for r in previous_results if r['ValidationFlag'] == 'ERROR')
     }
@@ -278,48 +270,45 @@ def main():
     print(f"Progress: {stats['completed']}/{stats['total']} | Success: {stats['successful']} | Failed: {stats['failed']}")
     print("-" * 70)
 
-    results = previous_results.copy()
     start_time = time.time()
+    validated_this_run = 0
 
-    for i, address in enumerate(addresses, 1):
-        sequence = int(address['sequence'])
+    with journal:
+        for address in pending:
+            sequence = int(address['sequence'])
 
-        # Skip if already validated
-        if sequence in completed_sequences:
-            continue
+            # Validate address
+            result = validate_address_usps(USPS_USER_ID, sequence, address)
+            journal.append(result)
+            validated_this_run += 1
 
-        # Validate address
-        result = validate_address_usps(USPS_USER_ID, sequence, address)
-        results.append(result)
-
-        # Update stats
-        stats['completed'] += 1
-        stats['remaining'] -= 1
-        if result['success'] and result['ValidationFlag'] == 'OK':
-            stats['successful'] += 1
-        else:
-            stats['failed'] += 1
+            # Update stats
+            stats['completed'] += 1
+            stats['remaining'] -= 1
+            if result['success'] and result['ValidationFlag'] == 'OK':
+                stats['successful'] += 1
+            else:
+                stats['failed'] += 1
 
-        # Print progress
-        if stats['completed'] % 10 == 0:
-            elapsed = time.time() - start_time
-            rate = stats['completed'] / elapsed if elapsed > 0 else 0
-            eta_seconds = stats['remaining'] / rate if rate > 0 else 0
-            eta_minutes = eta_seconds / 60
+            # Print progress
+            if stats['completed'] % 10 == 0:
+                elapsed = time.time() - start_time
+                rate = validated_this_run / elapsed if elapsed > 0 else 0
+                eta_seconds = stats['remaining'] / rate if rate > 0 else 0
+                eta_minutes = eta_seconds / 60
 
-            print(f"  [{stats['completed']}/{stats['total']}] "
-                  f"Success: {stats['successful']} | Failed: {stats['failed']} | "
-                  f"Rate: {rate:.1f}/sec | ETA: {eta_minutes:.1f}min")
+                print(f"  [{stats['completed']}/{stats['total']}] "
+                      f"Success: {stats['successful']} | Failed: {stats['failed']} | "
+                      f"Rate: {rate:.1f}/sec | ETA: {eta_minutes:.1f}min")
 
-            # Save progress every 10 records
-            write_output_csv(progress_file, results)
+            # Rate limiting
+            time.sleep(DELAY_BETWEEN_REQUESTS)
 
-        # Rate limiting
-        time.sleep(DELAY_BETWEEN_REQUESTS)
+        results = journal.records()
 
     # Final save
+    results.sort(key=lambda r: int(r['[sequence]']))
     write_output_csv(output_file, results)
-    write_output_csv(progress_file, results)
 
     # Print final statistics
     print()
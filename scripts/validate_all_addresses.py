@@ -5,7 +5,7 @@ EASY MODE: Validate ALL unvalidated addresses (billing + shipping) in one comman
 This script:
 - Uses SmartyStreets API (recommended for speed and data quality)
 - Validates 1,356 addresses (785 billing + 571 shipping)
-- Takes ~2-3 minutes total
+- Sends batches of 100 lookups, several requests in flight (well under a minute)
 - Automatically imports results when done
 
 Requirements:
@@ -20,114 +20,86 @@ import csv
 import os
 import sys
 import time
-import json
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
 from datetime import datetime
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from db_config import get_database_url
+from smarty_client import SmartyClient
+from checkpoint_journal import open_checkpoint
 
 # SmartyStreets API Configuration
-SMARTY_API_URL = "https://us-street.api.smarty.com/street-address"
 SMARTY_AUTH_ID = os.getenv("SMARTY_AUTH_ID", "")
 SMARTY_AUTH_TOKEN = os.getenv("SMARTY_AUTH_TOKEN", "")
 
 # Database connection
 DB_URL = get_database_url()
 
-# Rate limiting
+# Rate limiting: batch requests (up to 100 lookups each) per second, and in flight
 REQUESTS_PER_SECOND = 10
-DELAY_BETWEEN_REQUESTS = 1.0 / REQUESTS_PER_SECOND
-
-def validate_address_smarty(auth_id, auth_token, sequence, address_data):
-    """Validate address using SmartyStreets."""
-    try:
-        params = {
-            'auth-id': auth_id,
-            'auth-token': auth_token,
-            'street': address_data['addressline1'],
-            'city': address_data['city'],
-            'state': address_data['state'],
-            'zipcode': address_data['postalcode'][:5],
-            'candidates': '1',
-            'match': 'strict'
-        }
-
-        if address_data.get('addressline2'):
-            params['street2'] = address_data['addressline2']
-
-        url = f"{SMARTY_API_URL}?{urlencode(params)}"
-        request = Request(url)
-        request.add_header('User-Agent', 'StarHouse-CRM/1.0')
-
-        response = urlopen(request, timeout=10)
-        response_data = response.read().decode('utf-8')
-        results = json.loads(response_data)
-
-        if not results:
-            return {
-                '[sequence]': sequence,
-                'ValidationFlag': 'ERROR',
-                '[summary]': 'Address not found',
-                'success': False
-            }
-
-        result = results[0]
-        components = result.get('components', {})
-        metadata = result.get('metadata', {})
-        analysis = result.get('analysis', {})
-
-        dpv_match_code = analysis.get('dpv_match_code', 'N')
-        dpv_vacant = analysis.get('dpv_vacant', 'N')
-
-        zip5 = components.get('zipcode', '')
-        zip4 = components.get('plus4_code', '')
-        full_zipcode = f"{zip5}-{zip4}" if zip4 else zip5
-
-        return {
-            '[sequence]': sequence,
-            'ValidationFlag': 'OK' if dpv_match_code in ['Y', 'S', 'D'] else 'ERROR',
-            '[summary]': f"DPV: {dpv_match_code}",
-            '[delivery_line_1]': result.get('delivery_line_1', ''),
-            '[delivery_line_2]': result.get('delivery_line_2', ''),
-            '[city_name]': components.get('city_name', ''),
-            '[state_abbreviation]': components.get('state_abbreviation', ''),
-            '[full_zipcode]': full_zipcode,
-            '[notes]': analysis.get('dpv_footnotes', ''),
-            '[county_name]': metadata.get('county_name', ''),
-            '[rdi]': metadata.get('rdi', ''),
-            '[latitude]': str(metadata.get('latitude', '')),
-            '[longitude]': str(metadata.get('longitude', '')),
-            '[precision]': metadata.get('precision', ''),
-            '[dpv_match_code]': dpv_match_code,
-            '[dpv_vacant]': dpv_vacant,
-            '[active]': analysis.get('active', 'Y'),
-            '[last_line]': result.get('last_line', ''),
-            'success': True
-        }
-
-    except HTTPError as e:
-        error_msg = f"HTTP {e.code}"
-        if e.code == 401:
-            error_msg = "Auth failed - check credentials"
-        elif e.code == 402:
-            error_msg = "Payment required - exceeded free tier"
+MAX_IN_FLIGHT = 4
+
+def build_lookup(address_data):
+    """Smarty lookup for one input row (input_id = sequence)."""
+    return {
+        'input_id': address_data['sequence'],
+        'street': address_data['addressline1'],
+        'street2': address_data.get('addressline2', ''),
+        'city': address_data['city'],
+        'state': address_data['state'],
+        'zipcode': address_data['postalcode'][:5],
+    }
+
+def parse_smarty_result(sequence, result, error=None):
+    """Turn Smarty's best candidate (or the error) into an output row."""
+    if error:
         return {
             '[sequence]': sequence,
             'ValidationFlag': 'ERROR',
-            '[summary]': error_msg,
+            '[summary]': error,
             'success': False
         }
-    except Exception as e:
+
+    if not result:
         return {
             '[sequence]': sequence,
             'ValidationFlag': 'ERROR',
-            '[summary]': str(e),
+            '[summary]': 'Address not found',
             'success': False
         }
 
+    components = result.get('components', {})
+    metadata = result.get('metadata', {})
+    analysis = result.get('analysis', {})
+
+    dpv_match_code = analysis.get('dpv_match_code', 'N')
+    dpv_vacant = analysis.get('dpv_vacant', 'N')
+
+    zip5 = components.get('zipcode', '')
+    zip4 = components.get('plus4_code', '')
+    full_zipcode = f"{zip5}-{zip4}" if zip4 else zip5
+
+    return {
+        '[sequence]': sequence,
+        'ValidationFlag': 'OK' if dpv_match_code in ['Y', 'S', 'D'] else 'ERROR',
+        '[summary]': f"DPV: {dpv_match_code}",
+        '[delivery_line_1]': result.get('delivery_line_1', ''),
+        '[delivery_line_2]': result.get('delivery_line_2', ''),
+        '[city_name]': components.get('city_name', ''),
+        '[state_abbreviation]': components.get('state_abbreviation', ''),
+        '[full_zipcode]': full_zipcode,
+        '[notes]': analysis.get('dpv_footnotes', ''),
+        '[county_name]': metadata.get('county_name', ''),
+        '[rdi]': metadata.get('rdi', ''),
+        '[latitude]': str(metadata.get('latitude', '')),
+        '[longitude]': str(metadata.get('longitude', '')),
+        '[precision]': metadata.get('precision', ''),
+        '[dpv_match_code]': dpv_match_code,
+        '[dpv_vacant]': dpv_vacant,
+        '[active]': analysis.get('active', 'Y'),
+        '[last_line]': result.get('last_line', ''),
+        'success': True
+    }
+
 def read_input_csv(filepath):
     """Read input CSV."""
     addresses = []
@@ -257,7 +229,7 @@ def main():
 
     input_file = '/tmp/all_addresses_for_validation.csv'
     output_file = '/tmp/all_addresses_validated.csv'
-    progress_file = '/tmp/validation_progress.csv'
+    progress_file = '/tmp/validation_progress.jsonl'
 
     print("=" * 70)
     print("VALIDATE ALL ADDRESSES - EASY MODE")
@@ -275,51 +247,56 @@ def main():
     print()
 
     # Load progress
-    previous_results = []
-    if os.path.exists(progress_file):
-        with open(progress_file, 'r') as f:
-            reader = csv.DictReader(f)
-            previous_results = list(reader)
-        print(f"  ✓ Resuming from {len(previous_results)} previous validations")
+    journal = open_checkpoint(progress_file, key='[sequence]')
+    if len(journal):
+        print(f"  ✓ Resuming from {len(journal)} previous validations")
         print()
 
-    completed_sequences = {int(r['[sequence]']) for r in previous_results}
+    pending = [a for a in addresses if int(a['sequence']) not in journal]
+    previous_results = journal.records()
 
     # Validate
     print("Validating with SmartyStreets...")
-    print(f"Rate: {REQUESTS_PER_SECOND} req/sec | ETA: ~{len(addresses)/REQUESTS_PER_SECOND/60:.1f} minutes")
+    print(f"Rate: {REQUESTS_PER_SECOND} req/sec x 100 lookups | {MAX_IN_FLIGHT} requests in flight")
     print("-" * 70)
 
-    results = previous_results.copy()
     stats = {'success': len([r for r in previous_results if r['ValidationFlag'] == 'OK']),
              'failed': len([r for r in previous_results if r['ValidationFlag'] == 'ERROR'])}
+    errors = []
+    done = previously_done = len(addresses) - len(pending)
     start_time = time.time()
 
-    for i, address in enumerate(addresses, 1):
-        sequence = int(address['sequence'])
-        if sequence in completed_sequences:
-            continue
+    client = SmartyClient(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN,
+                          requests_per_second=REQUESTS_PER_SECOND,
+                          max_in_flight=MAX_IN_FLIGHT)
 
-        result = validate_address_smarty(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN, sequence, address)
-        results.append(result)
+    with journal:
+        for input_id, candidate, error in client.validate_all(build_lookup(a) for a in pending):
+            result = parse_smarty_result(int(input_id), candidate, error)
 
-        if result['success'] and result['ValidationFlag'] == 'OK':
-            stats['success'] += 1
-        else:
-            stats['failed'] += 1
+            # Only journal real answers so API errors are retried on resume
+            if error:
+                errors.append(result)
+            else:
+                journal.append(result)
 
-        if len(results) % 50 == 0:
-            elapsed = time.time() - start_time
-            rate = len(results) / elapsed if elapsed > 0 else 0
-            remaining = len(addresses) - len(results)
-            eta = remaining / rate / 60 if rate > 0 else 0
-            print(f"  [{len(results)}/{len(addresses)}] Success: {stats['success']} | Failed: {stats['failed']} | ETA: {eta:.1f}min")
-            write_output_csv(progress_file, results)
+            if result['success'] and result['ValidationFlag'] == 'OK':
+                stats['success'] += 1
+            else:
+                stats['failed'] += 1
 
-        time.sleep(DELAY_BETWEEN_REQUESTS)
+            done += 1
+            if done % 100 == 0:
+                elapsed = time.time() - start_time
+                rate = (done - previously_done) / elapsed if elapsed > 0 else 0
+                remaining = len(addresses) - done
+                eta = remaining / rate / 60 if rate > 0 else 0
+                print(f"  [{done}/{len(addresses)}] Success: {stats['success']} | Failed: {stats['failed']} | ETA: {eta:.1f}min")
 
-    write_output_csv(output_file, results)
+        results = journal.records() + errors
 
+    results.sort(key=lambda r: int(r['[sequence]']))
+    write_output_csv(output_file, results)
     print()
     print("=" * 70)
     print("VALIDATION COMPLETE")
@@ -336,9 +313,11 @@ def main():
     cursor = conn.cursor(cursor_factory=RealDictCursor)
 
     import_stats = {'billing': 0, 'shipping': 0}
+    results_by_sequence = {int(r['[sequence]']): r for r in results}
 
-    for i, (address, validation) in enumerate(zip(addresses, results), 1):
-        if validation['ValidationFlag'] != 'OK':
+    for address in addresses:
+        validation = results_by_sequence.get(int(address['sequence']))
+        if not validation or validation['ValidationFlag'] != 'OK':
             continue
 
         try:
@@ -17,105 +17,77 @@ SmartyStreets Setup:
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
+import re
 import sys
 import time
-import json
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
 from datetime import datetime
 from db_config import get_database_url
+from smarty_client import SmartyClient
 
 # Configuration
-SMARTY_API_URL = "https://us-street.api.smarty.com/street-address"
 SMARTY_AUTH_ID = os.getenv("SMARTY_AUTH_ID", "")
 SMARTY_AUTH_TOKEN = os.getenv("SMARTY_AUTH_TOKEN", "")
-REQUESTS_PER_SECOND = 5  # Conservative rate limit
-DELAY_BETWEEN_REQUESTS = 1.0 / REQUESTS_PER_SECOND
+REQUESTS_PER_SECOND = 5  # Conservative rate limit (each request carries up to 100 lookups)
+MAX_IN_FLIGHT = 2
 
 DRY_RUN = True  # Set via --live flag
 
-def validate_address_smarty(auth_id, auth_token, address_data):
-    """Validate a single address using SmartyStreets"""
-
-    try:
-        # Build request parameters
-        params = {
-            'auth-id': auth_id,
-            'auth-token': auth_token,
-            'street': address_data['street'],
-            'candidates': '1',
-            'match': 'strict'
-        }
+def build_lookup(contact):
+    """Smarty lookup for a contact's billing address (input_id = contact id)"""
+    lookup = {
+        'input_id': str(contact['id']),
+        'street': contact['address_line_1'],
+        'city': contact.get('city') or '',
+        'state': contact.get('state') or '',
+    }
 
-        # Add optional fields
-        if address_data.get('city'):
-            params['city'] = address_data['city']
-        if address_data.get('state'):
-            params['state'] = address_data['state']
-        if address_data.get('postal_code'):
-            # Extract just 5-digit ZIP
-            import re
-            match = re.search(r'(\d{5})', address_data['postal_code'])
-            if match:
-                params['zipcode'] = match.group(1)
-
-        # Make API request
-        url = f"{SMARTY_API_URL}?{urlencode(params)}"
-        request = Request(url)
-        request.add_header('User-Agent', 'StarHouse-CRM/1.0')
-
-        response = urlopen(request, timeout=10)
-        response_data = response.read().decode('utf-8')
-        results = json.loads(response_data)
-
-        # Check if we got results
-        if not results or len(results) == 0:
-            return {
-                'success': False,
-                'dpv_match_code': 'N',
-                'error': 'No match found'
-            }
-
-        # Parse first (best) result
-        result = results[0]
-        components = result.get('components', {})
-        metadata = result.get('metadata', {})
-        analysis = result.get('analysis', {})
-
-        # Build validated address data
-        validated = {
-            'success': True,
-            'delivery_line_1': result.get('delivery_line_1', ''),
-            'delivery_line_2': result.get('delivery_line_2', ''),
-            'last_line': result.get('last_line', ''),
-            'city': components.get('city_name', ''),
-            'state': components.get('state_abbreviation', ''),
-            'postal_code': components.get('zipcode', ''),
-            'zip4': components.get('plus4_code', ''),
-            'county': metadata.get('county_name', ''),
-            'latitude': metadata.get('latitude'),
-            'longitude': metadata.get('longitude'),
-            'precision': metadata.get('precision', ''),
-            'rdi': metadata.get('rdi', ''),  # Residential/Commercial
-            'dpv_match_code': analysis.get('dpv_match_code', 'N'),  # Y/S/D/N
-            'dpv_vacant': analysis.get('dpv_vacant', 'N') == 'Y',
-            'active': analysis.get('active', 'Y') == 'Y',
-            'dpv_footnotes': analysis.get('dpv_footnotes', '')
-        }
+    # Extract just 5-digit ZIP
+    match = re.search(r'(\d{5})', contact.get('postal_code') or '')
+    if match:
+        lookup['zipcode'] = match.group(1)
+
+    return lookup
+
+def parse_smarty_result(result, error=None):
+    """Turn Smarty's best candidate (or the error) into validated address data"""
 
-        return validated
+    if error:
+        return {'success': False, 'error': error}
 
-    except HTTPError as e:
-        error_msg = f"HTTP {e.code}: {e.reason}"
-        if e.code == 401:
-            error_msg = "Authentication failed - check your auth ID and token"
-        elif e.code == 402:
-            error_msg = "Payment required - exceeded free tier"
-        return {'success': False, 'error': error_msg}
+    # Check if we got results
+    if not result:
+        return {
+            'success': False,
+            'dpv_match_code': 'N',
+            'error': 'No match found'
+        }
+
+    components = result.get('components', {})
+    metadata = result.get('metadata', {})
+    analysis = result.get('analysis', {})
+
+    # Build validated address data
+    validated = {
+        'success': True,
+        'delivery_line_1': result.get('delivery_line_1', ''),
+        'delivery_line_2': result.get('delivery_line_2', ''),
+        'last_line': result.get('last_line', ''),
+        'city': components.get('city_name', ''),
+        'state': components.get('state_abbreviation', ''),
+        'postal_code': components.get('zipcode', ''),
+        'zip4': components.get('plus4_code', ''),
+        'county': metadata.get('county_name', ''),
+        'latitude': metadata.get('latitude'),
+        'longitude': metadata.get('longitude'),
+        'precision': metadata.get('precision', ''),
+        'rdi': metadata.get('rdi', ''),  # Residential/Commercial
+        'dpv_match_code': analysis.get('dpv_match_code', 'N'),  # Y/S/D/N
+        'dpv_vacant': analysis.get('dpv_vacant', 'N') == 'Y',
+        'active': analysis.get('active', 'Y') == 'Y',
+        'dpv_footnotes': analysis.get('dpv_footnotes', '')
+    }
 
-    except (URLError, json.JSONDecodeError, Exception) as e:
-        return {'success': False, 'error': str(e)}
+    return validated
 
 def validate_google_addresses(dry_run=True):
     """Main validation function"""
@@ -214,17 +186,15 @@ def validate_google_addresses(dry_run=True):
     start_time = time.time()
     updates = []
 
-    for i, contact in enumerate(google_addresses, 1):
-        # Build address data
-        address_data = {
-            'street': contact['address_line_1'],
-            'city': contact['city'],
-            'state': contact['state'],
-            'postal_code': contact['postal_code']
-        }
+    client = SmartyClient(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN,
+                          requests_per_second=REQUESTS_PER_SECOND,
+                          max_in_flight=MAX_IN_FLIGHT)
+    contacts_by_id = {str(contact['id']): contact for contact in google_addresses}
+    lookups = [build_lookup(contact) for contact in google_addresses]
 
-        # Validate
-        result = validate_address_smarty(SMARTY_AUTH_ID, SMARTY_AUTH_TOKEN, address_data)
+    for i, (contact_id, candidate, error) in enumerate(client.validate_all(lookups), 1):
+        contact = contacts_by_id[contact_id]
+        result = parse_smarty_result(candidate, error)
 
         stats['validated'] += 1
 
@@ -261,9 +231,6 @@ def validate_google_addresses(dry_run=True):
                   f"Valid: {stats['valid']} | Invalid: {stats['invalid']} | "
                   f"Rate: {rate:.1f}/sec | ETA: {eta_minutes:.1f}min")
 
-        # Rate limiting
-        time.sleep(DELAY_BETWEEN_REQUESTS)
-
     # Apply updates to database
     if not dry_run and updates:
         print("\n" + "=" * 80)
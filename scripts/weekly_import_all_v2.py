@@ -10,6 +10,24 @@ This script orchestrates:
   2. PayPal transactions import
   3. (Future: Ticket Tailor events)
 
+The importers run in this process as one pipeline: the lookup index (contact
+emails, tags, products, existing links) is warmed once and shared by every
+stage, and the stages borrow connections from the db_config pool instead of
+each script reconnecting and rebuilding its caches.
+
+Stage order:
+  warm_index -> kajabi_contacts -> { kajabi_tags ... kajabi_subscriptions | paypal }
+             -> kajabi_transactions
+
+Once contacts are in, the Kajabi catalog and link steps (tags, products,
+contact links, subscriptions) and the PayPal import write separate tables,
+so with --execute they run side by side on two pooled connections.
+Contacts are committed first so the PayPal lane can match them. Kajabi
+transactions share the transactions table with PayPal, so they wait until
+both lanes are done. A dry run keeps every stage on one connection in one
+transaction and rolls it back. A per-stage timing table is printed at the
+end.
+
 Usage:
   # Dry-run all imports (recommended first)
   python3 scripts/weekly_import_all_v2.py --dry-run
@@ -26,6 +44,12 @@ Usage:
   # Skip specific imports
   python3 scripts/weekly_import_all_v2.py --skip-paypal --execute
 
+  # Run the stages one after another (no concurrent lanes)
+  python3 scripts/weekly_import_all_v2.py --execute --sequential
+
+  # Previous behaviour: run each import script as its own process
+  python3 scripts/weekly_import_all_v2.py --execute --subprocess
+
 Required Files:
   Kajabi v2 exports (7 CSV files in kajabi-dir):
     - v2_contacts.csv          (Contact information, email subscription status)
@@ -45,8 +69,22 @@ See WEEKLY_IMPORT_GUIDE.md for detailed export instructions.
 import subprocess
 import sys
 import os
+import time
+import threading
+import traceback
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Add scripts directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from db_config import acquire_connection, release_connection, print_pool_stats
+from import_lookup_index import ImportLookupIndex
+from logging_config import span
+from run_ledger import RunRecorder
+from weekly_import_kajabi_v2 import KajabiV2Importer
+from weekly_import_paypal import PayPalImporter
 
 # ============================================================================
 # CONFIGURATION
@@ -70,6 +108,21 @@ KAJABI_V2_FILES = [
     'v2_transactions.csv',
 ]
 
+# Kajabi steps that run after contacts, in dependency order (load_<step>).
+# None of them writes a table the PayPal lane writes (contacts, transactions).
+KAJABI_LANE_STEPS = [
+    'tags',
+    'contact_tags',
+    'products',
+    'contact_products',
+    'subscriptions',
+]
+
+# Kajabi steps that write PayPal's tables; run after both lanes finish
+KAJABI_AFTER_LANES_STEPS = [
+    'transactions',
+]
+
 # ============================================================================
 # HELPERS
 # ============================================================================
@@ -116,6 +169,208 @@ def check_kajabi_v2_files(data_dir: str) -> bool:
             all_present = False
     return all_present
 
+# ============================================================================
+# IN-PROCESS PIPELINE
+# ============================================================================
+
+class WeeklyImportPipeline:
+    """Run every weekly import stage in this process on shared connections."""
+
+    def __init__(self, kajabi_dir: str, paypal_file: str, dry_run: bool = True,
+                 skip_kajabi: bool = False, skip_paypal: bool = False,
+                 bulk: bool = False, concurrent: bool = True):
+        self.kajabi_dir = kajabi_dir
+        self.paypal_file = paypal_file
+        self.dry_run = dry_run
+        self.skip_kajabi = skip_kajabi
+        self.skip_paypal = skip_paypal
+        self.bulk = bulk
+
+        # Separate connections only see committed rows, so lanes run
+        # concurrently only when each stage is committed (--execute)
+        self.concurrent = concurrent and not dry_run and not skip_kajabi and not skip_paypal
+
+        self.index = ImportLookupIndex()
+        self.kajabi: Optional[KajabiV2Importer] = None
+        self.paypal: Optional[PayPalImporter] = None
+
+        self.started = 0.0
+        self.contacts_committed = False
+        self.timings: List[Dict] = []
+        self._timings_lock = threading.Lock()
+
+    def _stage(self, name: str, lane: str, func: Callable[[], None],
+               rows: Callable[[], int]) -> bool:
+        """Run one stage, recording its start offset, duration and row count."""
+        start = time.time()
+        ok = True
+        try:
+            with span(name):
+                func()
+        except Exception as e:
+            ok = False
+            print(f"\n❌ Stage {name} failed: {e}")
+            traceback.print_exc()
+
+        try:
+            row_count = rows()
+        except Exception:
+            row_count = 0
+
+        with self._timings_lock:
+            self.timings.append({
+                'stage': name,
+                'lane': lane,
+                'start': start - self.started,
+                'seconds': time.time() - start,
+                'rows': row_count,
+                'ok': ok,
+            })
+        return ok
+
+    def _kajabi_lane(self, steps: List[str] = KAJABI_LANE_STEPS) -> bool:
+        """Kajabi steps that depend on contacts (tags through subscriptions by default)."""
+        for step in steps:
+            ok = self._stage(
+                f'kajabi_{step}', 'kajabi',
+                getattr(self.kajabi, f'load_{step}'),
+                lambda step=step: self.kajabi.stats[step]['processed'],
+            )
+            if not ok:
+                return False
+        return True
+
+    def _paypal_lane(self, conn) -> bool:
+        """PayPal contacts and transactions, matched through the shared index."""
+        def run():
+            self.paypal = PayPalImporter(dry_run=self.dry_run, conn=conn, index=self.index)
+            self.paypal.import_file(self.paypal_file)
+
+        return self._stage(
+            'paypal', 'paypal', run,
+            lambda: self.paypal.stats['rows_processed'] if self.paypal else 0,
+        )
+
+    def run(self) -> bool:
+        """Run all enabled stages; returns True when every stage succeeded."""
+        self.started = time.time()
+        # Record the run; connecting inside the try means a failed acquire
+        # still finishes the row. With instrumentation on, the stage spans
+        # become its per-stage timings
+        ledger = RunRecorder('weekly_import_all_v2', dry_run=self.dry_run).start()
+        primary = None
+        secondary = None
+        ok = False
+
+        try:
+            primary = acquire_connection()
+
+            print_header("WARM-UP: Loading Lookup Indexes")
+            ok = self._stage('warm_index', 'main', lambda: self.index.warm(primary),
+                             lambda: len(self.index.contact_ids))
+            if ok:
+                print(f"✅ {len(self.index.contact_ids):,} contacts, "
+                      f"{len(self.index.tag_ids):,} tags, "
+                      f"{len(self.index.product_ids):,} products "
+                      f"({self.index.warm_seconds:.2f}s, "
+                      f"~{self.index.total_bytes() / 1024 / 1024:.1f} MB)")
+
+            if ok and not self.skip_kajabi:
+                print_header("STEP 1: Importing Kajabi V2 Contacts")
+                self.kajabi = KajabiV2Importer(self.kajabi_dir, dry_run=self.dry_run,
+                                               bulk=self.bulk, index=self.index)
+                self.kajabi.attach(primary)
+                ok = self._stage('kajabi_contacts', 'main', self.kajabi.load_contacts,
+                                 lambda: self.kajabi.stats['contacts']['processed'])
+
+            if ok and self.concurrent:
+                # The PayPal lane matches against these contacts on another connection
+                primary.commit()
+                self.contacts_committed = True
+                secondary = acquire_connection()
+
+                print_header("STEP 2: Kajabi Tags/Products/Subscriptions + PayPal (concurrent)")
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    kajabi_future = executor.submit(self._kajabi_lane)
+                    paypal_future = executor.submit(self._paypal_lane, secondary)
+                    ok = kajabi_future.result() and paypal_future.result()
+
+                if ok:
+                    print_header("STEP 3: Importing Kajabi V2 Transactions")
+                    ok = self._kajabi_lane(KAJABI_AFTER_LANES_STEPS)
+            elif ok:
+                if not self.skip_kajabi:
+                    print_header("STEP 2: Importing Kajabi V2 Tags/Products/Subscriptions/Transactions")
+                    ok = self._kajabi_lane(KAJABI_LANE_STEPS + KAJABI_AFTER_LANES_STEPS)
+                if ok and not self.skip_paypal:
+                    print_header("STEP 3: Importing PayPal Transactions")
+                    ok = self._paypal_lane(primary)
+
+            self._finish(ok, [c for c in (primary, secondary) if c is not None])
+            return ok
+
+        finally:
+            ledger.finish(ok, **self.ledger_counts())
+            if self.kajabi:
+                self.kajabi.close()
+            if self.paypal:
+                self.paypal.close()
+            if secondary is not None:
+                release_connection(secondary)
+            if primary is not None:
+                release_connection(primary)
+
+    def _finish(self, ok: bool, connections: list):
+        """Commit every connection on success in execute mode, else roll back."""
+        if self.dry_run or not ok:
+            if self.contacts_committed:
+                print("\n⚠️  Kajabi contacts were committed before the failing stage and are kept")
+            print("\n🔄 Rolling back uncommitted changes...")
+            for conn in connections:
+                conn.rollback()
+        else:
+            print("\n💾 Committing changes to database...")
+            for conn in connections:
+                conn.commit()
+
+    def ledger_counts(self) -> Dict:
+        """Row and error totals across the Kajabi and PayPal importers, for the run ledger."""
+        counts = {'rows_processed': 0, 'rows_created': 0, 'rows_updated': 0, 'errors': 0}
+        details = {'stages': self.timings}
+        for name, importer in (('kajabi', self.kajabi), ('paypal', self.paypal)):
+            if importer:
+                importer_counts = importer.ledger_counts()
+                details[name] = importer_counts.pop('details')
+                for key, value in importer_counts.items():
+                    counts[key] += value
+        counts['details'] = details
+        return counts
+
+    def print_summary(self):
+        """Per-importer summaries, index hit rates, and the stage timing table."""
+        if self.kajabi:
+            self.kajabi.print_summary()
+        if self.paypal:
+            self.paypal.print_stats()
+
+        self.index.print_report()
+        print()
+        print_pool_stats()
+
+        wall = time.time() - self.started
+        stage_total = sum(t['seconds'] for t in self.timings)
+
+        print_header("STAGE TIMINGS")
+        print(f"  {'Stage':24s} {'Lane':8s} {'Start':>8s} {'Seconds':>9s} {'Rows':>10s} {'Rows/s':>9s}  Status")
+        for t in sorted(self.timings, key=lambda t: t['start']):
+            rate = t['rows'] / t['seconds'] if t['seconds'] > 0 else 0.0
+            status = '✅' if t['ok'] else '❌'
+            print(f"  {t['stage']:24s} {t['lane']:8s} {t['start']:>8.2f} {t['seconds']:>9.2f} "
+                  f"{t['rows']:>10,} {rate:>9,.0f}  {status}")
+        print()
+        print(f"  Wall time: {wall:.2f}s  (stage time {stage_total:.2f}s"
+              f"{', concurrent lanes' if self.concurrent else ''})")
+
 # ============================================================================
 # MAIN ORCHESTRATION
 # ============================================================================
@@ -146,6 +401,14 @@ def main():
     parser.add_argument('--skip-paypal', action='store_true',
                        help='Skip PayPal import')
 
+    # Pipeline options
+    parser.add_argument('--bulk', action='store_true',
+                       help='Load Kajabi contacts with COPY + set-based upserts')
+    parser.add_argument('--sequential', action='store_true',
+                       help='Run stages one after another instead of in concurrent lanes')
+    parser.add_argument('--subprocess', action='store_true',
+                       help='Run each import script as a separate process (previous behaviour)')
+
     args = parser.parse_args()
 
     # Validate at least one import is enabled
@@ -200,6 +463,33 @@ def main():
 
     print("✅ All files present")
 
+    if not args.subprocess:
+        pipeline = WeeklyImportPipeline(
+            kajabi_dir=args.kajabi_dir,
+            paypal_file=args.paypal_file,
+            dry_run=args.dry_run,
+            skip_kajabi=args.skip_kajabi,
+            skip_paypal=args.skip_paypal,
+            bulk=args.bulk,
+            concurrent=not args.sequential,
+        )
+        success = pipeline.run()
+        pipeline.print_summary()
+
+        print_header("IMPORT COMPLETE" if success else "IMPORT FAILED")
+        print(f"Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
+
+        if not success:
+            print("❌ One or more stages failed (see above)")
+        elif args.dry_run:
+            print("🔄 DRY RUN COMPLETE - No changes were saved")
+            print("Run with --execute to apply changes")
+        else:
+            print("✅ Changes committed to database")
+
+        sys.exit(0 if success else 1)
+
     # Track results
     results = {
         'kajabi': None,
@@ -217,6 +507,8 @@ def main():
             '--data-dir', args.kajabi_dir,
             '--dry-run' if args.dry_run else '--execute'
         ]
+        if args.bulk:
+            kajabi_args.append('--bulk')
 
         results['kajabi'] = run_import_script(KAJABI_V2_SCRIPT, kajabi_args)
 
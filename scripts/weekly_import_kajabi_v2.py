@@ -22,6 +22,9 @@ Usage:
   # Custom data folder
   python3 scripts/weekly_import_kajabi_v2.py --data-dir data/samples --execute
 
+  # Bulk contact loading (COPY into a staging table + set-based merge)
+  python3 scripts/weekly_import_kajabi_v2.py --execute --bulk
+
 Required Files from Kajabi (v2 exports):
   - v2_contacts.csv          (Contact information, email subscription status)
   - v2_tags.csv              (Tag definitions)
@@ -38,26 +41,26 @@ Export Instructions:
 """
 
 import csv
+import io
 import os
 import sys
 import argparse
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple, Set
-import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
 
 # Add scripts directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from secure_config import get_database_url
+from db_config import acquire_connection, release_connection, print_pool_stats
+from import_lookup_index import ImportLookupIndex
+from logging_config import instrument_cursor, span
+from run_ledger import RunRecorder
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-# Database connection - NO DEFAULTS, fails fast if missing
-DB_CONNECTION = get_database_url()
-
 # Expected file names (without path)
 REQUIRED_FILES = {
     'contacts': 'v2_contacts.csv',
@@ -69,6 +72,16 @@ REQUIRED_FILES = {
     'transactions': 'v2_transactions.csv',
 }
 
+# Bulk mode (--bulk): rows buffered per COPY round trip into the staging table
+BULK_COPY_CHUNK_ROWS = 5000
+
+# Staging column order for the bulk contact COPY (seq preserves file order)
+STAGE_CONTACT_COLUMNS = (
+    'seq', 'email', 'first_name', 'last_name', 'phone',
+    'address_line_1', 'address_line_2', 'city', 'state', 'postal_code', 'country',
+    'kajabi_id', 'kajabi_member_id', 'email_subscribed',
+)
+
 # ============================================================================
 # UTILITIES
 # ============================================================================
@@ -133,11 +146,14 @@ def normalize_email(email: str) -> Optional[str]:
 class KajabiV2Importer:
     """Comprehensive Kajabi v2 data importer."""
 
-    def __init__(self, data_dir: str, dry_run: bool = True):
+    def __init__(self, data_dir: str, dry_run: bool = True, bulk: bool = False,
+                 index: Optional[ImportLookupIndex] = None):
         self.data_dir = data_dir
         self.dry_run = dry_run
+        self.bulk = bulk
         self.conn = None
         self.cur = None
+        self.owns_connection = True
 
         # Statistics
         self.stats = {
@@ -151,10 +167,16 @@ class KajabiV2Importer:
             'validation': {'city_corrected': 0, 'duplicates_removed': 0, 'total_issues': 0},
         }
 
-        # Caches for lookups
-        self.contact_id_by_email: Dict[str, str] = {}
-        self.tag_ids: Set[str] = set()
-        self.product_ids: Set[str] = set()
+        # Lookup indexes, warmed once after connecting (see warm_indexes);
+        # the weekly pipeline passes in one index shared with other importers
+        self.index = index if index is not None else ImportLookupIndex()
+        self.contact_id_by_email: Dict[str, str] = self.index.contact_id_by_email
+        self.tag_ids: Set[str] = self.index.tag_ids
+        self.product_ids: Set[str] = self.index.product_ids
+
+        # v2 export contact id -> (email, kajabi_id), used to resolve the
+        # contact_id column of the relationship files to our contact rows
+        self.source_contact_keys: Dict[str, Tuple[str, Optional[str]]] = {}
 
     def validate_and_correct_address(self, address_line_1: Optional[str], address_line_2: Optional[str],
                                      city: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
@@ -192,16 +214,30 @@ class KajabiV2Importer:
         return address_line_1, address_line_2, city, corrected
 
     def connect(self):
-        """Connect to database."""
+        """Borrow a connection from the shared db_config pool."""
         print("📡 Connecting to database...")
-        self.conn = psycopg2.connect(DB_CONNECTION)
-        self.cur = self.conn.cursor(cursor_factory=RealDictCursor)
+        self.conn = acquire_connection()
+        self.cur = instrument_cursor(self.conn.cursor(cursor_factory=RealDictCursor))
         print("✅ Connected\n")
 
+    def attach(self, conn):
+        """
+        Run steps on a connection owned by the caller.
+
+        Used by weekly_import_all_v2.py; the caller commits or rolls back and
+        returns the connection to the pool, so close() only drops the cursor.
+        """
+        self.conn = conn
+        self.cur = instrument_cursor(conn.cursor(cursor_factory=RealDictCursor))
+        self.owns_connection = False
+
     def close(self):
-        """Close database connection."""
+        """Finish the transaction and return the connection to the pool."""
         if self.cur:
             self.cur.close()
+            self.cur = None
+        if not self.owns_connection:
+            return
         if self.conn:
             if self.dry_run:
                 print("\n🔄 DRY RUN - Rolling back all changes...")
@@ -209,7 +245,8 @@ class KajabiV2Importer:
             else:
                 print("\n💾 Committing changes to database...")
                 self.conn.commit()
-            self.conn.close()
+            release_connection(self.conn)
+            self.conn = None
 
     def verify_files(self) -> bool:
         """Verify all required files exist."""
@@ -237,6 +274,44 @@ class KajabiV2Importer:
         print("✅ All required files present")
         return True
 
+    def warm_indexes(self):
+        """Load every lookup index in one pass so the steps never query per row."""
+        print("\n" + "=" * 80)
+        print("  WARM-UP: Loading Lookup Indexes")
+        print("=" * 80)
+        print()
+
+        self.index.warm(self.conn)
+
+        print(f"✅ {len(self.index.contact_ids):,} contacts, "
+              f"{len(self.index.contact_tag_pairs):,} contact-tag links, "
+              f"{len(self.index.contact_product_pairs):,} contact-product links, "
+              f"{len(self.index.kajabi_subscription_ids):,} subscriptions, "
+              f"{len(self.index.kajabi_transaction_ids):,} transactions "
+              f"({self.index.warm_seconds:.2f}s, ~{self.index.total_bytes() / 1024 / 1024:.1f} MB)")
+
+    def resolve_contact_id(self, source_contact_id: str) -> Optional[str]:
+        """
+        Map a contact_id from the v2 relationship files to our contacts.id.
+
+        The export's ids only match ours for contacts that originated here, so
+        the contact's email (then kajabi_id) from v2_contacts.csv wins; the raw
+        id is accepted only if it already exists in contacts.
+        """
+        keys = self.source_contact_keys.get(source_contact_id)
+        if keys:
+            email, kajabi_id = keys
+            contact_id = self.index.contact_for_email(email)
+            if not contact_id and kajabi_id:
+                contact_id = self.index.contact_for_kajabi_id(kajabi_id)
+            if contact_id:
+                return contact_id
+
+        if self.index.has_contact(source_contact_id):
+            return source_contact_id
+
+        return None
+
     def load_contacts(self):
         """Import contacts from v2_contacts.csv."""
         print("\n" + "=" * 80)
@@ -244,6 +319,71 @@ class KajabiV2Importer:
         print("=" * 80)
         print()
 
+        if self.bulk:
+            self._load_contacts_bulk()
+        else:
+            self._load_contacts_per_row()
+
+        print(f"\n📇 Contacts:")
+        print(f"  Processed: {self.stats['contacts']['processed']}")
+        print(f"  Created: {self.stats['contacts']['created']}")
+        print(f"  Updated: {self.stats['contacts']['updated']}")
+        print(f"  Errors: {self.stats['contacts']['errors']}")
+
+        # Address validation summary
+        if self.stats['validation']['total_issues'] > 0:
+            print(f"\n🔧 Address Validation (Auto-Corrections):")
+            print(f"  City placement fixed: {self.stats['validation']['city_corrected']}")
+            print(f"  Duplicates removed: {self.stats['validation']['duplicates_removed']}")
+            print(f"  Total corrections: {self.stats['validation']['total_issues']}")
+
+    def _parse_contact_row(self, row: Dict[str, str]) -> Optional[Dict]:
+        """
+        Parse and clean one v2_contacts.csv row.
+
+        Returns None when the row has no usable email (counted as an error by
+        the caller). Address auto-corrections are applied here so both the
+        per-row and bulk paths feed identical values to the database. The
+        export's own contact id is remembered for resolve_contact_id().
+        """
+        email = normalize_email(row.get('email', ''))
+        if not email:
+            return None
+
+        kajabi_id = row.get('kajabi_id', '').strip() or None
+        source_id = row.get('id', '').strip()
+        if source_id:
+            self.source_contact_keys[source_id] = (email, kajabi_id)
+
+        # Address fields
+        address_line_1 = row.get('address_line_1', '').strip() or None
+        address_line_2 = row.get('address_line_2', '').strip() or None
+        city = row.get('city', '').strip() or None
+
+        # Validate and auto-correct address data
+        address_line_1, address_line_2, city, was_corrected = self.validate_and_correct_address(
+            address_line_1, address_line_2, city
+        )
+
+        return {
+            'email': email,
+            'first_name': row.get('first_name', '').strip() or None,
+            'last_name': row.get('last_name', '').strip() or None,
+            'phone': row.get('phone', '').strip() or None,
+            'address_line_1': address_line_1,
+            'address_line_2': address_line_2,
+            'city': city,
+            'state': row.get('state', '').strip() or None,
+            'postal_code': row.get('postal_code', '').strip() or None,
+            'country': row.get('country', '').strip() or None,
+            # External IDs
+            'kajabi_id': kajabi_id,
+            'kajabi_member_id': row.get('kajabi_member_id', '').strip() or None,
+            'email_subscribed': parse_bool(row.get('email_subscribed', 'false')),
+        }
+
+    def _load_contacts_per_row(self):
+        """Row-at-a-time contact import (index lookup, then UPDATE or INSERT)."""
         filepath = os.path.join(self.data_dir, REQUIRED_FILES['contacts'])
 
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -251,44 +391,19 @@ class KajabiV2Importer:
 
             for row in reader:
                 self.stats['contacts']['processed'] += 1
+                email = None
 
                 try:
-                    # Parse contact data
-                    email = normalize_email(row.get('email', ''))
-                    if not email:
+                    contact = self._parse_contact_row(row)
+                    if not contact:
                         self.stats['contacts']['errors'] += 1
                         continue
+                    email = contact['email']
 
-                    first_name = row.get('first_name', '').strip() or None
-                    last_name = row.get('last_name', '').strip() or None
-                    phone = row.get('phone', '').strip() or None
-                    email_subscribed = parse_bool(row.get('email_subscribed', 'false'))
-
-                    # Address fields
-                    address_line_1 = row.get('address_line_1', '').strip() or None
-                    address_line_2 = row.get('address_line_2', '').strip() or None
-                    city = row.get('city', '').strip() or None
-                    state = row.get('state', '').strip() or None
-                    postal_code = row.get('postal_code', '').strip() or None
-                    country = row.get('country', '').strip() or None
-
-                    # Validate and auto-correct address data
-                    address_line_1, address_line_2, city, was_corrected = self.validate_and_correct_address(
-                        address_line_1, address_line_2, city
-                    )
-
-                    # External IDs
-                    kajabi_id = row.get('kajabi_id', '').strip() or None
-                    kajabi_member_id = row.get('kajabi_member_id', '').strip() or None
-
-                    # Check if contact exists by email
-                    self.cur.execute("""
-                        SELECT id FROM contacts WHERE email = %s
-                    """, (email,))
-                    existing = self.cur.fetchone()
+                    # Check if contact exists by email (warmed index, no round trip)
+                    contact_id = self.index.contact_for_email(email)
 
-                    if existing:
-                        contact_id = existing['id']
+                    if contact_id:
 
                         # Update existing contact
                         self.cur.execute("""
@@ -310,9 +425,10 @@ class KajabiV2Importer:
                                 updated_at = NOW()
                             WHERE id = %s
                         """, (
-                            first_name, last_name, phone,
-                            address_line_1, address_line_2, city, state, postal_code, country,
-                            kajabi_id, kajabi_member_id, email_subscribed,
+                            contact['first_name'], contact['last_name'], contact['phone'],
+                            contact['address_line_1'], contact['address_line_2'], contact['city'],
+                            contact['state'], contact['postal_code'], contact['country'],
+                            contact['kajabi_id'], contact['kajabi_member_id'], contact['email_subscribed'],
                             contact_id
                         ))
 
@@ -331,9 +447,10 @@ class KajabiV2Importer:
                             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
                             RETURNING id
                         """, (
-                            email, first_name, last_name, phone,
-                            address_line_1, address_line_2, city, state, postal_code, country,
-                            kajabi_id, kajabi_member_id, email_subscribed,
+                            email, contact['first_name'], contact['last_name'], contact['phone'],
+                            contact['address_line_1'], contact['address_line_2'], contact['city'],
+                            contact['state'], contact['postal_code'], contact['country'],
+                            contact['kajabi_id'], contact['kajabi_member_id'], contact['email_subscribed'],
                             'kajabi'
                         ))
 
@@ -342,7 +459,7 @@ class KajabiV2Importer:
                         self.stats['contacts']['created'] += 1
 
                     # Cache contact ID for later lookups
-                    self.contact_id_by_email[email] = contact_id
+                    self.index.add_contact(contact_id, email, contact['kajabi_id'])
 
                     # Also create/update contact_emails entry (for the contact_emails table)
                     self.cur.execute("""
@@ -361,18 +478,195 @@ class KajabiV2Importer:
                     self.stats['contacts']['errors'] += 1
                     print(f"⚠️  Error processing contact {email}: {e}")
 
-        print(f"\n📇 Contacts:")
-        print(f"  Processed: {self.stats['contacts']['processed']}")
-        print(f"  Created: {self.stats['contacts']['created']}")
-        print(f"  Updated: {self.stats['contacts']['updated']}")
-        print(f"  Errors: {self.stats['contacts']['errors']}")
+    def _copy_contacts_to_stage(self) -> int:
+        """
+        Stream parsed contacts into the kajabi_contacts_stage temp table via COPY.
 
-        # Address validation summary
-        if self.stats['validation']['total_issues'] > 0:
-            print(f"\n🔧 Address Validation (Auto-Corrections):")
-            print(f"  City placement fixed: {self.stats['validation']['city_corrected']}")
-            print(f"  Duplicates removed: {self.stats['validation']['duplicates_removed']}")
-            print(f"  Total corrections: {self.stats['validation']['total_issues']}")
+        Rows are buffered BULK_COPY_CHUNK_ROWS at a time so memory stays flat
+        regardless of file size. Returns the number of valid rows staged.
+        """
+        filepath = os.path.join(self.data_dir, REQUIRED_FILES['contacts'])
+        staged = 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+
+        def flush():
+            buffer.seek(0)
+            self.cur.copy_expert(
+                f"COPY kajabi_contacts_stage ({', '.join(STAGE_CONTACT_COLUMNS)}) "
+                f"FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            buffer.seek(0)
+            buffer.truncate()
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+
+            for row in reader:
+                self.stats['contacts']['processed'] += 1
+
+                contact = self._parse_contact_row(row)
+                if not contact:
+                    self.stats['contacts']['errors'] += 1
+                    continue
+
+                staged += 1
+                writer.writerow([staged] + [
+                    ('true' if contact[col] else 'false') if col == 'email_subscribed'
+                    else contact[col]
+                    for col in STAGE_CONTACT_COLUMNS[1:]
+                ])
+
+                if staged % BULK_COPY_CHUNK_ROWS == 0:
+                    flush()
+
+        if buffer.tell():
+            flush()
+
+        return staged
+
+    def _load_contacts_bulk(self):
+        """
+        Set-based contact import: COPY into a staging table, then merge.
+
+        Keeps the per-row semantics exactly:
+          - Repeated emails in the file collapse to the last non-NULL value per
+            column (what chained COALESCE updates would leave behind), while
+            email_subscribed takes the last row's value.
+          - 'created' counts distinct new emails; every other valid row counts
+            as 'updated', matching what the per-row loop reports.
+        """
+        print("🚚 Bulk mode: staging contacts with COPY...")
+
+        self.cur.execute("DROP TABLE IF EXISTS kajabi_contacts_stage")
+        self.cur.execute("DROP TABLE IF EXISTS kajabi_contacts_merged")
+        self.cur.execute("""
+            CREATE TEMP TABLE kajabi_contacts_stage (
+                seq BIGINT NOT NULL,
+                email CITEXT NOT NULL,
+                first_name TEXT,
+                last_name TEXT,
+                phone TEXT,
+                address_line_1 TEXT,
+                address_line_2 TEXT,
+                city TEXT,
+                state TEXT,
+                postal_code TEXT,
+                country TEXT,
+                kajabi_id TEXT,
+                kajabi_member_id TEXT,
+                email_subscribed BOOLEAN NOT NULL
+            ) ON COMMIT DROP
+        """)
+
+        staged = self._copy_contacts_to_stage()
+        print(f"  Staged {staged:,} rows")
+        if staged == 0:
+            return
+
+        # Collapse repeated emails and resolve existing contacts in one pass
+        self.cur.execute("""
+            CREATE TEMP TABLE kajabi_contacts_merged ON COMMIT DROP AS
+            WITH collapsed AS (
+                SELECT
+                    email,
+                    (array_agg(first_name ORDER BY seq DESC) FILTER (WHERE first_name IS NOT NULL))[1] AS first_name,
+                    (array_agg(last_name ORDER BY seq DESC) FILTER (WHERE last_name IS NOT NULL))[1] AS last_name,
+                    (array_agg(phone ORDER BY seq DESC) FILTER (WHERE phone IS NOT NULL))[1] AS phone,
+                    (array_agg(address_line_1 ORDER BY seq DESC) FILTER (WHERE address_line_1 IS NOT NULL))[1] AS address_line_1,
+                    (array_agg(address_line_2 ORDER BY seq DESC) FILTER (WHERE address_line_2 IS NOT NULL))[1] AS address_line_2,
+                    (array_agg(city ORDER BY seq DESC) FILTER (WHERE city IS NOT NULL))[1] AS city,
+                    (array_agg(state ORDER BY seq DESC) FILTER (WHERE state IS NOT NULL))[1] AS state,
+                    (array_agg(postal_code ORDER BY seq DESC) FILTER (WHERE postal_code IS NOT NULL))[1] AS postal_code,
+                    (array_agg(country ORDER BY seq DESC) FILTER (WHERE country IS NOT NULL))[1] AS country,
+                    (array_agg(kajabi_id ORDER BY seq DESC) FILTER (WHERE kajabi_id IS NOT NULL))[1] AS kajabi_id,
+                    (array_agg(kajabi_member_id ORDER BY seq DESC) FILTER (WHERE kajabi_member_id IS NOT NULL))[1] AS kajabi_member_id,
+                    (array_agg(email_subscribed ORDER BY seq DESC))[1] AS email_subscribed
+                FROM kajabi_contacts_stage
+                GROUP BY email
+            )
+            SELECT m.*, c.id AS existing_id
+            FROM collapsed m
+            LEFT JOIN contacts c ON c.email = m.email
+        """)
+        self.cur.execute("ANALYZE kajabi_contacts_merged")
+
+        self.cur.execute("""
+            SELECT COUNT(*) FILTER (WHERE existing_id IS NULL) AS new_contacts
+            FROM kajabi_contacts_merged
+        """)
+        created = self.cur.fetchone()['new_contacts']
+
+        # Existing contacts: same COALESCE merge as the per-row UPDATE
+        self.cur.execute("""
+            UPDATE contacts c
+            SET
+                first_name = COALESCE(m.first_name, c.first_name),
+                last_name = COALESCE(m.last_name, c.last_name),
+                phone = COALESCE(m.phone, c.phone),
+                address_line_1 = COALESCE(m.address_line_1, c.address_line_1),
+                address_line_2 = COALESCE(m.address_line_2, c.address_line_2),
+                city = COALESCE(m.city, c.city),
+                state = COALESCE(m.state, c.state),
+                postal_code = COALESCE(m.postal_code, c.postal_code),
+                country = COALESCE(m.country, c.country),
+                kajabi_id = COALESCE(m.kajabi_id, c.kajabi_id),
+                kajabi_member_id = COALESCE(m.kajabi_member_id, c.kajabi_member_id),
+                email_subscribed = m.email_subscribed,
+                source_system = 'kajabi',
+                updated_at = NOW()
+            FROM kajabi_contacts_merged m
+            WHERE c.id = m.existing_id
+        """)
+
+        # New contacts
+        self.cur.execute("""
+            INSERT INTO contacts (
+                email, first_name, last_name, phone,
+                address_line_1, address_line_2,
+                city, state, postal_code, country,
+                kajabi_id, kajabi_member_id,
+                email_subscribed,
+                source_system, created_at, updated_at
+            )
+            SELECT
+                email, first_name, last_name, phone,
+                address_line_1, address_line_2,
+                city, state, postal_code, country,
+                kajabi_id, kajabi_member_id,
+                email_subscribed,
+                'kajabi', NOW(), NOW()
+            FROM kajabi_contacts_merged
+            WHERE existing_id IS NULL
+        """)
+
+        # contact_emails rows for every imported contact
+        self.cur.execute("""
+            INSERT INTO contact_emails (
+                contact_id, email, email_type, is_primary, is_outreach,
+                source, created_at, updated_at
+            )
+            SELECT c.id, m.email, 'personal', true, true, 'kajabi', NOW(), NOW()
+            FROM kajabi_contacts_merged m
+            JOIN contacts c ON c.email = m.email
+            ON CONFLICT (contact_id, email) DO UPDATE
+            SET
+                is_outreach = true,
+                updated_at = NOW()
+        """)
+
+        # Cache contact IDs for later lookups
+        self.cur.execute("""
+            SELECT m.email, c.id, c.kajabi_id
+            FROM kajabi_contacts_merged m
+            JOIN contacts c ON c.email = m.email
+        """)
+        for row in self.cur:
+            self.index.add_contact(row['id'], str(row['email']), row['kajabi_id'])
+
+        self.stats['contacts']['created'] += created
+        self.stats['contacts']['updated'] += staged - created
 
     def load_tags(self):
         """Import tags from v2_tags.csv."""
@@ -439,13 +733,18 @@ class KajabiV2Importer:
                 self.stats['contact_tags']['processed'] += 1
 
                 try:
-                    contact_id = row.get('contact_id', '').strip()
+                    contact_id = self.resolve_contact_id(row.get('contact_id', '').strip())
                     tag_id = row.get('tag_id', '').strip()
 
-                    if not contact_id or not tag_id:
+                    # Unknown contact or tag would only fail the FK constraint
+                    if not contact_id or not tag_id or not self.index.has_tag(tag_id):
                         self.stats['contact_tags']['errors'] += 1
                         continue
 
+                    if self.index.has_contact_tag(contact_id, tag_id):
+                        self.stats['contact_tags']['skipped'] += 1
+                        continue
+
                     # Insert contact-tag relationship
                     self.cur.execute("""
                         INSERT INTO contact_tags (contact_id, tag_id, created_at)
@@ -453,6 +752,7 @@ class KajabiV2Importer:
                         ON CONFLICT (contact_id, tag_id) DO NOTHING
                     """, (contact_id, tag_id))
 
+                    self.index.add_contact_tag(contact_id, tag_id)
                     if self.cur.rowcount > 0:
                         self.stats['contact_tags']['created'] += 1
                     else:
@@ -540,13 +840,18 @@ class KajabiV2Importer:
                 self.stats['contact_products']['processed'] += 1
 
                 try:
-                    contact_id = row.get('contact_id', '').strip()
+                    contact_id = self.resolve_contact_id(row.get('contact_id', '').strip())
                     product_id = row.get('product_id', '').strip()
 
-                    if not contact_id or not product_id:
+                    # Unknown contact or product would only fail the FK constraint
+                    if not contact_id or not product_id or not self.index.has_product(product_id):
                         self.stats['contact_products']['errors'] += 1
                         continue
 
+                    if self.index.has_contact_product(contact_id, product_id):
+                        self.stats['contact_products']['skipped'] += 1
+                        continue
+
                     # Insert contact-product relationship
                     self.cur.execute("""
                         INSERT INTO contact_products (contact_id, product_id, created_at)
@@ -554,6 +859,7 @@ class KajabiV2Importer:
                         ON CONFLICT (contact_id, product_id) DO NOTHING
                     """, (contact_id, product_id))
 
+                    self.index.add_contact_product(contact_id, product_id)
                     if self.cur.rowcount > 0:
                         self.stats['contact_products']['created'] += 1
                     else:
@@ -585,7 +891,7 @@ class KajabiV2Importer:
                 self.stats['subscriptions']['processed'] += 1
 
                 try:
-                    contact_id = row.get('contact_id', '').strip()
+                    contact_id = self.resolve_contact_id(row.get('contact_id', '').strip())
                     product_id = row.get('product_id', '').strip() or None
                     kajabi_subscription_id = row.get('kajabi_subscription_id', '').strip() or None
                     status = row.get('status', '').strip().lower() or 'active'
@@ -616,7 +922,10 @@ class KajabiV2Importer:
                     }
                     billing_cycle = billing_cycle_map.get(billing_cycle, 'monthly')
 
-                    # Insert or update subscription
+                    # Insert or update subscription (index decides which it will be)
+                    is_update = bool(kajabi_subscription_id) and \
+                        self.index.has_kajabi_subscription(kajabi_subscription_id)
+
                     if kajabi_subscription_id:
                         # Update by Kajabi subscription ID
                         self.cur.execute("""
@@ -659,10 +968,13 @@ class KajabiV2Importer:
                             payment_processor, coupon_code
                         ))
 
-                    if self.cur.rowcount > 0:
-                        self.stats['subscriptions']['created'] += 1
-                    else:
+                    if kajabi_subscription_id:
+                        self.index.add_kajabi_subscription(kajabi_subscription_id)
+
+                    if is_update:
                         self.stats['subscriptions']['updated'] += 1
+                    else:
+                        self.stats['subscriptions']['created'] += 1
 
                 except Exception as e:
                     self.stats['subscriptions']['errors'] += 1
@@ -690,7 +1002,7 @@ class KajabiV2Importer:
                 self.stats['transactions']['processed'] += 1
 
                 try:
-                    contact_id = row.get('contact_id', '').strip()
+                    contact_id = self.resolve_contact_id(row.get('contact_id', '').strip())
                     product_id = row.get('product_id', '').strip() or None
                     subscription_id = row.get('subscription_id', '').strip() or None
                     kajabi_transaction_id = row.get('kajabi_transaction_id', '').strip() or None
@@ -712,6 +1024,11 @@ class KajabiV2Importer:
                         self.stats['transactions']['errors'] += 1
                         continue
 
+                    # Already imported: skip without a round trip
+                    if kajabi_transaction_id and self.index.has_kajabi_transaction(kajabi_transaction_id):
+                        self.stats['transactions']['skipped'] += 1
+                        continue
+
                     # Insert transaction (with deduplication by kajabi_transaction_id)
                     if kajabi_transaction_id:
                         self.cur.execute("""
@@ -750,6 +1067,9 @@ class KajabiV2Importer:
                             'kajabi'
                         ))
 
+                    if kajabi_transaction_id:
+                        self.index.add_kajabi_transaction(kajabi_transaction_id)
+
                     if self.cur.rowcount > 0:
                         self.stats['transactions']['created'] += 1
                     else:
@@ -773,6 +1093,7 @@ class KajabiV2Importer:
         print()
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Mode: {'DRY RUN' if self.dry_run else 'EXECUTE'}")
+        print(f"Contact loading: {'BULK (COPY + set-based merge)' if self.bulk else 'per-row'}")
         print(f"Data directory: {self.data_dir}")
         print()
 
@@ -788,44 +1109,41 @@ class KajabiV2Importer:
             print("\n❌ Pre-flight check failed. Cannot continue.")
             return False
 
-        # Connect to database
-        self.connect()
+        # Record the run in the ledger; connecting inside the try means a
+        # failed connect still finishes the row as failed
+        ledger = RunRecorder('weekly_import_kajabi_v2', dry_run=self.dry_run).start()
+        success = False
 
         try:
+            self.connect()
+
+            with span('warm_indexes'):
+                self.warm_indexes()
+
             # Run imports in order
-            self.load_contacts()           # 1. Contacts first (base records)
-            self.load_tags()               # 2. Tags (definitions)
-            self.load_contact_tags()       # 3. Contact-Tag relationships
-            self.load_products()           # 4. Products (catalog)
-            self.load_contact_products()   # 5. Contact-Product relationships (purchases)
-            self.load_subscriptions()      # 6. Subscriptions
-            self.load_transactions()       # 7. Transactions
-
-            # Summary
-            print("\n" + "=" * 80)
-            print("  IMPORT COMPLETE")
-            print("=" * 80)
+            with span('contacts'):
+                self.load_contacts()           # 1. Contacts first (base records)
+            with span('tags'):
+                self.load_tags()               # 2. Tags (definitions)
+            with span('contact_tags'):
+                self.load_contact_tags()       # 3. Contact-Tag relationships
+            with span('products'):
+                self.load_products()           # 4. Products (catalog)
+            with span('contact_products'):
+                self.load_contact_products()   # 5. Contact-Product relationships (purchases)
+            with span('subscriptions'):
+                self.load_subscriptions()      # 6. Subscriptions
+            with span('transactions'):
+                self.load_transactions()       # 7. Transactions
+
+            self.print_summary()
+
+            self.index.print_report()
             print()
-            print("📊 Summary:")
+            print_pool_stats()
             print()
-            print(f"  Contacts:         {self.stats['contacts']['created']} created, {self.stats['contacts']['updated']} updated")
-            print(f"  Tags:             {self.stats['tags']['created']} created/updated")
-            print(f"  Contact Tags:     {self.stats['contact_tags']['created']} linked")
-            print(f"  Products:         {self.stats['products']['created']} created/updated")
-            print(f"  Contact Products: {self.stats['contact_products']['created']} linked")
-            print(f"  Subscriptions:    {self.stats['subscriptions']['created']} created, {self.stats['subscriptions']['updated']} updated")
-            print(f"  Transactions:     {self.stats['transactions']['created']} created")
-            print()
-
-            # Validation summary
-            if self.stats['validation']['total_issues'] > 0:
-                print(f"🔧 Address Validation:")
-                print(f"  City placements fixed:   {self.stats['validation']['city_corrected']}")
-                print(f"  Duplicates removed:      {self.stats['validation']['duplicates_removed']}")
-                print(f"  Total auto-corrections:  {self.stats['validation']['total_issues']}")
-                print()
 
-            total_errors = sum(s.get('errors', 0) for s in self.stats.values() if 'errors' in s)
+            total_errors = self.total_errors()
             if total_errors > 0:
                 print(f"⚠️  Total errors: {total_errors}")
             else:
@@ -840,6 +1158,7 @@ class KajabiV2Importer:
             else:
                 print("\n✅ Changes committed to database")
 
+            success = True
             return True
 
         except Exception as e:
@@ -850,6 +1169,47 @@ class KajabiV2Importer:
 
         finally:
             self.close()
+            ledger.finish(success, **self.ledger_counts())
+
+    def total_errors(self) -> int:
+        """Errors counted across every step."""
+        return sum(s.get('errors', 0) for s in self.stats.values() if 'errors' in s)
+
+    def ledger_counts(self) -> Dict:
+        """Row and error totals across every step, for the run ledger."""
+        steps = [s for name, s in self.stats.items() if name != 'validation']
+        return {
+            'rows_processed': sum(s['processed'] for s in steps),
+            'rows_created': sum(s['created'] for s in steps),
+            'rows_updated': sum(s.get('updated', 0) for s in steps),
+            'errors': self.total_errors(),
+            'details': self.stats,
+        }
+
+    def print_summary(self):
+        """Print per-step created/updated counts and address corrections."""
+        print("\n" + "=" * 80)
+        print("  IMPORT COMPLETE")
+        print("=" * 80)
+        print()
+        print("📊 Summary:")
+        print()
+        print(f"  Contacts:         {self.stats['contacts']['created']} created, {self.stats['contacts']['updated']} updated")
+        print(f"  Tags:             {self.stats['tags']['created']} created/updated")
+        print(f"  Contact Tags:     {self.stats['contact_tags']['created']} linked")
+        print(f"  Products:         {self.stats['products']['created']} created/updated")
+        print(f"  Contact Products: {self.stats['contact_products']['created']} linked")
+        print(f"  Subscriptions:    {self.stats['subscriptions']['created']} created, {self.stats['subscriptions']['updated']} updated")
+        print(f"  Transactions:     {self.stats['transactions']['created']} created")
+        print()
+
+        # Validation summary
+        if self.stats['validation']['total_issues'] > 0:
+            print(f"🔧 Address Validation:")
+            print(f"  City placements fixed:   {self.stats['validation']['city_corrected']}")
+            print(f"  Duplicates removed:      {self.stats['validation']['duplicates_removed']}")
+            print(f"  Total auto-corrections:  {self.stats['validation']['total_issues']}")
+            print()
 
 # ============================================================================
 # MAIN
@@ -880,6 +1240,12 @@ def main():
         help='Execute import and commit changes to database'
     )
 
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Load contacts with COPY + set-based upserts instead of one round trip per row'
+    )
+
     args = parser.parse_args()
 
     # Validate data directory
@@ -894,7 +1260,8 @@ def main():
     # Run importer
     importer = KajabiV2Importer(
         data_dir=args.data_dir,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        bulk=args.bulk
     )
 
     success = importer.run()
@@ -42,15 +42,15 @@ from psycopg2.extras import RealDictCursor
 
 # Add scripts directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from secure_config import get_database_url
+from db_config import acquire_connection, release_connection, execute_prepared, print_pool_stats
+from import_lookup_index import ImportLookupIndex
+from logging_config import instrument_cursor, span
+from run_ledger import RunRecorder
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-# Database connection - NO DEFAULTS, fails fast if missing
-DB_CONNECTION = get_database_url()
-
 # ============================================================================
 # HELPERS
 # ============================================================================
@@ -92,10 +92,24 @@ def is_business_name(name: str) -> bool:
 # ============================================================================
 
 class PayPalImporter:
-    def __init__(self, connection_string: str, dry_run: bool = True):
-        self.conn = psycopg2.connect(connection_string)
-        self.cur = self.conn.cursor(cursor_factory=RealDictCursor)
+    def __init__(self, connection_string: Optional[str] = None, dry_run: bool = True,
+                 conn=None, index: Optional[ImportLookupIndex] = None):
+        # Use the caller's connection (weekly pipeline), else borrow from the
+        # shared pool unless an explicit DSN is given
+        self.owns_connection = conn is None
+        self.pooled = self.owns_connection and connection_string is None
+        if conn is not None:
+            self.conn = conn
+        elif self.pooled:
+            self.conn = acquire_connection()
+        else:
+            self.conn = psycopg2.connect(connection_string)
+        self.cur = instrument_cursor(self.conn.cursor(cursor_factory=RealDictCursor))
         self.dry_run = dry_run
+
+        # Warm email/paypal_email index shared with the other weekly importers;
+        # when present, emails it doesn't know skip the lookup round trip
+        self.index = index
         self.stats = {
             'rows_processed': 0,
             'transactions_new': 0,
@@ -127,8 +141,19 @@ class PayPalImporter:
         return self.membership_products_cache.get(item_title.lower())
 
     def find_contact(self, email: str) -> Optional[Dict]:
-        """Find contact by email"""
-        self.cur.execute("""
+        """Find contact by email (prepared once per pooled connection)"""
+        if self.index is not None and self.index.warmed:
+            contact_id = self.index.contact_for_email(email) or self.index.contact_for_paypal_email(email)
+            if not contact_id:
+                return None
+            execute_prepared(self.cur, 'paypal_get_contact', """
+                SELECT id, first_name, last_name, phone, paypal_business_name
+                FROM contacts
+                WHERE id = %s
+            """, (contact_id,))
+            return self.cur.fetchone()
+
+        execute_prepared(self.cur, 'paypal_find_contact', """
             SELECT id, first_name, last_name, phone, paypal_business_name
             FROM contacts
             WHERE email = %s OR paypal_email = %s
@@ -274,6 +299,8 @@ class PayPalImporter:
                 ))
                 result = self.cur.fetchone()
                 contact_id = result['id'] if result else None
+                if contact_id and self.index is not None:
+                    self.index.add_contact(contact_id, email, paypal_email=email)
             else:
                 contact_id = 'dry-run-contact-id'
 
@@ -385,6 +412,34 @@ class PayPalImporter:
 
         print(f"\n")
 
+    def run(self, filepath: str) -> bool:
+        """
+        Import one export file and commit or roll back, recorded in the run ledger.
+
+        Standalone runs only; in weekly_import_all_v2.py the pipeline's own
+        ledger run covers this importer.
+        """
+        ledger = RunRecorder('weekly_import_paypal', dry_run=self.dry_run).start()
+        success = False
+        try:
+            with span('import_file'):
+                self.import_file(filepath)
+            self.commit_or_rollback()
+            success = True
+        finally:
+            ledger.finish(success, **self.ledger_counts())
+        return success
+
+    def ledger_counts(self) -> Dict:
+        """Row and error totals for the run ledger."""
+        return {
+            'rows_processed': self.stats['rows_processed'],
+            'rows_created': self.stats['transactions_new'] + self.stats['contacts_created'],
+            'rows_updated': self.stats['contacts_enriched'],
+            'errors': len(self.stats['errors']),
+            'details': {key: value for key, value in self.stats.items() if key != 'errors'},
+        }
+
     def commit_or_rollback(self):
         """Commit or rollback transaction"""
         if self.dry_run:
@@ -421,9 +476,14 @@ class PayPalImporter:
         print(f"\n{'='*80}\n")
 
     def close(self):
-        """Close database connection"""
+        """Close database connection (or return it to the pool)"""
         self.cur.close()
-        self.conn.close()
+        if not self.owns_connection:
+            return
+        if self.pooled:
+            release_connection(self.conn)
+        else:
+            self.conn.close()
 
 # ============================================================================
 # MAIN
@@ -447,17 +507,15 @@ def main():
         sys.exit(1)
 
     # Create importer
-    importer = PayPalImporter(DB_CONNECTION, dry_run=args.dry_run)
+    importer = PayPalImporter(dry_run=args.dry_run)
 
     try:
-        # Import file
-        importer.import_file(args.file)
-
-        # Commit or rollback
-        importer.commit_or_rollback()
+        # Import file, then commit or rollback
+        importer.run(args.file)
 
         # Print stats
         importer.print_stats()
+        print_pool_stats()
 
     except Exception as e:
         print(f"\n❌ FATAL ERROR: {e}")
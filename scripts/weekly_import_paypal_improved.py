@@ -6,7 +6,7 @@ WEEKLY PAYPAL IMPORT - IMPROVED (FAANG Quality)
 Production-grade PayPal transaction importer with:
 - Secure credential management (no hardcoded passwords)
 - Structured logging with correlation IDs
-- Batch operations for performance
+- Streaming, chunked reads with batched contact resolution and writes
 - Proper error handling with specific exceptions
 - Data validation and sanitization
 - Comprehensive metrics and observability
@@ -18,6 +18,12 @@ Usage:
   # Execute import
   python3 scripts/weekly_import_paypal_improved.py --file data/paypal_export.txt --execute
 
+  # Smaller/larger chunks (default: KAJABI_BATCH_SIZE or 1000 rows)
+  python3 scripts/weekly_import_paypal_improved.py --file data/paypal_export.txt --execute --chunk-size 5000
+
+  # Record stage timings and query counters (JSON summary + log line)
+  python3 scripts/weekly_import_paypal_improved.py --file data/paypal_export.txt --dry-run --instrument /tmp/paypal_stats.json
+
 Required File from PayPal:
   - PayPal transaction export (tab-delimited .txt or .tsv)
 
@@ -34,10 +40,12 @@ import os
 import sys
 import argparse
 import uuid
+from itertools import islice
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import psycopg2
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor, execute_values
 from psycopg2 import errors as pg_errors
 from dotenv import load_dotenv
@@ -47,8 +55,13 @@ load_dotenv()
 
 # Import our modules
 from config import get_config
-from logging_config import setup_logging, get_logger
+from logging_config import (
+    setup_logging, get_logger, enable_instrumentation, finish_instrumentation,
+    instrument_cursor, span,
+)
 from validation import validate_email, parse_decimal, sanitize_string, validate_phone
+from db_config import acquire_connection, release_connection, pool_stats
+from run_ledger import RunRecorder
 
 # ============================================================================
 # CONFIGURATION
@@ -176,17 +189,21 @@ class PayPalImprover:
     Production-grade PayPal transaction importer.
 
     Features:
-    - Batch operations for performance
+    - Streaming chunks: one contact lookup, one enrichment UPDATE, one
+      contact INSERT and one transaction INSERT per chunk
     - Structured logging with trace IDs
     - Proper error handling
     - Data validation
     - Contact enrichment
     """
 
-    def __init__(self, paypal_file: str, dry_run: bool = True):
+    def __init__(self, paypal_file: str, dry_run: bool = True, chunk_size: Optional[int] = None):
         self.paypal_file = paypal_file
         self.dry_run = dry_run
 
+        # Rows read, resolved and written per round of bulk statements
+        self.chunk_size = chunk_size or config.import_config.batch_size
+
         # Generate trace ID
         self.trace_id = str(uuid.uuid4())
 
@@ -201,29 +218,30 @@ class PayPalImprover:
         self.stats = ImportStats()
 
         # Caches
-        self.contact_cache: Dict[str, str] = {}  # email -> contact_id
+        self.contact_cache: Dict[str, str] = {}  # email -> contact_id, for the current chunk
         self.membership_products_cache: Dict[str, Dict] = {}
 
         self.logger.info(
             "paypal_importer_initialized",
             paypal_file=paypal_file,
-            dry_run=dry_run
+            dry_run=dry_run,
+            chunk_size=self.chunk_size
         )
 
     def connect(self):
-        """Connect to database."""
+        """Borrow a connection from the shared db_config pool."""
         self.logger.info("connecting_to_database")
 
         try:
-            self.conn = psycopg2.connect(config.database.url)
-            self.cur = self.conn.cursor(cursor_factory=RealDictCursor)
-            self.logger.info("database_connected")
-        except pg_errors.OperationalError as e:
+            self.conn = acquire_connection()
+            self.cur = instrument_cursor(self.conn.cursor(cursor_factory=RealDictCursor))
+            self.logger.info("database_connected", **pool_stats())
+        except (pg_errors.OperationalError, psycopg2.pool.PoolError) as e:
             self.logger.error("database_connection_failed", error=str(e), exc_info=True)
             raise ConnectionError(f"Failed to connect to database: {e}") from e
 
     def close(self):
-        """Close database connection."""
+        """Finish the transaction and return the connection to the pool."""
         if self.cur:
             self.cur.close()
 
@@ -234,9 +252,10 @@ class PayPalImprover:
             else:
                 self.logger.info("committing_changes")
                 self.conn.commit()
-            self.conn.close()
+            release_connection(self.conn)
+            self.conn = None
 
-        self.logger.info("database_connection_closed")
+        self.logger.info("database_connection_released", **pool_stats())
 
     def load_membership_products(self):
         """Load membership products cache for faster lookups."""
@@ -269,10 +288,46 @@ class PayPalImprover:
             return None
         return self.membership_products_cache.get(item_title.lower())
 
+    def _parse_contact_fields(self, row: Dict) -> Dict:
+        """Extract the contact/enrichment fields carried by a PayPal export row."""
+        # Parse contact data
+        first_name, last_name = parse_name(row.get('Name', ''))
+
+        # Check if business
+        business_name = None
+        if row.get('Name') and is_business_name(row['Name']):
+            business_name = sanitize_string(row['Name'], 255)
+
+        # Get membership info if subscription payment
+        product = None
+        if row.get('Type') == 'Subscription Payment' and row.get('Item Title'):
+            product = self.get_membership_product(row['Item Title'])
+
+        return {
+            'first_name': first_name,
+            'last_name': last_name,
+            'business_name': business_name,
+            'phone': validate_phone(row.get('Contact Phone Number', '')),
+            'address_line_1': sanitize_string(row.get('Address Line 1', ''), 255) or None,
+            'city': sanitize_string(row.get('Town/City', ''), 100) or None,
+            'state': sanitize_string(
+                row.get('State/Province/Region/County/Territory/Prefecture/Republic', ''), 50
+            ) or None,
+            'postal_code': sanitize_string(row.get('Zip/Postal Code', ''), 20) or None,
+            'country': sanitize_string(row.get('Country', ''), 50) or None,
+            'membership_group': product.get('membership_group') if product else None,
+            'membership_level': product.get('membership_level') if product else None,
+            'membership_tier': product.get('membership_tier') if product else None,
+            'is_legacy': product.get('is_legacy', False) if product else False,
+        }
+
     def find_or_create_contact(self, row: Dict) -> Optional[str]:
         """
         Find existing contact or create new one from PayPal data.
 
+        Single-row path; import_file() resolves whole chunks with
+        _resolve_contacts() instead.
+
         Returns:
             Contact ID or None if failed
         """
@@ -288,87 +343,112 @@ class PayPalImprover:
             self.stats.increment('contacts', 'matched')
             return self.contact_cache[email]
 
-        # Parse contact data
-        first_name, last_name = parse_name(row.get('Name', ''))
+        self._resolve_contacts({email: row})
+        return self.contact_cache.get(email)
 
-        # Check if business
-        business_name = None
-        if row.get('Name') and is_business_name(row['Name']):
-            business_name = sanitize_string(row['Name'], 255)
-
-        # Phone
-        phone = validate_phone(row.get('Contact Phone Number', ''))
+    @span('resolve_contacts')
+    def _resolve_contacts(self, first_rows: Dict[str, Dict]):
+        """
+        Match, enrich or create the contacts for a set of uncached emails.
 
-        # Addresses
-        address_line_1 = sanitize_string(row.get('Address Line 1', ''), 255) or None
-        city = sanitize_string(row.get('Town/City', ''), 100) or None
-        state = sanitize_string(
-            row.get('State/Province/Region/County/Territory/Prefecture/Republic', ''), 50
-        ) or None
-        postal_code = sanitize_string(row.get('Zip/Postal Code', ''), 20) or None
-        country = sanitize_string(row.get('Country', ''), 50) or None
+        One SELECT finds every existing contact by email or paypal_email, one
+        multi-row UPDATE enriches them and one multi-row INSERT creates the
+        rest. Each email's first row in the file supplies its data, exactly as
+        the row-at-a-time path did; when several emails match the same contact,
+        the first one's row enriches it, since an UPDATE ... FROM applies an
+        arbitrary one of several source rows. Results land in contact_cache.
 
-        # Get membership info if subscription payment
-        membership_group = None
-        membership_level = None
-        membership_tier = None
-        is_legacy = False
-
-        if row.get('Type') == 'Subscription Payment' and row.get('Item Title'):
-            product = self.get_membership_product(row['Item Title'])
-            if product:
-                membership_group = product.get('membership_group')
-                membership_level = product.get('membership_level')
-                membership_tier = product.get('membership_tier')
-                is_legacy = product.get('is_legacy', False)
+        Args:
+            first_rows: email -> first export row seen for that email
+        """
+        emails = list(first_rows)
 
-        # Check if contact exists
         try:
             self.cur.execute("""
-                SELECT id FROM contacts
-                WHERE email = %s OR paypal_email = %s
-                LIMIT 1
-            """, (email, email))
+                SELECT id, email, paypal_email FROM contacts
+                WHERE email = ANY(%s::citext[]) OR paypal_email = ANY(%s::citext[])
+            """, (emails, emails))
+
+            # Prefer a primary-email match over a paypal_email match
+            by_email: Dict[str, str] = {}
+            by_paypal_email: Dict[str, str] = {}
+            for match in self.cur.fetchall():
+                if match['email']:
+                    by_email.setdefault(str(match['email']).lower(), match['id'])
+                if match['paypal_email']:
+                    by_paypal_email.setdefault(str(match['paypal_email']).lower(), match['id'])
+
+            updates: Dict[str, Tuple] = {}  # contact_id -> UPDATE values
+            inserts = []
+            matched = 0
+            for email, row in first_rows.items():
+                fields = self._parse_contact_fields(row)
+                contact_id = by_email.get(email) or by_paypal_email.get(email)
 
-            existing = self.cur.fetchone()
-
-            if existing:
-                contact_id = existing['id']
-
-                # Enrich existing contact
-                self.cur.execute("""
-                    UPDATE contacts
+                if contact_id:
+                    self.contact_cache[email] = contact_id
+                    matched += 1
+                    if contact_id in updates:
+                        continue
+                    updates[contact_id] = (
+                        contact_id, email, fields['first_name'], fields['last_name'],
+                        fields['business_name'], fields['phone'],
+                        fields['address_line_1'], fields['city'], fields['state'],
+                        fields['postal_code'], fields['country'],
+                        fields['membership_group'], fields['membership_level'],
+                        fields['membership_tier'],
+                    )
+                else:
+                    inserts.append((
+                        email, fields['first_name'], fields['last_name'],
+                        email, fields['first_name'], fields['last_name'],
+                        fields['business_name'], fields['phone'], fields['phone'],
+                        fields['address_line_1'], fields['city'], fields['state'],
+                        fields['postal_code'], fields['country'],
+                        fields['membership_group'], fields['membership_level'],
+                        fields['membership_tier'],
+                        fields['is_legacy'], 'paypal', True
+                    ))
+
+            if updates:
+                # Enrich existing contacts
+                execute_values(self.cur, """
+                    UPDATE contacts c
                     SET
-                        paypal_email = %s,
-                        paypal_first_name = COALESCE(%s, paypal_first_name),
-                        paypal_last_name = COALESCE(%s, paypal_last_name),
-                        paypal_business_name = COALESCE(%s, paypal_business_name),
-                        paypal_phone = COALESCE(%s, paypal_phone),
-                        phone = COALESCE(phone, %s),
-                        shipping_address_line_1 = COALESCE(%s, shipping_address_line_1),
-                        shipping_city = COALESCE(%s, shipping_city),
-                        shipping_state = COALESCE(%s, shipping_state),
-                        shipping_postal_code = COALESCE(%s, shipping_postal_code),
-                        shipping_country = COALESCE(%s, shipping_country),
-                        membership_group = COALESCE(%s, membership_group),
-                        membership_level = COALESCE(%s, membership_level),
-                        membership_tier = COALESCE(%s, membership_tier),
+                        paypal_email = v.email,
+                        paypal_first_name = COALESCE(v.first_name, c.paypal_first_name),
+                        paypal_last_name = COALESCE(v.last_name, c.paypal_last_name),
+                        paypal_business_name = COALESCE(v.business_name, c.paypal_business_name),
+                        paypal_phone = COALESCE(v.phone, c.paypal_phone),
+                        phone = COALESCE(c.phone, v.phone),
+                        shipping_address_line_1 = COALESCE(v.address_line_1, c.shipping_address_line_1),
+                        shipping_city = COALESCE(v.city, c.shipping_city),
+                        shipping_state = COALESCE(v.state, c.shipping_state),
+                        shipping_postal_code = COALESCE(v.postal_code, c.shipping_postal_code),
+                        shipping_country = COALESCE(v.country, c.shipping_country),
+                        membership_group = COALESCE(v.membership_group, c.membership_group),
+                        membership_level = COALESCE(v.membership_level, c.membership_level),
+                        membership_tier = COALESCE(v.membership_tier, c.membership_tier),
                         updated_at = NOW()
-                    WHERE id = %s
-                """, (
-                    email, first_name, last_name, business_name, phone, phone,
-                    address_line_1, city, state, postal_code, country,
-                    membership_group, membership_level, membership_tier,
-                    contact_id
-                ))
-
-                self.stats.increment('contacts', 'enriched')
-                self.stats.increment('contacts', 'matched')
-
-                self.logger.debug("contact_enriched", email=email, contact_id=contact_id)
-            else:
-                # Create new contact
-                self.cur.execute("""
+                    FROM (VALUES %s) AS v(
+                        id, email, first_name, last_name, business_name, phone,
+                        address_line_1, city, state, postal_code, country,
+                        membership_group, membership_level, membership_tier
+                    )
+                    WHERE c.id = v.id
+                """, list(updates.values()),
+                    template="(%s::uuid, %s::text, %s::text, %s::text, %s::text, %s::text, "
+                             "%s::text, %s::text, %s::text, %s::text, %s::text, "
+                             "%s::text, %s::text, %s::text)",
+                    page_size=self.chunk_size)
+
+                self.stats.increment('contacts', 'enriched', len(updates))
+                self.stats.increment('contacts', 'matched', matched)
+                self.logger.debug("contacts_enriched", count=len(updates))
+
+            if inserts:
+                # Create new contacts
+                created = execute_values(self.cur, """
                     INSERT INTO contacts (
                         email, first_name, last_name,
                         paypal_email, paypal_first_name, paypal_last_name,
@@ -379,48 +459,41 @@ class PayPalImprover:
                         is_legacy_member, source_system, email_subscribed,
                         created_at, updated_at
                     )
-                    VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, NOW(), NOW()
-                    )
-                    RETURNING id
-                """, (
-                    email, first_name, last_name,
-                    email, first_name, last_name,
-                    business_name, phone, phone,
-                    address_line_1, city, state, postal_code, country,
-                    membership_group, membership_level, membership_tier,
-                    is_legacy, 'paypal', True
-                ))
-
-                result = self.cur.fetchone()
-                contact_id = result['id'] if result else None
-
-                self.stats.increment('contacts', 'created')
-                self.logger.debug("contact_created", email=email, contact_id=contact_id)
-
-            # Cache the contact ID
-            self.contact_cache[email] = contact_id
-            return contact_id
+                    VALUES %s
+                    RETURNING id, email
+                """, inserts,
+                    template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, "
+                             "%s, %s, %s, %s, %s, %s, NOW(), NOW())",
+                    page_size=self.chunk_size, fetch=True)
+
+                for new_contact in created:
+                    self.contact_cache[str(new_contact['email']).lower()] = new_contact['id']
+
+                self.stats.increment('contacts', 'created', len(created))
+                self.logger.debug("contacts_created", count=len(created))
 
         except (ValueError, KeyError, TypeError) as e:
-            self.logger.warning("contact_validation_error", email=email, error=str(e))
-            self.stats.increment('contacts', 'errors')
-            self.stats.add_error(f"Contact validation error for {email}: {e}")
-            return None
+            self.logger.warning("contact_validation_error", emails=len(emails), error=str(e))
+            self.stats.increment('contacts', 'errors', len(emails))
+            self.stats.add_error(f"Contact validation error for {len(emails)} contacts: {e}")
         except pg_errors.DatabaseError as e:
-            self.logger.error("contact_database_error", email=email, error=str(e), exc_info=True)
-            self.stats.increment('contacts', 'errors')
-            self.stats.add_error(f"Database error for contact {email}: {e}")
+            self.logger.error("contact_database_error", emails=len(emails), error=str(e), exc_info=True)
+            self.stats.increment('contacts', 'errors', len(emails))
+            self.stats.add_error(f"Database error resolving {len(emails)} contacts: {e}")
             raise
 
-    def create_transaction(self, row: Dict, contact_id: str):
-        """Create transaction from PayPal row."""
+    def _parse_transaction(self, row: Dict, contact_id: str) -> Optional[Tuple]:
+        """
+        Validate a PayPal row and build its transactions INSERT values.
+
+        Returns None (after counting the skip or error) when the row should
+        not be imported.
+        """
         # Only import completed or refunded transactions
         status_raw = row.get('Status', '')
         if status_raw not in ['Completed', 'Refunded']:
             self.stats.increment('rows_skipped')
-            return
+            return None
 
         try:
             # Parse amount
@@ -428,7 +501,7 @@ class PayPalImprover:
             if amount is None:
                 self.stats.add_error(f"Invalid amount for txn {row.get('Transaction ID')}")
                 self.stats.increment('transactions', 'errors')
-                return
+                return None
 
             # Parse date/time
             transaction_date = parse_paypal_datetime(
@@ -448,30 +521,12 @@ class PayPalImprover:
             # Map status
             status = 'completed' if status_raw == 'Completed' else 'refunded'
 
-            # Insert transaction
             transaction_id = sanitize_string(row.get('Transaction ID', ''), 255)
             if not transaction_id:
                 self.stats.increment('transactions', 'errors')
-                return
+                return None
 
-            self.cur.execute("""
-                INSERT INTO transactions (
-                    contact_id, source_system,
-                    external_transaction_id, external_order_id, order_number,
-                    transaction_type, status,
-                    amount, currency,
-                    payment_method, payment_processor,
-                    transaction_date,
-                    created_at, updated_at
-                )
-                VALUES (
-                    %s, 'paypal', %s, %s, %s, %s, %s, %s, %s, 'paypal', 'PayPal',
-                    COALESCE(%s, NOW()), NOW(), NOW()
-                )
-                ON CONFLICT (source_system, external_transaction_id)
-                WHERE external_transaction_id IS NOT NULL
-                DO NOTHING
-            """, (
+            return (
                 contact_id,
                 transaction_id,
                 row.get('Invoice Number') or transaction_id,
@@ -479,13 +534,7 @@ class PayPalImprover:
                 transaction_type, status,
                 amount, row.get('Currency', 'USD'),
                 transaction_date
-            ))
-
-            if self.cur.rowcount > 0:
-                self.stats.increment('transactions', 'new')
-                self.logger.debug("transaction_created", transaction_id=transaction_id)
-            else:
-                self.stats.increment('transactions', 'skipped')
+            )
 
         except (ValueError, InvalidOperation) as e:
             self.logger.warning(
@@ -495,66 +544,155 @@ class PayPalImprover:
             )
             self.stats.increment('transactions', 'errors')
             self.stats.add_error(f"Transaction validation error: {e}")
+            return None
+
+    def create_transaction(self, row: Dict, contact_id: str):
+        """Create transaction from a single PayPal row."""
+        values = self._parse_transaction(row, contact_id)
+        if values:
+            self._insert_transactions([values])
+
+    @span('insert_transactions')
+    def _insert_transactions(self, values: List[Tuple]):
+        """Insert parsed transactions in one statement, skipping known ones."""
+        try:
+            inserted = execute_values(self.cur, """
+                INSERT INTO transactions (
+                    contact_id, source_system,
+                    external_transaction_id, external_order_id, order_number,
+                    transaction_type, status,
+                    amount, currency,
+                    payment_method, payment_processor,
+                    transaction_date,
+                    created_at, updated_at
+                )
+                VALUES %s
+                ON CONFLICT (source_system, external_transaction_id)
+                WHERE external_transaction_id IS NOT NULL
+                DO NOTHING
+                RETURNING external_transaction_id
+            """, values,
+                template="(%s, 'paypal', %s, %s, %s, %s, %s, %s, %s, 'paypal', 'PayPal', "
+                         "COALESCE(%s, NOW()), NOW(), NOW())",
+                page_size=self.chunk_size, fetch=True)
+
+            self.stats.increment('transactions', 'new', len(inserted))
+            self.stats.increment('transactions', 'skipped', len(values) - len(inserted))
+            self.logger.debug("transactions_inserted", new=len(inserted), attempted=len(values))
+
         except pg_errors.DatabaseError as e:
             self.logger.error(
                 "transaction_database_error",
-                transaction_id=row.get('Transaction ID'),
+                attempted=len(values),
                 error=str(e),
                 exc_info=True
             )
-            self.stats.increment('transactions', 'errors')
-            self.stats.add_error(f"Database error for transaction: {e}")
+            self.stats.increment('transactions', 'errors', len(values))
+            self.stats.add_error(f"Database error for {len(values)} transactions: {e}")
             raise
 
-    def import_file(self):
-        """Import PayPal export file."""
-        self.logger.info("starting_paypal_import", file=self.paypal_file)
-
-        # Verify file exists
-        if not os.path.exists(self.paypal_file):
-            self.logger.error("file_not_found", file=self.paypal_file)
-            raise FileNotFoundError(f"PayPal file not found: {self.paypal_file}")
+    def _read_chunks(self, f) -> Iterator[List[Dict]]:
+        """Yield the tab-delimited export chunk_size rows at a time."""
+        reader = csv.DictReader(f, delimiter='\t')
+        while True:
+            chunk = list(islice(reader, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
 
-        # Read tab-delimited file
-        try:
-            with open(self.paypal_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter='\t')
-                rows = list(reader)
+    @span('process_chunk')
+    def process_chunk(self, rows: List[Dict], first_row_number: int):
+        """
+        Import one chunk: resolve its contacts in bulk, then batch-insert its
+        transactions. Counters match the row-at-a-time path within a chunk.
 
-            self.logger.info("file_parsed", row_count=len(rows))
+        contact_cache only holds the current chunk's emails, so memory stays
+        flat however many distinct emails the export has; an email repeated
+        in a later chunk is looked up (and enriched) again.
 
-        except IOError as e:
-            self.logger.error("file_read_error", file=self.paypal_file, error=str(e), exc_info=True)
-            raise
+        Args:
+            rows: Export rows in file order
+            first_row_number: File line number of rows[0] (for error messages)
+        """
+        # Validate emails; remember the first row of every email in the chunk
+        self.contact_cache.clear()
+        emails: List[Optional[str]] = []
+        first_rows: Dict[str, Dict] = {}
 
-        # Process rows
-        for i, row in enumerate(rows):
+        for row in rows:
             self.stats.increment('rows_processed')
-
-            if i > 0 and i % 100 == 0:
-                self.logger.info("import_progress", processed=i, total=len(rows))
+            email = validate_email(row.get('From Email Address', ''))
+            if not email:
+                self.stats.add_error(f"Invalid email: {row.get('From Email Address', 'N/A')}")
+                self.stats.increment('contacts', 'errors')
+            elif email not in first_rows:
+                first_rows[email] = row
+            emails.append(email)
+
+        if first_rows:
+            self._resolve_contacts(first_rows)
+
+        values = []
+        for i, (row, email) in enumerate(zip(rows, emails)):
+            if not email:
+                continue
+
+            contact_id = self.contact_cache.get(email)
+            if not contact_id:
+                continue
+
+            # Rows after an email's first one are cache hits
+            if first_rows.get(email) is not row:
+                self.stats.increment('contacts', 'matched')
 
             try:
-                # Find or create contact
-                contact_id = self.find_or_create_contact(row)
-
-                if contact_id:
-                    # Create transaction
-                    self.create_transaction(row, contact_id)
-
-            except pg_errors.DatabaseError:
-                # Already logged, re-raise
-                raise
+                txn = self._parse_transaction(row, contact_id)
+                if txn:
+                    values.append(txn)
             except Exception as e:
                 self.logger.error(
                     "row_processing_error",
-                    row_number=i + 2,  # +2 for header and 0-index
+                    row_number=first_row_number + i,
                     error=str(e),
                     exc_info=True
                 )
-                self.stats.add_error(f"Row {i + 2}: {e}")
+                self.stats.add_error(f"Row {first_row_number + i}: {e}")
+
+        if values:
+            self._insert_transactions(values)
+
+    def import_file(self):
+        """
+        Import PayPal export file.
+
+        Streams the file chunk_size rows at a time, so peak memory depends on
+        the chunk size rather than on the size of the export.
+        """
+        self.logger.info("starting_paypal_import", file=self.paypal_file, chunk_size=self.chunk_size)
+
+        # Verify file exists
+        if not os.path.exists(self.paypal_file):
+            self.logger.error("file_not_found", file=self.paypal_file)
+            raise FileNotFoundError(f"PayPal file not found: {self.paypal_file}")
+
+        row_number = 2  # header is line 1
+        try:
+            with open(self.paypal_file, 'r', encoding='utf-8') as f:
+                for chunk in self._read_chunks(f):
+                    self.process_chunk(chunk, row_number)
+                    row_number += len(chunk)
+
+                    self.logger.info(
+                        "import_progress",
+                        processed=self.stats.get('rows_processed'),
+                        contacts_in_chunk=len(self.contact_cache)
+                    )
 
-        self.logger.info("paypal_import_completed", rows_processed=len(rows))
+        except IOError as e:
+            self.logger.error("file_read_error", file=self.paypal_file, error=str(e), exc_info=True)
+            raise
+
+        self.logger.info("paypal_import_completed", rows_processed=self.stats.get('rows_processed'))
 
     def run(self):
         """Run the complete import process."""
@@ -566,19 +704,27 @@ class PayPalImprover:
             start_time=start_time.isoformat()
         )
 
+        # Record the run in the ledger
+        ledger = RunRecorder('weekly_import_paypal_improved', dry_run=self.dry_run,
+                             trace_id=self.trace_id).start()
+        completed = False
+
         # Connect to database
         try:
             self.connect()
         except ConnectionError as e:
             self.logger.error("import_aborted_connection_failed", error=str(e))
+            ledger.finish(False)
             return False
 
         try:
             # Load membership products
-            self.load_membership_products()
+            with span('load_membership_products'):
+                self.load_membership_products()
 
             # Import file
-            self.import_file()
+            with span('import_file'):
+                self.import_file()
 
             # Calculate duration
             end_time = datetime.now()
@@ -595,6 +741,7 @@ class PayPalImprover:
             # Print summary for user
             self._print_summary(duration)
 
+            completed = True
             return self.stats.total_errors() == 0
 
         except Exception as e:
@@ -602,6 +749,14 @@ class PayPalImprover:
             return False
         finally:
             self.close()
+            ledger.finish(
+                completed,
+                rows_processed=self.stats.get('rows_processed'),
+                rows_created=self.stats.get('transactions', 'new') + self.stats.get('contacts', 'created'),
+                rows_updated=self.stats.get('contacts', 'enriched'),
+                errors=self.stats.total_errors(),
+                details={k: v for k, v in self.stats.stats.items() if k != 'errors'},
+            )
 
     def _print_summary(self, duration: float):
         """Print import summary to console."""
@@ -611,6 +766,10 @@ class PayPalImprover:
         print()
         print(f"Duration: {duration:.1f} seconds")
         print(f"Trace ID: {self.trace_id}")
+        connections = pool_stats()
+        print(f"DB connection acquire: avg {connections['avg_acquire_ms']:.1f} ms, "
+              f"max {connections['max_acquire_ms']:.1f} ms "
+              f"({connections['acquired']} acquired, {connections['connections_opened']} opened)")
         print()
         print("📊 Summary:")
         print()
@@ -678,6 +837,22 @@ def main():
         help='Execute import and commit changes to database'
     )
 
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Rows per streamed chunk (default: import batch_size from config)'
+    )
+
+    parser.add_argument(
+        '--instrument',
+        metavar='PATH',
+        nargs='?',
+        const='paypal_instrumentation.json',
+        help='Record per-stage timings and query counters; write the JSON summary to PATH '
+             '(default: paypal_instrumentation.json)'
+    )
+
     args = parser.parse_args()
 
     # Validate file exists
@@ -688,11 +863,17 @@ def main():
     # Run importer
     importer = PayPalImprover(
         paypal_file=args.file,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        chunk_size=args.chunk_size
     )
 
+    if args.instrument:
+        enable_instrumentation('paypal_import')
+
     success = importer.run()
 
+    finish_instrumentation(importer.logger, path=args.instrument)
+
     sys.exit(0 if success else 1)
 
 
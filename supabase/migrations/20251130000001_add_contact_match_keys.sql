@@ -0,0 +1,57 @@
+-- Migration: Persisted normalized match keys on contacts
+-- Date: 2025-11-30
+--
+-- DuplicateDetector (scripts/duplicate_prevention.py) used to filter on
+-- LOWER(TRIM(email)) and regexp_replace(phone, '[^0-9]', '', 'g') LIKE '%...',
+-- which no index can serve, so every lookup scanned contacts. These generated
+-- columns hold the same normalized values and are indexed, so
+-- DuplicateDetector.find_duplicates_bulk() resolves a whole import batch with
+-- index lookups in one query.
+--
+--   email_norm    lower(btrim(email))
+--   phone_last10  last 10 digits of phone (NULL when fewer than 10 digits)
+--   name_key      lower(btrim(first_name)) || '|' || lower(btrim(last_name))
+--                 (NULL unless both names are present)
+--
+-- Adding STORED generated columns rewrites contacts once.
+
+ALTER TABLE contacts
+  ADD COLUMN IF NOT EXISTS email_norm TEXT
+    GENERATED ALWAYS AS (lower(btrim(email::text))) STORED;
+
+ALTER TABLE contacts
+  ADD COLUMN IF NOT EXISTS phone_last10 TEXT
+    GENERATED ALWAYS AS (
+      CASE
+        WHEN length(regexp_replace(phone, '[^0-9]', '', 'g')) >= 10
+        THEN right(regexp_replace(phone, '[^0-9]', '', 'g'), 10)
+      END
+    ) STORED;
+
+ALTER TABLE contacts
+  ADD COLUMN IF NOT EXISTS name_key TEXT
+    GENERATED ALWAYS AS (lower(btrim(first_name)) || '|' || lower(btrim(last_name))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_contacts_email_norm ON contacts (email_norm);
+CREATE INDEX IF NOT EXISTS idx_contacts_name_key ON contacts (name_key);
+CREATE INDEX IF NOT EXISTS idx_contacts_phone_last10_name_key
+  ON contacts (phone_last10, name_key)
+  WHERE phone_last10 IS NOT NULL;
+
+COMMENT ON COLUMN contacts.email_norm IS 'lower(btrim(email)); duplicate-detection key';
+COMMENT ON COLUMN contacts.phone_last10 IS 'Last 10 digits of phone (NULL if fewer); duplicate-detection key';
+COMMENT ON COLUMN contacts.name_key IS 'lower(btrim(first_name)) || ''|'' || lower(btrim(last_name)); duplicate-detection key';
+
+-- Verify the columns were added
+DO $$
+BEGIN
+  IF (
+    SELECT COUNT(*) FROM information_schema.columns
+    WHERE table_name = 'contacts'
+      AND column_name IN ('email_norm', 'phone_last10', 'name_key')
+  ) = 3 THEN
+    RAISE NOTICE 'SUCCESS: contact match key columns exist';
+  ELSE
+    RAISE EXCEPTION 'FAILED: contact match key columns were not created';
+  END IF;
+END $$;
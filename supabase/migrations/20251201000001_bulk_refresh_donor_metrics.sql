@@ -0,0 +1,135 @@
+-- ============================================================================
+-- SET-BASED DONOR METRICS REFRESH
+-- ============================================================================
+-- Migration: 20251201000001
+-- Purpose: Recompute donor metrics for many donors in one statement
+--
+-- update_donor_metrics(p_donor_id) aggregates transactions and then runs
+-- three UPDATEs for a single donor, so importers called it once per donor.
+-- refresh_donor_metrics(p_contact_ids) aggregates donation transactions once
+-- (GROUP BY contact_id) for every requested donor and writes lifetime, YTD,
+-- largest, first/last gift, average and status in a single UPDATE.
+--
+--   SELECT refresh_donor_metrics(ARRAY[...]::uuid[]);  -- these contacts' donors
+--   SELECT refresh_donor_metrics();                    -- every donor
+--
+-- Semantics follow update_donor_metrics (20251123000002):
+--   - refunds count negatively in lifetime_amount and are excluded from counts
+--   - first/last gift dates keep their old value when there are no donations
+--   - 'major' and 'deceased' statuses are never downgraded
+-- plus ytd_amount / ytd_count (non-refund donations this calendar year).
+-- lifetime_amount is floored at 0 so one over-refunded donor cannot violate
+-- donors_lifetime_positive and abort the whole batch.
+--
+-- update_donor_metrics(p_donor_id) now delegates here, so both paths agree.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_transactions_donation_contact
+  ON transactions (contact_id)
+  WHERE is_donation = true;
+
+CREATE OR REPLACE FUNCTION refresh_donor_metrics(p_contact_ids uuid[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_updated integer;
+BEGIN
+    WITH target AS (
+        SELECT id, contact_id
+        FROM donors
+        WHERE p_contact_ids IS NULL OR contact_id = ANY(p_contact_ids)
+    ),
+    agg AS (
+        SELECT
+            t.contact_id,
+            SUM(CASE WHEN t.transaction_type != 'refund' THEN t.amount ELSE -ABS(t.amount) END) AS lifetime_amount,
+            COUNT(*) FILTER (WHERE t.transaction_type != 'refund') AS lifetime_count,
+            MIN(t.transaction_date) AS first_gift_date,
+            MAX(t.transaction_date) AS last_gift_date,
+            MAX(CASE WHEN t.transaction_type != 'refund' THEN t.amount ELSE 0 END) AS largest_gift,
+            AVG(t.amount) FILTER (WHERE t.transaction_type != 'refund') AS average_gift,
+            SUM(t.amount) FILTER (
+                WHERE t.transaction_type != 'refund'
+                  AND date_trunc('year', t.transaction_date) = date_trunc('year', now())
+            ) AS ytd_amount,
+            COUNT(*) FILTER (
+                WHERE t.transaction_type != 'refund'
+                  AND date_trunc('year', t.transaction_date) = date_trunc('year', now())
+            ) AS ytd_count
+        FROM transactions t
+        JOIN target ON target.contact_id = t.contact_id
+        WHERE t.is_donation = true
+        GROUP BY t.contact_id
+    ),
+    metrics AS (
+        SELECT
+            target.id,
+            GREATEST(COALESCE(agg.lifetime_amount, 0), 0) AS lifetime_amount,
+            COALESCE(agg.lifetime_count, 0) AS lifetime_count,
+            agg.first_gift_date,
+            agg.last_gift_date,
+            agg.largest_gift,
+            COALESCE(agg.average_gift, 0) AS average_gift,
+            GREATEST(COALESCE(agg.ytd_amount, 0), 0) AS ytd_amount,
+            COALESCE(agg.ytd_count, 0) AS ytd_count
+        FROM target
+        LEFT JOIN agg ON agg.contact_id = target.contact_id
+    )
+    UPDATE donors d
+    SET
+        lifetime_amount = m.lifetime_amount,
+        lifetime_count = m.lifetime_count,
+        first_gift_date = COALESCE(m.first_gift_date, d.first_gift_date),
+        last_gift_date = COALESCE(m.last_gift_date, d.last_gift_date),
+        largest_gift = m.largest_gift,
+        average_gift = m.average_gift,
+        ytd_amount = m.ytd_amount,
+        ytd_count = m.ytd_count,
+        -- is_major_donor is generated from lifetime_amount / major_donor_threshold
+        status = CASE
+            WHEN d.status = 'deceased' THEN d.status
+            WHEN m.lifetime_amount >= d.major_donor_threshold THEN 'major'::donor_status
+            WHEN d.status = 'major' THEN d.status
+            WHEN m.lifetime_count = 0 THEN 'prospect'::donor_status
+            WHEN m.lifetime_count = 1 THEN 'first_time'::donor_status
+            WHEN COALESCE(m.last_gift_date, d.last_gift_date) >= now() - interval '12 months' THEN 'active'::donor_status
+            WHEN COALESCE(m.last_gift_date, d.last_gift_date) >= now() - interval '24 months' THEN 'lapsed'::donor_status
+            ELSE 'dormant'::donor_status
+        END,
+        updated_at = now()
+    FROM metrics m
+    WHERE d.id = m.id;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_donor_metrics(uuid[]) IS
+'Set-based recompute of donor metrics (lifetime, YTD, largest, first/last gift, average, status) for the donors of the given contacts, or all donors when NULL. Returns donors updated.';
+
+-- Single-donor entry point kept for existing callers; same code path
+CREATE OR REPLACE FUNCTION update_donor_metrics(p_donor_id UUID)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    PERFORM refresh_donor_metrics(ARRAY(SELECT contact_id FROM donors WHERE id = p_donor_id));
+END;
+$$;
+
+COMMENT ON FUNCTION update_donor_metrics(UUID) IS
+'Calculate and update donor metrics from transaction history. Delegates to refresh_donor_metrics().';
+
+-- Verify the function was created
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'refresh_donor_metrics') THEN
+    RAISE NOTICE 'SUCCESS: refresh_donor_metrics() created';
+  ELSE
+    RAISE EXCEPTION 'FAILED: refresh_donor_metrics() was not created';
+  END IF;
+END $$;
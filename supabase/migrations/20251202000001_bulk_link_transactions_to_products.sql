@@ -0,0 +1,55 @@
+-- ============================================================================
+-- BULK TRANSACTION -> PRODUCT LINKING
+-- ============================================================================
+-- Migration: 20251202000001
+-- Purpose: Link many transactions to products in one statement per batch
+--
+-- scripts/link_transactions_to_products_faang.py used to send one PostgREST
+-- update(...).eq('id', txn_id) per transaction (~100 ms round trip each).
+-- It now sends each batch of (transaction id, product id) pairs to this
+-- function, which applies them with a single UPDATE ... FROM.
+--
+--   SELECT link_transactions_to_products(
+--     '[{"id": "<transaction uuid>", "product_id": "<product uuid>"}]'::jsonb
+--   );
+--
+-- Only transactions whose product_id is still NULL are updated, so re-running
+-- a batch is a no-op. Returns the number of transactions linked.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION link_transactions_to_products(p_links jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_updated integer;
+BEGIN
+    UPDATE transactions t
+    SET product_id = m.product_id,
+        updated_at = now()
+    FROM jsonb_to_recordset(p_links) AS m(id uuid, product_id uuid)
+    WHERE t.id = m.id
+      AND t.product_id IS NULL;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+COMMENT ON FUNCTION link_transactions_to_products(jsonb) IS
+'Set product_id for a batch of [{id, product_id}] transaction links (only where product_id IS NULL). Returns transactions linked.';
+
+-- Writes through SECURITY DEFINER: migration scripts only (service role)
+REVOKE EXECUTE ON FUNCTION link_transactions_to_products(jsonb) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION link_transactions_to_products(jsonb) TO service_role;
+
+-- Verify the function was created
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'link_transactions_to_products') THEN
+    RAISE NOTICE 'SUCCESS: link_transactions_to_products() created';
+  ELSE
+    RAISE EXCEPTION 'FAILED: link_transactions_to_products() was not created';
+  END IF;
+END $$;
@@ -0,0 +1,32 @@
+-- Migration: Watermarks for incremental maintenance jobs
+-- Date: 2025-12-03
+--
+-- Maintenance scripts that sweep contacts (e.g. standardize_capitalization.py
+-- --incremental) record the start time of their last successful live run
+-- here, and on the next run only scan rows with updated_at after it.
+-- One row per job, keyed by job_name.
+
+CREATE TABLE IF NOT EXISTS job_watermarks (
+  job_name   TEXT PRIMARY KEY,
+  watermark  TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE job_watermarks IS 'Last successful run start per incremental maintenance job';
+COMMENT ON COLUMN job_watermarks.watermark IS 'Rows with updated_at after this still need processing';
+
+-- Incremental scans filter contacts by updated_at
+CREATE INDEX IF NOT EXISTS idx_contacts_updated_at ON contacts (updated_at);
+
+-- Verify the table was added
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.tables
+    WHERE table_name = 'job_watermarks'
+  ) THEN
+    RAISE NOTICE 'SUCCESS: job_watermarks table exists';
+  ELSE
+    RAISE EXCEPTION 'FAILED: job_watermarks table was not created';
+  END IF;
+END $$;
@@ -0,0 +1,59 @@
+-- Migration: Contact move history for NCOA imports
+-- Date: 2025-12-04
+-- Purpose: Keep the before-image of every address replaced by an NCOA import
+--
+-- scripts/import_ncoa_results.py stages the TrueNCOA return file with COPY,
+-- writes one row here per contact it is about to update (old and new address)
+-- with a single INSERT ... SELECT, and then applies every move with one
+-- UPDATE ... FROM. Restoring an address is a lookup by contact_id instead of
+-- a restore from a whole-table backup.
+
+CREATE TABLE IF NOT EXISTS contact_move_history (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    contact_id UUID NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    source TEXT NOT NULL DEFAULT 'ncoa',
+
+    -- Address before the import
+    old_address_line_1 TEXT,
+    old_address_line_2 TEXT,
+    old_city TEXT,
+    old_state TEXT,
+    old_postal_code TEXT,
+    old_ncoa_move_date DATE,
+
+    -- Address written by the import
+    new_address_line_1 TEXT,
+    new_address_line_2 TEXT,
+    new_city TEXT,
+    new_state TEXT,
+    new_postal_code TEXT,
+    move_date DATE,
+    move_type TEXT,              -- Individual, Family, Business
+
+    import_file TEXT,
+    imported_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_contact_move_history_contact_id
+    ON contact_move_history(contact_id);
+CREATE INDEX IF NOT EXISTS idx_contact_move_history_imported_at
+    ON contact_move_history(imported_at);
+
+COMMENT ON TABLE contact_move_history IS
+    'Before/after address for every contact updated by an NCOA import (one row per contact per import)';
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.tables
+        WHERE table_name = 'contact_move_history'
+    ) THEN
+        RAISE EXCEPTION 'Migration failed: contact_move_history not created';
+    ELSE
+        RAISE NOTICE 'Migration successful: contact_move_history created';
+    END IF;
+END $$;
@@ -0,0 +1,260 @@
+-- ============================================================================
+-- PERSISTED ADDRESS SCORES
+-- ============================================================================
+-- Migration: 20251205000001
+-- Purpose: Stop recomputing every address score on every mailing list query
+--
+-- mailing_list_priority called calculate_address_score() and
+-- is_address_complete() twice each per contact, and each call re-reads the
+-- contact row. Every export and every mailing_list_stats query paid for the
+-- whole list.
+--
+-- contact_address_scores holds the last computed billing/shipping score and
+-- completeness per contact. scripts/refresh_address_scores.py keeps it
+-- current incrementally (contacts or transactions changed since its last
+-- watermark, plus expired scores):
+--
+--   SELECT refresh_contact_address_scores(ARRAY[...]::uuid[]);  -- these contacts
+--   SELECT refresh_contact_address_scores();                    -- every contact
+--
+-- Scores include recency bonuses relative to NOW(), so a score is only valid
+-- until the next 30/90/180/365-day boundary of its dates; that instant is
+-- stored as expires_at.
+--
+-- The view uses a stored row only while it is fresh (computed after the
+-- contact's last update and not expired) and otherwise falls back to the
+-- live functions, so results stay identical to the old view; only the cost
+-- changes.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS contact_address_scores (
+  contact_id UUID PRIMARY KEY REFERENCES contacts(id) ON DELETE CASCADE,
+  billing_score INTEGER NOT NULL,
+  shipping_score INTEGER NOT NULL,
+  billing_complete BOOLEAN NOT NULL,
+  shipping_complete BOOLEAN NOT NULL,
+  expires_at TIMESTAMPTZ,               -- NULL = no recency bonus left to age out
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_contact_address_scores_expires_at
+  ON contact_address_scores (expires_at);
+
+-- The refresher also picks up contacts whose transactions changed
+CREATE INDEX IF NOT EXISTS idx_transactions_updated_at
+  ON transactions (updated_at);
+
+COMMENT ON TABLE contact_address_scores IS
+  'Cached calculate_address_score / is_address_complete results per contact (see refresh_address_scores.py)';
+COMMENT ON COLUMN contact_address_scores.expires_at IS
+  'Next time a recency bonus boundary passes and the score changes without any data change';
+
+
+-- ============================================================================
+-- STEP 1: Score expiry
+-- ============================================================================
+-- Mirrors the recency tiers in calculate_address_score (20251115000005):
+--   USPS validation: 90 / 365 days
+--   last transaction: 30 / 90 / 180 / 365 days
+--   address update: 30 / 90 days
+
+CREATE OR REPLACE FUNCTION address_score_expires_at(p_contact_id UUID)
+RETURNS TIMESTAMPTZ AS $$
+  SELECT MIN(b.boundary)
+  FROM contacts c
+  CROSS JOIN LATERAL (VALUES
+    (c.billing_usps_validated_at + INTERVAL '90 days'),
+    (c.billing_usps_validated_at + INTERVAL '365 days'),
+    (c.shipping_usps_validated_at + INTERVAL '90 days'),
+    (c.shipping_usps_validated_at + INTERVAL '365 days'),
+    (c.last_transaction_date + INTERVAL '30 days'),
+    (c.last_transaction_date + INTERVAL '90 days'),
+    (c.last_transaction_date + INTERVAL '180 days'),
+    (c.last_transaction_date + INTERVAL '365 days'),
+    (c.billing_address_updated_at + INTERVAL '30 days'),
+    (c.billing_address_updated_at + INTERVAL '90 days'),
+    (c.shipping_address_updated_at + INTERVAL '30 days'),
+    (c.shipping_address_updated_at + INTERVAL '90 days')
+  ) AS b(boundary)
+  WHERE c.id = p_contact_id
+    AND b.boundary > NOW();
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION address_score_expires_at IS
+  'Earliest future instant at which calculate_address_score changes for this contact with no data change (NULL = never)';
+
+
+-- ============================================================================
+-- STEP 2: Set-based refresh
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_contact_address_scores(p_contact_ids UUID[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+  v_refreshed INTEGER;
+BEGIN
+  INSERT INTO contact_address_scores (
+    contact_id, billing_score, shipping_score,
+    billing_complete, shipping_complete, expires_at, computed_at
+  )
+  SELECT
+    c.id,
+    calculate_address_score('billing', c.id),
+    calculate_address_score('shipping', c.id),
+    is_address_complete('billing', c.id),
+    is_address_complete('shipping', c.id),
+    address_score_expires_at(c.id),
+    NOW()
+  FROM contacts c
+  WHERE p_contact_ids IS NULL OR c.id = ANY(p_contact_ids)
+  ON CONFLICT (contact_id) DO UPDATE SET
+    billing_score = EXCLUDED.billing_score,
+    shipping_score = EXCLUDED.shipping_score,
+    billing_complete = EXCLUDED.billing_complete,
+    shipping_complete = EXCLUDED.shipping_complete,
+    expires_at = EXCLUDED.expires_at,
+    computed_at = EXCLUDED.computed_at;
+
+  GET DIAGNOSTICS v_refreshed = ROW_COUNT;
+  RETURN v_refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION refresh_contact_address_scores IS
+  'Recompute and upsert contact_address_scores for the given contacts (all contacts when NULL). Returns rows written.';
+
+
+-- ============================================================================
+-- STEP 3: Read scores from the table in mailing_list_priority
+-- ============================================================================
+-- Same columns as 20251114000002, so mailing_list_export and
+-- mailing_list_stats pick this up unchanged.
+
+CREATE OR REPLACE VIEW mailing_list_priority AS
+WITH address_scores AS (
+  SELECT
+    c.id,
+    c.email,
+    c.first_name,
+    c.last_name,
+
+    -- Billing address
+    c.address_line_1 as billing_line1,
+    c.address_line_2 as billing_line2,
+    c.city as billing_city,
+    c.state as billing_state,
+    c.postal_code as billing_zip,
+    c.country as billing_country,
+
+    -- Shipping address
+    c.shipping_address_line_1 as shipping_line1,
+    c.shipping_address_line_2 as shipping_line2,
+    c.shipping_city,
+    c.shipping_state,
+    c.shipping_postal_code as shipping_zip,
+    c.shipping_country,
+
+    -- Metadata
+    c.billing_address_updated_at,
+    c.shipping_address_updated_at,
+    c.billing_usps_validated_at,
+    c.shipping_usps_validated_at,
+    c.billing_usps_dpv_match_code,
+    c.shipping_usps_dpv_match_code,
+    c.billing_usps_vacant,
+    c.shipping_usps_vacant,
+    c.billing_address_verified,
+    c.shipping_address_verified,
+    c.last_transaction_date,
+    c.billing_address_source,
+    c.shipping_address_source,
+    c.preferred_mailing_address,
+
+    -- Stored scores when fresh, live calculation otherwise (will be 0 if incomplete)
+    COALESCE(s.billing_score, calculate_address_score('billing', c.id)) as billing_score,
+    COALESCE(s.shipping_score, calculate_address_score('shipping', c.id)) as shipping_score,
+
+    -- Check completeness flags
+    COALESCE(s.billing_complete, is_address_complete('billing', c.id)) as billing_complete,
+    COALESCE(s.shipping_complete, is_address_complete('shipping', c.id)) as shipping_complete
+
+  FROM contacts c
+  LEFT JOIN contact_address_scores s
+    ON s.contact_id = c.id
+   AND s.computed_at >= c.updated_at
+   AND (s.expires_at IS NULL OR s.expires_at > NOW())
+  WHERE c.address_line_1 IS NOT NULL OR c.shipping_address_line_1 IS NOT NULL
+)
+SELECT
+  *,
+
+  -- Determine recommended address (with manual override support)
+  CASE
+    -- Manual override takes precedence (if address is complete)
+    WHEN preferred_mailing_address = 'billing' AND billing_complete THEN 'billing'
+    WHEN preferred_mailing_address = 'shipping' AND shipping_complete THEN 'shipping'
+
+    -- If manual override points to incomplete address, fall back to algorithm
+    WHEN preferred_mailing_address IS NOT NULL AND NOT billing_complete AND shipping_complete THEN 'shipping'
+    WHEN preferred_mailing_address IS NOT NULL AND billing_complete AND NOT shipping_complete THEN 'billing'
+
+    -- Algorithm: 15 point threshold for switching
+    -- (15 points ≈ 6 months recency difference OR validation status difference)
+    WHEN billing_score >= shipping_score + 15 THEN 'billing'
+    WHEN shipping_score >= billing_score + 15 THEN 'shipping'
+
+    -- Tie: prefer whichever is complete
+    WHEN billing_score = shipping_score AND billing_complete AND NOT shipping_complete THEN 'billing'
+    WHEN billing_score = shipping_score AND shipping_complete AND NOT billing_complete THEN 'shipping'
+
+    -- Both incomplete or both complete with tie: default to billing
+    ELSE 'billing'
+  END as recommended_address,
+
+  -- Confidence level based on winning score
+  CASE
+    WHEN GREATEST(billing_score, shipping_score) >= 75 THEN 'very_high'
+    WHEN GREATEST(billing_score, shipping_score) >= 60 THEN 'high'
+    WHEN GREATEST(billing_score, shipping_score) >= 45 THEN 'medium'
+    WHEN GREATEST(billing_score, shipping_score) >= 30 THEN 'low'
+    ELSE 'very_low'
+  END as confidence,
+
+  -- Override flag
+  CASE
+    WHEN preferred_mailing_address IS NOT NULL THEN true
+    ELSE false
+  END as is_manual_override
+
+FROM address_scores
+WHERE billing_complete OR shipping_complete;  -- Only show contacts with at least ONE complete address
+
+COMMENT ON VIEW mailing_list_priority IS
+  'Prioritizes billing vs shipping addresses using multi-factor scoring algorithm. Reads fresh scores from contact_address_scores and computes stale/missing ones live. Only includes contacts with at least one COMPLETE address. Supports manual overrides via preferred_mailing_address column.';
+
+
+-- ============================================================================
+-- STEP 4: Initial fill
+-- ============================================================================
+
+SELECT refresh_contact_address_scores();
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+
+DO $$
+DECLARE
+  v_contacts INTEGER;
+  v_scored INTEGER;
+BEGIN
+  SELECT COUNT(*) INTO v_contacts FROM contacts;
+  SELECT COUNT(*) INTO v_scored FROM contact_address_scores;
+
+  IF v_scored <> v_contacts THEN
+    RAISE EXCEPTION 'Migration failed: % contacts but % stored scores', v_contacts, v_scored;
+  ELSE
+    RAISE NOTICE 'Migration successful: % address scores stored', v_scored;
+  END IF;
+END $$;
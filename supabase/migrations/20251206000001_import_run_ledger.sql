@@ -0,0 +1,58 @@
+-- Migration: Import run ledger
+-- Date: 2025-12-06
+-- Purpose: Durable record of every importer/enricher run for trend reporting
+--
+-- Runs used to leave ad hoc JSON reports in the repo root with no common
+-- shape. scripts/run_ledger.py inserts one row here when a run starts and
+-- fills in the outcome when it finishes: per-stage timings, row counts,
+-- errors and database round trips. `python3 scripts/run_ledger.py report`
+-- reads it for week-over-week throughput and regression flags.
+
+CREATE TABLE IF NOT EXISTS import_runs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    script TEXT NOT NULL,
+    mode TEXT NOT NULL CHECK (mode IN ('dry_run', 'execute')),
+    status TEXT NOT NULL DEFAULT 'running'
+        CHECK (status IN ('running', 'succeeded', 'failed')),
+
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    duration_ms NUMERIC,
+
+    -- {"stage": {"wall_ms": .., "statements": .., "rows_affected": ..}, ...}
+    stages JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    rows_processed INTEGER NOT NULL DEFAULT 0,
+    rows_created INTEGER NOT NULL DEFAULT 0,
+    rows_updated INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    db_round_trips INTEGER,      -- NULL when the run's cursors were not instrumented
+
+    trace_id TEXT,
+    details JSONB                -- script-specific counters
+);
+
+-- Report: latest runs per script
+CREATE INDEX IF NOT EXISTS idx_import_runs_script_started_at
+    ON import_runs(script, started_at DESC);
+
+COMMENT ON TABLE import_runs IS
+    'One row per importer/enricher run: timings, row counts, errors and round trips (scripts/run_ledger.py)';
+COMMENT ON COLUMN import_runs.db_round_trips IS
+    'Statements sent through instrumented cursors (logging_config.instrument_cursor)';
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.tables
+        WHERE table_name = 'import_runs'
+    ) THEN
+        RAISE EXCEPTION 'Migration failed: import_runs not created';
+    ELSE
+        RAISE NOTICE 'Migration successful: import_runs created';
+    END IF;
+END $$;
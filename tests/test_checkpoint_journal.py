@@ -0,0 +1,76 @@
+"""
+Unit tests for the checkpoint journal backends.
+
+Run with:
+    pytest tests/test_checkpoint_journal.py -v
+"""
+import pytest
+
+from checkpoint_journal import JsonlCheckpoint, SQLiteCheckpoint, open_checkpoint
+
+
+@pytest.fixture(params=['progress.jsonl', 'progress.sqlite'])
+def journal_path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+class TestCheckpointJournal:
+    def test_backend_follows_extension(self, tmp_path):
+        with open_checkpoint(str(tmp_path / 'a.jsonl')) as journal:
+            assert isinstance(journal, JsonlCheckpoint)
+        with open_checkpoint(str(tmp_path / 'a.db')) as journal:
+            assert isinstance(journal, SQLiteCheckpoint)
+
+    def test_resume_reads_appended_records(self, journal_path):
+        with open_checkpoint(journal_path) as journal:
+            journal.append({'[sequence]': 1, 'ValidationFlag': 'OK'})
+            journal.append({'[sequence]': 2, 'ValidationFlag': 'ERROR'})
+
+        with open_checkpoint(journal_path) as resumed:
+            assert 1 in resumed and '2' in resumed and 3 not in resumed
+            assert len(resumed) == 2
+            assert resumed.get(2)['ValidationFlag'] == 'ERROR'
+
+    def test_latest_record_wins_in_first_seen_order(self, journal_path):
+        with open_checkpoint(journal_path, key='contact_id') as journal:
+            journal.append({'contact_id': 'a', 'status': 'retry'})
+            journal.append({'contact_id': 'b', 'status': 'done'})
+            journal.append({'contact_id': 'a', 'status': 'done'})
+
+        with open_checkpoint(journal_path, key='contact_id') as resumed:
+            assert resumed.records() == [
+                {'contact_id': 'a', 'status': 'done'},
+                {'contact_id': 'b', 'status': 'done'},
+            ]
+
+    def test_pending_skips_journaled_items(self, journal_path):
+        items = [{'sequence': str(i)} for i in range(5)]
+        with open_checkpoint(journal_path) as journal:
+            journal.append({'[sequence]': 1})
+            journal.append({'[sequence]': 3})
+
+            pending = list(journal.pending(items, key=lambda item: int(item['sequence'])))
+
+        assert [item['sequence'] for item in pending] == ['0', '2', '4']
+
+    def test_unsynced_appends_survive_close(self, journal_path):
+        with open_checkpoint(journal_path, sync_every=1000) as journal:
+            for i in range(10):
+                journal.append({'[sequence]': i})
+
+        with open_checkpoint(journal_path) as resumed:
+            assert len(resumed) == 10
+
+
+class TestJsonlCheckpoint:
+    def test_ignores_torn_last_line(self, tmp_path):
+        path = tmp_path / 'progress.jsonl'
+        path.write_text('{"[sequence]": 1}\n{"[sequence]": 2, "Valid')
+
+        with JsonlCheckpoint(str(path)) as journal:
+            assert len(journal) == 1
+            assert journal.skipped_lines == 1
+            journal.append({'[sequence]': 2})
+
+        with JsonlCheckpoint(str(path)) as resumed:
+            assert len(resumed) == 2
@@ -0,0 +1,124 @@
+"""
+Unit tests for in-memory contact matching and batched USPS validation writes.
+
+Run with:
+    pytest tests/test_contact_match_index.py -v
+"""
+from types import SimpleNamespace
+
+import pytest
+
+psycopg2 = pytest.importorskip('psycopg2')
+
+from contact_match_index import ContactMatchIndex, normalize_key
+from usps_validation_batch import USPS_COLUMNS, build_update_sql, usps_values, write_usps_validations
+
+
+@pytest.fixture
+def index():
+    index = ContactMatchIndex()
+    index.add_contact('c1', 'Ann', 'Lee', None, '12  Pearl St')
+    index.add_contact('c2', 'Bob', 'Ray', 'Ray Pottery', '5 Elm Ave', '5 ELM AVE APT 2')
+    index.add_contact('c3', 'ann', 'lee', None, '12 pearl st')  # same key, scanned later
+    return index
+
+
+def validation(**values):
+    row = {key: '' for key in ('dpv_match_code', 'precision', 'delivery_line_1', 'delivery_line_2',
+                               'last_line', 'latitude', 'longitude', 'county_name', 'rdi',
+                               'notes', 'summary')}
+    row.update(dpv_vacant=False, active=True)
+    row.update(values)
+    return row
+
+
+class TestContactMatchIndex:
+    def test_normalize_key(self):
+        assert normalize_key('  12   Pearl  ST ') == '12 pearl st'
+        assert normalize_key(None) == ''
+
+    def test_name_and_address_first_scanned_wins(self, index):
+        assert index.find(first_name='ANN', last_name='Lee', address_line_1='12 Pearl St') == 'c1'
+
+    def test_business_name_fallback(self, index):
+        assert index.find(business_name='ray pottery', address_line_1='5 Elm Ave') == 'c2'
+
+    def test_delivery_line_fallback(self, index):
+        found = index.find(first_name='Bob', last_name='Ray', address_line_1='5 Elm Avenue',
+                           delivery_line_1='5 Elm Ave Apt 2')
+        assert found == 'c2'
+        assert index.stats['name_address'] == {'hits': 0, 'misses': 1}
+        assert index.stats['name_delivery_line'] == {'hits': 1, 'misses': 0}
+
+    def test_no_match(self, index):
+        assert index.find(first_name='Cy', last_name='Doe', address_line_1='1 Main St') is None
+
+
+class SavepointCursor:
+    """Rejects any UPDATE that carries a key in bad_keys; records the statements run."""
+
+    connection = SimpleNamespace(encoding='UTF8')
+
+    def __init__(self, bad_keys=()):
+        self.bad_keys = set(bad_keys)
+        self.statements = []
+        self._keys = []
+        self._pending = []
+
+    def mogrify(self, template, args):
+        self._pending.append(args[0])
+        return b'(?)'
+
+    def execute(self, sql, params=None):
+        keys, self._pending = self._pending, []
+        if isinstance(sql, str):
+            self.statements.append(sql)
+            return
+        self.statements.append(len(keys))
+        if self.bad_keys & set(keys):
+            raise psycopg2.DataError('invalid input syntax for type double precision')
+        self._keys = keys
+
+    def fetchall(self):
+        return [(key,) for key in self._keys]
+
+
+class TestBatchUpdate:
+    def test_clean_file_is_one_update(self):
+        cursor = SavepointCursor()
+        updated, failed = write_usps_validations(cursor, [(f'c{i}', validation()) for i in range(8)])
+
+        assert (len(updated), failed) == (8, [])
+        assert cursor.statements == ['SAVEPOINT usps_batch', 8, 'RELEASE SAVEPOINT usps_batch']
+
+    def test_bad_row_is_isolated_and_reported(self):
+        cursor = SavepointCursor(bad_keys={'c5'})
+        updated, failed = write_usps_validations(cursor, [(f'c{i}', validation()) for i in range(8)])
+
+        assert sorted(updated) == [f'c{i}' for i in range(8) if i != 5]
+        assert failed == [('c5', 'invalid input syntax for type double precision')]
+        assert cursor.statements.count('ROLLBACK TO SAVEPOINT usps_batch') == 4
+
+    def test_sql_targets_address_type_and_key(self):
+        sql, template = build_update_sql('shipping', 'email')
+
+        assert 'shipping_usps_dpv_match_code = v.dpv_match_code' in sql
+        assert 'shipping_address_verified = v.verified' in sql
+        assert 'billing_' not in sql
+        assert 'c.email = v.match_key::citext' in sql
+        assert template.count('%s') == len(USPS_COLUMNS) + 1
+
+    def test_rejects_unknown_columns(self):
+        with pytest.raises(ValueError):
+            build_update_sql('mailing', 'id')
+        with pytest.raises(ValueError):
+            build_update_sql('billing', 'name')
+
+    def test_values_blank_to_null(self):
+        values = usps_values(validation(dpv_match_code='Y', latitude='40.01', summary='ok'))
+
+        assert len(values) == len(USPS_COLUMNS)
+        assert values[0] == 'Y' and values[1] is None
+        assert values[5] == 40.01 and values[6] is None
+        assert values[9] == 'ok'
+        assert values[-1] is True
@@ -0,0 +1,144 @@
+"""
+Unit tests for the pooled connection helpers in db_config.
+
+Run with:
+    pytest tests/test_db_config.py -v
+"""
+import pytest
+
+import db_config
+from db_config import bisect_write, execute_prepared, get_application_name
+
+
+class FakeConnection:
+    def __init__(self, pooled=True):
+        if pooled:
+            self.prepared_statements = set()
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+
+class TestExecutePrepared:
+    """Tests for server-side prepared statement reuse."""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setenv('DB_PREPARED_STATEMENTS', 'true')
+
+    def test_prepares_once_per_connection(self):
+        cur = FakeCursor(FakeConnection())
+        sql = "SELECT id FROM contacts WHERE email = %s AND kajabi_id = %s"
+
+        execute_prepared(cur, 'find_contact', sql, ('a@example.com', '1'))
+        execute_prepared(cur, 'find_contact', sql, ('b@example.com', '2'))
+
+        assert cur.executed == [
+            ("PREPARE find_contact AS SELECT id FROM contacts WHERE email = $1 AND kajabi_id = $2", None),
+            ("EXECUTE find_contact (%s, %s)", ('a@example.com', '1')),
+            ("EXECUTE find_contact (%s, %s)", ('b@example.com', '2')),
+        ]
+
+    def test_statement_without_params(self):
+        cur = FakeCursor(FakeConnection())
+        execute_prepared(cur, 'count_contacts', "SELECT COUNT(*) FROM contacts")
+        assert cur.executed[-1] == ("EXECUTE count_contacts", None)
+
+    def test_escaped_percent_is_not_a_placeholder(self):
+        cur = FakeCursor(FakeConnection())
+        sql = "SELECT id FROM contacts WHERE email LIKE '%%s%%' AND source_system = %s"
+
+        execute_prepared(cur, 'find_like', sql, ('kajabi',))
+
+        assert cur.executed[0] == (
+            "PREPARE find_like AS SELECT id FROM contacts WHERE email LIKE '%s%' AND source_system = $1", None)
+
+    def test_rejects_bare_percent_and_wrong_arity(self):
+        cur = FakeCursor(FakeConnection())
+        with pytest.raises(ValueError, match='Unsupported placeholder'):
+            execute_prepared(cur, 'find_like', "SELECT id FROM contacts WHERE email LIKE '%s%'", ('a',))
+        with pytest.raises(ValueError, match='2 placeholders but 1 parameters'):
+            execute_prepared(cur, 'find_contact', "SELECT 1 WHERE %s AND %s", (True,))
+        assert cur.executed == []
+
+    def test_plain_connection_falls_back_to_execute(self):
+        cur = FakeCursor(FakeConnection(pooled=False))
+        execute_prepared(cur, 'find_contact', "SELECT 1 WHERE %s", (True,))
+        assert cur.executed == [("SELECT 1 WHERE %s", (True,))]
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv('DB_PREPARED_STATEMENTS')
+        cur = FakeCursor(FakeConnection())
+        execute_prepared(cur, 'find_contact', "SELECT 1 WHERE %s", (True,))
+        assert cur.executed == [("SELECT 1 WHERE %s", (True,))]
+
+
+class TestBisectWrite:
+    """Tests for isolating rejected rows under a savepoint."""
+
+    def test_bisects_down_to_rejected_rows(self):
+        cur = FakeCursor(FakeConnection())
+
+        def write(chunk):
+            if 3 in chunk:
+                raise ValueError('bad row')
+            return sum(chunk)
+
+        results, rejected = bisect_write(cur, [1, 2, 3, 4], write, 'test_chunk')
+
+        assert results == [3, 4]
+        assert [(row, str(e)) for row, e in rejected] == [(3, 'bad row')]
+        statements = [sql for sql, _ in cur.executed]
+        assert statements.count('ROLLBACK TO SAVEPOINT test_chunk') == 3
+        assert statements.count('SAVEPOINT test_chunk') == statements.count('RELEASE SAVEPOINT test_chunk') == 5
+
+    def test_unlisted_errors_propagate(self):
+        def write(chunk):
+            raise KeyError('bug')
+
+        with pytest.raises(KeyError):
+            bisect_write(FakeCursor(FakeConnection()), [1, 2], write, 'test_chunk', errors=(ValueError,))
+
+
+class TestApplicationName:
+    """Tests for application_name tagging."""
+
+    def test_defaults_to_script_name(self, monkeypatch):
+        monkeypatch.delenv('DB_APPLICATION_NAME', raising=False)
+        monkeypatch.setattr(db_config.sys, 'argv', ['scripts/weekly_import_kajabi_v2.py'])
+        assert get_application_name() == 'starhouse:weekly_import_kajabi_v2'
+
+    def test_environment_override_is_truncated(self, monkeypatch):
+        monkeypatch.setenv('DB_APPLICATION_NAME', 'x' * 100)
+        assert get_application_name() == 'x' * 63
+
+
+class TestPoolStats:
+    """Tests for connection-acquire reporting."""
+
+    def test_average_and_max(self, monkeypatch):
+        monkeypatch.setattr(db_config, '_pool_stats', {
+            'acquired': 4,
+            'connections_opened': 1,
+            'acquire_seconds_total': 0.2,
+            'acquire_seconds_max': 0.15,
+        })
+        stats = db_config.pool_stats()
+        assert stats['acquired'] == 4
+        assert stats['avg_acquire_ms'] == pytest.approx(50.0)
+        assert stats['max_acquire_ms'] == pytest.approx(150.0)
+
+    def test_no_acquisitions(self, monkeypatch):
+        monkeypatch.setattr(db_config, '_pool_stats', {
+            'acquired': 0,
+            'connections_opened': 0,
+            'acquire_seconds_total': 0.0,
+            'acquire_seconds_max': 0.0,
+        })
+        assert db_config.pool_stats()['avg_acquire_ms'] == 0.0
@@ -0,0 +1,124 @@
+"""
+Unit tests for the parallel diagnostics engine.
+
+Run with:
+    pytest tests/test_diagnostics_engine.py -v
+"""
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from psycopg2.extensions import QueryCanceledError
+
+from diagnostics_engine import DiagnosticCheck, build_report, run_check, run_checks
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+        self.rowcount = -1
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        if 'set_config' in sql:
+            self.result = [(params[0],)]
+        elif sql.startswith('EXPLAIN'):
+            self.result = [([{'Plan': {'Total Cost': 42.5, 'Plan Rows': 10}}],)]
+        elif 'pg_stat_xact_user_tables' in sql:
+            self.result = [(self.conn.scanned,)]
+            self.conn.scanned += 100
+        else:
+            if self.conn.error:
+                raise self.conn.error
+            self.result = [{'n': i} for i in range(self.conn.rows)]
+            self.rowcount = len(self.result)
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchmany(self, size):
+        return self.result[:size]
+
+    def fetchall(self):
+        return self.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, rows=0, error=None):
+        self.rows = rows
+        self.error = error
+        self.scanned = 0
+        self.statements = []
+        self.rollbacks = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_results_capped_but_row_count_is_total():
+    conn = FakeConnection(rows=8)
+
+    result = run_check(conn, DiagnosticCheck('big', 'SELECT n FROM t;', timeout_ms=1500, max_rows=3))
+
+    assert result['success']
+    assert (result['row_count'], result['truncated']) == (8, True)
+    assert result['results'] == [{'n': 0}, {'n': 1}, {'n': 2}]
+    assert (result['plan_cost'], result['plan_rows'], result['rows_scanned']) == (42.5, 10, 100)
+    assert conn.statements[0][1] == ('1500',)
+    assert ('EXPLAIN (FORMAT JSON) SELECT n FROM t', None) in conn.statements
+    assert conn.rollbacks == 1
+
+
+def test_max_rows_none_keeps_every_row():
+    result = run_check(FakeConnection(rows=8), DiagnosticCheck('all', 'SELECT n FROM t', max_rows=None))
+
+    assert len(result['results']) == 8
+    assert not result['truncated']
+
+
+def test_statement_timeout_reported_as_timed_out():
+    conn = FakeConnection(error=QueryCanceledError('canceling statement due to statement timeout'))
+
+    result = run_check(conn, DiagnosticCheck('slow', 'SELECT pg_sleep(60)'))
+
+    assert not result['success']
+    assert result['timed_out']
+    assert 'statement timeout' in result['error']
+    assert conn.rollbacks == 1
+
+
+def test_run_checks_keeps_input_order():
+    checks = [DiagnosticCheck(f'check {i}', 'SELECT 1') for i in range(6)]
+    seen = []
+
+    def runner(check):
+        return {'name': check.name}
+
+    results = run_checks(checks, workers=3, runner=runner, on_result=seen.append)
+
+    assert [r['name'] for r in results] == [c.name for c in checks]
+    assert sorted(r['name'] for r in seen) == sorted(c.name for c in checks)
+
+
+def test_build_report_summarises_timings():
+    results = [
+        {'name': 'a', 'success': True, 'timed_out': False, 'wall_ms': 5.0, 'rows_scanned': 10, 'plan_cost': 1.0},
+        {'name': 'b', 'success': True, 'timed_out': False, 'wall_ms': 20.0, 'rows_scanned': 900, 'plan_cost': 80.0},
+        {'name': 'c', 'success': False, 'timed_out': True, 'wall_ms': None, 'rows_scanned': None, 'plan_cost': 3.0},
+    ]
+
+    report = build_report(results, wall_seconds=0.021, slowest=1)
+
+    assert (report['total_queries'], report['failed_queries'], report['timed_out_queries']) == (3, 1, 1)
+    assert (report['wall_ms'], report['sum_check_ms']) == (21.0, 25.0)
+    assert report['slowest'] == [{'name': 'b', 'wall_ms': 20.0, 'rows_scanned': 900, 'plan_cost': 80.0}]
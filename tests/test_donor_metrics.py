@@ -0,0 +1,43 @@
+"""
+Unit tests for the bulk donor metrics refresh wrapper.
+
+Run with:
+    pytest tests/test_donor_metrics.py -v
+"""
+from donor_metrics import refresh_donor_metrics
+
+
+class FakeCursor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, sql, params=None):
+        self.calls.append((sql, params))
+
+    def fetchone(self):
+        params = self.calls[-1][1]
+        return {'updated': len(params[0]) if params else 7}
+
+
+class TestRefreshDonorMetrics:
+    def test_one_statement_per_chunk(self):
+        cursor = FakeCursor()
+        ids = [f'00000000-0000-0000-0000-{i:012d}' for i in range(12)]
+
+        assert refresh_donor_metrics(cursor, ids, chunk_size=5) == 12
+        assert [len(params[0]) for _, params in cursor.calls] == [5, 5, 2]
+
+    def test_dedupes_and_skips_empty_ids(self):
+        cursor = FakeCursor()
+        refresh_donor_metrics(cursor, ['a', None, 'b', 'a', ''])
+        assert cursor.calls[0][1] == (['a', 'b'],)
+
+    def test_no_ids_means_no_statement(self):
+        cursor = FakeCursor()
+        assert refresh_donor_metrics(cursor, []) == 0
+        assert cursor.calls == []
+
+    def test_none_refreshes_every_donor(self):
+        cursor = FakeCursor()
+        assert refresh_donor_metrics(cursor) == 7
+        assert cursor.calls == [("SELECT refresh_donor_metrics() AS updated", None)]
@@ -0,0 +1,87 @@
+"""
+Unit tests for union-find duplicate clustering.
+
+Run with:
+    pytest tests/test_duplicate_clusters.py -v
+"""
+import time
+
+from duplicate_clusters import (
+    ContactUnionFind,
+    DuplicateClusterIndex,
+    generate_group_id,
+    resolve_duplicate_groups,
+)
+
+
+def contacts(*ids, **fields):
+    return [dict({'id': cid}, **fields) for cid in ids]
+
+
+class TestResolveDuplicateGroups:
+    def test_transitive_links_form_one_group(self):
+        groups = resolve_duplicate_groups([['a', 'b'], ['c', 'd'], ['b', 'c'], ['x', 'y']])
+        assert sorted(sorted(g) for g in groups) == [['a', 'b', 'c', 'd'], ['x', 'y']]
+
+    def test_singletons_and_blanks_dropped(self):
+        assert resolve_duplicate_groups([['a'], ['b', None, 'b'], []]) == []
+
+    def test_long_chain(self):
+        uf = ContactUnionFind()
+        for i in range(10000):
+            uf.union(str(i), str(i + 1))
+        assert len(uf.components()) == 1
+        assert uf.find('0') == uf.find('10000')
+
+
+class TestDuplicateClusterIndex:
+    def test_overlapping_signals_merge_and_keep_signals(self):
+        index = DuplicateClusterIndex()
+        index.add_signal('exact_name', 'HIGH', 'Exact name match, Same phone',
+                         contacts('a', 'b', email='x@y.com'), first_name='Ann', last_name='Lee')
+        index.add_signal('phone_match', 'MEDIUM', 'Same phone, different names',
+                         contacts('b', 'c'), phone='3035550101')
+        index.add_signal('email_similarity', 'LOW', 'Similar email address', contacts('x', 'y'))
+
+        first, second = index.clusters()
+
+        assert sorted(c['id'] for c in first['contacts']) == ['a', 'b', 'c']
+        assert first['group_id'] == generate_group_id(['a', 'b', 'c'])
+        assert first['type'] == 'exact_name+phone_match'
+        assert first['confidence'] == 'MEDIUM'          # weakest link
+        assert first['reason'] == 'Exact name match, Same phone; Same phone, different names'
+        assert [s['type'] for s in first['signals']] == ['exact_name', 'phone_match']
+        assert (first['first_name'], first['phone']) == ('Ann', '3035550101')
+        assert second['confidence'] == 'LOW' and second['contact_count'] == 2
+
+    def test_corroborating_signals_upgrade_to_high(self):
+        index = DuplicateClusterIndex()
+        index.add_signal('exact_name', 'MEDIUM', 'Exact name match', contacts('a', 'b'))
+        index.add_signal('email_similarity', 'MEDIUM', 'Similar email + same name', contacts('b', 'a'))
+
+        [cluster] = index.clusters()
+        assert cluster['confidence'] == 'HIGH'
+
+    def test_repeated_signal_ignored(self):
+        index = DuplicateClusterIndex()
+        assert index.add_signal('phone_match', 'HIGH', 'r', contacts('a', 'b'))
+        assert index.add_signal('phone_match', 'HIGH', 'r', contacts('b', 'a')) is None
+        assert index.add_signal('phone_match', 'HIGH', 'r', contacts('a')) is None
+        assert len(index.clusters()[0]['signals']) == 1
+
+    def test_contact_fields_merged_across_signals(self):
+        index = DuplicateClusterIndex()
+        index.add_signal('exact_name', 'HIGH', 'r', [{'id': 'a', 'email': 'a@x.com', 'phone': None},
+                                                     {'id': 'b', 'email': 'b@x.com'}])
+        index.add_signal('phone_match', 'HIGH', 'r', [{'id': 'a', 'phone': '3035550101', 'name': 'Ann Lee'},
+                                                      {'id': 'b', 'phone': '3035550101'}])
+        contact_a = index.clusters()[0]['contacts'][0]
+        assert contact_a == {'id': 'a', 'email': 'a@x.com', 'phone': '3035550101', 'name': 'Ann Lee'}
+
+    def test_many_groups_assemble_quickly(self):
+        index = DuplicateClusterIndex()
+        start = time.perf_counter()
+        for i in range(20000):
+            index.add_signal('phone_match', 'HIGH', 'r', contacts(f'p{i}', f'q{i}'))
+        assert len(index.clusters()) == 20000
+        assert time.perf_counter() - start < 5
@@ -0,0 +1,93 @@
+"""
+Unit tests for batch duplicate detection.
+
+Run with:
+    pytest tests/test_duplicate_prevention.py -v
+"""
+import pytest
+
+import duplicate_prevention
+from duplicate_prevention import DuplicateDetector, MatchType
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Replace execute_values; record the rows sent and return canned matches."""
+    calls = {'rows': None, 'matches': []}
+
+    def fake_execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        calls['rows'] = rows
+        calls['page_size'] = page_size
+        return calls['matches']
+
+    monkeypatch.setattr(duplicate_prevention, 'execute_values', fake_execute_values)
+    return calls
+
+
+class TestFindDuplicatesBulk:
+    def test_one_query_for_the_whole_batch(self, captured):
+        detector = DuplicateDetector(cursor=None)
+        records = [{'email': f'user{i}@example.com'} for i in range(250)]
+
+        detector.find_duplicates_bulk(records)
+
+        assert len(captured['rows']) == 250
+        assert captured['page_size'] == 250
+
+    def test_keys_follow_strategy_rules(self, captured):
+        detector = DuplicateDetector(cursor=None)
+        detector.find_duplicates_bulk([
+            {'email': 'a@example.com', 'first_name': 'Ann', 'last_name': 'Lee', 'phone': '+1 (303) 555-0101'},
+            {'email': '', 'first_name': 'Bo', 'phone': '303-555-0101'},
+            {'first_name': 'Cy', 'last_name': 'Young', 'phone': '555-0101'},
+        ])
+
+        assert captured['rows'] == [
+            (0, 'a@example.com', 'Ann', 'Lee', '3035550101', True),
+            (1, None, None, None, None, False),     # no last name: no phone/name strategies
+            (2, None, 'Cy', 'Young', None, True),   # < 10 digits: no phone strategy
+        ]
+
+    def test_disabled_strategies(self, captured):
+        detector = DuplicateDetector(cursor=None, config={
+            'enable_name_matching': False,
+            'enable_phone_matching': False,
+        })
+        detector.find_duplicates_bulk([
+            {'first_name': 'Ann', 'last_name': 'Lee', 'phone': '3035550101'},
+        ])
+
+        assert captured['rows'] == [(0, None, 'Ann', 'Lee', None, False)]
+
+    def test_results_in_input_order(self, captured):
+        captured['matches'] = [
+            {'seq': 2, 'priority': 3, 'id': 'c3', 'email': 'x@example.com',
+             'first_name': 'Cy', 'last_name': 'Young', 'phone': None},
+            {'seq': 0, 'priority': 1, 'id': 'c1', 'email': 'a@example.com',
+             'first_name': 'Ann', 'last_name': 'Lee', 'phone': None},
+        ]
+        detector = DuplicateDetector(cursor=None)
+
+        results = detector.find_duplicates_bulk([{}, {}, {}])
+
+        assert [r.match_type for r in results] == [MatchType.EMAIL, MatchType.NONE, MatchType.EXACT_NAME]
+        assert [r.confidence for r in results] == [1.0, 0.0, 0.7]
+        assert results[0].contact_id == 'c1'
+        assert not results[1].is_duplicate
+
+    def test_empty_batch_skips_query(self, captured):
+        assert DuplicateDetector(cursor=None).find_duplicates_bulk([]) == []
+        assert captured['rows'] is None
+
+    def test_find_duplicate_wraps_bulk(self, captured):
+        captured['matches'] = [
+            {'seq': 0, 'priority': 2, 'id': 'c9', 'email': 'j@example.com',
+             'first_name': 'John', 'last_name': 'Doe', 'phone': '555-123-4567'},
+        ]
+        result = DuplicateDetector(cursor=None).find_duplicate(
+            email='new@example.com', first_name='John', last_name='Doe', phone='(555) 123-4567'
+        )
+
+        assert result.match_type == MatchType.PHONE_AND_NAME
+        assert result.confidence == 0.9
+        assert captured['rows'] == [(0, 'new@example.com', 'John', 'Doe', '5551234567', True)]
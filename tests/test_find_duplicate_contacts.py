@@ -0,0 +1,131 @@
+"""
+Unit tests for blocked fuzzy duplicate detection.
+
+Run with:
+    pytest tests/test_find_duplicate_contacts.py -v
+"""
+import random
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('Levenshtein')
+
+from find_duplicate_contacts import (  # noqa: E402
+    EXACT_BLOCKING_THRESHOLD,
+    Contact,
+    blocking_keys,
+    calculate_duplicate_score,
+    generate_candidate_pairs,
+    pair_keys,
+    score_pairs,
+    score_upper_bound,
+    soundex,
+)
+
+FIRST_NAMES = ['Robert', 'Bob', 'Jennifer', 'Jen', 'Maria', 'Marie', 'David', 'Dave']
+LAST_NAMES = ['Smith', 'Smyth', 'Garcia', 'Nguyen', 'Johnson', 'Jonson']
+STREETS = ['12 Pearl St', '12 Pearl Street', '400 Main Ave', '7 Canyon Blvd']
+
+
+def make_contact(i, rng):
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    user = rng.choice([f"{first}.{last}", f"{first[0]}{last}", f"user{i}"]).lower()
+    return Contact(
+        id=f"c{i}",
+        email=f"{user}@{rng.choice(['gmail.com', 'yahoo.com'])}",
+        first_name=first,
+        last_name=last,
+        phone=rng.choice([None, '303-555-0101', '(303) 555-0101', '1 303 555 0199', f"555{i:04d}"]),
+        address_line_1=rng.choice([None] + STREETS),
+        city=rng.choice(['Boulder', 'Denver']),
+        state='CO',
+        source_system='kajabi',
+        created_at=datetime(2025, 1, 1),
+        postal_code=rng.choice([None, '80302', '80302-1234', '80205']),
+    )
+
+
+def brute_force(contacts, threshold):
+    matches = []
+    for i in range(len(contacts)):
+        for j in range(i + 1, len(contacts)):
+            match = calculate_duplicate_score(contacts[i], contacts[j])
+            if match.confidence_score >= threshold:
+                matches.append(match)
+    return matches
+
+
+class TestSoundex:
+    def test_standard_codes(self):
+        assert soundex('Robert') == 'R163'
+        assert soundex('Rupert') == 'R163'
+        assert soundex('Ashcraft') == 'A261'
+        assert soundex('Tymczak') == 'T522'
+
+    def test_empty(self):
+        assert soundex(None) == ''
+        assert soundex("'") == ''
+
+
+class TestBlockingKeys:
+    def test_phone_key_uses_last_ten_digits(self):
+        rng = random.Random(0)
+        contact = make_contact(0, rng)
+        contact.phone = '+1 (303) 555-0101'
+        assert ('phone', '3035550101') in blocking_keys(contact)
+
+    def test_email_key_is_local_part(self):
+        contact = make_contact(0, random.Random(0))
+        contact.email = ' Jane.Doe@Example.com '
+        assert ('email', 'jane.doe') in blocking_keys(contact)
+
+
+class TestBlockedMatchesBruteForce:
+    """Blocking must not change results at or above the exact threshold."""
+
+    @pytest.mark.parametrize('threshold', [EXACT_BLOCKING_THRESHOLD, 0.75, 0.8, 0.9])
+    def test_identical_output(self, threshold):
+        rng = random.Random(42)
+        contacts = [make_contact(i, rng) for i in range(300)]
+
+        pairs, _ = generate_candidate_pairs(contacts)
+        blocked = score_pairs(contacts, pairs, len(pairs), threshold, workers=1)
+        expected = brute_force(contacts, threshold)
+
+        assert [(m.contact1_id, m.contact2_id) for m in blocked] == \
+            [(m.contact1_id, m.contact2_id) for m in expected]
+
+    def test_limit_keeps_first_matches_in_scan_order(self):
+        rng = random.Random(7)
+        contacts = [make_contact(i, rng) for i in range(200)]
+
+        pairs, _ = generate_candidate_pairs(contacts)
+        blocked = score_pairs(contacts, pairs, len(pairs), 0.8, limit=3, workers=1)
+
+        assert blocked == brute_force(contacts, 0.8)[:3]
+
+    def test_far_fewer_pairs_than_full_comparison(self):
+        rng = random.Random(1)
+        contacts = [make_contact(i, rng) for i in range(300)]
+        for contact in contacts:
+            contact.phone = None
+            contact.email = f"{contact.id}@example.com"
+
+        pairs, _ = generate_candidate_pairs(contacts)
+        assert len(pairs) < 300 * 299 // 2
+
+
+class TestScoreUpperBound:
+    """The prefilter bound must never be below the real score."""
+
+    def test_bound_covers_real_score(self):
+        rng = random.Random(11)
+        contacts = [make_contact(i, rng) for i in range(150)]
+        keys = [pair_keys(contact) for contact in contacts]
+
+        for i in range(len(contacts)):
+            for j in range(i + 1, len(contacts)):
+                score = calculate_duplicate_score(contacts[i], contacts[j]).confidence_score
+                assert score <= score_upper_bound(keys[i], keys[j])
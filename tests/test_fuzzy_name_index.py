@@ -0,0 +1,85 @@
+"""
+Unit tests for the bigram fuzzy name index.
+
+Run with:
+    pytest tests/test_fuzzy_name_index.py -v
+"""
+import random
+import string
+
+import pytest
+
+Levenshtein = pytest.importorskip('Levenshtein')
+
+from fuzzy_name_index import FuzzyNameIndex, qgrams  # noqa: E402
+
+FIRST = ['john', 'jon', 'jane', 'maria', 'mariah', 'robert', 'bob', 'li', 'ann', 'christopher']
+LAST = ['smith', 'smyth', 'garcia', 'nguyen', 'o brien', 'obrien', 'lee', 'van der berg']
+
+
+def typo(name, rng):
+    """Drop, swap or insert one character."""
+    i = rng.randrange(len(name))
+    choice = rng.randrange(3)
+    if choice == 0:
+        return name[:i] + name[i + 1:]
+    if choice == 1:
+        return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i:]
+
+
+def make_names(count, seed):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        if rng.random() < 0.5:
+            name = typo(name, rng)
+        names.append(name)
+    return names
+
+
+def brute_force(names, query, min_ratio):
+    seen = []
+    for name in names:
+        if name and name not in seen:
+            seen.append(name)
+    scored = [(name, Levenshtein.ratio(query, name)) for name in seen]
+    hits = [(i, name, score) for i, (name, score) in enumerate(scored) if score >= min_ratio]
+    hits.sort(key=lambda hit: (-hit[2], hit[0]))
+    return [(name, score) for _, name, score in hits]
+
+
+class TestQgrams:
+    def test_padded_bigrams(self):
+        assert sum(qgrams('ann').values()) == len('ann') + 1
+        assert qgrams('ann')['nn'] == 1
+
+
+class TestSearch:
+    """Index results must equal a full Levenshtein scan."""
+
+    @pytest.mark.parametrize('min_ratio', [0.6, 0.8, 0.95])
+    def test_matches_full_scan(self, min_ratio):
+        names = make_names(400, seed=1)
+        index = FuzzyNameIndex(names)
+
+        for query in make_names(60, seed=2):
+            assert index.search(query, min_ratio) == brute_force(names, query, min_ratio)
+
+    def test_limit_returns_top_k(self):
+        names = make_names(400, seed=3)
+        index = FuzzyNameIndex(names)
+        assert index.search('john smith', 0.6, limit=3) == brute_force(names, 'john smith', 0.6)[:3]
+
+    def test_prunes_at_acceptance_bar(self):
+        index = FuzzyNameIndex(make_names(400, seed=4))
+        index.search('christopher garcia', 0.8)
+        assert index.stats['verified'] < len(index)
+
+    def test_empty_query(self):
+        assert FuzzyNameIndex(['john smith']).search('', 0.8) == []
+
+    def test_duplicate_names_indexed_once(self):
+        index = FuzzyNameIndex(['john smith', 'john smith'])
+        assert len(index) == 1
@@ -0,0 +1,119 @@
+"""
+Unit tests for the synthetic data generator and benchmark stage metrics.
+
+Run with:
+    pytest tests/test_generate_synthetic_data.py -v
+"""
+import csv
+import importlib
+import os
+
+import pytest
+
+import logging_config
+from benchmark_metrics import measure_stage
+from generate_synthetic_data import (
+    DUPLICATE_EVERY,
+    KAJABI_FILES,
+    PAYPAL_FILE,
+    QUICKBOOKS_FILE,
+    generate,
+)
+
+CONTACTS = 200
+
+
+def read_rows(path, delimiter=','):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f, delimiter=delimiter))
+
+
+@pytest.fixture(scope='module')
+def synthetic(tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp('synthetic')
+    counts = generate(str(output_dir), CONTACTS, seed=7)
+    return output_dir, counts
+
+
+def test_kajabi_headers_match_sample_exports(synthetic, sample_csv_dir):
+    output_dir, _ = synthetic
+    for filename in KAJABI_FILES.values():
+        with open(sample_csv_dir / filename.replace('.csv', '_sample.csv'), newline='') as f:
+            expected = next(csv.reader(f))
+        with open(output_dir / filename, newline='') as f:
+            assert next(csv.reader(f)) == expected, filename
+
+
+def test_kajabi_relationships_reference_written_rows(synthetic):
+    output_dir, counts = synthetic
+    contacts = read_rows(output_dir / KAJABI_FILES['contacts'])
+    contact_ids = {row['id'] for row in contacts}
+    tag_ids = {row['id'] for row in read_rows(output_dir / KAJABI_FILES['tags'])}
+    product_ids = {row['id'] for row in read_rows(output_dir / KAJABI_FILES['products'])}
+
+    assert len(contacts) == counts[KAJABI_FILES['contacts']] == CONTACTS + CONTACTS // DUPLICATE_EVERY
+    assert len({row['email'] for row in contacts}) == len(contacts)
+
+    for row in read_rows(output_dir / KAJABI_FILES['contact_tags']):
+        assert row['contact_id'] in contact_ids and row['tag_id'] in tag_ids
+    for name in ('contact_products', 'subscriptions', 'transactions'):
+        for row in read_rows(output_dir / KAJABI_FILES[name]):
+            assert row['contact_id'] in contact_ids and row['product_id'] in product_ids, name
+
+
+def test_paypal_mostly_reuses_kajabi_emails(synthetic):
+    output_dir, counts = synthetic
+    kajabi_emails = {row['email'] for row in read_rows(output_dir / KAJABI_FILES['contacts'])}
+    paypal = read_rows(output_dir / PAYPAL_FILE, delimiter='\t')
+
+    assert len(paypal) == counts[PAYPAL_FILE]
+    known = sum(row['From Email Address'] in kajabi_emails for row in paypal)
+    assert 0 < len(paypal) - known < known
+    assert len({row['Transaction ID'] for row in paypal}) == len(paypal)
+
+
+def test_same_seed_same_files(synthetic, tmp_path):
+    output_dir, _ = synthetic
+    generate(str(tmp_path), CONTACTS, seed=7)
+    for filename in os.listdir(output_dir):
+        assert (tmp_path / filename).read_bytes() == (output_dir / filename).read_bytes(), filename
+
+
+def test_quickbooks_report_loads(synthetic, tmp_path):
+    output_dir, counts = synthetic
+    (tmp_path / 'logs').mkdir()
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        qb = importlib.import_module('import_quickbooks_donors')
+    finally:
+        os.chdir(cwd)
+
+    donors, stats = qb.load_quickbooks_csv(str(output_dir / QUICKBOOKS_FILE))
+
+    assert stats['total_rows'] == counts[QUICKBOOKS_FILE]
+    assert donors and all(donor.email for donor in donors)
+
+
+def test_measure_stage_records_queries_and_rate(monkeypatch):
+    monkeypatch.setattr(logging_config, '_run', None)
+
+    class Cursor:
+        description = None
+        rowcount = 0
+
+        def execute(self, sql, params=None):
+            return sql
+
+        def copy_expert(self, sql, file, size=8192):
+            return sql
+
+    with measure_stage('stage', rows=100) as metrics:
+        cursor = logging_config.instrument_cursor(Cursor())
+        cursor.execute('SELECT 1')
+        cursor.copy_expert('COPY t TO STDOUT', None)
+
+    assert metrics.queries == 2
+    assert metrics.seconds > 0 and metrics.rows_per_sec > 0
+    assert metrics.peak_rss_mb > 0
+    assert set(metrics.as_dict()) >= {'stage', 'rows', 'rows_per_sec', 'queries', 'peak_rss_mb'}
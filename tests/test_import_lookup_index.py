@@ -0,0 +1,143 @@
+"""
+Unit tests for the importer lookup indexes.
+
+Run with:
+    pytest tests/test_import_lookup_index.py -v
+"""
+import threading
+
+import pytest
+
+from import_lookup_index import ImportLookupIndex, deep_size
+
+
+class FakeCursor:
+    """Server-side cursor stand-in that serves canned rows per query."""
+
+    def __init__(self, rows_by_table):
+        self.rows_by_table = rows_by_table
+        self.rows = []
+        self.itersize = None
+
+    def execute(self, query):
+        for table, rows in self.rows_by_table.items():
+            if f"FROM {table}" in query:
+                self.rows = rows
+                return
+        self.rows = []
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows_by_table):
+        self.rows_by_table = rows_by_table
+        self.cursor_names = []
+
+    def cursor(self, name=None):
+        self.cursor_names.append(name)
+        return FakeCursor(self.rows_by_table)
+
+
+@pytest.fixture
+def warmed_index():
+    conn = FakeConnection({
+        'contacts': [
+            ('c1', 'a@example.com', 'k1', None),
+            ('c2', 'b@example.com', None, 'b.paypal@example.com'),
+        ],
+        'tags': [('t1',)],
+        'products': [('p1',)],
+        'contact_tags': [('c1', 't1')],
+        'contact_products': [('c2', 'p1')],
+        'subscriptions': [('sub-1',)],
+        'transactions': [('txn-1',), ('txn-2',)],
+    })
+    index = ImportLookupIndex()
+    index.warm(conn)
+    return index
+
+
+class TestWarm:
+    """Tests for loading indexes from the database."""
+
+    def test_loads_contacts(self, warmed_index):
+        assert warmed_index.contact_ids == {'c1', 'c2'}
+        assert warmed_index.contact_id_by_email == {'a@example.com': 'c1', 'b@example.com': 'c2'}
+        assert warmed_index.contact_id_by_kajabi_id == {'k1': 'c1'}
+        assert warmed_index.contact_id_by_paypal_email == {'b.paypal@example.com': 'c2'}
+
+    def test_loads_relationships_and_external_ids(self, warmed_index):
+        assert warmed_index.contact_tag_pairs == {('c1', 't1')}
+        assert warmed_index.contact_product_pairs == {('c2', 'p1')}
+        assert warmed_index.kajabi_subscription_ids == {'sub-1'}
+        assert warmed_index.kajabi_transaction_ids == {'txn-1', 'txn-2'}
+
+    def test_uses_server_side_cursors(self):
+        conn = FakeConnection({})
+        ImportLookupIndex().warm(conn)
+        assert all(name and name.startswith('warm_') for name in conn.cursor_names)
+
+    def test_contact_ids_are_shared_between_indexes(self, warmed_index):
+        by_email = warmed_index.contact_id_by_email['a@example.com']
+        in_pair = next(iter(warmed_index.contact_tag_pairs))[0]
+        assert by_email is in_pair
+
+
+class TestLookups:
+    """Tests for lookups and hit-rate counting."""
+
+    def test_email_lookup_is_case_insensitive(self, warmed_index):
+        assert warmed_index.contact_for_email('A@Example.com') == 'c1'
+
+    def test_hits_and_misses_are_counted(self, warmed_index):
+        warmed_index.has_kajabi_transaction('txn-1')
+        warmed_index.has_kajabi_transaction('txn-9')
+        warmed_index.has_kajabi_transaction('txn-2')
+        assert warmed_index.stats['kajabi_transaction'] == {'hits': 2, 'misses': 1}
+
+    def test_missing_email_is_a_miss(self, warmed_index):
+        assert warmed_index.contact_for_email(None) is None
+        assert warmed_index.stats['email'] == {'hits': 0, 'misses': 1}
+
+    def test_add_contact_updates_all_contact_indexes(self, warmed_index):
+        warmed_index.add_contact('c3', 'New@Example.com', 'k3')
+        assert warmed_index.has_contact('c3')
+        assert warmed_index.contact_for_email('new@example.com') == 'c3'
+        assert warmed_index.contact_for_kajabi_id('k3') == 'c3'
+
+
+class TestConcurrentUse:
+    """Tests for sharing one index between pipeline lanes."""
+
+    def test_counters_and_writes_from_two_threads(self, warmed_index):
+        def lane(prefix):
+            for i in range(2000):
+                warmed_index.add_contact(f'{prefix}{i}', f'{prefix}{i}@example.com')
+                warmed_index.add_contact_tag(f'{prefix}{i}', 't1')
+                warmed_index.contact_for_email(f'{prefix}{i}@example.com')
+
+        threads = [threading.Thread(target=lane, args=(prefix,)) for prefix in ('k', 'p')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(warmed_index.contact_ids) == 4002
+        assert len(warmed_index.contact_tag_pairs) == 4001
+        assert warmed_index.stats['email'] == {'hits': 4000, 'misses': 0}
+
+
+class TestDeepSize:
+    """Tests for the memory estimate."""
+
+    def test_counts_contents(self):
+        assert deep_size({'key': 'value' * 100}) > deep_size({})
+
+    def test_shared_objects_counted_once(self):
+        value = 'x' * 1000
+        assert deep_size([value, value]) < deep_size([value, 'y' * 1000])
@@ -0,0 +1,62 @@
+"""
+Unit tests for NCOA staging rows and the COPY stream.
+
+Run with:
+    pytest tests/test_import_ncoa_results.py -v
+"""
+import csv
+import importlib
+import io
+import os
+
+import pytest
+
+CONTACT_ID = '6f1c2a8e-3b7d-4c5e-9f10-2a3b4c5d6e7f'
+
+
+@pytest.fixture(scope='module')
+def ncoa(tmp_path_factory):
+    """Import the script from a scratch directory (it logs to ./logs)."""
+    workdir = tmp_path_factory.mktemp('ncoa')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.environ.setdefault('DATABASE_URL', 'postgresql://localhost/test')
+    try:
+        return importlib.import_module('import_ncoa_results')
+    finally:
+        os.chdir(cwd)
+
+
+def test_staging_rows(ncoa):
+    vendor_file = io.StringIO(
+        'input_ID,Move Applied,Address Line 1,Address Line 2,City Name,State Code,'
+        'Postal Code,Move Date,Move Type,Extra\n'
+        f'{CONTACT_ID.upper()}, yes ,12 Pearl St,,Boulder,CO,80302,202508,Individual,x\n'
+        'not-a-uuid,No,1 Main St,,Denver,CO,80202,,,\n'
+    )
+    importer = ncoa.NCOAImporter('unused.csv')
+
+    rows = list(importer.staging_rows(csv.DictReader(vendor_file)))
+
+    assert rows == [
+        (1, CONTACT_ID, 'YES', '12 Pearl St', '', 'Boulder', 'CO', '80302', '2025-08-01', 'Individual'),
+        (2, '', 'NO', '1 Main St', '', 'Denver', 'CO', '80202', '', ''),
+    ]
+    assert len(rows[0]) == len(ncoa.STAGING_COLUMNS)
+
+
+def test_copy_stream_matches_csv(ncoa):
+    rows = [(i, f'Street {i}, "Apt" {i}', '') for i in range(500)]
+    expected = io.StringIO()
+    csv.writer(expected, lineterminator='\n').writerows(rows)
+
+    stream = ncoa.CsvCopyStream(rows)
+    chunks = []
+    while True:
+        chunk = stream.read(1000)
+        if not chunk:
+            break
+        assert len(chunk) <= 1000
+        chunks.append(chunk)
+
+    assert b''.join(chunks).decode('utf-8') == expected.getvalue()
@@ -0,0 +1,195 @@
+"""
+Unit tests for chunked QuickBooks donor import with bisecting error isolation.
+
+Run with:
+    pytest tests/test_import_quickbooks_donors.py -v
+"""
+import importlib
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def qb(tmp_path_factory):
+    """Import the script from a scratch directory (it logs to ./logs)."""
+    workdir = tmp_path_factory.mktemp('qb')
+    (workdir / 'logs').mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return importlib.import_module('import_quickbooks_donors')
+    finally:
+        os.chdir(cwd)
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+
+def make_donor(qb, name):
+    day = datetime(2025, 1, 1)
+    return qb.DonorRecord(customer_name=name, customer_id=name, total_amount=10.0,
+                          transaction_count=1, first_date=day, last_date=day)
+
+
+def make_importer(qb, bad_names=()):
+    importer = qb.QuickBooksDonorImporter('unused.csv')
+    importer.cur = RecordingCursor()
+    importer.batch_calls = []
+
+    def fake_batch(items):
+        importer.batch_calls.append(len(items))
+        if any(donor.customer_name in bad_names for donor, _ in items):
+            raise RuntimeError('constraint violation')
+        return [(contact_id, f'donor-{contact_id}') for _, contact_id in items], 0
+
+    importer._import_donor_batch = fake_batch
+    return importer
+
+
+class TestChunks:
+    def test_chunk_size(self, qb):
+        importer = make_importer(qb)
+        items = [(make_donor(qb, str(i)), f'c{i}') for i in range(qb.BATCH_SIZE * 2 + 5)]
+        assert [len(chunk) for chunk in importer._chunks(items)] == [qb.BATCH_SIZE, qb.BATCH_SIZE, 5]
+
+    def test_repeated_contact_starts_new_chunk(self, qb):
+        importer = make_importer(qb)
+        items = [(make_donor(qb, 'a'), 'c1'), (make_donor(qb, 'b'), 'c2'),
+                 (make_donor(qb, 'c'), 'c1'), (make_donor(qb, 'd'), None), (make_donor(qb, 'e'), None)]
+        assert [len(chunk) for chunk in importer._chunks(items)] == [2, 3]
+
+
+class TestBisection:
+    def test_clean_chunk_is_one_batch(self, qb):
+        importer = make_importer(qb)
+        items = [(make_donor(qb, str(i)), f'c{i}') for i in range(50)]
+
+        totals = importer._import_in_chunks(items, 'donor')
+
+        assert importer.batch_calls == [50]
+        assert len(totals['donor_ids']) == 50
+        assert totals['contact_ids'] == [f'c{i}' for i in range(50)]
+        assert totals['errors'] == 0
+
+    def test_bad_record_is_isolated(self, qb):
+        importer = make_importer(qb, bad_names={'13'})
+        items = [(make_donor(qb, str(i)), f'c{i}') for i in range(64)]
+
+        totals = importer._import_in_chunks(items, 'donor')
+
+        assert totals['errors'] == 1
+        assert sorted(totals['donor_ids']) == sorted(f'donor-c{i}' for i in range(64) if i != 13)
+        # 64 -> 32 -> 16 -> 8 -> 4 -> 2 -> 1: two calls per level after the first
+        assert len(importer.batch_calls) == 1 + 2 * 6
+
+    def test_failed_chunks_are_rolled_back(self, qb):
+        importer = make_importer(qb, bad_names={'0'})
+        importer._import_in_chunks([(make_donor(qb, '0'), 'c0'), (make_donor(qb, '1'), 'c1')], 'donor')
+
+        statements = importer.cur.statements
+        assert statements.count('ROLLBACK TO SAVEPOINT donor_chunk') == 2
+        assert statements.count('SAVEPOINT donor_chunk') == statements.count('RELEASE SAVEPOINT donor_chunk')
+
+
+class BatchCursor:
+    """Collects execute_values() rows per table; RETURNING rows come back reversed."""
+
+    connection = SimpleNamespace(encoding='UTF8')
+
+    def __init__(self):
+        self.rows = defaultdict(list)
+        self._pending = []
+        self._result = []
+
+    def mogrify(self, template, args):
+        self._pending.append(args)
+        return b'(?)'
+
+    def execute(self, sql, params=None):
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        if 'FROM contacts WHERE id = ANY' in sql:
+            self._result = [{'id': contact_id, 'phone': '1', 'address_line_1': 'x'} for contact_id in params[0]]
+            return
+        table = re.search(r'(?:INSERT INTO|UPDATE)\s+(\w+)', sql).group(1)
+        self.rows[table].extend(self._pending)
+        self._result = [{'id': f'donor-{row[0]}', 'contact_id': row[0]}
+                        for row in reversed(self._pending)] if table == 'donors' else []
+        self._pending = []
+
+    def fetchall(self):
+        return self._result
+
+
+class TestDonorBatch:
+    def test_acknowledgments_follow_their_transactions(self, qb):
+        importer = qb.QuickBooksDonorImporter('unused.csv')
+        importer.cur = BatchCursor()
+        items = []
+        for i in range(3):
+            donor = make_donor(qb, f'Donor {i}')
+            donor.transactions = [{'amount': 10.0 * i + n, 'date': datetime.now()} for n in range(2)]
+            items.append((donor, f'c{i}'))
+
+        imported, created = importer._import_donor_batch(items)
+
+        assert (sorted(imported), created) == ([(f'c{i}', f'donor-c{i}') for i in range(3)], 0)
+        transactions = {row[0]: row for row in importer.cur.rows['transactions']}
+        acknowledgments = importer.cur.rows['donation_acknowledgments']
+        assert len(transactions) == len(acknowledgments) == 6
+        for transaction_id, donor_id, status, name, amount, *_ in acknowledgments:
+            _, contact_id, _, transaction_amount = transactions[transaction_id][:4]
+            assert donor_id == f'donor-{contact_id}'
+            assert amount == transaction_amount
+            assert status == 'auto_queued'
+
+
+REPORT = '''Star House
+"Transaction Detail by Account"
+"January 1, 2020 - December 31, 2025"
+
+Transaction date,Transaction type,Num,Customer,Customer ID,Full name,Memo/Description,Amount,Customer email,Customer bill street,Customer bill city,Customer bill state,Customer bill zip,Class full name,Payment method
+01/05/2025,Sales Receipt,101,Jane Doe,C1,DEVELOPMENT:General,"Thank you,
+again",100.00,jane@example.com,1 Main St,Boulder,CO,80302,Annual Fund,Check
+03/10/2024,Sales Receipt,102,Jane Doe,C1,DEVELOPMENT:General,,"1,250.00",,,,,,,Credit Card
+02/01/2025,Invoice,103,Acme Corp,C2,PROGRAMS:Workshops,,75.00,,,,,,,
+
+06/01/2025,Sales Receipt,104,Acme Corp,C2,DEVELOPMENT:Events,,50.00,,,,,,Gala,Cash
+'''
+
+
+class TestLoadQuickBooksCsv:
+    def test_streams_past_preamble_and_aggregates(self, qb, tmp_path):
+        path = tmp_path / 'report.csv'
+        path.write_text(REPORT, encoding='utf-8')
+
+        donors, stats = qb.load_quickbooks_csv(str(path))
+
+        assert stats == {'total_rows': 4, 'development_rows': 3, 'skipped_rows': 1, 'unique_donors': 2}
+        jane, acme = donors
+        assert (jane.customer_name, jane.customer_id, jane.total_amount, jane.transaction_count) == \
+            ('Jane Doe', 'C1', 1350.0, 2)
+        assert jane.first_date == datetime(2024, 3, 10)
+        assert jane.last_date == datetime(2025, 1, 5)
+        assert jane.email == 'jane@example.com'
+        assert jane.address == {'street': '1 Main St', 'city': 'Boulder', 'state': 'CO', 'zip': '80302'}
+        assert jane.campaign == 'Annual Fund'
+        assert jane.transactions[0]['memo'] == 'Thank you,\nagain'
+        assert acme.is_organization
+        assert acme.total_amount == 50.0
+
+    def test_missing_header(self, qb, tmp_path):
+        path = tmp_path / 'report.csv'
+        path.write_text('Star House\nno header here\n', encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            qb.load_quickbooks_csv(str(path))
@@ -0,0 +1,108 @@
+"""
+Unit tests for the span/cursor instrumentation in logging_config.
+
+Run with:
+    pytest tests/test_instrumentation.py -v
+"""
+import json
+
+import pytest
+
+pytest.importorskip('structlog')
+
+import logging_config
+from logging_config import (
+    enable_instrumentation,
+    finish_instrumentation,
+    instrument_cursor,
+    instrumentation_summary,
+    span,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, sql, params=None):
+        if sql.lstrip().upper().startswith('SELECT'):
+            self.description = [('col',)]
+            self.rowcount = len(self.rows)
+        else:
+            self.description = None
+            self.rowcount = 3
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_run(monkeypatch):
+    monkeypatch.setattr(logging_config, '_run', None)
+
+
+def test_disabled_costs_nothing():
+    cur = FakeCursor()
+
+    assert instrument_cursor(cur) is cur
+    with span('stage'):
+        pass
+    assert instrumentation_summary() is None
+    assert finish_instrumentation() is None
+
+
+def test_spans_attribute_statements_and_rows():
+    enable_instrumentation('test')
+    cur = instrument_cursor(FakeCursor(rows=[{'email': 'ann@example.com'}, {'email': None}]))
+
+    @span('inner')
+    def write():
+        cur.execute("UPDATE contacts SET phone = %s WHERE id = %s", ('1', '2'))
+
+    with span('outer'):
+        cur.execute("SELECT email FROM contacts")
+        assert len(cur.fetchall()) == 2
+        write()
+
+    summary = instrumentation_summary()
+    outer, inner = summary['spans']['outer'], summary['spans']['inner']
+    assert (summary['statements'], summary['rows_affected'], summary['bytes_fetched']) == (2, 3, 15)
+    assert (outer['calls'], outer['statements'], outer['rows_affected'], outer['rows_fetched']) == (1, 2, 3, 2)
+    assert (inner['statements'], inner['rows_affected'], inner['rows_fetched']) == (1, 3, 0)
+    assert outer['wall_ms'] >= inner['wall_ms']
+
+
+def test_repeated_statements_rank_first():
+    enable_instrumentation('test')
+    cur = instrument_cursor(FakeCursor())
+
+    for contact_id in range(5):
+        cur.execute(f"SELECT id FROM contacts WHERE id = {contact_id}")
+    cur.execute("INSERT INTO t VALUES ('a', 1), ('b', 2)")
+
+    top = instrumentation_summary()['top_statements']
+    assert top[0]['sql'] == 'SELECT id FROM contacts WHERE id = ?'
+    assert top[0]['count'] == 5
+    assert top[1]['sql'] == 'INSERT INTO t VALUES (...)'
+
+
+def test_finish_writes_json_and_ends_run(tmp_path):
+    enable_instrumentation('paypal_import')
+    with span('import_file'):
+        instrument_cursor(FakeCursor()).execute("DELETE FROM t")
+    output = tmp_path / 'summary.json'
+
+    summary = finish_instrumentation(path=str(output))
+
+    assert json.loads(output.read_text()) == summary
+    assert summary['run'] == 'paypal_import'
+    assert summary['spans']['import_file']['rows_affected'] == 3
+    assert instrumentation_summary() is None
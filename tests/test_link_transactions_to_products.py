@@ -0,0 +1,124 @@
+"""
+Unit tests for keyset-paginated fetching and RPC batch linking.
+
+Run with:
+    pytest tests/test_link_transactions_to_products.py -v
+"""
+from types import SimpleNamespace
+
+import pytest
+
+linker_module = pytest.importorskip('link_transactions_to_products_faang', exc_type=ImportError)
+
+
+class FakeQuery:
+    def __init__(self, client):
+        self.client = client
+        self.after = None
+        self.page_size = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def is_(self, *args):
+        return self
+
+    @property
+    def not_(self):
+        return self
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, count):
+        self.page_size = count
+        return self
+
+    def execute(self):
+        self.client.pages.append((self.after, self.page_size))
+        rows = [row for row in self.client.rows if self.after is None or row['id'] > self.after]
+        return SimpleNamespace(data=rows[:self.page_size])
+
+
+class FakeRpc:
+    def __init__(self, client, params):
+        self.client = client
+        self.params = params
+
+    def execute(self):
+        links = self.params['p_links']
+        if any(link['id'] in self.client.bad_ids for link in links):
+            raise RuntimeError('invalid input syntax for type uuid')
+        self.client.rpc_batches.append(links)
+        return SimpleNamespace(data=sum(link['id'] not in self.client.linked_ids for link in links))
+
+
+class FakeSupabase:
+    def __init__(self, row_count=0, bad_ids=(), linked_ids=()):
+        self.rows = [{'id': f'{i:05d}', 'offer_id': str(i % 3), 'transaction_type': 'purchase',
+                      'amount': 10, 'transaction_date': '2025-01-01'} for i in range(row_count)]
+        self.bad_ids = set(bad_ids)
+        self.linked_ids = set(linked_ids)
+        self.pages = []
+        self.rpc_batches = []
+
+    def table(self, name):
+        return FakeQuery(self)
+
+    def rpc(self, name, params):
+        assert name == linker_module.LINK_RPC
+        return FakeRpc(self, params)
+
+
+@pytest.fixture
+def page_size(monkeypatch):
+    monkeypatch.setattr(linker_module, 'FETCH_PAGE_SIZE', 10)
+    return 10
+
+
+class TestFetchUnlinkedTransactions:
+    def test_keyset_pages(self, page_size):
+        client = FakeSupabase(row_count=25)
+        linker = linker_module.TransactionProductLinker(client)
+
+        rows = linker.fetch_unlinked_transactions()
+
+        assert [row['id'] for row in rows] == [f'{i:05d}' for i in range(25)]
+        assert client.pages == [(None, 10), ('00009', 10), ('00019', 10)]
+
+    def test_limit_caps_last_page(self, page_size):
+        client = FakeSupabase(row_count=25)
+        rows = linker_module.TransactionProductLinker(client).fetch_unlinked_transactions(limit=15)
+
+        assert len(rows) == 15
+        assert client.pages == [(None, 10), ('00009', 5)]
+
+
+class TestUpdateTransactionsBatch:
+    def test_one_rpc_per_batch(self):
+        client = FakeSupabase()
+        linker = linker_module.TransactionProductLinker(client, dry_run=False, batch_size=4)
+        matches = [(f't{i}', 'p1') for i in range(10)]
+
+        assert linker.update_transactions_batch(matches) == 10
+        assert [len(batch) for batch in client.rpc_batches] == [4, 4, 2]
+        assert client.rpc_batches[0][0] == {'id': 't0', 'product_id': 'p1'}
+
+    def test_failed_batch_counted_and_run_continues(self):
+        client = FakeSupabase(bad_ids={'t5'})
+        linker = linker_module.TransactionProductLinker(client, dry_run=False, batch_size=4)
+
+        assert linker.update_transactions_batch([(f't{i}', 'p1') for i in range(10)]) == 6
+        assert linker.metrics.failed_updates == 4
+
+    def test_rows_linked_since_fetch_are_counted(self):
+        client = FakeSupabase(bad_ids={'t9'}, linked_ids={'t1', 't2', 't6'})
+        linker = linker_module.TransactionProductLinker(client, dry_run=False, batch_size=4)
+
+        assert linker.update_transactions_batch([(f't{i}', 'p1') for i in range(10)]) == 5
+        metrics = linker.metrics
+        assert (metrics.successful_updates, metrics.already_linked, metrics.failed_updates) == (5, 3, 2)
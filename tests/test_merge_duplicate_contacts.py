@@ -0,0 +1,62 @@
+"""
+Unit tests for in-memory merge planning.
+
+Run with:
+    pytest tests/test_merge_duplicate_contacts.py -v
+"""
+import os
+from datetime import datetime
+
+os.environ.setdefault('DATABASE_URL', 'postgresql://localhost/test')
+
+from merge_duplicate_contacts import (  # noqa: E402
+    DuplicateMerger,
+    read_groups_csv,
+    resolve_duplicate_groups,
+)
+
+
+def make_contact(cid, day, email, transactions=0, emails=(), phone=None):
+    return {
+        'id': cid, 'first_name': 'Ann', 'last_name': 'Lee', 'email': email,
+        'phone': phone, 'address': None, 'source': 'kajabi',
+        'created_at': datetime(2024, 1, day), 'transaction_count': transactions,
+        'additional_emails': list(emails),
+    }
+
+
+class TestPlanMerges:
+    def test_primary_and_emails(self):
+        contacts = {
+            'a': make_contact('a', 3, 'ann@new.com', emails=['Ann@Old.com']),
+            'b': make_contact('b', 1, 'ann@old.com', transactions=2),
+            'c': make_contact('c', 2, 'ann@work.com', emails=['ann@home.com', 'ANN@WORK.COM']),
+        }
+        [plan] = DuplicateMerger().plan_merges([['a', 'b', 'c']], contacts)
+
+        assert plan['primary']['id'] == 'b'                    # most transactions
+        assert [d['id'] for d in plan['duplicates']] == ['c', 'a']
+        assert plan['emails_to_migrate'] == ['ann@work.com', 'ann@home.com', 'ann@new.com']
+        assert plan['group_id'] == DuplicateMerger().generate_group_id(['a', 'b', 'c'])
+
+    def test_skips_groups_without_two_active_contacts(self):
+        contacts = {'a': make_contact('a', 1, 'a@x.com')}
+        assert DuplicateMerger().plan_merges([['a', 'gone']], contacts) == []
+
+    def test_target_group_and_limit(self):
+        contacts = {cid: make_contact(cid, i + 1, f'{cid}@x.com') for i, cid in enumerate('abcdef')}
+        components = [['a', 'b'], ['c', 'd'], ['e', 'f']]
+        target = DuplicateMerger().generate_group_id(['c', 'd'])
+
+        assert [p['group_id'] for p in DuplicateMerger(group_id=target).plan_merges(components, contacts)] == [target]
+        assert len(DuplicateMerger(limit=2).plan_merges(components, contacts)) == 2
+
+
+def test_read_groups_csv(tmp_path):
+    path = tmp_path / 'duplicates.csv'
+    path.write_text(
+        'group_id,contact_id,action_recommended\n'
+        'g1,a,MERGE\ng1,b,MERGE\ng2,c,REVIEW\ng2,d,REVIEW\ng3,b,MERGE\ng3,e,MERGE\n'
+    )
+    assert read_groups_csv(str(path)) == [['a', 'b'], ['b', 'e']]
+    assert resolve_duplicate_groups(read_groups_csv(str(path))) == [['a', 'b', 'e']]
@@ -0,0 +1,96 @@
+"""
+Unit tests for the incremental address score refresher.
+
+Run with:
+    pytest tests/test_refresh_address_scores.py -v
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+import refresh_address_scores as refresher
+
+STARTED_AT = datetime(2025, 12, 5, 12, 0, tzinfo=timezone.utc)
+WATERMARK = datetime(2025, 12, 4, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        if 'NOW() AS started_at' in sql:
+            self.result = [{'started_at': STARTED_AT}]
+        elif 'FROM job_watermarks' in sql:
+            self.result = [{'watermark': self.conn.watermark}] if self.conn.watermark else []
+        elif 'INSERT INTO job_watermarks' in sql:
+            self.conn.watermark = params[1]
+        elif 'COUNT(*) AS total' in sql:
+            self.result = [{'total': 7}]
+        elif 'UNION' in sql:
+            self.result = [{'contact_id': contact_id} for contact_id in self.conn.stale]
+        elif 'refresh_contact_address_scores(%s' in sql:
+            self.result = [{'refreshed': len(params[0])}]
+        elif 'refresh_contact_address_scores()' in sql:
+            self.result = [{'refreshed': 7}]
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, watermark=None, stale=()):
+        self.watermark = watermark
+        self.stale = list(stale)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def refresh_calls(self):
+        return [params for sql, params in self.statements if 'refresh_contact_address_scores' in sql]
+
+
+def test_first_run_rescores_everything_and_sets_watermark():
+    conn = FakeConnection()
+
+    assert refresher.refresh_address_scores(conn) == (7, 7)
+    assert conn.refresh_calls() == [None]
+    assert conn.watermark == STARTED_AT
+    assert conn.commits == 1
+
+
+def test_incremental_rescores_only_stale_contacts_in_batches():
+    conn = FakeConnection(watermark=WATERMARK, stale=[f'c{i}' for i in range(5)])
+
+    assert refresher.refresh_address_scores(conn, batch_size=2) == (5, 5)
+    assert conn.refresh_calls() == [(['c0', 'c1'],), (['c2', 'c3'],), (['c4'],)]
+    candidates_params = next(params for sql, params in conn.statements if 'UNION' in sql)
+    assert candidates_params == {'watermark': WATERMARK}
+    assert conn.watermark == STARTED_AT
+
+
+def test_dry_run_writes_nothing():
+    conn = FakeConnection(watermark=WATERMARK, stale=['c1'])
+
+    assert refresher.refresh_address_scores(conn, dry_run=True) == (1, 0)
+    assert conn.refresh_calls() == []
+    assert (conn.watermark, conn.commits, conn.rollbacks) == (WATERMARK, 0, 1)
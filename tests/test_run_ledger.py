@@ -0,0 +1,134 @@
+"""
+Unit tests for the import run ledger recorder and trend report.
+
+Run with:
+    pytest tests/test_run_ledger.py -v
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('structlog')
+
+import psycopg2
+
+import logging_config
+import run_ledger
+from logging_config import enable_instrumentation, instrument_cursor, span
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rowcount = 1
+
+    def execute(self, sql, params=None):
+        if self.conn.error:
+            raise self.conn.error
+        self.conn.statements.append((sql, params))
+
+    def fetchone(self):
+        return ('run-1',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, error=None):
+        self.error = error
+        self.statements = []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+
+@pytest.fixture
+def ledger_conn(monkeypatch):
+    conn = FakeConnection()
+
+    @contextmanager
+    def pooled_connection(production=False, autocommit=False):
+        assert autocommit
+        yield conn
+
+    monkeypatch.setattr(run_ledger, 'pooled_connection', pooled_connection)
+    monkeypatch.setattr(logging_config, '_run', None)
+    return conn
+
+
+def test_records_stages_counts_and_round_trips(ledger_conn):
+    enable_instrumentation('weekly_import_paypal_improved')
+    recorder = run_ledger.RunRecorder('weekly_import_paypal_improved', dry_run=False, trace_id='t1').start()
+    cur = instrument_cursor(FakeCursor(FakeConnection()))
+    with span('import_file'):
+        cur.execute("INSERT INTO transactions VALUES (%s)", (1,))
+        cur.execute("INSERT INTO transactions VALUES (%s)", (2,))
+
+    recorder.finish(True, rows_processed=10, rows_created=2, errors=1, details={'rows_skipped': 8})
+
+    (start_sql, start_params), (_, params) = ledger_conn.statements
+    assert 'INSERT INTO import_runs' in start_sql
+    assert start_params == ('weekly_import_paypal_improved', 'execute', 't1')
+    assert params['run_id'] == 'run-1'
+    assert (params['status'], params['rows_processed'], params['rows_created'], params['errors']) == ('succeeded', 10, 2, 1)
+    assert params['round_trips'] == 2
+    assert params['stages'].adapted['import_file']['statements'] == 2
+    assert params['details'].adapted == {'rows_skipped': 8}
+
+
+def test_uninstrumented_run_records_only_counts(ledger_conn):
+    recorder = run_ledger.RunRecorder('weekly_import_paypal', dry_run=False).start()
+    with span('import_file'):
+        instrument_cursor(FakeCursor(FakeConnection())).execute("SELECT 1")
+
+    recorder.finish(True, rows_processed=3)
+
+    assert not logging_config.instrumentation_enabled()
+    params = ledger_conn.statements[-1][1]
+    assert (params['rows_processed'], params['stages'], params['round_trips']) == (3, None, None)
+    assert params['duration_ms'] >= 0
+
+
+def test_ledger_failure_does_not_stop_the_run(ledger_conn, capsys):
+    ledger_conn.error = psycopg2.ProgrammingError('relation "import_runs" does not exist')
+    recorder = run_ledger.RunRecorder('weekly_import_kajabi_v2', dry_run=True).start()
+
+    recorder.finish(False)
+
+    assert recorder.run_id is None and not recorder.enabled
+    assert 'Run ledger unavailable' in capsys.readouterr().err
+
+
+def weekly(*weeks):
+    return run_ledger.weekly_throughput([
+        {'script': 'weekly_import_kajabi_v2', 'week': datetime(2025, 11, 3 + 7 * i), 'runs': 1,
+         'rows_processed': rows, 'duration_ms': seconds * 1000, 'round_trips': trips, 'errors': 0}
+        for i, (rows, seconds, trips) in enumerate(weeks)
+    ])['weekly_import_kajabi_v2']
+
+
+def test_weekly_throughput_rates():
+    week = weekly((10_000, 20, 500))[0]
+    assert (week['rows_per_sec'], week['trips_per_row']) == (500, 0.05)
+
+
+def test_flags_throughput_drop_against_median():
+    flags = run_ledger.find_regressions(weekly((10_000, 20, 500), (10_000, 25, 500), (10_000, 40, 500)))
+    assert len(flags) == 1 and 'below the 2-week median' in flags[0]
+
+
+def test_flags_round_trips_per_row_increase():
+    flags = run_ledger.find_regressions(weekly((10_000, 20, 500), (10_000, 20, 10_500)))
+    assert len(flags) == 1 and 'round trips per row' in flags[0]
+
+
+def test_steady_weeks_not_flagged():
+    assert run_ledger.find_regressions(weekly((10_000, 20, 500), (11_000, 21, 520), (9_000, 19, 470))) == []
+    assert run_ledger.find_regressions(weekly((10_000, 20, None))) == []
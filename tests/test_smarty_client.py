@@ -0,0 +1,172 @@
+"""
+Unit tests for the shared Smarty client, against a local stub server.
+
+Run with:
+    pytest tests/test_smarty_client.py -v
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from smarty_client import MAX_BATCH_SIZE, SmartyClient, TokenBucket
+
+
+class StubSmarty:
+    """Minimal US Street API: echoes each lookup back as a DPV 'Y' candidate."""
+
+    def __init__(self):
+        self.batches = []
+        self.failures = []      # statuses to return before answering normally
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    status = stub.failures.pop(0) if stub.failures else 200
+                    if status == 200:
+                        stub.batches.append(body)
+                stub.release.wait(5)
+                with stub.lock:
+                    stub.in_flight -= 1
+
+                if status != 200:
+                    self.send_response(status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                candidates = [
+                    {
+                        'input_index': index,
+                        'input_id': lookup['input_id'],
+                        'delivery_line_1': lookup['street'].upper(),
+                        'analysis': {'dpv_match_code': 'Y'},
+                    }
+                    for index, lookup in enumerate(body)
+                    if not lookup['street'].startswith('nowhere')
+                ]
+                payload = json.dumps(candidates).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/street-address"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubSmarty()
+    yield server
+    server.close()
+
+
+def make_client(stub, **kwargs):
+    kwargs.setdefault('requests_per_second', 1000)
+    return SmartyClient('id', 'token', api_url=stub.url, **kwargs)
+
+
+def lookups(count, street='{} main st'):
+    return [{'input_id': str(i), 'street': street.format(i), 'city': 'Boulder', 'state': 'CO'}
+            for i in range(count)]
+
+
+class TestSmartyClient:
+    def test_batches_of_at_most_100(self, stub):
+        results = list(make_client(stub).validate_all(lookups(250)))
+
+        assert sorted(len(batch) for batch in stub.batches) == [50, 100, 100]
+        assert all(len(batch) <= MAX_BATCH_SIZE for batch in stub.batches)
+        assert sorted(int(input_id) for input_id, _, _ in results) == list(range(250))
+        assert all(candidate['delivery_line_1'] == f'{input_id} MAIN ST'
+                   for input_id, candidate, _ in results)
+
+    def test_lookup_body(self, stub):
+        list(make_client(stub).validate_all([
+            {'input_id': '7', 'street': '1 main st', 'street2': '', 'zipcode': '80302', 'ignored': 'x'}
+        ]))
+
+        assert stub.batches == [[{
+            'street': '1 main st', 'zipcode': '80302',
+            'input_id': '7', 'candidates': 1, 'match': 'strict',
+        }]]
+
+    def test_unmatched_lookup_has_no_candidate(self, stub):
+        results = dict((i, (c, e)) for i, c, e in make_client(stub).validate_all(
+            lookups(1) + [{'input_id': 'x', 'street': 'nowhere rd'}]
+        ))
+        assert results['x'] == (None, None)
+        assert results['0'][0] is not None
+
+    def test_requests_in_flight_concurrently(self, stub):
+        stub.release.clear()
+        client = make_client(stub, batch_size=10, max_in_flight=3)
+        threading.Timer(0.5, stub.release.set).start()
+
+        assert len(list(client.validate_all(lookups(60)))) == 60
+        assert stub.max_in_flight == 3
+
+    def test_stopping_early_leaves_no_queued_batches(self, stub):
+        client = make_client(stub, batch_size=10, max_in_flight=2)
+
+        results = client.validate_all(lookups(100))
+        next(results)
+        results.close()
+
+        assert len(stub.batches) <= 3
+
+    def test_auth_error_reported_per_lookup(self, stub):
+        stub.failures = [401]
+        results = list(make_client(stub).validate_all(lookups(3)))
+
+        assert [error for _, _, error in results] == \
+            ["Authentication failed - check your auth ID and token"] * 3
+        assert all(candidate is None for _, candidate, _ in results)
+
+    def test_retries_transient_errors(self, stub, monkeypatch):
+        monkeypatch.setattr('smarty_client.time.sleep', lambda seconds: None)
+        stub.failures = [503, 429]
+        client = make_client(stub)
+
+        results = list(client.validate_all(lookups(5)))
+
+        assert all(error is None for _, _, error in results)
+        assert client.stats['retries'] == 2
+        assert client.stats['requests'] == 3
+
+
+class TestTokenBucket:
+    def test_waits_once_burst_is_spent(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=10, clock=lambda: now[0], sleep=sleep)
+
+        waits = [bucket.acquire() for _ in range(30)]
+
+        assert waits[:10] == [0.0] * 10
+        assert now[0] == pytest.approx(2.0)   # 10 burst + 20 at 10/sec
+
@@ -0,0 +1,93 @@
+"""
+Unit tests for memoized title casing and per-contact standardization.
+
+Run with:
+    pytest tests/test_standardize_capitalization.py -v
+"""
+import pytest
+
+from standardize_capitalization import (
+    FIELDS,
+    apply_staged_updates,
+    smart_title_case,
+    standardize_contact,
+    standardize_state,
+)
+
+
+def blank_contact(**values):
+    contact = {'id': 'c1', 'email': 'a@x.com'}
+    contact.update({column: None for column in FIELDS})
+    contact.update(values)
+    return contact
+
+
+def new_stats():
+    return {key: 0 for key in (
+        'first_name_updated', 'last_name_updated', 'billing_address_updated',
+        'billing_city_updated', 'billing_state_updated', 'shipping_address_updated',
+        'shipping_city_updated', 'shipping_state_updated')}
+
+
+class TestSmartTitleCase:
+    @pytest.mark.parametrize('text, expected', [
+        ('123 MAIN ST NE', '123 Main St NE'),
+        ("o'brien", "O'Brien"),
+        ('mcdonald', 'McDonald'),
+        ('macgregor', 'MacGregor'),
+        ('po box 12', 'PO Box 12'),
+        ('acme llc', 'Acme LLC'),
+        ('2ND avenue', '2nd Avenue'),
+        ('denver', 'Denver'),
+        ('', ''),
+        (None, None),
+    ])
+    def test_rules(self, text, expected):
+        assert smart_title_case(text) == expected
+
+    def test_repeated_values_hit_cache(self):
+        smart_title_case.cache_clear()
+        for _ in range(100):
+            smart_title_case('BOULDER')
+        info = smart_title_case.cache_info()
+        assert (info.misses, info.hits) == (1, 99)
+
+    def test_state_codes_uppercase(self):
+        assert standardize_state(' co ') == 'CO'
+        assert standardize_state('colorado') == 'Colorado'
+
+
+class TestStandardizeContact:
+    def test_changed_fields_and_stats(self):
+        stats = new_stats()
+        contact = blank_contact(first_name='JANE', last_name='Doe', address_line_2='apt 4',
+                                city='boulder', country='usa')
+
+        updates, changes = standardize_contact(contact, stats)
+
+        assert updates == {'first_name': 'Jane', 'address_line_2': 'Apt 4',
+                           'city': 'Boulder', 'country': 'USA'}
+        assert changes == ["first_name: 'JANE' → 'Jane'", "city: 'boulder' → 'Boulder'"]
+        assert stats['first_name_updated'] == 1 and stats['billing_city_updated'] == 1
+        assert stats['last_name_updated'] == 0
+
+    def test_clean_contact_has_no_updates(self):
+        updates, changes = standardize_contact(blank_contact(first_name='Jane', state='CO'), new_stats())
+        assert (updates, changes) == ({}, [])
+
+
+def test_apply_is_one_update_from_staging():
+    class RecordingCursor:
+        rowcount = 3
+
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, sql, params=None):
+            self.statements.append(sql)
+
+    cur = RecordingCursor()
+    assert apply_staged_updates(cur) == 3
+    [sql] = cur.statements
+    assert 'FROM contact_standardization s' in sql
+    assert all(f'{column} = COALESCE(s.{column}, c.{column})' in sql for column in FIELDS)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the streaming CSV export engine.
+
+Run with:
+    pytest tests/test_streaming_export.py -v
+"""
+import csv
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from streaming_export import SampleRows, copy_query_to_csv, write_csv_rows
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class TestWriteCsvRows:
+    def test_header_written_before_first_row_is_fetched(self, tmp_path):
+        output = tmp_path / 'out.csv'
+        seen_on_first_fetch = []
+
+        def rows():
+            seen_on_first_fetch.append(output.read_bytes())
+            yield {'a': 1, 'b': 2}
+
+        assert write_csv_rows(rows(), str(output), ['a', 'b']) == 1
+        assert seen_on_first_fetch == [b'a,b\r\n']
+        assert read_csv(output) == [['a', 'b'], ['1', '2']]
+
+    def test_transform_formats_and_skips(self, tmp_path):
+        output = tmp_path / 'out.csv'
+        rows = iter([{'n': 1}, {'n': 2}, {'n': 3}])
+
+        def transform(row):
+            return None if row['n'] == 2 else {'double': row['n'] * 2}
+
+        assert write_csv_rows(rows, str(output), ['double'], transform) == 2
+        assert read_csv(output) == [['double'], ['2'], ['6']]
+
+
+def test_copy_binds_params_and_wraps_query(tmp_path):
+    class FakeCursor:
+        rowcount = 2
+
+        def mogrify(self, query, params):
+            return query.replace('%s', repr(params[0])).encode()
+
+        def copy_expert(self, sql, f):
+            self.sql = sql
+            f.write('id\n1\n2\n')
+
+        def close(self):
+            pass
+
+    cur = FakeCursor()
+
+    class FakeConnection:
+        def cursor(self):
+            return cur
+
+    output = tmp_path / 'out.csv'
+    assert copy_query_to_csv(FakeConnection(), 'SELECT id FROM t WHERE x = %s', str(output), ('y',)) == 2
+    assert cur.sql == "COPY (SELECT id FROM t WHERE x = 'y') TO STDOUT WITH CSV HEADER"
+    assert read_csv(output) == [['id'], ['1'], ['2']]
+
+
+def test_sample_rows_keeps_first_n():
+    sample = SampleRows(2)
+    for i in range(5):
+        sample.add({'i': i})
+    assert sample.rows == [{'i': 0}, {'i': 1}]
+
+
+def test_validated_mailing_row_postal_code_from_usps_last_line():
+    from generate_validated_mailing_list import format_mailing_row
+
+    contact = {
+        'first_name': 'Ann', 'last_name': 'Lee', 'paypal_business_name': None,
+        'email': 'ann@example.com', 'phone': None, 'email_subscribed': True,
+        'address_line_1': '12 Pearl St', 'address_line_2': None, 'city': 'Boulder',
+        'state': 'CO', 'postal_code': '80302', 'billing_usps_last_line': 'Boulder CO 00302-1234',
+        'country': 'US', 'total_spent': 12.5, 'transaction_count': 2,
+        'has_active_subscription': False, 'membership_tier': None, 'membership_level': None,
+        'membership_group': None, 'created_at': datetime(2024, 1, 2), 'updated_at': None,
+        'last_transaction_date': datetime(2025, 3, 4), 'billing_usps_validated_at': None,
+        'billing_usps_precision': 'Zip9', 'billing_usps_county': 'Boulder', 'billing_usps_rdi': None,
+    }
+
+    row = format_mailing_row(contact)
+
+    assert row['PostalCode'] == '00302'
+    assert row['TotalAmount'] == '$12.50'
+    assert (row['ActiveMember'], row['EmailSubscriber']) == ('No', 'Yes')
+    assert row['LastActivityDate'] == '2025-03-04'
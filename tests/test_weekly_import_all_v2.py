@@ -0,0 +1,177 @@
+"""
+Unit tests for the in-process weekly import pipeline.
+
+Run with:
+    pytest tests/test_weekly_import_all_v2.py -v
+"""
+import threading
+from collections import defaultdict
+
+import pytest
+
+import weekly_import_all_v2
+from weekly_import_all_v2 import KAJABI_AFTER_LANES_STEPS, KAJABI_LANE_STEPS, WeeklyImportPipeline
+
+
+def make_pipeline(**kwargs):
+    options = dict(kajabi_dir='data/current', paypal_file='data/current/paypal_export.txt')
+    options.update(kwargs)
+    return WeeklyImportPipeline(**options)
+
+
+class TestConcurrency:
+    """Tests for choosing concurrent lanes."""
+
+    def test_execute_runs_lanes_concurrently(self):
+        assert make_pipeline(dry_run=False).concurrent
+
+    def test_dry_run_stays_on_one_connection(self):
+        assert not make_pipeline(dry_run=True).concurrent
+
+    def test_single_importer_is_sequential(self):
+        assert not make_pipeline(dry_run=False, skip_paypal=True).concurrent
+
+    def test_sequential_flag(self):
+        assert not make_pipeline(dry_run=False, concurrent=False).concurrent
+
+
+class TestStage:
+    """Tests for stage timing records."""
+
+    def test_records_rows_and_success(self):
+        pipeline = make_pipeline()
+        assert pipeline._stage('kajabi_tags', 'kajabi', lambda: None, lambda: 42)
+        timing = pipeline.timings[0]
+        assert timing['stage'] == 'kajabi_tags'
+        assert timing['lane'] == 'kajabi'
+        assert timing['rows'] == 42
+        assert timing['ok']
+
+    def test_failure_is_recorded_not_raised(self):
+        pipeline = make_pipeline()
+
+        def boom():
+            raise RuntimeError('bad row')
+
+        assert not pipeline._stage('paypal', 'paypal', boom, lambda: 0)
+        assert pipeline.timings[0]['ok'] is False
+
+
+class FakeConnection:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def recorded_pipeline(monkeypatch):
+    """Pipeline whose importers only record the order their stages ran in."""
+    events = []
+    lock = threading.Lock()
+
+    def record(event):
+        with lock:
+            events.append(event)
+
+    class FakeKajabi:
+        def __init__(self, *args, **kwargs):
+            self.stats = defaultdict(lambda: {'processed': 0})
+
+        def attach(self, conn):
+            pass
+
+        def __getattr__(self, name):
+            if name.startswith('load_'):
+                return lambda: record(name[len('load_'):])
+            raise AttributeError(name)
+
+        def ledger_counts(self):
+            return {'rows_processed': 7, 'rows_created': 2, 'rows_updated': 1, 'errors': 0, 'details': {}}
+
+        def close(self):
+            pass
+
+    class FakePayPal:
+        def __init__(self, *args, **kwargs):
+            self.stats = {'rows_processed': 0}
+
+        def import_file(self, path):
+            record('paypal')
+
+        def ledger_counts(self):
+            return {'rows_processed': 3, 'rows_created': 1, 'rows_updated': 0, 'errors': 1, 'details': {}}
+
+        def close(self):
+            pass
+
+    class FakeRecorder:
+        def __init__(self, script, dry_run, **kwargs):
+            self.script = script
+
+        def start(self):
+            return self
+
+        def finish(self, success, **counts):
+            record(('ledger', self.script, success, counts))
+
+    monkeypatch.setattr(weekly_import_all_v2, 'acquire_connection', FakeConnection)
+    monkeypatch.setattr(weekly_import_all_v2, 'release_connection', lambda conn: None)
+    monkeypatch.setattr(weekly_import_all_v2, 'KajabiV2Importer', FakeKajabi)
+    monkeypatch.setattr(weekly_import_all_v2, 'PayPalImporter', FakePayPal)
+    monkeypatch.setattr(weekly_import_all_v2, 'RunRecorder', FakeRecorder)
+    monkeypatch.setattr(WeeklyImportPipeline, '_finish', lambda self, ok, connections: None)
+
+    pipeline = make_pipeline(dry_run=False)
+    pipeline.index.warm = lambda conn: None
+    return pipeline, events
+
+
+class TestLanes:
+    """Tests for keeping the concurrent lanes on separate tables."""
+
+    def test_lanes_do_not_share_kajabi_transactions(self):
+        assert 'transactions' not in KAJABI_LANE_STEPS
+        assert KAJABI_AFTER_LANES_STEPS == ['transactions']
+
+    def test_kajabi_transactions_run_after_paypal(self, recorded_pipeline):
+        pipeline, events = recorded_pipeline
+
+        assert pipeline.run()
+
+        events.pop()
+        assert events[0] == 'contacts'
+        assert events[-1] == 'transactions'
+        assert events.index('paypal') < events.index('transactions')
+        assert sorted(events[1:-1]) == sorted(KAJABI_LANE_STEPS + ['paypal'])
+
+
+class TestRunLedger:
+    """Tests for recording the pipeline run in the run ledger."""
+
+    def test_finishes_one_run_with_combined_counts(self, recorded_pipeline):
+        pipeline, events = recorded_pipeline
+
+        assert pipeline.run()
+
+        _, script, success, counts = events[-1]
+        assert (script, success) == ('weekly_import_all_v2', True)
+        assert (counts['rows_processed'], counts['rows_created'], counts['rows_updated'], counts['errors']) == (10, 3, 1, 1)
+        assert [t['stage'] for t in counts['details']['stages']][:2] == ['warm_index', 'kajabi_contacts']
+
+    def test_failed_acquire_finishes_run_as_failed(self, recorded_pipeline, monkeypatch):
+        pipeline, events = recorded_pipeline
+        released = []
+
+        def refuse():
+            raise OSError('connection refused')
+
+        monkeypatch.setattr(weekly_import_all_v2, 'acquire_connection', refuse)
+        monkeypatch.setattr(weekly_import_all_v2, 'release_connection', released.append)
+
+        with pytest.raises(OSError):
+            pipeline.run()
+
+        assert [event[:3] for event in events] == [('ledger', 'weekly_import_all_v2', False)]
+        assert released == []
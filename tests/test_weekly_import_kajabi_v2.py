@@ -0,0 +1,111 @@
+"""
+Unit tests for the Kajabi v2 bulk contact load (COPY into the staging table).
+
+Run with:
+    pytest tests/test_weekly_import_kajabi_v2.py -v
+"""
+import csv
+import io
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+import weekly_import_kajabi_v2
+from weekly_import_kajabi_v2 import STAGE_CONTACT_COLUMNS, KajabiV2Importer
+
+CONTACT_HEADER = ['id', 'email', 'first_name', 'last_name', 'phone', 'address_line_1',
+                  'address_line_2', 'city', 'state', 'postal_code', 'country',
+                  'kajabi_id', 'kajabi_member_id', 'email_subscribed']
+
+
+class CopyCursor:
+    """Keeps the raw CSV text of every COPY round trip."""
+
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql, file):
+        self.copies.append((sql, file.read()))
+
+
+@pytest.fixture
+def stage(tmp_path):
+    """Write v2_contacts.csv rows and COPY them through a recording cursor."""
+    def run(rows):
+        with open(tmp_path / 'v2_contacts.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CONTACT_HEADER)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({column: row.get(column, '') for column in CONTACT_HEADER})
+
+        importer = KajabiV2Importer(str(tmp_path), bulk=True)
+        importer.cur = CopyCursor()
+        staged = importer._copy_contacts_to_stage()
+        return importer, staged
+
+    return run
+
+
+def copied_rows(importer):
+    """Staged rows as COPY ... (FORMAT csv) would read them (unquoted empty = NULL)."""
+    text = ''.join(data for _, data in importer.cur.copies)
+    rows = []
+    for line in csv.reader(io.StringIO(text)):
+        rows.append(dict(zip(STAGE_CONTACT_COLUMNS, line)))
+    return text, rows
+
+
+class TestCopyContactsToStage:
+    def test_builds_staged_rows_from_contacts(self, stage):
+        importer, staged = stage([
+            {'id': 'k1', 'email': ' Ada@Example.COM ', 'first_name': 'Ada', 'kajabi_id': '42',
+             'email_subscribed': 'true'},
+            {'id': 'k2', 'email': 'not-an-email'},
+            {'id': 'k3', 'email': 'grace@example.com', 'last_name': 'Hopper'},
+        ])
+
+        assert staged == 2
+        assert importer.stats['contacts']['processed'] == 3
+        assert importer.stats['contacts']['errors'] == 1
+
+        (sql, _), = importer.cur.copies
+        assert sql == (f"COPY kajabi_contacts_stage ({', '.join(STAGE_CONTACT_COLUMNS)}) "
+                       f"FROM STDIN WITH (FORMAT csv)")
+
+        _, rows = copied_rows(importer)
+        assert [(r['seq'], r['email'], r['email_subscribed']) for r in rows] == [
+            ('1', 'ada@example.com', 'true'),
+            ('2', 'grace@example.com', 'false'),
+        ]
+        assert rows[0]['kajabi_id'] == '42'
+        assert importer.source_contact_keys['k1'] == ('ada@example.com', '42')
+
+    def test_missing_values_are_copied_as_null(self, stage):
+        importer, _ = stage([{'email': 'ada@example.com', 'first_name': '  ', 'city': 'Boulder'}])
+
+        text, _ = copied_rows(importer)
+
+        # Unquoted empty fields are NULL in COPY csv; blank input never becomes ''
+        assert text == '1,ada@example.com,,,,,,Boulder,,,,,,false\n'
+
+    def test_embedded_quotes_commas_and_newlines_round_trip(self, stage):
+        tricky = 'Suite "B", Floor 2\nRear entrance'
+        importer, _ = stage([{'email': 'ada@example.com', 'address_line_2': tricky,
+                              'last_name': 'O"Neil, Jr.'}])
+
+        text, rows = copied_rows(importer)
+
+        assert '"Suite ""B"", Floor 2\nRear entrance"' in text
+        assert rows[0]['address_line_2'] == tricky
+        assert rows[0]['last_name'] == 'O"Neil, Jr.'
+
+    def test_copies_in_chunks(self, stage, monkeypatch):
+        monkeypatch.setattr(weekly_import_kajabi_v2, 'BULK_COPY_CHUNK_ROWS', 2)
+
+        importer, staged = stage([{'email': f'user{i}@example.com'} for i in range(5)])
+
+        assert staged == 5
+        assert [data.count('\n') for _, data in importer.cur.copies] == [2, 2, 1]
+        _, rows = copied_rows(importer)
+        assert [r['seq'] for r in rows] == ['1', '2', '3', '4', '5']